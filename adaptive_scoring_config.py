@@ -157,9 +157,17 @@ class AdaptiveScoringManager:
         return MarketRegime.SIDEWAYS
 
     def optimize_thresholds_from_backtest(self, backtest_results: List[Dict]):
-        """백테스트 결과 기반 임계점 최적화"""
+        """
+        백테스트 결과 기반 임계점 최적화
+
+        Args:
+            backtest_results: 시점별 (점수, 수익률) 샘플 목록
+                - 'total_score' (또는 'score'): 0-100 점수
+                - 'return': 소수 수익률 (0.05 = 5%), 없으면 'pnl_pct' / 100 사용
+                backtest_engine.BacktestResult.threshold_samples()가 이 형식을 생성한다.
+        """
         # 백테스트 결과를 분석하여 최적의 임계점 찾기
-        best_threshold = 60.0
+        best_threshold = self.config.base_pass_threshold
         best_performance = 0.0
 
         for threshold in range(40, 90, 5):
@@ -179,11 +187,25 @@ class AdaptiveScoringManager:
 
     def _calculate_performance_at_threshold(self,
                                           results: List[Dict],
-                                          threshold: float) -> float:
-        """특정 임계점에서의 성과 계산"""
-        # 승률, 수익률, 샤프비율 등을 종합한 성과 지표
-        # 임시 구현
-        return 0.5
+                                          threshold: float,
+                                          min_samples: int = 5) -> float:
+        """
+        특정 임계점에서의 성과 계산
+
+        임계점 이상 점수를 받은 샘플의 수익률로 calculate_performance_score를 계산한다.
+        """
+        returns = []
+        for result in results:
+            score = result.get('total_score', result.get('score'))
+            if score is None or score < threshold:
+                continue
+
+            ret = result.get('return')
+            if ret is None:
+                ret = result.get('pnl_pct', 0.0) / 100.0
+            returns.append(float(ret))
+
+        return calculate_performance_score(returns, min_samples)
 
     def update_from_live_performance(self, trade_results: List[Dict]):
         """실제 거래 성과 기반 설정 업데이트"""
@@ -205,6 +227,27 @@ class AdaptiveScoringManager:
 
             self.save_config(self.config)
 
+def calculate_performance_score(returns: List[float], min_samples: int = 5) -> float:
+    """
+    수익률 샘플의 종합 성과 지표
+
+    - 승률 40% + 평균 수익률 40% (10% 수익 = 만점) + 샤프비율 20% (1.0 = 만점)
+    - 수익률/샤프 항목은 -1~1로 제한, 샘플이 min_samples 미만이면 0.0
+    """
+    count = len(returns)
+    if count < min_samples:
+        return 0.0
+
+    win_rate = sum(1 for r in returns if r > 0) / count
+    avg_return = sum(returns) / count
+    variance = sum((r - avg_return) ** 2 for r in returns) / (count - 1)
+    sharpe = avg_return / variance ** 0.5 if variance > 0 else 0.0
+
+    return_component = max(-1.0, min(1.0, avg_return / 0.10))
+    sharpe_component = max(-1.0, min(1.0, sharpe))
+
+    return 0.4 * win_rate + 0.4 * return_component + 0.2 * sharpe_component
+
 def create_scoring_strategies():
     """다양한 점수제 전략 프리셋"""
 
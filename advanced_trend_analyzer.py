@@ -148,13 +148,14 @@ class AdvancedTrendAnalyzer:
 
         logger.info("🚀 AdvancedTrendAnalyzer 초기화 완료")
 
-    def analyze_ticker(self, ticker: str) -> TradingSignal:
-        """3단계 계층적 분석 실행"""
+    def analyze_ticker(self, ticker: str, df: Optional[pd.DataFrame] = None) -> TradingSignal:
+        """3단계 계층적 분석 실행 (df 전달 시 DB 조회 생략)"""
         logger.info(f"🔍 {ticker} 고도화 분석 시작")
 
         try:
             # 데이터 로드
-            df = self._get_ohlcv_data(ticker)
+            if df is None:
+                df = self._get_ohlcv_data(ticker)
             if df.empty or len(df) < self.min_data_points:
                 return TradingSignal.reject(ticker, f"데이터 부족 ({len(df)}개)")
 
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+API Rate Limiter - 업비트 Remaining-Req 기반 중앙 레이트 리밋 스케줄러
+모든 Phase가 고정 sleep 대신 이 스케줄러를 통해 API를 호출하여
+여유가 있을 때는 최대 속도로, 429 발생 시에는 적응형 백오프로 동작
+
+🎯 핵심 기능:
+- 엔드포인트 그룹별 토큰 버킷 (업비트 공식 한도 기준)
+  · Quotation: market / candles / ticker / orderbook / trades 초당 10회
+  · Exchange: default 초당 30회, order 초당 8회
+- Remaining-Req 헤더(group=market; min=573; sec=9) 반영: 서버가 알려준 잔여량으로 버킷 동기화
+- 429(TooManyRequests) 감지 시 AIMD: 속도 절반 감소 + 지수 백오프(full jitter) 후 재시도 (주문 그룹은 재시도 없이 호출 측 반환)
+- 성공이 이어지면 기준 속도까지 점진 복구
+
+📊 사용 예시:
+    limiter = get_rate_limiter()
+
+    # 일반 호출 (토큰 확보 후 실행)
+    df = limiter.call('candles', pyupbit.get_ohlcv, ticker, interval='day', count=200)
+
+    # Remaining-Req 정보를 함께 받는 pyupbit 함수 (limit_info=True / contain_req=True)
+    price = limiter.call('ticker', pyupbit.get_current_price, ticker, limit_info_kw='limit_info')
+    balances = limiter.call('default', upbit.get_balances, limit_info_kw='contain_req')
+
+    # requests 직접 호출 시 헤더 반영
+    limiter.acquire('ticker')
+    response = requests.get(url, params=params)
+    limiter.observe_headers(response.headers)
+"""
+
+import re
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 그룹별 기준 초당 호출 수 (업비트 API 요청 수 제한 정책)
+DEFAULT_GROUP_RATES: Dict[str, float] = {
+    'market': 10.0,
+    'candles': 10.0,
+    'ticker': 10.0,
+    'orderbook': 10.0,
+    'trades': 10.0,
+    'default': 30.0,
+    'order': 8.0,
+    'external': 2.0,   # Fear&Greed 등 외부 API
+    'openai': 1.0,     # GPT 분석
+}
+
+# 자동 재시도 금지 그룹: 주문은 멱등하지 않으므로 제한 응답도 호출 측(order_tracker 대사)에 그대로 전달
+NON_RETRYABLE_GROUPS = frozenset({'order'})
+
+_REMAINING_REQ_PATTERN = re.compile(r"group=([a-z\-]+); min=([0-9]+); sec=([0-9]+)")
+
+
+@dataclass
+class _GroupState:
+    """그룹별 토큰 버킷 + 적응형 백오프 상태"""
+    name: str
+    base_rate: float
+    rate: float
+    tokens: float
+    last_refill: float
+    blocked_until: float = 0.0
+    consecutive_throttles: int = 0
+    success_streak: int = 0
+    stats: Dict[str, float] = field(default_factory=lambda: {
+        'calls': 0, 'throttled': 0, 'retries': 0, 'wait_seconds': 0.0, 'server_syncs': 0
+    })
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate)  # 1초 분량까지 버스트 허용
+
+    def refill(self, now: float):
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+
+
+class UpbitRateLimiter:
+    """엔드포인트 그룹별 토큰 버킷 스케줄러 (스레드 안전)"""
+
+    def __init__(self, group_rates: Optional[Dict[str, float]] = None,
+                 max_retries: int = 3, base_backoff: float = 0.5, max_backoff: float = 10.0,
+                 min_rate_ratio: float = 0.1, recovery_step_ratio: float = 0.1,
+                 recovery_after: int = 5, sleep_func: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.group_rates = dict(DEFAULT_GROUP_RATES)
+        if group_rates:
+            self.group_rates.update(group_rates)
+
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_rate_ratio = min_rate_ratio
+        self.recovery_step_ratio = recovery_step_ratio
+        self.recovery_after = recovery_after
+        self.enabled = True
+
+        self._sleep = sleep_func
+        self._clock = clock
+        self._groups: Dict[str, _GroupState] = {}
+        self._lock = threading.Lock()
+
+    def _group(self, name: str) -> _GroupState:
+        """그룹 상태 조회 (미등록 그룹은 default 속도로 생성) - 호출 측에서 lock 보유"""
+        state = self._groups.get(name)
+        if state is None:
+            rate = self.group_rates.get(name, self.group_rates['default'])
+            state = _GroupState(name=name, base_rate=rate, rate=rate, tokens=rate, last_refill=self._clock())
+            self._groups[name] = state
+        return state
+
+    # ------------------------------------------------------------------
+    # 토큰 확보
+    # ------------------------------------------------------------------
+
+    def acquire(self, group: str):
+        """토큰 1개 확보 (필요 시 대기)"""
+        if not self.enabled:
+            with self._lock:
+                self._group(group).stats['calls'] += 1
+            return
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                state = self._group(group)
+                now = self._clock()
+                state.refill(now)
+
+                if now < state.blocked_until:
+                    wait = state.blocked_until - now
+                elif state.tokens >= 1.0:
+                    state.tokens -= 1.0
+                    state.stats['calls'] += 1
+                    state.stats['wait_seconds'] += waited
+                    return
+                else:
+                    wait = (1.0 - state.tokens) / state.rate
+
+            self._sleep(wait)
+            waited += wait
+
+    # ------------------------------------------------------------------
+    # 서버 피드백 반영
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def parse_remaining_req(value: Any) -> Optional[Dict[str, Any]]:
+        """Remaining-Req 헤더 문자열 또는 pyupbit limit_info dict → {'group', 'min', 'sec'}"""
+        if isinstance(value, dict):
+            return value if 'group' in value and 'sec' in value else None
+        if not value:
+            return None
+        matched = _REMAINING_REQ_PATTERN.search(str(value))
+        if not matched:
+            return None
+        return {'group': matched.group(1), 'min': int(matched.group(2)), 'sec': int(matched.group(3))}
+
+    def observe_remaining(self, remaining: Any):
+        """서버가 알려준 초당 잔여 요청 수로 토큰 버킷 동기화"""
+        info = self.parse_remaining_req(remaining)
+        if not info:
+            return
+
+        with self._lock:
+            state = self._group(info['group'])
+            state.refill(self._clock())
+            # 서버 기준 잔여량이 더 적으면 따라간다 (다른 프로세스/스레드 사용분 반영)
+            state.tokens = min(state.tokens, float(info['sec']))
+            state.stats['server_syncs'] += 1
+
+    def observe_headers(self, headers: Optional[Dict[str, str]]):
+        """requests 응답 헤더의 Remaining-Req 반영"""
+        if headers:
+            self.observe_remaining(headers.get('Remaining-Req'))
+
+    def report_throttled(self, group: str) -> float:
+        """429 감지: 속도 절반 감소 + 지수 백오프 (full jitter). 백오프 시간 반환"""
+        with self._lock:
+            state = self._group(group)
+            state.consecutive_throttles += 1
+            state.success_streak = 0
+            state.rate = max(state.base_rate * self.min_rate_ratio, state.rate * 0.5)
+            state.tokens = 0.0
+
+            backoff = min(self.max_backoff, self.base_backoff * (2 ** (state.consecutive_throttles - 1)))
+            backoff = random.uniform(backoff / 2, backoff)
+            state.blocked_until = max(state.blocked_until, self._clock() + backoff)
+            state.stats['throttled'] += 1
+            rate = state.rate
+
+        logger.warning(f"🚦 {group} 그룹 요청 제한(429): {backoff:.2f}초 대기, 속도 {rate:.1f}/s로 감소")
+        return backoff
+
+    def report_success(self, group: str):
+        """성공 누적 시 기준 속도까지 점진 복구 (additive increase)"""
+        with self._lock:
+            state = self._group(group)
+            state.consecutive_throttles = 0
+            if state.rate >= state.base_rate:
+                return
+
+            state.success_streak += 1
+            if state.success_streak >= self.recovery_after:
+                state.rate = min(state.base_rate, state.rate + state.base_rate * self.recovery_step_ratio)
+                state.success_streak = 0
+
+    # ------------------------------------------------------------------
+    # 호출 래퍼
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_throttle_error(error: BaseException) -> bool:
+        """pyupbit TooManyRequests 또는 HTTP 429 상태 코드 예외만 요청 제한으로 판정 (메시지 문자열은 보지 않음)"""
+        if type(error).__name__ == 'TooManyRequests':
+            return True
+        status = getattr(error, 'status_code', None)
+        if status is None:
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status == 429
+
+    @staticmethod
+    def _is_throttle_response(result: Any) -> bool:
+        """업비트 error 응답 dict 중 요청 수 제한"""
+        if isinstance(result, dict) and isinstance(result.get('error'), dict):
+            return 'too_many' in str(result['error'].get('name', '')).lower()
+        return False
+
+    def call(self, group: str, func: Callable, *args, limit_info_kw: Optional[str] = None, **kwargs) -> Any:
+        """
+        레이트 리밋을 적용하여 API 호출
+
+        Args:
+            group: 엔드포인트 그룹 (market, candles, ticker, orderbook, default, order ...)
+            func: 호출할 함수 (pyupbit 함수 / Upbit 메서드 등)
+            limit_info_kw: Remaining-Req 정보를 함께 반환받는 인자명 ('limit_info' 또는 'contain_req')
+
+        order 그룹은 요청 제한이어도 재시도하지 않는다 (속도만 줄이고 예외/에러 응답을 그대로 반환).
+        None 응답은 요청 제한으로 보지 않는다 (pyupbit.get_ohlcv는 상장폐지/네트워크 오류도 None으로 반환하므로
+        None마다 그룹 속도를 줄이면 종목 하나의 오류가 전체 수집을 늦춘다).
+        """
+        if limit_info_kw:
+            kwargs[limit_info_kw] = True
+
+        max_retries = 0 if group in NON_RETRYABLE_GROUPS else self.max_retries
+        attempt = 0
+        while True:
+            self.acquire(group)
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if self._is_throttle_error(e):
+                    self.report_throttled(group)
+                    if attempt < max_retries:
+                        attempt += 1
+                        self._count_retry(group)
+                        continue
+                raise
+
+            if limit_info_kw and isinstance(result, tuple) and len(result) == 2:
+                result, remaining = result
+                self.observe_remaining(remaining)
+
+            if self._is_throttle_response(result):
+                self.report_throttled(group)
+                if attempt < max_retries:
+                    attempt += 1
+                    self._count_retry(group)
+                    continue
+                return result
+
+            if result is not None:
+                self.report_success(group)
+            return result
+
+    def _count_retry(self, group: str):
+        with self._lock:
+            self._group(group).stats['retries'] += 1
+
+    # ------------------------------------------------------------------
+    # 설정 / 통계
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """그룹별 호출/대기/제한 통계"""
+        with self._lock:
+            return {
+                name: {
+                    **{k: round(v, 3) if isinstance(v, float) else v for k, v in state.stats.items()},
+                    'rate': round(state.rate, 2),
+                    'base_rate': state.base_rate
+                }
+                for name, state in self._groups.items()
+            }
+
+
+_rate_limiter: Optional[UpbitRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> UpbitRateLimiter:
+    """프로세스 전역 레이트 리미터 (모든 Phase가 공유)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = UpbitRateLimiter()
+    return _rate_limiter
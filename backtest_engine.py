@@ -0,0 +1,865 @@
+#!/usr/bin/env python3
+"""
+Backtest Engine - 오프라인 백테스트 엔진
+ohlcv_data를 날짜순으로 재생하며 점수제 → Kelly → 매도 조건 전체 스택을 검증
+
+🎯 핵심 기능:
+- 시점별(point-in-time) 데이터: 각 날짜는 그날 종가까지의 데이터만 사용
+- LayeredScoringEngine.score_data: 실운영과 동일한 모듈/Layer/Quality Gate 로직
+- KellyCalculator.calculate_position_size: 실운영과 동일한 패턴 감지 및 포지션 크기
+- LocalTradingEngine.check_sell_conditions: 실운영과 동일한 매도 우선순위
+- 체결 시뮬레이션: 종가 신호 → 다음 날 시가 체결, 슬리피지 + Taker 수수료 반영
+- 결과물: 일별 자산 곡선, 거래 내역, 성과 지표, 임계점 최적화용 샘플
+
+⚡ 성능 설계 (1년 × 200종목 = 약 7만 회 채점):
+- Phase A (채점): 종목별 독립 → ProcessPoolExecutor 병렬, 종목 데이터 1회 로드 후 슬라이스 재사용
+  - 채점은 동기 경로(score_data)로 모듈 호출마다 스레드 풀을 만드는 비동기 오버헤드 제거
+  - MA/RSI는 DB 값, MACD/ATR은 전체 이력에 1회 계산 (모두 인과적 지표 → 미래 정보 없음)
+- Phase B (시뮬레이션): 미리 계산된 신호 테이블 위에서 날짜별 순차 처리 (포트폴리오 상태 의존)
+
+📊 사용 예시:
+    engine = BacktestEngine(BacktestConfig(start_date='2024-01-01', end_date='2024-12-31'))
+    result = engine.run()
+    result.save('backtest_results')
+"""
+
+import os
+import sys
+import dis
+import json
+import sqlite3
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from layered_scoring_engine import LayeredScoringEngine, LayerType, ScoringResult
+from basic_scoring_modules import (
+    MarketRegimeModule, VolumeProfileModule, PriceActionModule,
+    StageAnalysisModule, MovingAverageModule, RelativeStrengthModule,
+    PatternRecognitionModule, VolumeSpikeModule, MomentumModule
+)
+from kelly_calculator import KellyCalculator, RiskLevel
+from trading_engine import LocalTradingEngine, TradingConfig, TrailingStopManager, PositionInfo
+
+logger = logging.getLogger(__name__)
+
+
+OHLCV_BASE_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume',
+                      'ma5', 'ma20', 'ma60', 'ma120', 'ma200', 'rsi']
+
+
+@dataclass
+class BacktestConfig:
+    """백테스트 설정"""
+    db_path: str = "./makenaide_local.db"
+    start_date: Optional[str] = None          # 시뮬레이션 시작일 (None: 데이터 최초일 + 워밍업)
+    end_date: Optional[str] = None            # 시뮬레이션 종료일 (None: 데이터 최종일)
+    tickers: Optional[List[str]] = None       # 대상 종목 (None: ohlcv_data 전체)
+
+    initial_capital: float = 10_000_000.0     # 초기 자본 (KRW)
+    taker_fee_rate: float = 0.00139           # Taker 수수료 (TradingConfig와 동일)
+    slippage_rate: float = 0.001              # 시가 체결 슬리피지 (0.1%)
+    max_positions: int = 8                    # 최대 동시 보유 종목
+
+    # 진입 조건 (LayeredScoringEngine 추천 등급 기준)
+    entry_recommendations: Tuple[str, ...] = ('BUY', 'STRONG_BUY')
+    min_entry_confidence: float = 0.0
+    risk_level: RiskLevel = RiskLevel.MODERATE
+
+    # 매도 조건
+    stop_loss_percent: float = -8.0
+    take_profit_percent: float = 20.0
+    use_trailing_stop: bool = True
+    atr_multiplier: float = 1.0
+    liquidate_at_end: bool = True             # 종료일 종가로 잔여 포지션 청산
+
+    # 채점 설정
+    lookback_days: int = 300                  # 채점 윈도우 (_get_ohlcv_data의 LIMIT 300과 동일)
+    min_history_days: int = 50                # 채점 최소 이력
+    forward_return_days: int = 20             # 임계점 최적화용 선행 수익률 기간
+    max_workers: int = max(1, (os.cpu_count() or 2) - 1)
+
+
+@dataclass
+class BacktestPosition:
+    """백테스트 보유 포지션"""
+    ticker: str
+    quantity: float
+    entry_price: float          # 슬리피지 반영 체결가
+    cost_basis: float           # 수수료 포함 총 매수 금액
+    entry_fee: float
+    entry_date: str
+    entry_score: float
+    pattern: str
+    kelly_pct: float
+    last_price: float = 0.0
+
+
+@dataclass
+class BacktestResult:
+    """백테스트 결과"""
+    config: BacktestConfig
+    equity_curve: pd.DataFrame
+    trades: pd.DataFrame
+    signals: pd.DataFrame
+    metrics: Dict[str, float] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def threshold_samples(self) -> List[Dict]:
+        """
+        AdaptiveScoringManager.optimize_thresholds_from_backtest 입력용 샘플
+
+        실제 체결된 거래만 쓰면 현재 진입 임계점 이상의 점수만 관측되므로,
+        모든 시점의 (점수, 선행 수익률) 쌍을 반환한다.
+        """
+        if self.signals.empty or 'forward_return' not in self.signals.columns:
+            return []
+
+        valid = self.signals.dropna(subset=['forward_return'])
+        return [
+            {'ticker': ticker, 'date': date, 'total_score': score, 'return': ret}
+            for ticker, date, score, ret in zip(
+                valid['ticker'], valid['date'], valid['total_score'], valid['forward_return']
+            )
+        ]
+
+    def save(self, output_dir: str = "backtest_results") -> str:
+        """자산 곡선 / 거래 내역 / 요약 저장"""
+        run_dir = os.path.join(output_dir, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        os.makedirs(run_dir, exist_ok=True)
+
+        self.equity_curve.to_csv(os.path.join(run_dir, 'equity_curve.csv'), index=False)
+        self.trades.to_csv(os.path.join(run_dir, 'trades.csv'), index=False)
+
+        config_dict = asdict(self.config)
+        config_dict['risk_level'] = self.config.risk_level.value
+
+        with open(os.path.join(run_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'config': config_dict,
+                'metrics': self.metrics,
+                'timings': self.timings
+            }, f, indent=2, ensure_ascii=False, default=str)
+
+        logger.info(f"💾 백테스트 결과 저장: {run_dir}")
+        return run_dir
+
+
+class BacktestTradingEngine(LocalTradingEngine):
+    """
+    백테스트용 거래 엔진
+
+    API 클라이언트/DB 없이 LocalTradingEngine의 매도 조건과 포지션 사이징 로직만 재사용한다.
+    - get_total_balance_krw: 시뮬레이션 자산 반환
+    - _get_stage_history: 시점별 Stage 이력 반환 (unified_technical_analysis 조회 대체)
+    - ATR 트레일링 스탑은 BacktestEngine이 시점별 ATR로 직접 관리하므로
+      trailing_stop_manager 속성은 두지 않는다
+
+    LocalTradingEngine.__init__은 업비트 클라이언트 초기화와 로컬 DB 쓰기를 수행하므로 호출하지 않는다.
+    대신 부모 __init__이 설정하는 속성을 BACKTEST_ATTRIBUTES / LIVE_ONLY_ATTRIBUTES로 모두 분류해 두고,
+    생성 시 미분류 속성이 있으면 실패시킨다 (부모에 속성이 추가되면 여기서 분류해야 함).
+    """
+
+    # 백테스트 인스턴스가 직접 설정하는 속성 (check_sell_conditions / calculate_position_size 경로)
+    BACKTEST_ATTRIBUTES = ('config', 'dry_run', 'db_path', 'upbit', 'simulated_equity', 'stage_history')
+
+    # 실거래 전용 속성 - 주문/대사/리스크/DB 상태는 백테스트에서 의도적으로 두지 않는다
+    LIVE_ONLY_ATTRIBUTES = (
+        'rate_limiter', 'order_tracker', 'order_executor', 'reconciler', 'risk_engine',
+        'portfolio_snapshot', 'position_context', 'pyramid_state_manager',
+        'trailing_stop_manager', 'trading_stats',
+    )
+
+    def __init__(self, config: TradingConfig):
+        self._check_parent_attributes()
+
+        self.config = config
+        self.dry_run = True
+        self.db_path = None
+        self.upbit = None
+        self.simulated_equity = 0.0
+        self.stage_history: Dict[str, List[Dict[str, Any]]] = {}
+
+        missing = [name for name in self.BACKTEST_ATTRIBUTES if not hasattr(self, name)]
+        if missing:
+            raise RuntimeError(f"BacktestTradingEngine 속성 누락: {missing}")
+
+    @classmethod
+    def _check_parent_attributes(cls):
+        """LocalTradingEngine.__init__이 설정하는 속성이 모두 분류되어 있는지 확인"""
+        parent_attributes = {
+            instruction.argval for instruction in dis.get_instructions(LocalTradingEngine.__init__)
+            if instruction.opname == 'STORE_ATTR'
+        }
+        unclassified = parent_attributes - set(cls.BACKTEST_ATTRIBUTES) - set(cls.LIVE_ONLY_ATTRIBUTES)
+        if unclassified:
+            raise RuntimeError(
+                f"LocalTradingEngine에 백테스트 미분류 속성 추가됨: {sorted(unclassified)} "
+                f"- BacktestTradingEngine.BACKTEST_ATTRIBUTES 또는 LIVE_ONLY_ATTRIBUTES에 분류 필요"
+            )
+
+    def get_total_balance_krw(self) -> float:
+        return self.simulated_equity
+
+    def _get_stage_history(self, ticker: str, limit: int = 3) -> List[Dict[str, Any]]:
+        return self.stage_history.get(ticker, [])[:limit]
+
+
+def create_default_scoring_engine(db_path: str = "./makenaide_local.db") -> LayeredScoringEngine:
+    """IntegratedScoringSystem과 동일한 9개 모듈이 등록된 LayeredScoringEngine 생성"""
+    engine = LayeredScoringEngine(db_path)
+
+    for module in (MarketRegimeModule(), VolumeProfileModule(), PriceActionModule(),
+                   StageAnalysisModule(), MovingAverageModule(), RelativeStrengthModule(),
+                   PatternRecognitionModule(), VolumeSpikeModule(), MomentumModule()):
+        engine.register_module(module)
+
+    return engine
+
+
+def load_ohlcv_history(db_path: str, tickers: Optional[List[str]] = None,
+                       end_date: Optional[str] = None) -> pd.DataFrame:
+    """
+    ohlcv_data 전체 이력 1회 로드 (long format, ticker/date 오름차순)
+
+    ATR 컬럼이 없거나 비어 있으면 14일 True Range 평균으로 보충한다.
+    """
+    with sqlite3.connect(db_path) as conn:
+        table_columns = {row[1] for row in conn.execute("PRAGMA table_info(ohlcv_data)")}
+        columns = [col for col in OHLCV_BASE_COLUMNS if col in table_columns]
+        if 'atr' in table_columns:
+            columns.append('atr')
+
+        conditions = ["close IS NOT NULL"]
+        params: List[Any] = []
+        if tickers:
+            conditions.append(f"ticker IN ({','.join('?' * len(tickers))})")
+            params.extend(tickers)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+
+        query = f"""
+            SELECT {', '.join(columns)}
+            FROM ohlcv_data
+            WHERE {' AND '.join(conditions)}
+            ORDER BY ticker, date
+        """
+        df = pd.read_sql_query(query, conn, params=params)
+
+    if df.empty:
+        return df
+
+    df['date'] = df['date'].astype(str).str[:10]
+
+    # ATR 보충 (인과적 계산: 당일까지의 데이터만 사용)
+    prev_close = df.groupby('ticker')['close'].shift(1)
+    true_range = pd.concat([
+        df['high'] - df['low'],
+        (df['high'] - prev_close).abs(),
+        (df['low'] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    computed_atr = true_range.groupby(df['ticker']).transform(lambda s: s.rolling(14, min_periods=1).mean())
+
+    if 'atr' in df.columns:
+        df['atr'] = df['atr'].fillna(computed_atr)
+    else:
+        df['atr'] = computed_atr
+
+    return df
+
+
+# Phase A 워커 프로세스별 엔진 (프로세스당 1회 생성)
+_worker_scoring_engine: Optional[LayeredScoringEngine] = None
+
+
+def _get_worker_scoring_engine(db_path: str) -> LayeredScoringEngine:
+    global _worker_scoring_engine
+    if _worker_scoring_engine is None:
+        _worker_scoring_engine = create_default_scoring_engine(db_path)
+    return _worker_scoring_engine
+
+
+def _ma200_trend_from_slope(ma200_slope: float) -> str:
+    """MA200 20일 기울기(%) → 트렌드 (HybridTechnicalFilter 2% 기준과 동일)"""
+    if ma200_slope > 2.0:
+        return 'up'
+    if ma200_slope < -2.0:
+        return 'down'
+    return 'sideways'
+
+
+def _layers_data(scoring_result: ScoringResult) -> Dict[str, Any]:
+    """KellyCalculator._map_technical_data가 읽는 analysis_details 형식으로 변환"""
+    return {
+        layer_type.value: {
+            'score': layer_result.score,
+            'modules': {
+                module_result.module_name: {'score': module_result.score, 'details': module_result.details}
+                for module_result in layer_result.module_results
+            }
+        }
+        for layer_type, layer_result in scoring_result.layer_results.items()
+    }
+
+
+def score_ticker_history(ticker: str, frame: pd.DataFrame, db_path: str,
+                         start_date: Optional[str], end_date: Optional[str],
+                         lookback_days: int, min_history_days: int,
+                         forward_return_days: int, cost_rate: float,
+                         entry_recommendations: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    한 종목의 모든 시뮬레이션 날짜를 시점별로 채점 (Phase A, 워커 프로세스에서 실행)
+
+    Returns:
+        날짜별 신호 DataFrame (총점, 추천, Stage 이력, 모듈별 원점수, 선행 수익률)
+    """
+    engine = _get_worker_scoring_engine(db_path)
+
+    frame = frame.reset_index(drop=True)
+    frame = LayeredScoringEngine.add_macd(frame)
+
+    dates = frame['date'].to_numpy()
+    rows = []
+
+    for i in range(len(frame)):
+        date = dates[i]
+        if i + 1 < min_history_days:
+            continue
+        if start_date and date < start_date:
+            continue
+        if end_date and date > end_date:
+            break
+
+        window = frame.iloc[max(0, i - lookback_days + 1):i + 1]
+        result = engine.score_data(ticker, window)
+
+        row = {
+            'ticker': ticker,
+            'date': date,
+            'close': float(frame.at[i, 'close']),
+            'atr': float(frame.at[i, 'atr']),
+            'total_score': result.total_score,
+            'confidence': result.confidence,
+            'recommendation': result.recommendation,
+            'quality_gates_passed': result.quality_gates_passed,
+            'stage': 1,
+            'stage_confidence': 0.0,
+            'price_vs_ma200': 0.0,
+            'ma200_trend': 'sideways',
+            'layers_data': None
+        }
+
+        for layer_result in result.layer_results.values():
+            for module_result in layer_result.module_results:
+                row[f"{module_result.module_name}_score"] = module_result.score
+                row[f"{module_result.module_name}_confidence"] = module_result.confidence
+
+                if module_result.module_name == 'StageAnalysis' and 'stage' in module_result.details:
+                    details = module_result.details
+                    row['stage'] = details['stage']
+                    row['stage_confidence'] = details.get('stage_confidence', 0.0)
+                    row['price_vs_ma200'] = details.get('price_vs_ma200', 0.0)
+                    row['ma200_trend'] = _ma200_trend_from_slope(details.get('ma200_slope', 0.0))
+
+        # 진입 후보 시점만 Kelly 패턴 감지용 상세 정보 보관 (메모리 절약)
+        if result.recommendation in entry_recommendations:
+            row['layers_data'] = _layers_data(result)
+
+        rows.append(row)
+
+    if not rows:
+        return pd.DataFrame()
+
+    signals = pd.DataFrame(rows)
+
+    # 직전 분석 시점 Stage (매도 조건의 Stage 2→3 전환 체크용)
+    for col in ('stage', 'stage_confidence', 'ma200_trend', 'price_vs_ma200'):
+        signals[f'prev_{col}'] = signals[col].shift(1)
+
+    # 선행 수익률: 다음 날 시가 매수 → N일 후 종가 매도 (비용 반영, 라벨 전용)
+    next_open = frame['open'].shift(-1)
+    exit_close = frame['close'].shift(-forward_return_days)
+    forward = (exit_close * (1 - cost_rate)) / (next_open * (1 + cost_rate)) - 1
+    forward_by_date = pd.Series(forward.to_numpy(), index=frame['date'])
+    signals['forward_return'] = signals['date'].map(forward_by_date)
+
+    return signals
+
+
+def _score_ticker_task(args: Tuple) -> pd.DataFrame:
+    """ProcessPoolExecutor용 래퍼"""
+    ticker = args[0]
+    try:
+        return score_ticker_history(*args)
+    except Exception as e:
+        logger.error(f"❌ {ticker} 백테스트 채점 실패: {e}")
+        return pd.DataFrame()
+
+
+class BacktestEngine:
+    """점수제 → Kelly → 매도 조건 스택의 오프라인 백테스트 엔진"""
+
+    def __init__(self, config: Optional[BacktestConfig] = None):
+        self.config = config or BacktestConfig()
+
+        self.trading_config = TradingConfig(
+            max_positions=self.config.max_positions,
+            stop_loss_percent=self.config.stop_loss_percent,
+            take_profit_percent=self.config.take_profit_percent,
+            taker_fee_rate=self.config.taker_fee_rate
+        )
+        self.trading_engine = BacktestTradingEngine(self.trading_config)
+        self.kelly_calculator = KellyCalculator(
+            db_path=self.config.db_path,
+            risk_level=self.config.risk_level,
+            use_realized_statistics=False  # 시뮬레이션 시점 이후 실거래 성과 반영 방지
+        )
+
+    # ------------------------------------------------------------------
+    # Phase A: 시점별 채점
+    # ------------------------------------------------------------------
+
+    def generate_signals(self, history: pd.DataFrame) -> pd.DataFrame:
+        """전 종목 시점별 채점 (종목 단위 병렬)"""
+        cfg = self.config
+        cost_rate = cfg.taker_fee_rate + cfg.slippage_rate
+
+        tasks = [
+            (ticker, frame, cfg.db_path, cfg.start_date, cfg.end_date,
+             cfg.lookback_days, cfg.min_history_days, cfg.forward_return_days,
+             cost_rate, tuple(cfg.entry_recommendations))
+            for ticker, frame in history.groupby('ticker', sort=True)
+        ]
+
+        logger.info(f"🧮 시점별 채점 시작: {len(tasks)}개 종목 (workers={cfg.max_workers})")
+
+        if cfg.max_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=cfg.max_workers) as executor:
+                frames = list(executor.map(_score_ticker_task, tasks, chunksize=4))
+        else:
+            frames = [_score_ticker_task(task) for task in tasks]
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+
+        signals = pd.concat(frames, ignore_index=True).sort_values(['date', 'ticker'])
+        logger.info(f"✅ 시점별 채점 완료: {len(signals):,}건")
+        return signals.reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # Phase B: 포트폴리오 시뮬레이션
+    # ------------------------------------------------------------------
+
+    def simulate(self, history: pd.DataFrame, signals: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """신호 테이블 기반 날짜별 체결/평가 시뮬레이션"""
+        cfg = self.config
+        fee_rate = cfg.taker_fee_rate
+
+        sim_dates = sorted(signals['date'].unique())
+        open_px = history.pivot(index='date', columns='ticker', values='open')
+        close_px = history.pivot(index='date', columns='ticker', values='close')
+
+        signals_by_date: Dict[str, Dict[str, Dict]] = {}
+        for record in signals.to_dict('records'):
+            signals_by_date.setdefault(record['date'], {})[record['ticker']] = record
+
+        trailing = TrailingStopManager(atr_multiplier=cfg.atr_multiplier)
+
+        cash = cfg.initial_capital
+        positions: Dict[str, BacktestPosition] = {}
+        pending_buys: List[Tuple[str, float, Dict]] = []
+        pending_sells: Dict[str, str] = {}
+        trades: List[Dict] = []
+        equity_rows: List[Dict] = []
+        peak_equity = cfg.initial_capital
+
+        def close_position(ticker: str, price: float, date: str, reason: str) -> float:
+            position = positions.pop(ticker)
+            fill_price = price * (1 - cfg.slippage_rate)
+            gross = position.quantity * fill_price
+            fee = gross * fee_rate
+            proceeds = gross - fee
+            pnl = proceeds - position.cost_basis
+
+            trades.append({
+                'ticker': ticker,
+                'entry_date': position.entry_date,
+                'exit_date': date,
+                'entry_price': position.entry_price,
+                'exit_price': fill_price,
+                'quantity': position.quantity,
+                'cost_basis': position.cost_basis,
+                'proceeds': proceeds,
+                'pnl': pnl,
+                'pnl_pct': pnl / position.cost_basis * 100 if position.cost_basis > 0 else 0.0,
+                'fees': position.entry_fee + fee,
+                'hold_days': (pd.Timestamp(date) - pd.Timestamp(position.entry_date)).days,
+                'entry_score': position.entry_score,
+                'pattern': position.pattern,
+                'kelly_pct': position.kelly_pct,
+                'exit_reason': reason
+            })
+
+            for state in (trailing.entry_price, trailing.highest_price, trailing.atr,
+                          trailing.stop_price, trailing.stop_type):
+                state.pop(ticker, None)
+
+            return proceeds
+
+        for date in sim_dates:
+            opens = open_px.loc[date] if date in open_px.index else pd.Series(dtype=float)
+            closes = close_px.loc[date] if date in close_px.index else pd.Series(dtype=float)
+            day_signals = signals_by_date.get(date, {})
+
+            # 1. 전일 종가 신호 → 당일 시가 체결 (매도 먼저, 매도 대금으로 매수 가능)
+            for ticker, reason in list(pending_sells.items()):
+                price = opens.get(ticker, np.nan)
+                if pd.isna(price) or ticker not in positions:
+                    continue
+                cash += close_position(ticker, float(price), date, reason)
+                del pending_sells[ticker]
+
+            for ticker, amount_krw, meta in pending_buys:
+                price = opens.get(ticker, np.nan)
+                if pd.isna(price) or ticker in positions:
+                    continue
+
+                amount_krw = min(amount_krw, cash)
+                if amount_krw < self.trading_config.min_order_amount_krw:
+                    continue
+
+                # LocalTradingEngine.execute_buy_order와 동일: 주문 금액에서 수수료 선차감
+                order_amount = amount_krw / (1 + fee_rate)
+                fill_price = float(price) * (1 + cfg.slippage_rate)
+                quantity = order_amount / fill_price
+                cash -= amount_krw
+
+                positions[ticker] = BacktestPosition(
+                    ticker=ticker, quantity=quantity, entry_price=fill_price,
+                    cost_basis=amount_krw, entry_fee=amount_krw - order_amount, entry_date=date,
+                    entry_score=meta['total_score'], pattern=meta['pattern'],
+                    kelly_pct=meta['kelly_pct'], last_price=fill_price
+                )
+
+                if cfg.use_trailing_stop:
+                    self._seed_trailing_stop(trailing, ticker, fill_price, meta['atr'])
+
+            pending_buys = []
+
+            # 2. 종가 평가 및 매도 조건 확인
+            for ticker, position in positions.items():
+                price = closes.get(ticker, np.nan)
+                if pd.isna(price):
+                    continue
+                position.last_price = float(price)
+
+                if ticker in pending_sells:
+                    continue
+
+                if cfg.use_trailing_stop and trailing.update(ticker, position.last_price):
+                    pending_sells[ticker] = f"트레일링 손절 (손절가 {trailing.stop_price[ticker]:.0f})"
+                    continue
+
+                signal = day_signals.get(ticker)
+                self.trading_engine.stage_history[ticker] = self._stage_history_from_signal(signal)
+
+                market_value = position.quantity * position.last_price
+                unrealized_pnl = market_value - position.cost_basis
+                position_info = PositionInfo(
+                    ticker=ticker,
+                    quantity=position.quantity,
+                    avg_buy_price=position.cost_basis / position.quantity,
+                    current_price=position.last_price,
+                    market_value=market_value,
+                    unrealized_pnl=unrealized_pnl,
+                    unrealized_pnl_percent=unrealized_pnl / position.cost_basis * 100,
+                    buy_timestamp=datetime.strptime(position.entry_date, '%Y-%m-%d'),
+                    hold_days=(pd.Timestamp(date) - pd.Timestamp(position.entry_date)).days
+                )
+
+                should_sell, reason = self.trading_engine.check_sell_conditions(position_info)
+                if should_sell:
+                    pending_sells[ticker] = reason
+
+            positions_value = sum(p.quantity * p.last_price for p in positions.values())
+            equity = cash + positions_value
+
+            # 3. 진입 후보 선정 (당일 종가 신호 → 다음 날 시가 주문)
+            open_slots = cfg.max_positions - len(positions) + len(pending_sells)
+            if open_slots > 0:
+                pending_buys = self._select_entries(date, day_signals, positions, open_slots, equity, cash)
+
+            # 4. 자산 곡선 기록
+            peak_equity = max(peak_equity, equity)
+            equity_rows.append({
+                'date': date,
+                'cash': cash,
+                'positions_value': positions_value,
+                'equity': equity,
+                'positions': len(positions),
+                'drawdown_pct': (equity / peak_equity - 1) * 100 if peak_equity > 0 else 0.0
+            })
+
+        # 종료일 종가 기준 잔여 포지션 청산
+        if cfg.liquidate_at_end and sim_dates:
+            last_date = sim_dates[-1]
+            for ticker in list(positions.keys()):
+                cash += close_position(ticker, positions[ticker].last_price, last_date, "백테스트 종료 청산")
+            if equity_rows:
+                equity_rows[-1].update({'cash': cash, 'positions_value': 0.0, 'equity': cash, 'positions': 0})
+                equity_rows[-1]['drawdown_pct'] = (cash / peak_equity - 1) * 100 if peak_equity > 0 else 0.0
+
+        return pd.DataFrame(equity_rows), pd.DataFrame(trades)
+
+    def _select_entries(self, date: str, day_signals: Dict[str, Dict],
+                        positions: Dict[str, BacktestPosition], open_slots: int,
+                        equity: float, cash: float) -> List[Tuple[str, float, Dict]]:
+        """당일 신호 중 진입 후보 선정 및 Kelly 포지션 크기 결정"""
+        cfg = self.config
+
+        candidates = sorted(
+            (s for s in day_signals.values()
+             if s['recommendation'] in cfg.entry_recommendations
+             and s['confidence'] >= cfg.min_entry_confidence
+             and s['ticker'] not in positions),
+            key=lambda s: s['total_score'],
+            reverse=True
+        )[:open_slots]
+
+        self.trading_engine.simulated_equity = equity
+        orders = []
+        reserved = 0.0
+
+        for signal in candidates:
+            technical_result = {
+                'ticker': signal['ticker'],
+                # LayeredScoringEngine 100점 → Kelly 품질 점수 25점 스케일
+                'quality_score': signal['total_score'] / 4.0,
+                'recommendation': signal['recommendation'],
+                'stage_status': signal['recommendation'],
+                'current_stage': signal['stage'],
+                'stage_confidence': signal['stage_confidence'],
+                'price_vs_ma200': signal['price_vs_ma200'],
+                'analysis_details': signal['layers_data']
+            }
+            kelly_result = self.kelly_calculator.calculate_position_size(
+                technical_result, save_result=False, analysis_date=date
+            )
+
+            amount_krw = self.trading_engine.calculate_position_size(
+                signal['ticker'], kelly_result.final_position_pct, 1.0
+            )
+            if amount_krw <= 0 or reserved + amount_krw > cash:
+                continue
+
+            reserved += amount_krw
+            orders.append((signal['ticker'], amount_krw, {
+                'total_score': signal['total_score'],
+                'pattern': kelly_result.detected_pattern.value,
+                'kelly_pct': kelly_result.final_position_pct,
+                'atr': signal['atr']
+            }))
+
+        return orders
+
+    @staticmethod
+    def _stage_history_from_signal(signal: Optional[Dict]) -> List[Dict[str, Any]]:
+        """신호 행 → _get_stage_history 형식 (최신순 2개)"""
+        if not signal or pd.isna(signal.get('prev_stage')):
+            return []
+
+        return [
+            {
+                'stage': signal['stage'],
+                'confidence': signal['stage_confidence'],
+                'analysis_date': signal['date'],
+                'ma200_trend': signal['ma200_trend'],
+                'price_vs_ma200': signal['price_vs_ma200']
+            },
+            {
+                'stage': int(signal['prev_stage']),
+                'confidence': signal['prev_stage_confidence'],
+                'analysis_date': None,
+                'ma200_trend': signal['prev_ma200_trend'],
+                'price_vs_ma200': signal['prev_price_vs_ma200']
+            }
+        ]
+
+    @staticmethod
+    def _seed_trailing_stop(trailing: TrailingStopManager, ticker: str,
+                            entry_price: float, atr_value: float):
+        """
+        시점별 ATR로 트레일링 스탑 초기화
+
+        TrailingStopManager.update의 첫 호출은 DB에서 최신 ATR을 조회하므로
+        (미래 데이터), 백테스트에서는 진입 시점 ATR로 상태를 직접 설정한다.
+        """
+        if not atr_value or pd.isna(atr_value) or atr_value <= 0:
+            atr_value = entry_price * 0.03  # get_atr_with_fallback 기본값과 동일
+
+        multiplier = trailing.get_atr_multiplier(ticker)
+        final_stop, stop_type = trailing._apply_stop_clamping(
+            ticker=ticker,
+            trail_price=entry_price - atr_value * multiplier,
+            fixed_stop=entry_price - atr_value,
+            entry_price=entry_price
+        )
+
+        trailing.entry_price[ticker] = entry_price
+        trailing.highest_price[ticker] = entry_price
+        trailing.atr[ticker] = atr_value
+        trailing.stop_price[ticker] = final_stop
+        trailing.stop_type[ticker] = stop_type
+
+    # ------------------------------------------------------------------
+    # 성과 지표
+    # ------------------------------------------------------------------
+
+    def calculate_metrics(self, equity_curve: pd.DataFrame, trades: pd.DataFrame) -> Dict[str, float]:
+        """수익률 / MDD / 샤프 / 승률 등 성과 지표"""
+        if equity_curve.empty:
+            return {}
+
+        initial = self.config.initial_capital
+        final = float(equity_curve['equity'].iloc[-1])
+        days = max(1, (pd.Timestamp(equity_curve['date'].iloc[-1]) -
+                       pd.Timestamp(equity_curve['date'].iloc[0])).days)
+
+        daily_returns = equity_curve['equity'].pct_change().dropna()
+        daily_std = float(daily_returns.std()) if len(daily_returns) > 1 else 0.0
+
+        metrics = {
+            'initial_capital': initial,
+            'final_equity': final,
+            'total_return_pct': (final / initial - 1) * 100,
+            # 암호화폐는 365일 거래
+            'cagr_pct': ((final / initial) ** (365 / days) - 1) * 100 if final > 0 else -100.0,
+            'max_drawdown_pct': float(equity_curve['drawdown_pct'].min()),
+            'sharpe_ratio': float(daily_returns.mean() / daily_std * np.sqrt(365)) if daily_std > 0 else 0.0,
+            'trade_count': int(len(trades)),
+            'avg_positions': float(equity_curve['positions'].mean())
+        }
+
+        if not trades.empty:
+            wins = trades[trades['pnl'] > 0]
+            losses = trades[trades['pnl'] <= 0]
+            gross_loss = float(-losses['pnl'].sum())
+
+            metrics.update({
+                'win_rate': float(len(wins) / len(trades)),
+                'avg_trade_return_pct': float(trades['pnl_pct'].mean()),
+                'avg_hold_days': float(trades['hold_days'].mean()),
+                'profit_factor': float(wins['pnl'].sum() / gross_loss) if gross_loss > 0 else float('inf'),
+                'total_fees': float(trades['fees'].sum())
+            })
+
+        return metrics
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def run(self) -> BacktestResult:
+        """전체 백테스트 실행"""
+        cfg = self.config
+        timings = {}
+
+        logger.info("🚀 백테스트 시작")
+        logger.info(f"   • 기간: {cfg.start_date or '데이터 시작'} ~ {cfg.end_date or '데이터 종료'}")
+        logger.info(f"   • 초기 자본: {cfg.initial_capital:,.0f}원, 최대 {cfg.max_positions}종목")
+
+        start = datetime.now()
+        history = load_ohlcv_history(cfg.db_path, cfg.tickers, cfg.end_date)
+        timings['load_seconds'] = (datetime.now() - start).total_seconds()
+
+        if history.empty:
+            logger.warning("⚠️ 백테스트할 OHLCV 데이터가 없습니다")
+            return BacktestResult(cfg, pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), {}, timings)
+
+        logger.info(f"📊 OHLCV 로드: {history['ticker'].nunique()}개 종목, {len(history):,}행 "
+                    f"({timings['load_seconds']:.1f}초)")
+
+        start = datetime.now()
+        signals = self.generate_signals(history)
+        timings['scoring_seconds'] = (datetime.now() - start).total_seconds()
+
+        if signals.empty:
+            logger.warning("⚠️ 채점 결과가 없습니다 (기간/최소 이력 확인 필요)")
+            return BacktestResult(cfg, pd.DataFrame(), pd.DataFrame(), signals, {}, timings)
+
+        start = datetime.now()
+        equity_curve, trades = self.simulate(history, signals)
+        timings['simulation_seconds'] = (datetime.now() - start).total_seconds()
+
+        metrics = self.calculate_metrics(equity_curve, trades)
+
+        logger.info("=" * 60)
+        logger.info("📈 백테스트 결과")
+        logger.info(f"   • 총 수익률: {metrics.get('total_return_pct', 0):+.2f}% "
+                    f"(CAGR {metrics.get('cagr_pct', 0):+.2f}%)")
+        logger.info(f"   • 최대 낙폭: {metrics.get('max_drawdown_pct', 0):.2f}%, "
+                    f"샤프: {metrics.get('sharpe_ratio', 0):.2f}")
+        logger.info(f"   • 거래: {metrics.get('trade_count', 0)}건, 승률 {metrics.get('win_rate', 0):.1%}")
+        logger.info(f"   • 소요 시간: 채점 {timings['scoring_seconds']:.1f}초, "
+                    f"시뮬레이션 {timings['simulation_seconds']:.1f}초")
+        logger.info("=" * 60)
+
+        return BacktestResult(cfg, equity_curve, trades, signals, metrics, timings)
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description='Makenaide 오프라인 백테스트')
+    parser.add_argument('--db-path', default='./makenaide_local.db', help='SQLite DB 경로')
+    parser.add_argument('--start', dest='start_date', help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', dest='end_date', help='종료일 (YYYY-MM-DD)')
+    parser.add_argument('--tickers', nargs='*', help='대상 종목 (기본: 전체)')
+    parser.add_argument('--capital', type=float, default=10_000_000.0, help='초기 자본 (KRW)')
+    parser.add_argument('--max-positions', type=int, default=8, help='최대 동시 보유 종목')
+    parser.add_argument('--workers', type=int, default=BacktestConfig.max_workers, help='채점 프로세스 수')
+    parser.add_argument('--no-trailing-stop', action='store_true', help='ATR 트레일링 스탑 비활성화')
+    parser.add_argument('--output-dir', default='backtest_results', help='결과 저장 디렉토리')
+    parser.add_argument('--optimize-thresholds', action='store_true',
+                        help='결과로 AdaptiveScoringManager 통과 임계점 최적화')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    config = BacktestConfig(
+        db_path=args.db_path,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        tickers=args.tickers or None,
+        initial_capital=args.capital,
+        max_positions=args.max_positions,
+        max_workers=args.workers,
+        use_trailing_stop=not args.no_trailing_stop
+    )
+
+    result = BacktestEngine(config).run()
+    if result.equity_curve.empty:
+        return
+
+    result.save(args.output_dir)
+
+    if args.optimize_thresholds:
+        from adaptive_scoring_config import AdaptiveScoringManager
+
+        best_threshold, best_performance = AdaptiveScoringManager().optimize_thresholds_from_backtest(
+            result.threshold_samples()
+        )
+        logger.info(f"🎯 최적 통과 임계점: {best_threshold} (성과 지표 {best_performance:.3f})")
+
+
+if __name__ == "__main__":
+    main()
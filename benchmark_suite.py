@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Phase 1/2 핫패스 성능 벤치마크
+결정적(deterministic) 합성 ohlcv_data 픽스처 위에서 핵심 경로의 실행 시간을 측정하고
+저장된 기준선(baseline) 대비 성능 저하를 검출
+
+🎯 측정 대상:
+- indicators: SimpleDataCollector.calculate_technical_indicators (Phase 1)
+- save_ohlcv_data: SimpleDataCollector.save_ohlcv_data (Phase 1)
+- module:<이름>: basic_scoring_modules 9개 모듈 calculate_score (Phase 2)
+- layered_score: LayeredScoringEngine.score_data 전체 점수 (Phase 2)
+- rs_percentile: RelativeStrengthCalculator.calculate_rs_rating (시장 percentile 포함)
+- market_thermometer: MarketThermometer.calculate_market_sentiment_snapshot
+
+📊 사용 예시:
+    python benchmark_suite.py --update-baseline            # 기준선 저장
+    python benchmark_suite.py --max-slowdown 0.25          # 25% 이상 느려지면 exit 1
+    python benchmark_suite.py --tickers 100 --days 400 --only layered_score rs_percentile
+
+💡 픽스처 가격/거래량은 seed로 완전히 결정되며, 날짜만 실행일 기준으로 끝난다
+   (RS percentile 쿼리가 date('now') 기준 400일 창을 사용하기 때문).
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_collector import SimpleDataCollector
+from layered_scoring_engine import LayeredScoringEngine
+from advanced_trend_analyzer import RelativeStrengthCalculator
+from market_sentiment import MarketThermometer
+from backtest_engine import create_default_scoring_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = "./benchmark_baseline.json"
+
+
+@dataclass
+class BenchmarkResult:
+    """벤치마크 1개 측정 결과"""
+    name: str
+    items: int              # 1회 실행당 처리 건수 (종목 수 등)
+    repeats: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+
+    @property
+    def per_item_ms(self) -> float:
+        return self.median_ms / self.items if self.items else self.median_ms
+
+
+@dataclass
+class RegressionCheck:
+    """기준선 대비 비교 결과"""
+    name: str
+    baseline_ms: float
+    current_ms: float
+    ratio: float
+    regressed: bool
+
+
+def build_fixture_frames(n_tickers: int, n_days: int, seed: int = 42,
+                         end_date: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+    """
+    결정적 합성 OHLCV 생성 (pyupbit.get_ohlcv와 동일한 DatetimeIndex 형식)
+
+    종목마다 추세(drift)와 변동성을 다르게 주어 Stage 1~4가 고루 섞이도록 한다.
+    """
+    rng = np.random.default_rng(seed)
+    end_date = (end_date or datetime.now()).replace(hour=9, minute=0, second=0, microsecond=0)
+    index = pd.date_range(end=end_date, periods=n_days, freq='D')
+
+    frames = {}
+    for i in range(n_tickers):
+        drift = rng.normal(0.0003, 0.0015)
+        volatility = rng.uniform(0.015, 0.05)
+        returns = rng.normal(drift, volatility, n_days)
+
+        close = 1000.0 * (1 + i % 7) * np.exp(np.cumsum(returns))
+        open_ = close * (1 + rng.normal(0, volatility / 4, n_days))
+        high = np.maximum(open_, close) * (1 + rng.uniform(0, volatility / 2, n_days))
+        low = np.minimum(open_, close) * (1 - rng.uniform(0, volatility / 2, n_days))
+        volume = rng.lognormal(13, 0.6, n_days)
+
+        frames[f"KRW-BM{i:04d}"] = pd.DataFrame(
+            {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+            index=index
+        )
+
+    return frames
+
+
+class BenchmarkSuite:
+    """합성 픽스처 기반 핫패스 벤치마크"""
+
+    def __init__(self, n_tickers: int = 50, n_days: int = 400, seed: int = 42,
+                 repeats: int = 3, work_dir: Optional[str] = None):
+        self.n_tickers = n_tickers
+        self.n_days = n_days
+        self.seed = seed
+        self.repeats = repeats
+
+        self._owns_work_dir = work_dir is None
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="makenaide_bench_")
+        self.db_path = os.path.join(self.work_dir, "benchmark_fixture.db")
+
+        self.raw_frames: Dict[str, pd.DataFrame] = {}
+        self.indicator_frames: Dict[str, pd.DataFrame] = {}
+        self.scoring_frames: Dict[str, pd.DataFrame] = {}
+        self.collector: Optional[SimpleDataCollector] = None
+
+    def fixture_meta(self) -> Dict:
+        return {'n_tickers': self.n_tickers, 'n_days': self.n_days, 'seed': self.seed}
+
+    # ------------------------------------------------------------------
+    # 픽스처
+    # ------------------------------------------------------------------
+
+    def setup(self):
+        """픽스처 DB 생성 (ohlcv_data 스키마는 SimpleDataCollector가 생성)"""
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+        # MarketThermometer는 db_manager_sqlite 싱글톤(SQLITE_DATABASE)을 통해 조회하므로
+        # 싱글톤 생성 전에 픽스처 DB를 가리키도록 설정
+        os.environ['SQLITE_DATABASE'] = self.db_path
+
+        self.collector = SimpleDataCollector(db_path=self.db_path)
+        self.raw_frames = build_fixture_frames(self.n_tickers, self.n_days, self.seed)
+
+        self.indicator_frames = {
+            ticker: self.collector.calculate_technical_indicators(df, ticker)
+            for ticker, df in self.raw_frames.items()
+        }
+        for ticker, df in self.indicator_frames.items():
+            self.collector.save_ohlcv_data(ticker, df)
+
+        # 점수 모듈 입력: _get_ohlcv_data와 동일한 최근 300일 + MACD
+        for ticker, df in self.indicator_frames.items():
+            frame = df.tail(300).reset_index().rename(columns={'index': 'date'})
+            self.scoring_frames[ticker] = LayeredScoringEngine.add_macd(frame)
+
+    def teardown(self):
+        if self._owns_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # 측정
+    # ------------------------------------------------------------------
+
+    def _measure(self, name: str, func: Callable[[], None], items: int) -> BenchmarkResult:
+        """warm-up 1회 후 repeats회 측정, 중앙값 사용"""
+        func()
+
+        samples = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+
+        return BenchmarkResult(
+            name=name,
+            items=items,
+            repeats=self.repeats,
+            median_ms=statistics.median(samples),
+            min_ms=min(samples),
+            max_ms=max(samples)
+        )
+
+    def benchmark_definitions(self) -> Dict[str, Callable[[], BenchmarkResult]]:
+        """벤치마크 이름 → 실행 함수"""
+        collector = self.collector
+        tickers = list(self.raw_frames.keys())
+
+        def indicators():
+            for ticker in tickers:
+                collector.calculate_technical_indicators(self.raw_frames[ticker], ticker)
+
+        def save_ohlcv():
+            for ticker in tickers:
+                collector.save_ohlcv_data(ticker, self.indicator_frames[ticker])
+
+        engine = create_default_scoring_engine(self.db_path)
+
+        def layered_score():
+            for ticker in tickers:
+                engine.score_data(ticker, self.scoring_frames[ticker])
+
+        rs_calculator = RelativeStrengthCalculator(self.db_path)
+
+        def rs_percentile():
+            for ticker in tickers:
+                rs_calculator.calculate_rs_rating(ticker, self.indicator_frames[ticker])
+
+        thermometer = MarketThermometer(self.db_path)
+
+        def market_thermometer():
+            snapshot = thermometer.calculate_market_sentiment_snapshot()
+            # 내부 예외는 폴백 결과로 삼켜지므로, 실제 집계가 수행되지 않았으면 측정 대신 실패 처리
+            details = snapshot.get('details', {})
+            if not (details.get('price_distribution', {}).get('total_tickers')
+                    and details.get('volume_concentration', {}).get('top10_tickers')
+                    and details.get('ma200_ratio', {}).get('total_tickers')):
+                raise RuntimeError(f"시장 체온계 스냅샷이 비어 있습니다 (폴백/오류 경로): {details}")
+
+        n = len(tickers)
+        definitions = {
+            'indicators': lambda: self._measure('indicators', indicators, n),
+            'save_ohlcv_data': lambda: self._measure('save_ohlcv_data', save_ohlcv, n),
+        }
+
+        for modules in engine.module_registry.get_all_modules().values():
+            for module in modules:
+                def module_score(module=module):
+                    for ticker in tickers:
+                        module.calculate_score(self.scoring_frames[ticker], engine.config)
+
+                name = f"module:{module.name}"
+                definitions[name] = lambda name=name, func=module_score: self._measure(name, func, n)
+
+        definitions.update({
+            'layered_score': lambda: self._measure('layered_score', layered_score, n),
+            'rs_percentile': lambda: self._measure('rs_percentile', rs_percentile, n),
+            'market_thermometer': lambda: self._measure('market_thermometer', market_thermometer, 1),
+        })
+        return definitions
+
+    @staticmethod
+    @contextmanager
+    def _suppress_logs(enabled: bool):
+        """측정 대상 함수의 종목별 INFO 로그 차단 (로그 I/O가 측정 잡음이 되지 않도록)"""
+        previous = logging.root.manager.disable
+        if enabled:
+            logging.disable(logging.INFO)
+        try:
+            yield
+        finally:
+            logging.disable(previous)
+
+    def run(self, only: Optional[List[str]] = None, quiet: bool = True) -> List[BenchmarkResult]:
+        """전체(또는 선택) 벤치마크 실행"""
+        logger.info(f"🏁 벤치마크 픽스처 생성: {self.n_tickers}종목 × {self.n_days}일 (seed={self.seed})")
+
+        try:
+            with self._suppress_logs(quiet):
+                self.setup()
+                definitions = self.benchmark_definitions()
+
+            selected = [name for name in definitions
+                        if not only or name in only or name.split(':')[0] in only]
+
+            results = []
+            for name in selected:
+                with self._suppress_logs(quiet):
+                    result = definitions[name]()
+
+                logger.info(f"⏱️ {name:<32} {result.median_ms:>10.1f}ms "
+                            f"({result.per_item_ms:.3f}ms/item, n={result.items})")
+                results.append(result)
+
+            return results
+
+        finally:
+            self.teardown()
+
+
+def load_baseline(path: str) -> Dict:
+    """기준선 로드 (없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: List[BenchmarkResult], fixture_meta: Dict):
+    """현재 측정값을 기준선으로 저장 (기존 항목 중 이번에 측정하지 않은 것은 유지)"""
+    baseline = load_baseline(path)
+    if baseline.get('fixture') != fixture_meta:
+        baseline = {}
+
+    benchmarks = baseline.get('benchmarks', {})
+    for result in results:
+        benchmarks[result.name] = {**asdict(result), 'per_item_ms': result.per_item_ms}
+
+    baseline.update({
+        'fixture': fixture_meta,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'benchmarks': benchmarks
+    })
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"💾 벤치마크 기준선 저장: {path} ({len(benchmarks)}개)")
+
+
+def compare_with_baseline(results: List[BenchmarkResult], baseline: Dict,
+                          max_slowdown: float) -> List[RegressionCheck]:
+    """중앙값 기준 비교: current > baseline × (1 + max_slowdown)이면 회귀"""
+    checks = []
+    benchmarks = baseline.get('benchmarks', {})
+
+    for result in results:
+        entry = benchmarks.get(result.name)
+        if not entry or entry.get('median_ms', 0) <= 0:
+            continue
+
+        ratio = result.median_ms / entry['median_ms']
+        checks.append(RegressionCheck(
+            name=result.name,
+            baseline_ms=entry['median_ms'],
+            current_ms=result.median_ms,
+            ratio=ratio,
+            regressed=ratio > 1 + max_slowdown
+        ))
+
+    return checks
+
+
+def main() -> int:
+    """CLI 진입점 (회귀 발생 시 exit code 1)"""
+    parser = argparse.ArgumentParser(description='Makenaide Phase 1/2 핫패스 벤치마크')
+    parser.add_argument('--tickers', type=int, default=50, help='픽스처 종목 수')
+    parser.add_argument('--days', type=int, default=400, help='픽스처 일수')
+    parser.add_argument('--seed', type=int, default=42, help='픽스처 난수 seed')
+    parser.add_argument('--repeats', type=int, default=3, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--only', nargs='*', help='실행할 벤치마크 (예: layered_score module)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='기준선 JSON 경로')
+    parser.add_argument('--update-baseline', action='store_true', help='측정값으로 기준선 갱신')
+    parser.add_argument('--max-slowdown', type=float, default=0.25,
+                        help='허용 성능 저하 비율 (0.25 = 25%% 느려지면 실패)')
+    parser.add_argument('--verbose', action='store_true', help='측정 대상 함수 로그 출력')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    suite = BenchmarkSuite(args.tickers, args.days, args.seed, args.repeats)
+    results = suite.run(only=args.only, quiet=not args.verbose)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, suite.fixture_meta())
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        logger.warning(f"⚠️ 기준선 없음: {args.baseline} (--update-baseline으로 생성)")
+        return 0
+
+    if baseline.get('fixture') != suite.fixture_meta():
+        logger.warning(f"⚠️ 픽스처 설정이 기준선과 다릅니다: {baseline.get('fixture')} vs {suite.fixture_meta()}")
+        return 0
+
+    checks = compare_with_baseline(results, baseline, args.max_slowdown)
+
+    print(f"\n{'벤치마크':<34} {'기준선':>10} {'현재':>10} {'비율':>7}")
+    print("-" * 66)
+    for check in checks:
+        mark = "❌" if check.regressed else "✅"
+        print(f"{mark} {check.name:<32} {check.baseline_ms:>9.1f}ms {check.current_ms:>9.1f}ms {check.ratio:>6.2f}x")
+
+    regressions = [check for check in checks if check.regressed]
+    if regressions:
+        logger.error(f"❌ 성능 회귀 {len(regressions)}건 (허용 {args.max_slowdown:.0%} 초과): "
+                     f"{', '.join(check.name for check in regressions)}")
+        return 1
+
+    logger.info(f"✅ 성능 회귀 없음 ({len(checks)}개 비교, 허용 {args.max_slowdown:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Top-K Candidate Selector - Phase 2 후보 선정기
+종목 분석과 동시에 상위 K개 후보만 유지하는 스트리밍 선정기
+
+🎯 핵심 기능:
+- (quality_score, confidence) 기준 bounded min-heap 유지
+- 메모리 O(K): 전체 분석 결과를 리스트로 쌓지 않음
+- 종목당 삽입 O(log K), 최종 정렬 O(K log K)
+- GPT / Kelly / SNS 알림 단계가 DB 재조회 없이 직접 조회
+
+📊 사용 예시:
+    selector = TopKCandidateSelector(k=15, min_quality_score=8.0)
+    for result in results:
+        selector.offer(result.ticker, result.quality_score, result.confidence, payload={...})
+    top = selector.get_ranked_candidates()
+"""
+
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RankedCandidate:
+    """순위가 매겨진 후보 종목"""
+    ticker: str
+    quality_score: float
+    confidence: float
+    recommendation: str = 'HOLD'
+    payload: Dict[str, Any] = field(default_factory=dict)  # 다운스트림 단계용 상세 데이터
+
+    @property
+    def rank_key(self) -> Tuple[float, float]:
+        """정렬 키 (품질 점수 우선, 신뢰도 보조)"""
+        return (self.quality_score, self.confidence)
+
+
+class TopKCandidateSelector:
+    """(quality_score, confidence) 기준 상위 K개 후보를 유지하는 bounded heap 선정기"""
+
+    def __init__(self, k: int = 15, min_quality_score: float = 0.0,
+                 min_confidence: float = 0.0,
+                 allowed_recommendations: Optional[Iterable[str]] = None):
+        if k <= 0:
+            raise ValueError(f"k는 1 이상이어야 합니다: {k}")
+
+        self.k = k
+        self.min_quality_score = min_quality_score
+        self.min_confidence = min_confidence
+        self.allowed_recommendations = set(allowed_recommendations) if allowed_recommendations else None
+
+        # min-heap: 루트가 현재 K개 중 가장 약한 후보 → 새 후보와 O(1) 비교
+        self._heap: List[Tuple[float, float, int, RankedCandidate]] = []
+        self._by_ticker: Dict[str, RankedCandidate] = {}
+        self._sequence = itertools.count()
+
+        # 통계 (리스트 대신 카운터만 유지)
+        self.stats = {
+            'offered': 0,
+            'rejected_threshold': 0,
+            'rejected_rank': 0,
+            'evicted': 0
+        }
+
+    def offer(self, ticker: str, quality_score: float, confidence: float,
+              recommendation: str = 'HOLD', payload: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        후보 제출
+
+        Returns:
+            bool: 상위 K개에 포함되었는지 여부
+        """
+        self.stats['offered'] += 1
+
+        quality_score = float(quality_score or 0.0)
+        confidence = float(confidence or 0.0)
+
+        if (quality_score < self.min_quality_score or confidence < self.min_confidence or
+                (self.allowed_recommendations is not None and recommendation not in self.allowed_recommendations)):
+            self.stats['rejected_threshold'] += 1
+            return False
+
+        candidate = RankedCandidate(
+            ticker=ticker,
+            quality_score=quality_score,
+            confidence=confidence,
+            recommendation=recommendation,
+            payload=payload or {}
+        )
+
+        # 동일 종목 재제출: 더 좋은 결과일 때만 교체
+        existing = self._by_ticker.get(ticker)
+        if existing is not None:
+            if candidate.rank_key <= existing.rank_key:
+                self.stats['rejected_rank'] += 1
+                return False
+            self._heap = [entry for entry in self._heap if entry[3].ticker != ticker]
+            heapq.heapify(self._heap)
+            del self._by_ticker[ticker]
+
+        # 동점일 때는 먼저 제출된 후보 우선 (나중 후보가 heap에서 더 작게 정렬됨)
+        entry = (quality_score, confidence, -next(self._sequence), candidate)
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:3] > self._heap[0][:3]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            del self._by_ticker[evicted[3].ticker]
+            self.stats['evicted'] += 1
+        else:
+            self.stats['rejected_rank'] += 1
+            return False
+
+        self._by_ticker[ticker] = candidate
+        return True
+
+    def get_ranked_candidates(self, min_confidence: float = None,
+                              min_quality_score: float = None) -> List[RankedCandidate]:
+        """품질 점수/신뢰도 내림차순으로 정렬된 후보 목록 (선택적 추가 임계값)"""
+        ranked = [entry[3] for entry in sorted(self._heap, key=lambda e: e[:3], reverse=True)]
+
+        if min_confidence is not None:
+            ranked = [c for c in ranked if c.confidence >= min_confidence]
+        if min_quality_score is not None:
+            ranked = [c for c in ranked if c.quality_score >= min_quality_score]
+
+        return ranked
+
+    def get_tickers(self, **thresholds) -> List[str]:
+        """정렬된 후보 티커 목록"""
+        return [c.ticker for c in self.get_ranked_candidates(**thresholds)]
+
+    def get(self, ticker: str) -> Optional[RankedCandidate]:
+        """특정 종목 후보 조회 (O(1))"""
+        return self._by_ticker.get(ticker)
+
+    def reset(self):
+        """선정기 초기화 (다음 실행 준비)"""
+        self._heap.clear()
+        self._by_ticker.clear()
+        self._sequence = itertools.count()
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._by_ticker
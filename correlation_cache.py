@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Correlation Cache - KRW 마켓 일간 수익률 상관/공분산 행렬 캐시
+매번 ohlcv_data 전체를 pandas로 pivot/cov 하는 대신, 롤링 윈도우 합계를 새 일봉마다 증분 갱신하고
+결과 행렬을 float32 배열로 디스크에 저장하여 종목 쌍 조회를 O(1)로 처리
+
+🎯 핵심 기능:
+- 최근 window개 일간 로그 수익률 링 버퍼 (float32, 결측 NaN) + 쌍별 누적 합계 (Σx, Σx², Σxy, 관측 수)
+- refresh: 마지막 반영 일자 이후 완성된 일봉만 조회 → 일봉마다 신규 수익률 더하고 윈도우 밖 수익률 빼기 (O(N²)/일봉)
+- 쌍별 유효 관측치 기준 공분산/상관 (상장 기간이 다른 종목도 겹치는 구간으로 계산, min_observations 미만은 NaN)
+- correlation / covariance: 종목 인덱스 해시맵 + 행렬 원소 조회 (O(1))
+- submatrix: 리스크 엔진용 부분 행렬 (NaN 보정 포함)
+- 디스크 저장: 링 버퍼 + 상관/공분산 행렬 float32 (np.savez, 임시 파일 → os.replace 원자적 교체)
+
+⚠️ ohlcv_data 최신 일자는 업비트 당일 진행 중 캔들이므로 반영하지 않고, 그 이전 일자까지만 확정 일봉으로 사용
+
+📊 사용 예시:
+    cache = get_correlation_cache()
+    cache.refresh()                                  # Phase 1 수집 직후 1회
+    rho = cache.correlation('KRW-BTC', 'KRW-ETH')   # O(1)
+    cov, corr = cache.submatrix(['KRW-BTC', 'KRW-ETH', 'KRW-XRP'])
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from db_manager_sqlite import get_db_connection_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = './correlation_cache.npz'
+CACHE_FORMAT_VERSION = 1
+
+
+class ReturnCorrelationCache:
+    """일간 로그 수익률 롤링 윈도우 상관/공분산 행렬 (증분 갱신 + 디스크 캐시)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, window: int = 60, min_observations: int = 20):
+        self.path = path
+        self.window = window
+        self.min_observations = min_observations
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+        self.stats = {'bars_applied': 0, 'rebuilds': 0, 'loads': 0, 'saves': 0}
+
+    def _reset(self):
+        """빈 캐시 (종목 0개)"""
+        self.tickers: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.as_of: Optional[str] = None   # 마지막으로 반영된 확정 일봉 일자
+        self._returns = np.full((self.window, 0), np.nan, dtype=np.float32)   # 링 버퍼 (window × N)
+        self._head = 0                                                       # 다음 기록 위치
+        self._filled = 0
+        self._last_close = np.zeros(0)
+        self._sum_x = np.zeros((0, 0))    # [i, j] = Σ x_i (i, j 모두 관측된 일자)
+        self._sum_xx = np.zeros((0, 0))   # [i, j] = Σ x_i²
+        self._sum_xy = np.zeros((0, 0))   # [i, j] = Σ x_i x_j
+        self._count = np.zeros((0, 0))    # [i, j] = 공통 관측 일수
+        self.cov = np.zeros((0, 0), dtype=np.float32)
+        self.corr = np.zeros((0, 0), dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # 조회 (O(1))
+    # ------------------------------------------------------------------
+
+    def correlation(self, ticker_a: str, ticker_b: str) -> float:
+        """두 종목 수익률 상관계수 (캐시에 없거나 관측 부족 시 NaN)"""
+        i, j = self.index.get(ticker_a), self.index.get(ticker_b)
+        if i is None or j is None:
+            return float('nan')
+        return float(self.corr[i, j])
+
+    def covariance(self, ticker_a: str, ticker_b: str) -> float:
+        """두 종목 일간 로그 수익률 공분산 (캐시에 없거나 관측 부족 시 NaN)"""
+        i, j = self.index.get(ticker_a), self.index.get(ticker_b)
+        if i is None or j is None:
+            return float('nan')
+        return float(self.cov[i, j])
+
+    def submatrix(self, tickers: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        요청 종목 순서의 (공분산, 상관) 부분 행렬 (float64)
+
+        캐시에 없거나 관측이 부족한 쌍은 상관 0 / 공분산 0, 분산은 유효 종목 중앙값으로 대체한다.
+        캐시를 아직 적재하지 않았으면 refresh를 1회 수행한다.
+        """
+        if not self._loaded:
+            self.refresh()
+
+        tickers = list(tickers)
+        n = len(tickers)
+        with self._lock:
+            idx = np.array([self.index.get(t, -1) for t in tickers], dtype=int)
+            known = idx >= 0
+            cov = np.full((n, n), np.nan)
+            corr = np.full((n, n), np.nan)
+            if known.any():
+                sub = np.ix_(idx[known], idx[known])
+                cov[np.ix_(known, known)] = self.cov[sub]
+                corr[np.ix_(known, known)] = self.corr[sub]
+
+        variances = np.diag(cov).copy()
+        fallback_var = np.nanmedian(variances) if np.isfinite(variances).any() else 0.0
+        cov = np.nan_to_num(cov, nan=0.0)
+        cov[np.diag_indices(n)] = np.where(np.isfinite(variances), variances, fallback_var)
+        corr = np.nan_to_num(corr, nan=0.0)
+        np.fill_diagonal(corr, 1.0)
+        return cov, corr
+
+    # ------------------------------------------------------------------
+    # 증분 갱신
+    # ------------------------------------------------------------------
+
+    def _ensure_tickers(self, tickers: Sequence[str]):
+        """신규 종목 열/행 추가 (기존 누적 합계 유지, 신규 종목 과거 수익률은 NaN)"""
+        new = [t for t in tickers if t not in self.index]
+        if not new:
+            return
+
+        n_old, n_add = len(self.tickers), len(new)
+        for t in new:
+            self.index[t] = len(self.tickers)
+            self.tickers.append(t)
+
+        self._returns = np.hstack([self._returns, np.full((self.window, n_add), np.nan, dtype=np.float32)])
+        self._last_close = np.concatenate([self._last_close, np.full(n_add, np.nan)])
+
+        def grow(matrix: np.ndarray) -> np.ndarray:
+            grown = np.zeros((n_old + n_add, n_old + n_add))
+            grown[:n_old, :n_old] = matrix
+            return grown
+
+        self._sum_x, self._sum_xx = grow(self._sum_x), grow(self._sum_xx)
+        self._sum_xy, self._count = grow(self._sum_xy), grow(self._count)
+
+    def _accumulate(self, returns: np.ndarray, sign: float):
+        """수익률 1행 (NaN = 결측)을 쌍별 합계에 더하거나 뺌"""
+        mask = np.isfinite(returns).astype(np.float64)
+        x = np.where(mask > 0, returns, 0.0).astype(np.float64)
+        self._sum_x += sign * np.outer(x, mask)
+        self._sum_xx += sign * np.outer(x * x, mask)
+        self._sum_xy += sign * np.outer(x, x)
+        self._count += sign * np.outer(mask, mask)
+
+    def _push(self, returns: np.ndarray):
+        """링 버퍼에 일봉 수익률 추가 (윈도우가 차 있으면 가장 오래된 행을 합계에서 제거)"""
+        row = returns.astype(np.float32)
+        if self._filled == self.window:
+            self._accumulate(self._returns[self._head], -1.0)
+        self._accumulate(row, 1.0)
+        self._returns[self._head] = row
+        self._head = (self._head + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+
+    def _recompute_sums(self):
+        """링 버퍼에서 누적 합계 재계산 (로드 시 - float 덧셈/뺄셈 오차 초기화)"""
+        rows = self._returns.astype(np.float64)
+        mask = np.isfinite(rows).astype(np.float64)
+        x = np.where(mask > 0, rows, 0.0)
+        self._sum_x = x.T @ mask
+        self._sum_xx = (x * x).T @ mask
+        self._sum_xy = x.T @ x
+        self._count = mask.T @ mask
+
+    def _derive(self):
+        """누적 합계 → 쌍별 표본 공분산/상관 행렬 (float32)"""
+        count = self._count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = (self._sum_xy - self._sum_x * self._sum_x.T / count) / (count - 1)
+            var_i = (self._sum_xx - self._sum_x ** 2 / count) / (count - 1)
+            corr = cov / np.sqrt(var_i * var_i.T)
+
+        insufficient = count < self.min_observations - 0.5   # 누적 뺄셈 오차 허용
+        cov[insufficient] = np.nan
+        corr[insufficient] = np.nan
+        self.cov = cov.astype(np.float32)
+        self.corr = np.clip(corr, -1.0, 1.0).astype(np.float32)
+
+    def _load_bars(self, cursor) -> pd.DataFrame:
+        """반영할 확정 일봉 (마지막 반영 일자 이후 ~ 최신 일자 전날) → date × ticker 종가 표"""
+        cursor.execute("SELECT MAX(date) FROM ohlcv_data")
+        latest = cursor.fetchone()[0]
+        if latest is None:
+            return pd.DataFrame()
+
+        cursor.execute("SELECT DISTINCT date FROM ohlcv_data WHERE date > ? AND date < ? ORDER BY date",
+                       (self.as_of or '', latest))
+        dates = [row[0] for row in cursor.fetchall()]
+        if not dates:
+            return pd.DataFrame()
+
+        # 미반영 일봉이 윈도우보다 많으면 (최초 생성 / 장기 미갱신) 마지막 window+1개 일봉으로 새로 생성
+        if self.as_of is None or len(dates) > self.window:
+            self._reset()
+            self.stats['rebuilds'] += 1
+            dates = dates[-(self.window + 1):]
+
+        cursor.execute("""
+            SELECT ticker, date, close FROM ohlcv_data
+            WHERE date >= ? AND date <= ? AND close > 0
+        """, (dates[0], dates[-1]))
+        frame = pd.DataFrame(cursor.fetchall(), columns=['ticker', 'date', 'close'])
+        return frame.pivot_table(index='date', columns='ticker', values='close').sort_index()
+
+    def refresh(self) -> int:
+        """
+        디스크 캐시 적재 후 미반영 확정 일봉 증분 반영 (변경 시 디스크 저장)
+
+        Returns:
+            이번에 반영한 일봉 수 (실패 시 0)
+        """
+        with self._lock:
+            try:
+                if not self._loaded:
+                    self.load()
+                    self._loaded = True
+
+                with get_db_connection_context() as conn:
+                    bars = self._load_bars(conn.cursor())
+
+                if bars.empty:
+                    return 0
+
+                self._ensure_tickers(list(bars.columns))
+                closes = bars.reindex(columns=self.tickers).to_numpy(dtype=np.float64)
+
+                applied = 0
+                for date, close in zip(bars.index, closes):
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        returns = np.log(close / self._last_close)
+                    if np.isfinite(returns).any():
+                        self._push(returns)
+                        applied += 1
+                    self._last_close = np.where(np.isfinite(close), close, self._last_close)
+                    self.as_of = date
+
+                self._derive()
+                self.save()
+                self.stats['bars_applied'] += applied
+                logger.info(f"📐 수익률 상관 행렬 갱신: 일봉 {applied}개 반영 ({len(self.tickers)}개 종목, "
+                            f"윈도우 {self._filled}/{self.window}일, 기준 {self.as_of})")
+                return applied
+
+            except Exception as e:
+                logger.warning(f"⚠️ 수익률 상관 행렬 갱신 실패: {e}")
+                return 0
+
+    # ------------------------------------------------------------------
+    # 디스크 저장/적재
+    # ------------------------------------------------------------------
+
+    def save(self):
+        """링 버퍼 + 행렬 float32 저장 (임시 파일 작성 후 원자적 교체)"""
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.array(CACHE_FORMAT_VERSION),
+            window=np.array(self.window),
+            tickers=np.array(self.tickers, dtype=str),
+            as_of=np.array(self.as_of or ''),
+            head=np.array(self._head),
+            filled=np.array(self._filled),
+            returns=self._returns,
+            last_close=self._last_close,
+            cov=self.cov,
+            corr=self.corr
+        )
+        os.replace(tmp_path, self.path)
+        self.stats['saves'] += 1
+
+    def load(self) -> bool:
+        """디스크 캐시 적재 (없거나 형식/윈도우가 다르면 빈 캐시 → 다음 refresh에서 새로 생성)"""
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            with np.load(self.path) as data:
+                if int(data['version']) != CACHE_FORMAT_VERSION or int(data['window']) != self.window:
+                    logger.info("📐 상관 행렬 캐시 형식/윈도우 변경 - 새로 생성")
+                    return False
+
+                self._reset()
+                self.tickers = [str(t) for t in data['tickers']]
+                self.index = {t: i for i, t in enumerate(self.tickers)}
+                self.as_of = str(data['as_of']) or None
+                self._head = int(data['head'])
+                self._filled = int(data['filled'])
+                self._returns = data['returns'].astype(np.float32)
+                self._last_close = data['last_close'].astype(np.float64)
+                self.cov = data['cov'].astype(np.float32)
+                self.corr = data['corr'].astype(np.float32)
+
+            self._recompute_sums()
+            self.stats['loads'] += 1
+            return True
+
+        except Exception as e:
+            logger.warning(f"⚠️ 상관 행렬 캐시 적재 실패 - 새로 생성: {e}")
+            self._reset()
+            return False
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            'as_of': self.as_of,
+            'tickers': len(self.tickers),
+            'window_filled': self._filled,
+            'window': self.window,
+            **self.stats
+        }
+
+
+_correlation_cache: Optional[ReturnCorrelationCache] = None
+_correlation_cache_lock = threading.Lock()
+
+
+def get_correlation_cache() -> ReturnCorrelationCache:
+    """프로세스 전역 상관 행렬 캐시 (리스크 엔진 / Kelly / 보고서가 공유)"""
+    global _correlation_cache
+    if _correlation_cache is None:
+        with _correlation_cache_lock:
+            if _correlation_cache is None:
+                _correlation_cache = ReturnCorrelationCache()
+    return _correlation_cache
@@ -23,10 +23,13 @@ import pandas as pd
 import json
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
 import logging
 import pytz
 
+from trace_recorder import trace_span
+from api_rate_limiter import get_rate_limiter
+
 # pandas_ta 사용 (설치 확인됨)
 try:
     import pandas_ta as ta
@@ -329,7 +332,8 @@ class SimpleDataCollector:
             for ticker in active_tickers:
                 try:
                     # 월봉 데이터 조회 (최대 24개월치 요청)
-                    monthly_df = pyupbit.get_ohlcv(
+                    monthly_df = get_rate_limiter().call(
+                        'candles', pyupbit.get_ohlcv,
                         ticker=ticker,
                         interval="month",
                         count=24  # 충분한 기간 요청
@@ -347,9 +351,6 @@ class SimpleDataCollector:
                     else:
                         logger.debug(f"⚠️ {ticker}: 월봉 데이터 없음")
 
-                    # API 레이트 제한 방지
-                    time.sleep(0.1)
-
                 except Exception as e:
                     logger.warning(f"⚠️ {ticker} 월봉 데이터 조회 실패: {e}")
                     continue
@@ -373,7 +374,8 @@ class SimpleDataCollector:
             for ticker in candidate_tickers:
                 try:
                     # 최근 1일 데이터로 24시간 거래량 확인
-                    daily_df = pyupbit.get_ohlcv(
+                    daily_df = get_rate_limiter().call(
+                        'candles', pyupbit.get_ohlcv,
                         ticker=ticker,
                         interval="day",
                         count=1  # 가장 최근 1일치만
@@ -396,9 +398,6 @@ class SimpleDataCollector:
                     else:
                         logger.debug(f"⚠️ {ticker}: 거래대금 데이터 없음")
 
-                    # API 레이트 제한 방지
-                    time.sleep(0.1)
-
                 except Exception as e:
                     logger.warning(f"⚠️ {ticker} 거래대금 조회 실패: {e}")
                     continue
@@ -512,8 +511,10 @@ class SimpleDataCollector:
             # (to 파라미터 사용시 현재 날짜 데이터가 누락되는 업비트 API 특성)
             logger.debug(f"🔍 {ticker} API 호출: count={count} (to 파라미터 없이 최신 데이터 수집)")
 
-            # 3단계: 업비트 API 호출
-            df = pyupbit.get_ohlcv(
+            # 3단계: 업비트 API 호출 (레이트 리미터 경유)
+            # pyupbit.get_ohlcv는 429/상장폐지/네트워크 오류를 모두 None으로 반환하므로 None은 재시도하지 않음
+            df = get_rate_limiter().call(
+                'candles', pyupbit.get_ohlcv,
                 ticker=ticker,
                 interval="day",
                 count=count
@@ -935,11 +936,16 @@ class SimpleDataCollector:
 
     def collect_ticker_data(self, ticker: str) -> Dict[str, Any]:
         """개별 티커 데이터 수집"""
+        with trace_span(ticker, "ticker", phase="Phase 1"):
+            return self._collect_ticker_data(ticker)
+
+    def _collect_ticker_data(self, ticker: str) -> Dict[str, Any]:
         try:
             logger.info(f"🔄 {ticker} 데이터 수집 시작")
 
             # 1. 갭 분석
-            gap_info = self.analyze_gap(ticker)
+            with trace_span("db_load", ticker=ticker):
+                gap_info = self.analyze_gap(ticker)
             strategy = gap_info['strategy']
 
             logger.info(f"📊 {ticker} 전략: {strategy} ({gap_info['reason']})")
@@ -964,7 +970,8 @@ class SimpleDataCollector:
                     count = min(gap_info['gap_days'] + 10, 200)  # 갭 + 여유분
 
                 # API 호출
-                df = self.safe_get_ohlcv(ticker, count)
+                with trace_span("api_call", ticker=ticker, count=count):
+                    df = self.safe_get_ohlcv(ticker, count)
                 if df is None or df.empty:
                     return {
                         'ticker': ticker,
@@ -975,10 +982,14 @@ class SimpleDataCollector:
                     }
 
                 # 기술적 지표 계산
-                df_with_indicators = self.calculate_technical_indicators(df, ticker)
+                with trace_span("indicators", ticker=ticker):
+                    df_with_indicators = self.calculate_technical_indicators(df, ticker)
 
                 # 데이터 저장
-                if self.save_ohlcv_data(ticker, df_with_indicators):
+                with trace_span("db_write", ticker=ticker):
+                    saved = self.save_ohlcv_data(ticker, df_with_indicators)
+
+                if saved:
                     return {
                         'ticker': ticker,
                         'strategy': strategy,
@@ -1021,6 +1032,27 @@ class SimpleDataCollector:
             test_mode: 테스트 모드 (제한된 종목만 처리)
             use_quality_filter: 고품질 필터링 사용 여부
         """
+        collection_stats = {}
+        for _ in self.iter_collect_all_data(test_mode, use_quality_filter, collection_stats):
+            pass
+
+        return collection_stats
+
+    def iter_collect_all_data(self, test_mode: bool = False, use_quality_filter: bool = True,
+                              collection_stats: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """전체 데이터 수집을 티커 단위로 스트리밍 실행
+
+        티커 하나의 수집/저장이 끝날 때마다 collect_ticker_data 결과를 yield 하므로
+        호출 측(Phase 2 스트리밍 모드)이 수집 완료를 기다리지 않고 바로 분석할 수 있습니다.
+
+        Args:
+            test_mode: 테스트 모드 (제한된 종목만 처리)
+            use_quality_filter: 고품질 필터링 사용 여부
+            collection_stats: 수집 통계를 채워 넣을 dict (collect_all_data 반환 형식과 동일)
+        """
+        if collection_stats is None:
+            collection_stats = {}
+
         start_time = time.time()
         logger.info("🚀 전체 데이터 수집 시작")
 
@@ -1037,7 +1069,7 @@ class SimpleDataCollector:
             active_tickers = active_tickers[:5]  # 테스트 모드: 5개만
             logger.info("🧪 테스트 모드: 5개 티커만 처리")
 
-        collection_stats = {
+        collection_stats.update({
             'start_time': datetime.now().isoformat(),
             'total_tickers': len(active_tickers),
             'quality_filter_enabled': use_quality_filter,
@@ -1049,7 +1081,7 @@ class SimpleDataCollector:
                 'skipped': 0,
                 'total_records': 0
             }
-        }
+        })
 
         # 개별 티커 처리
         for ticker in active_tickers:
@@ -1066,8 +1098,7 @@ class SimpleDataCollector:
             else:
                 collection_stats['summary']['failed'] += 1
 
-            # 레이트 제한을 위한 짧은 대기
-            time.sleep(0.1)
+            yield result
 
         # 완료 통계
         total_time = time.time() - start_time
@@ -1080,8 +1111,6 @@ class SimpleDataCollector:
                    f"스킵 {collection_stats['summary']['skipped']}개")
         logger.info(f"📈 총 레코드: {collection_stats['summary']['total_records']}개")
 
-        return collection_stats
-
     def manage_old_data(self, retention_days: int = 300) -> Dict[str, Any]:
         """300일 이상 된 데이터 관리 및 최적화
 
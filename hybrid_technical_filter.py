@@ -82,14 +82,20 @@ class HybridTechnicalFilter:
             'ma200_breakout': 0.52   # 52% - MA200 단순 돌파
         }
 
+    # 분석/저장에 필요한 ohlcv_data 컬럼 (단일 조회와 일괄 조회가 동일한 프레임을 만들도록 공유)
+    OHLCV_COLUMNS = (
+        "ticker, date, open, high, low, close, volume, "
+        "ma5, ma20, ma60, ma120, ma200, rsi, volume_ratio, "
+        "atr, supertrend, macd_histogram, adx, support_level"
+    )
+
     def get_ohlcv_data(self, ticker: str, days: int = 250) -> pd.DataFrame:
         """SQLite에서 OHLCV 데이터 조회"""
         try:
             conn = sqlite3.connect(self.db_path)
 
-            query = """
-            SELECT ticker, date, open, high, low, close, volume,
-                   ma5, ma20, ma60, ma120, ma200, rsi, volume_ratio
+            query = f"""
+            SELECT {self.OHLCV_COLUMNS}
             FROM ohlcv_data
             WHERE ticker = ?
             ORDER BY date DESC
@@ -114,6 +120,72 @@ class HybridTechnicalFilter:
             logger.error(f"❌ {ticker} 데이터 조회 실패: {e}")
             return pd.DataFrame()
 
+    def load_ohlcv_window(self, tickers: List[str], days: int = 250,
+                          chunk_size: int = 500) -> pd.DataFrame:
+        """여러 종목의 최근 OHLCV 데이터를 하나의 long 프레임으로 일괄 조회
+
+        종목당 쿼리 대신 청크당 1회 조회하며, ticker/date 오름차순으로 정렬된 프레임을 반환합니다.
+        """
+        if not tickers:
+            return pd.DataFrame()
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            chunks = []
+
+            # SQLite 바인딩 변수 한도(999)를 넘지 않도록 청크 단위 조회
+            for start in range(0, len(tickers), chunk_size):
+                chunk = tickers[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+
+                query = f"""
+                SELECT {self.OHLCV_COLUMNS}
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY date DESC) AS rn
+                    FROM ohlcv_data
+                    WHERE ticker IN ({placeholders})
+                )
+                WHERE rn <= ?
+                ORDER BY ticker, date
+                """
+
+                df_chunk = pd.read_sql_query(query, conn, params=(*chunk, days))
+                if not df_chunk.empty:
+                    chunks.append(df_chunk)
+
+            conn.close()
+
+            if not chunks:
+                return pd.DataFrame()
+
+            df_all = pd.concat(chunks, ignore_index=True)
+            df_all['date'] = pd.to_datetime(df_all['date'])
+            return df_all
+
+        except Exception as e:
+            logger.error(f"❌ OHLCV 일괄 조회 실패: {e}")
+            return pd.DataFrame()
+
+    def load_ohlcv_frames(self, tickers: List[str], days: int = 250,
+                          chunk_size: int = 500) -> Dict[str, pd.DataFrame]:
+        """여러 종목의 최근 OHLCV 데이터를 일괄 조회하여 종목별 프레임으로 분리
+
+        Returns:
+            Dict[str, pd.DataFrame]: ticker → get_ohlcv_data()와 동일한 형식의 프레임
+        """
+        df_all = self.load_ohlcv_window(tickers, days, chunk_size)
+        if df_all.empty:
+            return {}
+
+        frames = {
+            ticker: df.reset_index(drop=True)
+            for ticker, df in df_all.groupby('ticker', sort=False)
+        }
+
+        missing = len(tickers) - len(frames)
+        logger.info(f"📊 {len(frames)}개 종목 데이터 일괄 로드 완료" + (f" (데이터 없음 {missing}개)" if missing else ""))
+        return frames
+
     def detect_weinstein_stage(self, df: pd.DataFrame) -> WeinsteingStageResult:
         """Weinstein 4 Stage 분석"""
         ticker = df['ticker'].iloc[0] if not df.empty else "Unknown"
@@ -448,63 +520,73 @@ class HybridTechnicalFilter:
         else:
             return "AVOID"
 
-    def save_analysis_results(self, stage_result: WeinsteingStageResult, gate_result: TechnicalGateResult) -> bool:
-        """분석 결과를 SQLite에 저장"""
+    def _ensure_analysis_table(self, cursor):
+        """technical_analysis 테이블 및 인덱스 생성 (존재 시 무시)"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS technical_analysis (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT NOT NULL,
+                analysis_date TEXT NOT NULL,
+
+                -- Weinstein Stage 분석
+                current_stage INTEGER,
+                stage_confidence REAL,
+                ma200_trend TEXT,
+                price_vs_ma200 REAL,
+                breakout_strength REAL,
+                volume_surge REAL,
+                days_in_stage INTEGER,
+
+                -- 4-Gate 필터링 결과
+                gate1_stage2 INTEGER,
+                gate2_volume INTEGER,
+                gate3_momentum INTEGER,
+                gate4_quality INTEGER,
+                total_gates_passed INTEGER,
+                quality_score REAL,
+                recommendation TEXT,
+
+                -- 메타데이터
+                created_at TEXT DEFAULT (datetime('now')),
+
+                UNIQUE(ticker, analysis_date)
+            )
+        """)
+
+        # 인덱스 생성
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_technical_analysis_ticker
+            ON technical_analysis(ticker)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_technical_analysis_date
+            ON technical_analysis(analysis_date)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_technical_analysis_recommendation
+            ON technical_analysis(recommendation)
+        """)
+
+    def save_analysis_results(self, stage_result: WeinsteingStageResult, gate_result: TechnicalGateResult,
+                              df: Optional[pd.DataFrame] = None) -> bool:
+        """분석 결과를 SQLite에 저장
+
+        Args:
+            df: 분석에 사용한 OHLCV 프레임 (전달 시 기술적 지표 추출을 위한 재조회 생략)
+        """
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
             # technical_analysis 테이블 확인/생성
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS technical_analysis (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ticker TEXT NOT NULL,
-                    analysis_date TEXT NOT NULL,
-
-                    -- Weinstein Stage 분석
-                    current_stage INTEGER,
-                    stage_confidence REAL,
-                    ma200_trend TEXT,
-                    price_vs_ma200 REAL,
-                    breakout_strength REAL,
-                    volume_surge REAL,
-                    days_in_stage INTEGER,
-
-                    -- 4-Gate 필터링 결과
-                    gate1_stage2 INTEGER,
-                    gate2_volume INTEGER,
-                    gate3_momentum INTEGER,
-                    gate4_quality INTEGER,
-                    total_gates_passed INTEGER,
-                    quality_score REAL,
-                    recommendation TEXT,
-
-                    -- 메타데이터
-                    created_at TEXT DEFAULT (datetime('now')),
-
-                    UNIQUE(ticker, analysis_date)
-                )
-            """)
-
-            # 인덱스 생성
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_technical_analysis_ticker
-                ON technical_analysis(ticker)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_technical_analysis_date
-                ON technical_analysis(analysis_date)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_technical_analysis_recommendation
-                ON technical_analysis(recommendation)
-            """)
+            self._ensure_analysis_table(cursor)
 
             # 데이터 저장 (UPSERT)
             analysis_date = datetime.now().strftime('%Y-%m-%d')
 
             # 🚀 Phase 1: 새로운 기술적 지표들을 OHLCV 데이터에서 가져와서 저장
-            df = self.get_ohlcv_data(stage_result.ticker)
+            if df is None:
+                df = self.get_ohlcv_data(stage_result.ticker)
             latest_atr = None
             latest_supertrend = None
             latest_macd_histogram = None
@@ -554,13 +636,246 @@ class HybridTechnicalFilter:
             logger.error(f"❌ {stage_result.ticker} 분석 결과 저장 실패: {e}")
             return False
 
-    def analyze_ticker(self, ticker: str) -> Optional[Tuple[WeinsteingStageResult, TechnicalGateResult]]:
-        """개별 종목 분석 (Weinstein Stage + 4-Gate Filter)"""
+    def save_analysis_results_batch(self, analyses: List[Tuple[WeinsteingStageResult, TechnicalGateResult, Dict]]) -> bool:
+        """여러 종목의 분석 결과를 단일 트랜잭션으로 저장
+
+        Args:
+            analyses: (stage_result, gate_result, 최신 기술적 지표 dict) 목록
+        """
+        if not analyses:
+            return True
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            self._ensure_analysis_table(cursor)
+
+            analysis_date = datetime.now().strftime('%Y-%m-%d')
+            rows = []
+            for stage_result, gate_result, indicators in analyses:
+                rows.append((
+                    stage_result.ticker, analysis_date, stage_result.current_stage,
+                    stage_result.stage_confidence, stage_result.ma200_trend,
+                    stage_result.price_vs_ma200, stage_result.breakout_strength,
+                    stage_result.volume_surge, stage_result.days_in_stage,
+                    gate_result.gate1_stage2, gate_result.gate2_volume,
+                    gate_result.gate3_momentum, gate_result.gate4_quality,
+                    gate_result.total_gates_passed, gate_result.quality_score,
+                    gate_result.recommendation, indicators.get('atr'), indicators.get('supertrend'),
+                    indicators.get('macd_histogram'), indicators.get('adx'), indicators.get('support_level')
+                ))
+
+            cursor.executemany("""
+                INSERT OR REPLACE INTO technical_analysis (
+                    ticker, analysis_date, current_stage, stage_confidence,
+                    ma200_trend, price_vs_ma200, breakout_strength,
+                    volume_surge, days_in_stage, gate1_stage2, gate2_volume,
+                    gate3_momentum, gate4_quality, total_gates_passed,
+                    quality_score, recommendation, atr, supertrend, macd_histogram,
+                    adx, support_level
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            conn.commit()
+            conn.close()
+
+            logger.info(f"💾 {len(rows)}개 종목 분석 결과 일괄 저장 완료 (단일 트랜잭션)")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ 분석 결과 일괄 저장 실패: {e}")
+            return False
+
+    @staticmethod
+    def _extract_latest_indicators(latest_row) -> Dict:
+        """최신 행에서 technical_analysis에 함께 저장할 기술적 지표 추출"""
+        indicators = {}
+        for column in ('atr', 'supertrend', 'macd_histogram', 'adx', 'support_level'):
+            value = latest_row.get(column) if hasattr(latest_row, 'get') else None
+            indicators[column] = float(value) if value is not None and pd.notna(value) else None
+        return indicators
+
+    def classify_stages_batch(self, df_all: pd.DataFrame) -> List[Tuple[WeinsteingStageResult, TechnicalGateResult, Dict]]:
+        """전체 종목 Weinstein Stage + 4-Gate 판정을 벡터 연산으로 일괄 수행
+
+        detect_weinstein_stage / apply_four_gate_filter와 동일한 규칙을 종목 축으로 벡터화합니다.
+        최소 데이터(min_data_points) 미만 종목은 기존 단일 종목 로직으로 처리합니다.
+
+        Args:
+            df_all: load_ohlcv_window() 형식의 long 프레임 (ticker, date 오름차순)
+
+        Returns:
+            List[Tuple]: (stage_result, gate_result, 최신 기술적 지표 dict)
+        """
+        if df_all.empty:
+            return []
+
+        # 종목별 끝에서부터의 위치 (0 = 최신 행) → iloc[-1], iloc[-20], tail(N)을 마스크로 표현
+        pos_from_end = df_all.groupby('ticker', sort=False).cumcount(ascending=False)
+        counts = df_all.groupby('ticker', sort=False).size()
+
+        latest = df_all[pos_from_end == 0].set_index('ticker')
+        prev20 = df_all[pos_from_end == 19].set_index('ticker')
+        tail20 = df_all[pos_from_end < 20]
+        tail5 = df_all[pos_from_end < 5]
+
+        full_tickers = counts.index[counts >= self.min_data_points]
+        short_tickers = counts.index[counts < self.min_data_points]
+
+        analyses = []
+
+        if len(full_tickers) > 0:
+            f = latest.loc[full_tickers]
+            close, volume = f['close'], f['volume']
+            ma200, ma120 = f['ma200'], f['ma120']
+            ma5, ma20, ma60 = f['ma5'], f['ma20'], f['ma60']
+            rsi, volume_ratio = f['rsi'], f['volume_ratio']
+            ma200_prev = prev20['ma200'].reindex(full_tickers)
+            close_prev = prev20['close'].reindex(full_tickers)
+            volume_avg_20 = tail20.groupby('ticker')['volume'].mean().reindex(full_tickers)
+
+            ma200_valid = ma200.notna()
+            ma200_positive = ma200_valid & (ma200 > 0)
+
+            # 현재가 대비 MA200 위치
+            price_vs_ma200 = np.where(ma200_positive, (close - ma200) / ma200 * 100, 0.0)
+            price_vs_ma200 = pd.Series(price_vs_ma200, index=full_tickers)
+
+            # MA200 트렌드: 20일 전 MA200 → MA120 → 20일 가격 추세 순으로 대체 (_determine_ma200_trend와 동일)
+            step1 = ma200_valid & ma200_prev.notna() & (ma200_prev > 0)
+            step2 = ~step1 & ma200_valid & ma120.notna() & (ma120 > 0)
+            step3 = ~step1 & ~step2
+            ma200_trend = pd.Series(np.select(
+                [
+                    step1 & (ma200 > ma200_prev * 1.02), step1 & (ma200 < ma200_prev * 0.98), step1,
+                    step2 & (ma200 > ma120 * 1.05), step2 & (ma200 < ma120 * 0.95), step2,
+                    step3 & (close > close_prev * 1.10), step3 & (close < close_prev * 0.90)
+                ],
+                ['up', 'down', 'sideways', 'up', 'down', 'sideways', 'up', 'down'],
+                default='sideways'
+            ), index=full_tickers)
+
+            # 거래량 급증률
+            volume_surge = pd.Series(
+                np.where(volume_avg_20 > 0, volume / volume_avg_20, 1.0), index=full_tickers
+            )
+
+            # Stage 판정 (_determine_stage와 동일한 가산 순서)
+            rsi_healthy = (rsi >= 40) & (rsi <= 70)
+            stage2_confidence = 0.6 + np.where(volume_surge > self.volume_surge_threshold, 0.2, 0.0)
+            stage2_confidence = stage2_confidence + np.where(
+                price_vs_ma200 > 5, 0.1, np.where(price_vs_ma200 > 2, 0.05, 0.0)
+            )
+            stage2_confidence = np.minimum(stage2_confidence + np.where(rsi_healthy, 0.05, 0.0), 1.0)
+
+            is_stage2 = ma200_valid & (close > ma200) & (ma200_trend == 'up')
+            is_stage4 = ma200_valid & (close < ma200) & (ma200_trend == 'down')
+            is_stage3 = (ma200_trend == 'sideways') & ma200_valid & (close > ma200 * 0.95)
+            stage = np.select([is_stage2, is_stage4, is_stage3], [2, 4, 3], default=1)
+            stage_confidence = np.select([is_stage2, is_stage4, is_stage3],
+                                         [stage2_confidence, 0.7, 0.5], default=0.4)
+
+            # 돌파 강도: 최근 5일 종가의 MA200 대비 양수 돌파율 평균
+            tail5_ma200 = tail5['ticker'].map(ma200)
+            tail5_strength = ((tail5['close'] - tail5_ma200) / tail5_ma200 * 100).clip(lower=0)
+            breakout_strength = tail5_strength.groupby(tail5['ticker']).mean().reindex(full_tickers).fillna(0.0)
+            breakout_strength = breakout_strength.where(ma200_positive, 0.0)
+
+            # Gate 1~3
+            gate1 = (stage == 2) & (stage_confidence >= 0.55) & (price_vs_ma200 > 0)
+            gate2 = volume_surge >= self.volume_surge_threshold
+            ma_complete = ma5.notna() & ma20.notna() & ma60.notna()
+            ma_aligned = ma_complete & (ma5 > ma20) & (ma20 > ma60)
+            price_above_ma20 = np.where(ma20.notna(), close > ma20, True)
+            gate3 = (rsi_healthy.astype(int) + ma_aligned.astype(int) + price_above_ma20.astype(int)) >= 2
+
+            # Gate 4: 품질 점수 (_calculate_quality_score + _calculate_technical_bonus)
+            technical_bonus = (
+                np.where((rsi >= 40) & (rsi <= 60), 2.0, np.where((rsi >= 35) & (rsi <= 70), 1.0, 0.0)) +
+                np.where(ma_aligned, 2.0, np.where(ma_complete & (ma5 > ma20), 1.0, 0.0)) +
+                np.where(volume_ratio > 2.0, 1.0, np.where(volume_ratio > 1.5, 0.5, 0.0))
+            )
+            quality_raw = stage_confidence * 5
+            quality_raw = quality_raw + np.where(price_vs_ma200 > 0, np.minimum(5, price_vs_ma200 * 0.5), 0.0)
+            quality_raw = quality_raw + np.where(
+                volume_surge.notna() & (volume_surge > 0),
+                np.maximum(0, np.minimum(5, (volume_surge - 1) * 2)), 0.0
+            )
+            quality_raw = quality_raw + np.select([ma200_trend == 'up', ma200_trend == 'sideways'], [3.0, 1.0], default=0.0)
+            quality_raw = quality_raw + np.minimum(5.0, technical_bonus)
+
+            columns = zip(
+                full_tickers, stage, stage_confidence, ma200_trend, price_vs_ma200,
+                breakout_strength, volume_surge, gate1, gate2, gate3, quality_raw
+            )
+            for (ticker, stg, conf, trend, pv, bs, vs, g1, g2, g3, q) in columns:
+                stage_result = WeinsteingStageResult(
+                    ticker=ticker,
+                    current_stage=int(stg),
+                    stage_confidence=float(conf),
+                    ma200_trend=str(trend),
+                    price_vs_ma200=float(pv),
+                    breakout_strength=float(bs),
+                    volume_surge=float(vs),
+                    days_in_stage=self._estimate_days_in_stage(None, int(stg))
+                )
+
+                quality_score = round(float(q), 1)
+                gate4 = quality_score >= self.quality_threshold
+                gates = [bool(g1), bool(g2), bool(g3), gate4]
+                total_gates_passed = sum(gates)
+
+                gate_result = TechnicalGateResult(
+                    ticker=ticker,
+                    gate1_stage2=gates[0],
+                    gate2_volume=gates[1],
+                    gate3_momentum=gates[2],
+                    gate4_quality=gates[3],
+                    total_gates_passed=total_gates_passed,
+                    quality_score=quality_score,
+                    recommendation=self._determine_recommendation(total_gates_passed, quality_score)
+                )
+
+                analyses.append((stage_result, gate_result, self._extract_latest_indicators(latest.loc[ticker])))
+
+        # 데이터 부족 종목은 단일 종목 로직 사용 (기본 Stage 결과 + 게이트 판정)
+        for ticker in short_tickers:
+            df = df_all[df_all['ticker'] == ticker].reset_index(drop=True)
+            stage_result = self.detect_weinstein_stage(df)
+            gate_result = self.apply_four_gate_filter(stage_result, df)
+            analyses.append((stage_result, gate_result, self._extract_latest_indicators(df.iloc[-1])))
+
+        return analyses
+
+    def analyze_tickers_batch(self, tickers: List[str],
+                              days: int = 250) -> List[Tuple[WeinsteingStageResult, TechnicalGateResult]]:
+        """전체 종목 일괄 분석: 1회 조회 → 벡터화 판정 → 단일 트랜잭션 저장"""
+        logger.info(f"⚡ {len(tickers)}개 종목 일괄(batch) 분석 시작")
+
+        df_all = self.load_ohlcv_window(tickers, days)
+        if df_all.empty:
+            logger.warning("⚠️ 일괄 분석 대상 데이터 없음")
+            return []
+
+        analyses = self.classify_stages_batch(df_all)
+        self.save_analysis_results_batch(analyses)
+
+        return [(stage_result, gate_result) for stage_result, gate_result, _ in analyses]
+
+    def analyze_ticker(self, ticker: str,
+                       df: Optional[pd.DataFrame] = None) -> Optional[Tuple[WeinsteingStageResult, TechnicalGateResult]]:
+        """개별 종목 분석 (Weinstein Stage + 4-Gate Filter)
+
+        Args:
+            df: 미리 로드한 OHLCV 프레임 (없으면 DB에서 조회)
+        """
 
         logger.info(f"🔍 {ticker} 기술적 분석 시작")
 
         # 1. OHLCV 데이터 로드
-        df = self.get_ohlcv_data(ticker)
+        if df is None:
+            df = self.get_ohlcv_data(ticker)
         if df.empty:
             logger.warning(f"⚠️ {ticker}: 데이터 없음, 분석 건너뛰기")
             return None
@@ -572,7 +887,7 @@ class HybridTechnicalFilter:
         gate_result = self.apply_four_gate_filter(stage_result, df)
 
         # 4. 결과 저장
-        self.save_analysis_results(stage_result, gate_result)
+        self.save_analysis_results(stage_result, gate_result, df)
 
         # 5. 결과 출력
         logger.info(f"📊 {ticker} 분석 완료:")
@@ -608,10 +923,43 @@ class HybridTechnicalFilter:
             logger.error(f"❌ 활성 종목 조회 실패: {e}")
             return []
 
-    def run_full_analysis(self) -> Dict:
-        """전체 종목 기술적 분석 실행"""
+    def _classify_analysis_result(self, results: Dict, stage_result: WeinsteingStageResult,
+                                  gate_result: TechnicalGateResult):
+        """분석 결과를 Stage 2 후보 및 권고 등급별로 분류"""
+        ticker = stage_result.ticker
+        results['analyzed_tickers'].append(ticker)
+
+        # Stage 2 후보 분류
+        if stage_result.current_stage == 2 and gate_result.total_gates_passed >= 2:
+            results['stage2_candidates'].append({
+                'ticker': ticker,
+                'gates_passed': gate_result.total_gates_passed,
+                'quality_score': gate_result.quality_score,
+                'recommendation': gate_result.recommendation
+            })
+
+        # 권고 등급별 분류
+        if gate_result.recommendation == 'STRONG_BUY':
+            results['strong_buy'].append(ticker)
+        elif gate_result.recommendation == 'BUY':
+            results['buy'].append(ticker)
+        elif gate_result.recommendation == 'BUY_LITE':
+            results['buy_lite'].append(ticker)
+        elif gate_result.recommendation == 'HOLD':
+            results['hold'].append(ticker)
+        elif gate_result.recommendation == 'WATCH':
+            results['watch'].append(ticker)
+        else:
+            results['avoid'].append(ticker)
 
-        logger.info("🚀 Phase 2: Hybrid Technical Filter 시작")
+    def run_full_analysis(self, batch_mode: bool = False) -> Dict:
+        """전체 종목 기술적 분석 실행
+
+        Args:
+            batch_mode: True면 전체 종목을 1회 조회 + 벡터화 판정 + 단일 트랜잭션 저장으로 처리
+        """
+
+        logger.info(f"🚀 Phase 2: Hybrid Technical Filter 시작 ({'batch' if batch_mode else '종목별'} 모드)")
 
         # 활성 종목 목록 조회
         tickers = self.get_active_tickers()
@@ -631,41 +979,21 @@ class HybridTechnicalFilter:
             'analysis_summary': {}
         }
 
-        # 각 종목 분석
-        for ticker in tickers:
-            try:
-                analysis_result = self.analyze_ticker(ticker)
-                if analysis_result:
-                    stage_result, gate_result = analysis_result
-
-                    results['analyzed_tickers'].append(ticker)
-
-                    # Stage 2 후보 분류
-                    if stage_result.current_stage == 2 and gate_result.total_gates_passed >= 2:
-                        results['stage2_candidates'].append({
-                            'ticker': ticker,
-                            'gates_passed': gate_result.total_gates_passed,
-                            'quality_score': gate_result.quality_score,
-                            'recommendation': gate_result.recommendation
-                        })
-
-                    # 권고 등급별 분류
-                    if gate_result.recommendation == 'STRONG_BUY':
-                        results['strong_buy'].append(ticker)
-                    elif gate_result.recommendation == 'BUY':
-                        results['buy'].append(ticker)
-                    elif gate_result.recommendation == 'BUY_LITE':
-                        results['buy_lite'].append(ticker)
-                    elif gate_result.recommendation == 'HOLD':
-                        results['hold'].append(ticker)
-                    elif gate_result.recommendation == 'WATCH':
-                        results['watch'].append(ticker)
-                    else:
-                        results['avoid'].append(ticker)
+        if batch_mode:
+            for stage_result, gate_result in self.analyze_tickers_batch(tickers):
+                self._classify_analysis_result(results, stage_result, gate_result)
+        else:
+            # 각 종목 분석
+            for ticker in tickers:
+                try:
+                    analysis_result = self.analyze_ticker(ticker)
+                    if analysis_result:
+                        stage_result, gate_result = analysis_result
+                        self._classify_analysis_result(results, stage_result, gate_result)
 
-            except Exception as e:
-                logger.error(f"❌ {ticker} 분석 중 오류: {e}")
-                continue
+                except Exception as e:
+                    logger.error(f"❌ {ticker} 분석 중 오류: {e}")
+                    continue
 
         # 분석 요약
         total_analyzed = len(results['analyzed_tickers'])
@@ -714,8 +1042,8 @@ def main():
     # 필터 인스턴스 생성
     filter_engine = HybridTechnicalFilter()
 
-    # 전체 분석 실행
-    results = filter_engine.run_full_analysis()
+    # 전체 분석 실행 (일괄 조회 + 벡터화 판정 + 단일 트랜잭션 저장)
+    results = filter_engine.run_full_analysis(batch_mode=True)
 
     # 결과를 JSON으로 저장 (선택사항)
     output_file = f"technical_analysis_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
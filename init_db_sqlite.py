@@ -310,6 +310,7 @@ class SQLiteDatabaseInitializer:
             "CREATE INDEX IF NOT EXISTS idx_technical_analysis_ticker ON technical_analysis(ticker)",
             "CREATE INDEX IF NOT EXISTS idx_technical_analysis_date ON technical_analysis(analysis_date)",
             "CREATE INDEX IF NOT EXISTS idx_technical_analysis_recommendation ON technical_analysis(recommendation)",
+            "CREATE INDEX IF NOT EXISTS idx_technical_analysis_ticker_created ON technical_analysis(ticker, created_at)",
             "CREATE INDEX IF NOT EXISTS idx_gpt_analysis_ticker ON gpt_analysis(ticker)",
             "CREATE INDEX IF NOT EXISTS idx_gpt_analysis_date ON gpt_analysis(analysis_date)",
             "CREATE INDEX IF NOT EXISTS idx_kelly_ticker ON kelly_analysis(ticker)",
@@ -320,7 +321,8 @@ class SQLiteDatabaseInitializer:
             "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_ticker ON unified_technical_analysis(ticker)",
             "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_date ON unified_technical_analysis(analysis_date)",
             "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_mode ON unified_technical_analysis(filter_mode)",
-            "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_recommendation ON unified_technical_analysis(final_recommendation)"
+            "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_recommendation ON unified_technical_analysis(final_recommendation)",
+            "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_ticker_created ON unified_technical_analysis(ticker, created_at)"
         ]
 
         for index in indexes:
@@ -365,6 +367,11 @@ class SQLiteDatabaseInitializer:
                 fee REAL DEFAULT 0,
                 error_message TEXT,
 
+                -- 호가창 기반 집행 (중간가 대비 bp)
+                estimated_slippage_bps REAL,
+                actual_slippage_bps REAL,
+                execution_style TEXT,                     -- market | twap | ladder
+
                 -- 타임스탬프
                 timestamp TEXT NOT NULL DEFAULT (datetime('now')),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -417,6 +424,8 @@ class SQLiteDatabaseInitializer:
                 activation_price REAL NOT NULL,
                 stop_price REAL NOT NULL,
                 atr_value REAL,
+                highest_price REAL,
+                stop_type TEXT,
                 created_at TEXT DEFAULT (datetime('now')),
                 updated_at TEXT DEFAULT (datetime('now'))
             )
@@ -429,7 +438,8 @@ class SQLiteDatabaseInitializer:
             "CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)",
             "CREATE INDEX IF NOT EXISTS idx_trades_order_type ON trades(order_type)",
             "CREATE INDEX IF NOT EXISTS idx_trades_pyramid_eligible ON trades(is_pyramid_eligible)",
-            "CREATE INDEX IF NOT EXISTS idx_trades_fill_rate ON trades(fill_rate)"
+            "CREATE INDEX IF NOT EXISTS idx_trades_fill_rate ON trades(fill_rate)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_ticker_type_created ON trades(ticker, order_type, created_at)"
         ]
 
         for index in trades_indexes:
@@ -16,9 +16,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from hybrid_technical_filter import HybridTechnicalFilter
 from advanced_trend_analyzer import AdvancedTrendAnalyzer
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import json
+import pandas as pd
 
 # 로깅 설정
 logging.basicConfig(
@@ -74,7 +76,7 @@ class IntegratedTrendFilter:
         self.db_path = db_path
 
         # 시스템 초기화
-        self.legacy_filter = HybridTechnicalFilter()
+        self.legacy_filter = HybridTechnicalFilter(db_path)
         self.advanced_analyzer = AdvancedTrendAnalyzer(db_path)
 
         # 성능 통계
@@ -88,20 +90,17 @@ class IntegratedTrendFilter:
 
         logger.info(f"🚀 IntegratedTrendFilter 초기화 완료 (모드: {mode})")
 
-    def analyze_ticker(self, ticker: str) -> IntegratedResult:
-        """ticker 통합 분석"""
-        logger.info(f"🔍 {ticker} 통합 분석 시작")
-
-        self.stats['total_analyzed'] += 1
+    def analyze_ticker(self, ticker: str, df: Optional[pd.DataFrame] = None) -> IntegratedResult:
+        """ticker 통합 분석
 
-        # 1. 데이터 품질 평가
-        data_quality = self._assess_data_quality(ticker)
+        Args:
+            df: 미리 로드한 OHLCV 프레임 (없으면 1회 조회 후 두 시스템이 공유)
+        """
+        logger.info(f"🔍 {ticker} 통합 분석 시작")
 
-        # 2. 기존 시스템 분석
-        legacy_result = self._analyze_with_legacy(ticker)
+        data_quality, legacy_result, new_result = self._run_analyzers(ticker, df)
 
-        # 3. 새 시스템 분석 (데이터 품질에 따라)
-        new_result = self._analyze_with_new_system(ticker, data_quality)
+        self.stats['total_analyzed'] += 1
 
         # 4. 모드에 따른 최종 결정
         integrated_result = self._make_integrated_decision(
@@ -111,11 +110,29 @@ class IntegratedTrendFilter:
         logger.info(f"📊 {ticker} 통합 분석 완료: {integrated_result.final_recommendation}")
         return integrated_result
 
-    def _assess_data_quality(self, ticker: str) -> float:
+    def _run_analyzers(self, ticker: str,
+                       df: Optional[pd.DataFrame] = None) -> Tuple[float, Dict, Dict]:
+        """한 번 로드한 프레임으로 품질 평가 + 두 시스템 분석 실행 (stats 변경 없음 → 스레드 실행 가능)"""
+        if df is None:
+            df = self.legacy_filter.get_ohlcv_data(ticker)
+
+        # 1. 데이터 품질 평가
+        data_quality = self._assess_data_quality(ticker, df)
+
+        # 2. 기존 시스템 분석
+        legacy_result = self._analyze_with_legacy(ticker, df)
+
+        # 3. 새 시스템 분석 (데이터 품질에 따라)
+        new_result = self._analyze_with_new_system(ticker, data_quality, df)
+
+        return data_quality, legacy_result, new_result
+
+    def _assess_data_quality(self, ticker: str, df: Optional[pd.DataFrame] = None) -> float:
         """데이터 품질 평가 (0.0 ~ 1.0)"""
         try:
-            # AdvancedTrendAnalyzer의 데이터 로드 시도
-            df = self.advanced_analyzer._get_ohlcv_data(ticker)
+            # AdvancedTrendAnalyzer의 데이터 로드 시도 (프레임 미전달 시)
+            if df is None:
+                df = self.advanced_analyzer._get_ohlcv_data(ticker)
 
             if df.empty:
                 return 0.0
@@ -143,10 +160,10 @@ class IntegratedTrendFilter:
             logger.warning(f"⚠️ {ticker} 데이터 품질 평가 실패: {e}")
             return 0.0
 
-    def _analyze_with_legacy(self, ticker: str) -> Dict:
+    def _analyze_with_legacy(self, ticker: str, df: Optional[pd.DataFrame] = None) -> Dict:
         """기존 시스템으로 분석"""
         try:
-            result = self.legacy_filter.analyze_ticker(ticker)
+            result = self.legacy_filter.analyze_ticker(ticker, df)
             if result:
                 stage_result, gate_result = result
                 return {
@@ -164,7 +181,8 @@ class IntegratedTrendFilter:
             logger.warning(f"⚠️ {ticker} Legacy 분석 실패: {e}")
             return {'success': False, 'reason': str(e)}
 
-    def _analyze_with_new_system(self, ticker: str, data_quality: float) -> Dict:
+    def _analyze_with_new_system(self, ticker: str, data_quality: float,
+                                 df: Optional[pd.DataFrame] = None) -> Dict:
         """새 시스템으로 분석"""
         # 데이터 품질이 너무 낮으면 스킵
         if data_quality < 0.3:  # 30% 이하면 신뢰도 부족
@@ -174,7 +192,7 @@ class IntegratedTrendFilter:
             }
 
         try:
-            result = self.advanced_analyzer.analyze_ticker(ticker)
+            result = self.advanced_analyzer.analyze_ticker(ticker, df)
             return {
                 'success': True,
                 'stage': result.stage,
@@ -333,14 +351,47 @@ class IntegratedTrendFilter:
             'data_quality_issue_ratio': self.stats['data_quality_issues'] / total
         }
 
-    def analyze_multiple_tickers(self, tickers: List[str]) -> List[IntegratedResult]:
-        """여러 ticker 일괄 분석"""
-        logger.info(f"🚀 {len(tickers)}개 ticker 일괄 분석 시작")
+    def analyze_multiple_tickers(self, tickers: List[str], max_workers: int = 4) -> List[IntegratedResult]:
+        """여러 ticker 일괄 분석
 
+        모든 종목의 OHLCV를 일괄 쿼리로 한 번만 로드하고, 같은 프레임을 품질 평가 /
+        Legacy / 고도화 분석이 공유합니다. 종목별 분석은 스레드 풀에서 병렬 실행하며
+        통계를 갱신하는 최종 결정 단계만 호출 스레드에서 순차 처리합니다.
+
+        Args:
+            tickers: 분석할 종목 목록
+            max_workers: 병렬 분석 스레드 수 (1이면 순차 실행)
+        """
+        logger.info(f"🚀 {len(tickers)}개 ticker 일괄 분석 시작 (워커: {max_workers}개)")
+
+        # 1. 전체 프레임 일괄 로드 (종목당 최대 4회 → 전체 1회)
+        frames = self.legacy_filter.load_ohlcv_frames(tickers)
+        empty_frame = pd.DataFrame()
+
+        # 2. 종목별 분석 (병렬)
+        analyzed = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(self._run_analyzers, ticker, frames.get(ticker, empty_frame)): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    analyzed[ticker] = future.result()
+                except Exception as e:
+                    logger.error(f"❌ {ticker} 분석 실패: {e}")
+
+        # 3. 통합 결정 (입력 순서 유지, stats는 단일 스레드에서만 갱신)
         results = []
         for i, ticker in enumerate(tickers, 1):
+            if ticker not in analyzed:
+                continue
+
             try:
-                result = self.analyze_ticker(ticker)
+                data_quality, legacy_result, new_result = analyzed[ticker]
+                self.stats['total_analyzed'] += 1
+                result = self._make_integrated_decision(ticker, legacy_result, new_result, data_quality)
                 results.append(result)
                 logger.info(f"✅ [{i}/{len(tickers)}] {ticker}: {result.final_recommendation}")
 
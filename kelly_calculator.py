@@ -37,6 +37,9 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
+from correlation_cache import get_correlation_cache
+from pattern_statistics import PatternStatistics
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -68,6 +71,7 @@ class PatternProbability:
     avg_win: float   # 평균 수익률
     avg_loss: float  # 평균 손실률
     base_position: float  # 기본 포지션 크기 (%)
+    sample_size: int = 0  # 반영된 실현 청산 표본 수 (0이면 사전값)
 
 @dataclass
 class QualityScoreAdjustment:
@@ -100,6 +104,72 @@ class KellyResult:
     max_portfolio_allocation: float = 25.0  # 최대 포트폴리오 할당 %
     reasoning: str = ""
 
+# 패턴별 사전 확률 (역사적 검증 수치) - 실현 청산 성과가 쌓이면 PatternStatistics가 이 값으로 축소 추정
+PATTERN_PRIORS: Dict[PatternType, PatternProbability] = {
+    # 스탠 와인스타인 Stage 1→2 전환 (최강 신호)
+    PatternType.STAGE_1_TO_2: PatternProbability(
+        pattern_type=PatternType.STAGE_1_TO_2,
+        win_rate=0.675,  # 67.5% 승률 (65-70% 중간값)
+        avg_win=0.25,    # 평균 25% 수익
+        avg_loss=0.08,   # 평균 8% 손실 (미너비니 규칙)
+        base_position=5.0  # 5% 기본 포지션
+    ),
+
+    # 마크 미너비니 VCP 돌파
+    PatternType.VCP_BREAKOUT: PatternProbability(
+        pattern_type=PatternType.VCP_BREAKOUT,
+        win_rate=0.625,  # 62.5% 승률 (60-65% 중간값)
+        avg_win=0.22,    # 평균 22% 수익
+        avg_loss=0.08,   # 평균 8% 손실
+        base_position=4.0  # 4% 기본 포지션
+    ),
+
+    # 윌리엄 오닐 Cup & Handle
+    PatternType.CUP_HANDLE: PatternProbability(
+        pattern_type=PatternType.CUP_HANDLE,
+        win_rate=0.625,  # 62.5% 승률 (60-65% 중간값)
+        avg_win=0.20,    # 평균 20% 수익
+        avg_loss=0.08,   # 평균 8% 손실
+        base_position=4.0  # 4% 기본 포지션
+    ),
+
+    # 60일 고점 돌파 + 거래량
+    PatternType.HIGH_60D_BREAKOUT: PatternProbability(
+        pattern_type=PatternType.HIGH_60D_BREAKOUT,
+        win_rate=0.575,  # 57.5% 승률 (55-60% 중간값)
+        avg_win=0.18,    # 평균 18% 수익
+        avg_loss=0.08,   # 평균 8% 손실
+        base_position=3.0  # 3% 기본 포지션
+    ),
+
+    # Stage 2 지속 (추가 매수)
+    PatternType.STAGE_2_CONTINUATION: PatternProbability(
+        pattern_type=PatternType.STAGE_2_CONTINUATION,
+        win_rate=0.55,   # 55% 승률
+        avg_win=0.15,    # 평균 15% 수익
+        avg_loss=0.08,   # 평균 8% 손실
+        base_position=2.0  # 2% 기본 포지션
+    ),
+
+    # 단순 MA200 돌파
+    PatternType.MA200_BREAKOUT: PatternProbability(
+        pattern_type=PatternType.MA200_BREAKOUT,
+        win_rate=0.525,  # 52.5% 승률 (50-55% 중간값)
+        avg_win=0.12,    # 평균 12% 수익
+        avg_loss=0.08,   # 평균 8% 손실
+        base_position=1.5  # 1.5% 기본 포지션
+    ),
+
+    # 알 수 없는 패턴 (보수적 접근)
+    PatternType.UNKNOWN: PatternProbability(
+        pattern_type=PatternType.UNKNOWN,
+        win_rate=0.500,  # 50% 승률 (중립적)
+        avg_win=0.10,    # 평균 10% 수익 (보수적)
+        avg_loss=0.08,   # 평균 8% 손실
+        base_position=1.5  # 1.5% 기본 포지션 (최소 수준)
+    ),
+}
+
 class KellyCalculator:
     """
     Kelly Criterion 기반 포지션 사이징 계산기
@@ -110,89 +180,51 @@ class KellyCalculator:
                  db_path: str = "./makenaide_local.db",
                  risk_level: RiskLevel = RiskLevel.MODERATE,
                  max_single_position: float = 8.0,
-                 max_total_allocation: float = 25.0):
+                 max_total_allocation: float = 25.0,
+                 use_realized_statistics: bool = True):
 
         self.db_path = db_path
         self.risk_level = risk_level
         self.max_single_position = max_single_position  # 개별 포지션 최대 %
         self.max_total_allocation = max_total_allocation  # 전체 할당 최대 %
 
-        # 패턴별 확률 정보 초기화
-        self.pattern_probabilities = self._initialize_pattern_probabilities()
+        # 패턴별 확률 정보: 사전값 + 실현 청산 성과 축소 추정 (백테스트는 미래 거래 반영 방지를 위해 사전값만)
+        self.pattern_statistics = PatternStatistics(db_path) if use_realized_statistics else None
+        self.pattern_probabilities = dict(PATTERN_PRIORS)
+        self.refresh_pattern_probabilities()
 
         # 품질 점수 조정자 초기화
         self.quality_adjustments = self._initialize_quality_adjustments()
 
+        # 일간 수익률 상관 행렬 캐시 (프로세스 공유, 종목 쌍 O(1) 조회)
+        self.correlation_cache = get_correlation_cache()
+
         self.init_database()
         logger.info("🎲 KellyCalculator 초기화 완료")
 
-    def _initialize_pattern_probabilities(self) -> Dict[PatternType, PatternProbability]:
-        """패턴별 확률 정보 초기화 (역사적 검증 데이터)"""
-        return {
-            # 스탠 와인스타인 Stage 1→2 전환 (최강 신호)
-            PatternType.STAGE_1_TO_2: PatternProbability(
-                pattern_type=PatternType.STAGE_1_TO_2,
-                win_rate=0.675,  # 67.5% 승률 (65-70% 중간값)
-                avg_win=0.25,    # 평균 25% 수익
-                avg_loss=0.08,   # 평균 8% 손실 (미너비니 규칙)
-                base_position=5.0  # 5% 기본 포지션
-            ),
-
-            # 마크 미너비니 VCP 돌파
-            PatternType.VCP_BREAKOUT: PatternProbability(
-                pattern_type=PatternType.VCP_BREAKOUT,
-                win_rate=0.625,  # 62.5% 승률 (60-65% 중간값)
-                avg_win=0.22,    # 평균 22% 수익
-                avg_loss=0.08,   # 평균 8% 손실
-                base_position=4.0  # 4% 기본 포지션
-            ),
-
-            # 윌리엄 오닐 Cup & Handle
-            PatternType.CUP_HANDLE: PatternProbability(
-                pattern_type=PatternType.CUP_HANDLE,
-                win_rate=0.625,  # 62.5% 승률 (60-65% 중간값)
-                avg_win=0.20,    # 평균 20% 수익
-                avg_loss=0.08,   # 평균 8% 손실
-                base_position=4.0  # 4% 기본 포지션
-            ),
-
-            # 60일 고점 돌파 + 거래량
-            PatternType.HIGH_60D_BREAKOUT: PatternProbability(
-                pattern_type=PatternType.HIGH_60D_BREAKOUT,
-                win_rate=0.575,  # 57.5% 승률 (55-60% 중간값)
-                avg_win=0.18,    # 평균 18% 수익
-                avg_loss=0.08,   # 평균 8% 손실
-                base_position=3.0  # 3% 기본 포지션
-            ),
-
-            # Stage 2 지속 (추가 매수)
-            PatternType.STAGE_2_CONTINUATION: PatternProbability(
-                pattern_type=PatternType.STAGE_2_CONTINUATION,
-                win_rate=0.55,   # 55% 승률
-                avg_win=0.15,    # 평균 15% 수익
-                avg_loss=0.08,   # 평균 8% 손실
-                base_position=2.0  # 2% 기본 포지션
-            ),
-
-            # 단순 MA200 돌파
-            PatternType.MA200_BREAKOUT: PatternProbability(
-                pattern_type=PatternType.MA200_BREAKOUT,
-                win_rate=0.525,  # 52.5% 승률 (50-55% 중간값)
-                avg_win=0.12,    # 평균 12% 수익
-                avg_loss=0.08,   # 평균 8% 손실
-                base_position=1.5  # 1.5% 기본 포지션
-            ),
-
-            # 알 수 없는 패턴 (보수적 접근)
-            PatternType.UNKNOWN: PatternProbability(
-                pattern_type=PatternType.UNKNOWN,
-                win_rate=0.500,  # 50% 승률 (중립적)
-                avg_win=0.10,    # 평균 10% 수익 (보수적)
-                avg_loss=0.08,   # 평균 8% 손실
-                base_position=1.5  # 1.5% 기본 포지션 (최소 수준)
-            ),
+    def refresh_pattern_probabilities(self) -> int:
+        """
+        새 청산 거래를 패턴별 누적 합계에 반영하고 패턴 확률 재추정
+
+        Returns:
+            이번에 반영된 청산 포지션 수
+        """
+        if self.pattern_statistics is None:
+            return 0
+
+        applied = self.pattern_statistics.refresh()
+        self.pattern_probabilities = {
+            pattern_type: self.pattern_statistics.estimate(pattern_type.value, prior)
+            for pattern_type, prior in PATTERN_PRIORS.items()
         }
 
+        for probability in self.pattern_probabilities.values():
+            if probability.sample_size:
+                logger.debug(f"📈 {probability.pattern_type.value}: 승률 {probability.win_rate:.1%}, "
+                             f"평균 +{probability.avg_win:.1%}/-{probability.avg_loss:.1%}, "
+                             f"기본 포지션 {probability.base_position:.2f}% (청산 {probability.sample_size}건)")
+        return applied
+
     def _initialize_quality_adjustments(self) -> List[QualityScoreAdjustment]:
         """품질 점수 조정자 초기화"""
         return [
@@ -678,8 +710,19 @@ class KellyCalculator:
 
     def calculate_position_size(self,
                               technical_result: Dict,
-                              gpt_result: Optional[Dict] = None) -> KellyResult:
-        """종합 포지션 사이징 계산"""
+                              gpt_result: Optional[Dict] = None,
+                              save_result: bool = True,
+                              analysis_date: Optional[str] = None) -> KellyResult:
+        """
+        종합 포지션 사이징 계산
+
+        Args:
+            technical_result: 기술적 분석 결과
+            gpt_result: GPT 분석 결과 (선택)
+            save_result: kelly_analysis 테이블 저장 여부 (백테스트는 False)
+            analysis_date: 분석 기준일 (기본값: 오늘, 백테스트는 시뮬레이션 날짜)
+        """
+        analysis_date = analysis_date or datetime.now().strftime('%Y-%m-%d')
 
         ticker = technical_result.get('ticker', 'UNKNOWN')
         quality_score = technical_result.get('quality_score', 10.0)
@@ -710,7 +753,7 @@ class KellyCalculator:
             # 4. 결과 생성
             result = KellyResult(
                 ticker=ticker,
-                analysis_date=datetime.now().strftime('%Y-%m-%d'),
+                analysis_date=analysis_date,
                 detected_pattern=pattern_type,
                 quality_score=quality_score,
                 base_position_pct=base_position,
@@ -726,7 +769,8 @@ class KellyCalculator:
             )
 
             # 5. DB 저장
-            self._save_kelly_result(result)
+            if save_result:
+                self._save_kelly_result(result)
 
             logger.info(f"🎲 {ticker}: Kelly 계산 완료 - {pattern_type.value} → {final_position:.2f}%")
             return result
@@ -737,7 +781,7 @@ class KellyCalculator:
             # 기본값 반환
             return KellyResult(
                 ticker=ticker,
-                analysis_date=datetime.now().strftime('%Y-%m-%d'),
+                analysis_date=analysis_date,
                 detected_pattern=PatternType.UNKNOWN,
                 quality_score=quality_score,
                 base_position_pct=1.0,
@@ -778,32 +822,50 @@ class KellyCalculator:
 
     def _save_kelly_result(self, result: KellyResult):
         """Kelly 계산 결과 저장"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        self._save_kelly_results([result])
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO kelly_analysis (
-                    ticker, analysis_date, detected_pattern, quality_score,
-                    base_position_pct, quality_multiplier, technical_position_pct,
-                    gpt_confidence, gpt_recommendation, gpt_adjustment, final_position_pct,
-                    risk_level, max_portfolio_allocation, reasoning
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+    def _save_kelly_results(self, results: List[KellyResult]) -> int:
+        """
+        Kelly 계산 결과 일괄 저장 (연결 1개 + executemany 1회 + commit 1회, 실패 시 전체 롤백)
+
+        Returns:
+            저장된 결과 수 (실패 시 0)
+        """
+        if not results:
+            return 0
+
+        rows = [
+            (
                 result.ticker, result.analysis_date, result.detected_pattern.value,
                 result.quality_score, result.base_position_pct, result.quality_multiplier,
                 result.technical_position_pct, result.gpt_confidence, result.gpt_recommendation,
                 result.gpt_adjustment, result.final_position_pct, result.risk_level.value,
                 result.max_portfolio_allocation, result.reasoning
-            ))
-
-            conn.commit()
-            conn.close()
+            )
+            for result in results
+        ]
 
-            logger.debug(f"💾 {result.ticker}: Kelly 결과 DB 저장 완료")
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            try:
+                with conn:
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO kelly_analysis (
+                            ticker, analysis_date, detected_pattern, quality_score,
+                            base_position_pct, quality_multiplier, technical_position_pct,
+                            gpt_confidence, gpt_recommendation, gpt_adjustment, final_position_pct,
+                            risk_level, max_portfolio_allocation, reasoning
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+            finally:
+                conn.close()
+
+            logger.debug(f"💾 Kelly 결과 {len(rows)}건 DB 저장 완료")
+            return len(rows)
 
         except Exception as e:
-            logger.error(f"❌ {result.ticker} Kelly 결과 저장 실패: {e}")
+            logger.error(f"❌ Kelly 결과 저장 실패 ({', '.join(r.ticker for r in results)}): {e}")
+            return 0
 
     def get_portfolio_allocation_status(self) -> Dict[str, float]:
         """현재 포트폴리오 할당 상태 조회"""
@@ -845,35 +907,48 @@ class KellyCalculator:
                 'utilization_rate': 0.0
             }
 
-    def calculate_batch_positions(self, candidates: List[Dict]) -> List[Dict]:
-        """다수 후보에 대한 배치 포지션 계산"""
-        logger.info(f"🎲 Kelly 배치 계산 시작: {len(candidates)}개 후보")
+    def get_correlated_pairs(self, tickers: List[str], threshold: float = 0.7) -> List[Tuple[str, str, float]]:
+        """종목 쌍별 일간 수익률 상관 조회 (쌍당 O(1)) - 임계값 이상 쌍을 상관 내림차순으로 반환"""
+        pairs = []
+        for i, ticker_a in enumerate(tickers):
+            for ticker_b in tickers[i + 1:]:
+                correlation = self.correlation_cache.correlation(ticker_a, ticker_b)
+                if correlation >= threshold:  # NaN(관측 부족)은 제외
+                    pairs.append((ticker_a, ticker_b, correlation))
+        return sorted(pairs, key=lambda pair: -pair[2])
+
+    def calculate_batch_positions(self,
+                                  technical_results: List[Dict],
+                                  gpt_results: Optional[Dict[str, Dict]] = None,
+                                  save_result: bool = True,
+                                  analysis_date: Optional[str] = None) -> Dict[str, KellyResult]:
+        """
+        다수 후보 배치 포지션 계산
 
-        enhanced_candidates = []
+        입력은 호출 측에서 그룹 쿼리로 미리 적재한 값만 사용하고 (종목별 DB 조회 없음),
+        계산 결과는 마지막에 단일 트랜잭션으로 저장한다.
 
-        for candidate in candidates:
-            try:
-                # GPT 결과 추출 (있을 경우)
-                gpt_result = None
-                if 'gpt_analysis' in candidate and candidate['gpt_analysis']:
-                    gpt_analysis = candidate['gpt_analysis']
-                    gpt_result = {
-                        'confidence': gpt_analysis.confidence,
-                        'recommendation': gpt_analysis.recommendation.value
-                    }
-
-                # Kelly 계산 실행
-                kelly_result = self.calculate_position_size(candidate, gpt_result)
-
-                # 결과 추가
-                candidate['kelly_analysis'] = kelly_result
-                enhanced_candidates.append(candidate)
-
-            except Exception as e:
-                logger.error(f"❌ {candidate.get('ticker', 'UNKNOWN')} Kelly 계산 실패: {e}")
-                # 실패해도 기본값으로 포함
-                candidate['kelly_analysis'] = None
-                enhanced_candidates.append(candidate)
+        Args:
+            technical_results: 기술적 분석 결과 목록 (각 항목에 'ticker' 포함)
+            gpt_results: {ticker: {'confidence', 'recommendation'}} - 없는 종목은 GPT 조정 생략
+            save_result: kelly_analysis 테이블 저장 여부
+            analysis_date: 분석 기준일 (기본값: 오늘)
+
+        Returns:
+            {ticker: KellyResult} - 입력 순서 유지
+        """
+        logger.info(f"🎲 Kelly 배치 계산 시작: {len(technical_results)}개 후보")
+        gpt_results = gpt_results or {}
+
+        results: Dict[str, KellyResult] = {}
+        for technical_result in technical_results:
+            ticker = technical_result.get('ticker', 'UNKNOWN')
+            results[ticker] = self.calculate_position_size(
+                technical_result, gpt_results.get(ticker), save_result=False, analysis_date=analysis_date
+            )
+
+        if save_result:
+            self._save_kelly_results(list(results.values()))
 
         # 포트폴리오 할당 상태 확인
         allocation_status = self.get_portfolio_allocation_status()
@@ -882,7 +957,7 @@ class KellyCalculator:
         logger.info(f"📊 포트폴리오 할당: {allocation_status['total_allocation']:.2f}% / {self.max_total_allocation}%")
         logger.info(f"🎯 남은 할당: {allocation_status['remaining_allocation']:.2f}%")
 
-        return enhanced_candidates
+        return results
 
 def main():
     """테스트 실행"""
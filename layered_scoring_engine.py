@@ -36,6 +36,8 @@ from datetime import datetime
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
+from trace_recorder import trace_span
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -134,7 +136,12 @@ class ScoringModule(ABC):
         """점수 계산 (비동기 버전) - 기본적으로 동기 버전 호출"""
         loop = asyncio.get_event_loop()
         with ThreadPoolExecutor() as executor:
-            return await loop.run_in_executor(executor, self.calculate_score, data, config)
+            return await loop.run_in_executor(executor, self.calculate_score_traced, data, config)
+
+    def calculate_score_traced(self, data: pd.DataFrame, config: Dict[str, Any]) -> ModuleScore:
+        """calculate_score + 트레이스 span (트레이서 비활성 시 그대로 호출)"""
+        with trace_span(self.name, "module_score", layer=self.layer_type.value):
+            return self.calculate_score(data, config)
 
     def validate_data(self, data: pd.DataFrame) -> Tuple[bool, str]:
         """데이터 유효성 검증"""
@@ -272,47 +279,75 @@ class LayerProcessor:
 
         if not self.modules:
             logger.warning(f"⚠️ {self.layer_type.value} Layer에 모듈이 없습니다")
-            return LayerResult(
-                layer_type=self.layer_type,
-                score=0.0,
-                max_score=self.max_score,
-                confidence=0.0,
-                module_results=[]
-            )
+            return self._empty_result()
 
         # 병렬 모듈 실행
-        module_tasks = []
-        for module in self.modules:
-            if config.get(f"{module.name}_enabled", True):
-                task = module.calculate_score_async(data, config)
-                module_tasks.append(task)
+        enabled_modules = self._enabled_modules(config)
+        module_tasks = [module.calculate_score_async(data, config) for module in enabled_modules]
 
         try:
             module_results = await asyncio.gather(*module_tasks)
         except Exception as e:
             logger.error(f"❌ {self.layer_type.value} Layer 처리 실패: {e}")
-            return LayerResult(
-                layer_type=self.layer_type,
-                score=0.0,
-                max_score=self.max_score,
-                confidence=0.0,
-                module_results=[]
-            )
+            return self._empty_result()
+
+        return self._aggregate(enabled_modules, module_results, start_time)
 
+    def process_sync(self, ticker: str, data: pd.DataFrame,
+                     config: Dict[str, Any]) -> LayerResult:
+        """
+        Layer 점수 계산 (동기 버전)
+
+        백테스트처럼 같은 종목을 수백 번 반복 채점할 때 사용.
+        모듈 호출마다 ThreadPoolExecutor를 만드는 비동기 경로의 오버헤드 없이
+        동일한 가중 평균 로직으로 LayerResult를 생성한다.
+        """
+        start_time = datetime.now()
+
+        if not self.modules:
+            return self._empty_result()
+
+        enabled_modules = self._enabled_modules(config)
+
+        try:
+            module_results = [module.calculate_score_traced(data, config) for module in enabled_modules]
+        except Exception as e:
+            logger.error(f"❌ {self.layer_type.value} Layer 처리 실패: {e}")
+            return self._empty_result()
+
+        return self._aggregate(enabled_modules, module_results, start_time)
+
+    def _enabled_modules(self, config: Dict[str, Any]) -> List[ScoringModule]:
+        """설정에서 활성화된 모듈 목록"""
+        return [module for module in self.modules if config.get(f"{module.name}_enabled", True)]
+
+    def _empty_result(self) -> LayerResult:
+        """빈 Layer 결과 (모듈 없음 / 처리 실패)"""
+        return LayerResult(
+            layer_type=self.layer_type,
+            score=0.0,
+            max_score=self.max_score,
+            confidence=0.0,
+            module_results=[]
+        )
+
+    def _aggregate(self, modules: List[ScoringModule], module_results: List[ModuleScore],
+                   start_time: datetime) -> LayerResult:
+        """모듈 점수 가중 평균 → Layer 결과 변환"""
         # 가중 평균 점수 계산
-        total_weight = sum(module.weight for module in self.modules)
+        total_weight = sum(module.weight for module in modules)
         if total_weight == 0:
             weighted_score = 0.0
             avg_confidence = 0.0
         else:
             weighted_score = sum(
                 result.score * module.weight
-                for result, module in zip(module_results, self.modules)
+                for result, module in zip(module_results, modules)
             ) / total_weight
 
             avg_confidence = sum(
                 result.confidence * module.weight
-                for result, module in zip(module_results, self.modules)
+                for result, module in zip(module_results, modules)
             ) / total_weight
 
         # Layer 점수는 max_score 비율로 변환
@@ -325,7 +360,7 @@ class LayerProcessor:
             score=layer_score,
             max_score=self.max_score,
             confidence=avg_confidence,
-            module_results=module_results,
+            module_results=list(module_results),
             execution_time=execution_time
         )
 
@@ -399,16 +434,7 @@ class LayeredScoringEngine:
 
             # 날짜순 정렬
             df = df.sort_values('date').reset_index(drop=True)
-
-            # MACD 계산 (간단 버전)
-            if len(df) >= 26:
-                exp1 = df['close'].ewm(span=12).mean()
-                exp2 = df['close'].ewm(span=26).mean()
-                df['macd'] = exp1 - exp2
-                df['macd_signal'] = df['macd'].ewm(span=9).mean()
-            else:
-                df['macd'] = 0.0
-                df['macd_signal'] = 0.0
+            df = self.add_macd(df)
 
             logger.debug(f"📊 {ticker}: {len(df)}일 데이터 로드")
             return df
@@ -417,6 +443,19 @@ class LayeredScoringEngine:
             logger.error(f"❌ {ticker} 데이터 로드 실패: {e}")
             return pd.DataFrame()
 
+    @staticmethod
+    def add_macd(df: pd.DataFrame) -> pd.DataFrame:
+        """MACD 계산 (간단 버전) - 날짜 오름차순 DataFrame 기준"""
+        if len(df) >= 26:
+            exp1 = df['close'].ewm(span=12).mean()
+            exp2 = df['close'].ewm(span=26).mean()
+            df['macd'] = exp1 - exp2
+            df['macd_signal'] = df['macd'].ewm(span=9).mean()
+        else:
+            df['macd'] = 0.0
+            df['macd_signal'] = 0.0
+        return df
+
     async def analyze_ticker(self, ticker: str) -> ScoringResult:
         """ticker 점수 분석"""
         start_time = datetime.now()
@@ -424,7 +463,8 @@ class LayeredScoringEngine:
         logger.info(f"🔍 {ticker} 점수 분석 시작")
 
         # 1. 데이터 로드
-        data = self._get_ohlcv_data(ticker)
+        with trace_span("db_load", ticker=ticker):
+            data = self._get_ohlcv_data(ticker)
         if data.empty:
             return ScoringResult.create_invalid(ticker, "데이터 없음")
 
@@ -441,6 +481,38 @@ class LayeredScoringEngine:
             logger.error(f"❌ {ticker} Layer 처리 실패: {e}")
             return ScoringResult.create_invalid(ticker, str(e))
 
+        result = self._build_scoring_result(ticker, layer_results_list, start_time)
+
+        logger.info(f"✅ {ticker} 분석 완료: {result.total_score:.1f}점, {result.recommendation}")
+
+        return result
+
+    def score_data(self, ticker: str, data: pd.DataFrame) -> ScoringResult:
+        """
+        사전 로드된 데이터로 동기 점수 분석 (DB 조회 없음)
+
+        백테스트에서 시점별(point-in-time) 슬라이스를 채점할 때 사용.
+        analyze_ticker와 동일한 Layer 집계 / Quality Gate / 추천 로직을 사용한다.
+        """
+        start_time = datetime.now()
+
+        if data is None or data.empty:
+            return ScoringResult.create_invalid(ticker, "데이터 없음")
+
+        try:
+            layer_results_list = [
+                self.layer_processors[layer_type].process_sync(ticker, data, self.config)
+                for layer_type in (LayerType.MACRO, LayerType.STRUCTURAL, LayerType.MICRO)
+            ]
+        except Exception as e:
+            logger.error(f"❌ {ticker} Layer 처리 실패: {e}")
+            return ScoringResult.create_invalid(ticker, str(e))
+
+        return self._build_scoring_result(ticker, layer_results_list, start_time)
+
+    def _build_scoring_result(self, ticker: str, layer_results_list: List[LayerResult],
+                              start_time: datetime) -> ScoringResult:
+        """Layer 결과 → 최종 ScoringResult (총점, Quality Gate, 추천, 신뢰도)"""
         # 3. 결과 정리
         layer_results = {
             result.layer_type: result
@@ -479,8 +551,6 @@ class LayeredScoringEngine:
             execution_time=execution_time
         )
 
-        logger.info(f"✅ {ticker} 분석 완료: {total_score:.1f}점, {recommendation}")
-
         return result
 
     def _determine_recommendation(self, total_score: float, quality_gates_passed: bool,
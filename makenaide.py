@@ -23,6 +23,7 @@ Portfolio Management: portfolio_manager.py (포트폴리오 관리)
 
 import sys
 import os
+import asyncio
 import logging
 import sqlite3
 import time
@@ -49,6 +50,11 @@ from real_time_market_sentiment import RealTimeMarketSentiment
 # from portfolio_manager import PortfolioManager  # trading_engine으로 통합됨
 from trading_engine import LocalTradingEngine, TradingConfig
 from trade_status import TradeStatus, TradeResult
+from candidate_selector import TopKCandidateSelector
+from trace_recorder import TraceRecorder, activate_tracer, deactivate_tracer, trace_span, traced
+from phase_profiler import PhaseProfiler, activate_profiler, deactivate_profiler
+from api_rate_limiter import get_rate_limiter
+from correlation_cache import get_correlation_cache
 
 # 환경 변수 로드
 load_dotenv()
@@ -112,12 +118,23 @@ class OrchestratorConfig:
     enable_gpt_analysis: bool = True  # GPT 분석 활성화 여부
     max_gpt_budget_daily: float = 5.0  # 일일 GPT 비용 한도 (USD)
     min_quality_score: float = 8.0  # 최소 품질 점수 (실제 데이터 분포 기반 조정)
+    min_candidate_confidence: float = 0.7  # Phase 2 후보 최소 신뢰도 (선정기 heap 진입 전 적용)
     risk_level: RiskLevel = RiskLevel.MODERATE  # 리스크 레벨
     dry_run: bool = False  # 실제 거래 실행 여부
     max_positions: int = 8  # 최대 동시 보유 종목 수
     portfolio_allocation_limit: float = 0.25  # 전체 포트폴리오 대비 최대 할당 비율
     auto_sync_enabled: bool = True  # 포트폴리오 자동 동기화 활성화 여부
     sync_policy: str = 'aggressive'  # 포트폴리오 동기화 정책 (기본: 전체 동기화)
+    sync_sell_corrections: bool = False  # 초과 기록 SELL 보정 자동 저장 여부 (기본: 감지/경고만)
+    max_technical_candidates: int = 15  # Phase 2 상위 후보 유지 개수 (bounded heap 크기)
+    streaming_pipeline: bool = False  # Phase 1 → Phase 2 종목 단위 스트리밍 실행 여부
+    streaming_queue_size: int = 16  # 스트리밍 큐 최대 크기 (초과 시 수집 측 대기 = backpressure)
+    streaming_scoring_workers: int = 1  # 스트리밍 분석 워커 수 (TechnicalFilter가 스레드 안전할 때만 증가)
+    enable_tracing: bool = True  # Phase → 종목 → 단계별 span 기록 및 Chrome trace 저장
+    trace_dir: str = './logs'  # 트레이스 파일 저장 경로
+    profile_mode: Optional[str] = None  # Phase별 프로파일링 모드 ('cprofile' | 'sampling', None이면 비활성)
+    profile_top_n: int = 15  # 보고서에 포함할 Phase별 hot function 개수
+    use_simulator: bool = False  # 합성 업비트 시뮬레이터 사용 (dry run에서도 주문 경로를 가상 계좌로 실행)
 
 class MakenaideLocalOrchestrator:
     """Makenaide 로컬 통합 오케스트레이터"""
@@ -137,6 +154,9 @@ class MakenaideLocalOrchestrator:
         self.trading_engine = None
         self.sns_notifier = None  # SNS 알림 시스템 (Phase 1-3)
 
+        # 🏆 Phase 2 상위 K개 후보 (GPT/Kelly/SNS 단계가 DB 재조회 없이 사용)
+        self.candidate_selector = None
+
         # 📊 시장 감정 분석 결과 저장 (SNS 알림용)
         self.last_sentiment_result = None
 
@@ -145,6 +165,10 @@ class MakenaideLocalOrchestrator:
         self.predictive_analyzer = None
         self.auto_recovery_system = None
 
+        # 🧭 실행 트레이서 / 🔬 Phase 프로파일러 (run 단위로 생성)
+        self.tracer = None
+        self.profiler = None
+
         # 실행 통계
         self.execution_stats = {
             'start_time': None,
@@ -155,9 +179,13 @@ class MakenaideLocalOrchestrator:
             'total_cost': 0.0,
             'technical_candidates': [],  # 기술적 분석 통과 종목
             'gpt_candidates': [],        # GPT 분석 통과 종목
-            'kelly_results': {}          # Kelly 계산 결과
+            'kelly_results': {},         # Kelly 계산 결과
+            'correlated_candidates': [], # Kelly 후보 중 고상관 쌍
+            'phase_timings': {},         # 단계별 소요 시간 (트레이스 요약)
+            'trace_path': None           # Chrome trace 파일 경로
         }
 
+    @traced('Initialization')
     def initialize_components(self) -> bool:
         """모든 컴포넌트 초기화"""
         try:
@@ -237,13 +265,14 @@ class MakenaideLocalOrchestrator:
 
             # Trading Engine 초기화 (포트폴리오 관리 기능 통합)
             trading_config = TradingConfig()
-            self.trading_engine = LocalTradingEngine(trading_config, dry_run=self.config.dry_run)
+            self.trading_engine = LocalTradingEngine(trading_config, dry_run=self._engine_dry_run())
             logger.info("✅ Trading Engine 초기화 완료 (포트폴리오 관리 기능 포함)")
 
             # 포트폴리오 동기화 검증 및 자동 동기화
             sync_success, sync_details = self.trading_engine.validate_and_sync_portfolio(
                 auto_sync=self.config.auto_sync_enabled,
-                sync_policy=self.config.sync_policy
+                sync_policy=self.config.sync_policy,
+                sync_sell_corrections=self.config.sync_sell_corrections
             )
 
             if not sync_success and not self.config.auto_sync_enabled:
@@ -381,6 +410,80 @@ class MakenaideLocalOrchestrator:
                 except Exception as nested_e:
                     logger.error(f"❌ SNS 백업 알림 전송도 실패: {nested_e}")
 
+    def _engine_dry_run(self) -> bool:
+        """
+        Trading Engine에 전달할 dry run 여부
+
+        시뮬레이터 모드에서는 pyupbit가 가상 계좌로 대체되므로 주문/잔고 경로까지 그대로 실행한다.
+        """
+        return self.config.dry_run and not self.config.use_simulator
+
+    def _start_tracing(self):
+        """실행 단위 트레이서 (및 --profile 시 Phase 프로파일러) 시작"""
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        if self.config.enable_tracing and not self.tracer:
+            self.tracer = activate_tracer(TraceRecorder(run_id=run_id))
+            logger.info(f"🧭 실행 트레이싱 활성화 (run_id: {self.tracer.run_id})")
+
+        if self.config.profile_mode and not self.profiler:
+            try:
+                self.profiler = activate_profiler(PhaseProfiler(
+                    output_dir=self.config.trace_dir,
+                    run_id=run_id,
+                    mode=self.config.profile_mode,
+                    top_n=self.config.profile_top_n
+                ))
+                logger.info(f"🔬 Phase 프로파일링 활성화 (모드: {self.config.profile_mode})")
+            except Exception as e:
+                logger.warning(f"⚠️ 프로파일러 시작 실패: {e}")
+
+    def _finish_profiling(self) -> Optional[Dict]:
+        """Phase 프로파일러 종료 및 hot function 요약 반환"""
+        if not self.profiler:
+            return None
+
+        try:
+            profiler = self.profiler
+            deactivate_profiler()
+            self.profiler = None
+            return profiler.finish()
+
+        except Exception as e:
+            logger.error(f"❌ 프로파일 정리 실패: {e}")
+            return None
+
+    def _finish_tracing(self) -> Optional[Dict]:
+        """트레이서 종료, Chrome trace 저장 및 execution_stats에 요약 반영"""
+        if not self.tracer:
+            return None
+
+        try:
+            tracer = self.tracer
+            deactivate_tracer()
+            self.tracer = None
+
+            trace_path = tracer.export_chrome_trace(
+                os.path.join(self.config.trace_dir, f"trace_{tracer.run_id}.json")
+            )
+
+            self.execution_stats['trace_path'] = trace_path
+            self.execution_stats['phase_timings'] = tracer.summary('phase')
+
+            return {
+                'trace_path': trace_path,
+                'span_count': tracer.event_count,
+                'phase_timings': self.execution_stats['phase_timings'],
+                'step_timings': tracer.summary('step'),
+                'module_timings': tracer.summary('module_score'),
+                'slowest_tickers': tracer.slowest('ticker', limit=10)
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 트레이스 정리 실패: {e}")
+            return None
+
+    @traced('Phase 0: Scanner')
     def run_phase_0_scanner(self) -> bool:
         """Phase 0: 업비트 종목 스캔"""
         try:
@@ -398,6 +501,7 @@ class MakenaideLocalOrchestrator:
             self.execution_stats['errors'].append(f"Phase 0 실패: {e}")
             return False
 
+    @traced('Phase 1: Data Collection')
     def run_phase_1_data_collection(self) -> bool:
         """Phase 1: 증분 OHLCV 데이터 수집 (품질 필터링 포함)"""
         try:
@@ -410,6 +514,16 @@ class MakenaideLocalOrchestrator:
                 use_quality_filter=True  # 품질 필터링 활성화
             )
 
+            return self._finalize_phase_1(results)
+
+        except Exception as e:
+            logger.error(f"❌ Phase 1 실패: {e}")
+            self.execution_stats['errors'].append(f"Phase 1 실패: {e}")
+            return False
+
+    def _finalize_phase_1(self, results: Dict) -> bool:
+        """Phase 1 수집 결과 검증, 통계 로깅 및 데이터 보존 정책 적용"""
+        try:
             if not results:
                 logger.error("❌ 데이터 수집 실패: 수집 결과 없음")
                 self.execution_stats['errors'].append("Phase 1 실패: 수집 결과 없음")
@@ -462,6 +576,9 @@ class MakenaideLocalOrchestrator:
                 logger.warning(f"⚠️ 데이터 보존 정책 적용 실패: {e}")
                 # 데이터 보존 정책 실패는 치명적이지 않으므로 계속 진행
 
+            # 📐 수익률 상관 행렬 증분 갱신 (새 확정 일봉만 반영, 리스크 엔진/Kelly/보고서 공유)
+            get_correlation_cache().refresh()
+
             self.execution_stats['phases_completed'].append('Phase 1: Data Collection')
             logger.info("✅ Phase 1 완료: 증분 OHLCV 데이터 수집 (품질 필터링 적용)")
             return True
@@ -471,6 +588,7 @@ class MakenaideLocalOrchestrator:
             self.execution_stats['errors'].append(f"Phase 1 실패: {e}")
             return False
 
+    @traced('Phase 2: Technical Filter')
     async def run_phase_2_technical_filter(self) -> List[str]:
         """Phase 2: 통합 기술적 필터링 시스템 (4-Layer Architecture)"""
         try:
@@ -499,16 +617,7 @@ class MakenaideLocalOrchestrator:
             logger.info(f"📊 분석 대상 종목: {len(active_tickers)}개")
 
             # 기존 보유 포지션 조회 및 제외
-            held_tickers = set()
-            if self.trading_engine:
-                try:
-                    positions = self.trading_engine.get_current_positions()
-                    held_tickers = {pos.ticker for pos in positions}
-
-                    if held_tickers:
-                        logger.info(f"🔒 현재 보유 중인 {len(held_tickers)}개 종목 제외: {', '.join(sorted(held_tickers))}")
-                except Exception as e:
-                    logger.warning(f"⚠️ 보유 포지션 조회 실패: {e}")
+            held_tickers = self._get_held_tickers()
 
             # 기존 포지션 제외한 티커만 분석
             active_tickers = [t for t in active_tickers if t not in held_tickers]
@@ -520,59 +629,211 @@ class MakenaideLocalOrchestrator:
             logger.info(f"📊 신규 분석 대상 종목: {len(active_tickers)}개")
 
             # 통합 필터 실행 (AUTO 모드로 지능형 분석)
-            analysis_results = []
-            technical_candidates_data = []  # SNS 알림용 상세 데이터
+            phase2_stats = self._start_phase_2_selection()
 
             for ticker in active_tickers:
+                result = self._analyze_and_save_ticker(ticker)
+                self._register_phase_2_result(result, phase2_stats)
+
+            return self._finalize_phase_2(phase2_stats, phase_start_time)
+
+        except Exception as e:
+            logger.error(f"❌ Phase 2 실패: {e}")
+            self.execution_stats['errors'].append(f"Phase 2 실패: {e}")
+            return []
+
+    @traced('Phase 1-2: Streaming')
+    async def run_streaming_phase_1_2(self) -> Tuple[bool, List[str]]:
+        """
+        Phase 1 → Phase 2 스트리밍 실행
+
+        종목 하나의 OHLCV 수집/저장이 끝나는 즉시 bounded 큐를 통해 분석 워커로 전달하여
+        네트워크 대기(수집)와 CPU 작업(분석)을 겹쳐 실행합니다.
+        큐가 가득 차면 수집 측이 대기하므로(backpressure) 메모리 사용량이 일정하게 유지되고,
+        전체 소요 시간은 수집 + 분석의 합이 아닌 max(수집, 분석)에 근접합니다.
+
+        Returns:
+            Tuple[bool, List[str]]: (Phase 1 성공 여부, Phase 2 거래 후보 목록)
+        """
+        try:
+            logger.info("🌊 Phase 1 → Phase 2 스트리밍 모드 시작")
+            logger.info(f"   📦 큐 크기: {self.config.streaming_queue_size}, 분석 워커: {self.config.streaming_scoring_workers}개")
+            phase_start_time = time.time()
+
+            # 보유 종목은 수집 시작 전에 한 번만 조회
+            held_tickers = self._get_held_tickers()
+            phase2_stats = self._start_phase_2_selection()
+
+            worker_count = max(1, self.config.streaming_scoring_workers)
+            queue = asyncio.Queue(maxsize=max(1, self.config.streaming_queue_size))
+            collection_stats = {}
+            stream_stats = {'queued': 0, 'max_queue_depth': 0}
+
+            async def produce():
+                """수집 완료된 종목을 큐에 투입 (동기 제너레이터를 워커 스레드에서 한 단계씩 진행)"""
+                collector_iter = self.data_collector.iter_collect_all_data(
+                    test_mode=False,
+                    use_quality_filter=True,
+                    collection_stats=collection_stats
+                )
                 try:
-                    # TechnicalFilter AUTO 모드로 분석
-                    result = self.technical_filter.analyze_ticker(ticker, FilterMode.AUTO)
+                    while True:
+                        result = await asyncio.to_thread(next, collector_iter, None)
+                        if result is None:
+                            break
+
+                        ticker = result.get('ticker')
+                        if result.get('status') not in ('success', 'skipped') or ticker in held_tickers:
+                            continue
+
+                        await queue.put(ticker)  # 큐가 가득 차면 여기서 대기
+                        stream_stats['queued'] += 1
+                        stream_stats['max_queue_depth'] = max(stream_stats['max_queue_depth'], queue.qsize())
+                finally:
+                    for _ in range(worker_count):
+                        await queue.put(None)  # 워커 종료 신호
+
+            async def consume():
+                """큐에서 종목을 꺼내 분석 후 후보 선정기에 등록"""
+                while True:
+                    ticker = await queue.get()
+                    try:
+                        if ticker is None:
+                            return
+                        result = await asyncio.to_thread(self._analyze_and_save_ticker, ticker)
+                        # 선정기 등록은 이벤트 루프 스레드에서만 수행 (잠금 불필요)
+                        self._register_phase_2_result(result, phase2_stats)
+                    finally:
+                        queue.task_done()
 
-                    if result:
-                        analysis_results.append(result)
-
-                        # ✅ 기술적 분석 결과를 DB에 저장 (Kelly Calculator가 조회할 수 있도록)
-                        self._save_technical_analysis_to_db(result)
-
-                        # 매수 권고 종목만 후보로 선정
-                        if result.final_recommendation.value in ['STRONG_BUY', 'BUY', 'BUY_LITE']:
-                            technical_candidates_data.append({
-                                'ticker': ticker,
-                                'recommendation': result.final_recommendation.value,
-                                'confidence': result.final_confidence,
-                                'quality_score': result.final_quality_score,
-                                'filter_mode': result.filter_mode.value,
-                                'processing_time': result.processing_time_ms
-                            })
+            await asyncio.gather(produce(), *[consume() for _ in range(worker_count)])
 
-                except Exception as e:
-                    logger.warning(f"⚠️ {ticker} 분석 실패: {e}")
-                    continue
+            elapsed = time.time() - phase_start_time
+            collection_time = collection_stats.get('processing_time_seconds', 0)
+            logger.info(f"🌊 스트리밍 완료: {elapsed:.1f}초 (수집 {collection_time:.1f}초, "
+                        f"분석 대상 {stream_stats['queued']}개, 최대 큐 깊이 {stream_stats['max_queue_depth']})")
+
+            phase_1_success = self._finalize_phase_1(collection_stats)
+            if not phase_1_success:
+                return False, []
+
+            candidates = self._finalize_phase_2(phase2_stats, phase_start_time)
+            return True, candidates
+
+        except Exception as e:
+            logger.error(f"❌ Phase 1 → Phase 2 스트리밍 실패: {e}")
+            self.execution_stats['errors'].append(f"Phase 1 실패: 스트리밍 실행 오류 {e}")
+            return False, []
+
+    def _get_held_tickers(self) -> set:
+        """현재 보유 중인 종목 (Phase 2 분석 대상에서 제외)"""
+        held_tickers = set()
+        if self.trading_engine:
+            try:
+                positions = self.trading_engine.get_current_positions()
+                held_tickers = {pos.ticker for pos in positions}
+
+                if held_tickers:
+                    logger.info(f"🔒 현재 보유 중인 {len(held_tickers)}개 종목 제외: {', '.join(sorted(held_tickers))}")
+            except Exception as e:
+                logger.warning(f"⚠️ 보유 포지션 조회 실패: {e}")
+
+        return held_tickers
+
+    def _start_phase_2_selection(self) -> Dict:
+        """Phase 2 후보 선정기 및 분석 카운터 초기화"""
+        # 🏆 bounded heap으로 상위 K개 후보만 유지 (메모리 O(K))
+        self.candidate_selector = TopKCandidateSelector(
+            k=self.config.max_technical_candidates,
+            min_quality_score=self.config.min_quality_score,
+            min_confidence=self.config.min_candidate_confidence,
+            allowed_recommendations=['STRONG_BUY', 'BUY', 'BUY_LITE']
+        )
+
+        return {
+            'analyzed_count': 0,
+            'buy_signal_count': 0,
+            'filter_mode_counts': {}
+        }
+
+    def _analyze_and_save_ticker(self, ticker: str):
+        """단일 종목 TechnicalFilter 분석 및 DB 저장 (스트리밍 모드에서는 워커 스레드에서 실행)"""
+        with trace_span(ticker, "ticker", phase="Phase 2"):
+            return self._analyze_and_save_ticker_untraced(ticker)
+
+    def _analyze_and_save_ticker_untraced(self, ticker: str):
+        try:
+            # TechnicalFilter AUTO 모드로 분석
+            with trace_span("technical_filter", ticker=ticker):
+                result = self.technical_filter.analyze_ticker(ticker, FilterMode.AUTO)
+
+            if result:
+                # ✅ 기술적 분석 결과를 DB에 저장 (Kelly Calculator가 조회할 수 있도록)
+                with trace_span("db_write", ticker=ticker):
+                    self._save_technical_analysis_to_db(result)
+
+            return result
+
+        except Exception as e:
+            logger.warning(f"⚠️ {ticker} 분석 실패: {e}")
+            return None
 
-            # 품질 점수 임계값 필터링
+    def _register_phase_2_result(self, result, phase2_stats: Dict):
+        """분석 결과를 후보 선정기에 제출 (임계값 미달/순위 밖은 선정기가 즉시 폐기)"""
+        if not result:
+            return
+
+        try:
+            phase2_stats['analyzed_count'] += 1
+
+            # 매수 권고 종목만 후보로 제출
+            recommendation = result.final_recommendation.value
+            if recommendation in ['STRONG_BUY', 'BUY', 'BUY_LITE']:
+                phase2_stats['buy_signal_count'] += 1
+                filter_mode = result.filter_mode.value
+                filter_mode_counts = phase2_stats['filter_mode_counts']
+                filter_mode_counts[filter_mode] = filter_mode_counts.get(filter_mode, 0) + 1
+
+                self.candidate_selector.offer(
+                    result.ticker,
+                    quality_score=result.final_quality_score,
+                    confidence=result.final_confidence,
+                    recommendation=recommendation,
+                    payload=self._build_candidate_payload(result)
+                )
+
+        except Exception as e:
+            logger.warning(f"⚠️ {getattr(result, 'ticker', 'Unknown')} 후보 등록 실패: {e}")
+
+    def _finalize_phase_2(self, phase2_stats: Dict, phase_start_time: float) -> List[str]:
+        """상위 K개 후보 최종 선정, 통계 저장 및 성능 모니터링"""
+        try:
+            # 고품질 후보 선정 (신뢰도/품질 임계값은 선정기 진입 시 적용) - 상위 K개 안에서 순위순
+            ranked_candidates = self.candidate_selector.get_ranked_candidates()
             filtered_candidates = []
 
-            for candidate in technical_candidates_data:
-                ticker = candidate['ticker']
-                recommendation = candidate['recommendation']
-                confidence = candidate['confidence']
-                quality_score = candidate['quality_score']
-                filter_mode = candidate['filter_mode']
-
-                # 고품질 후보 선정 (높은 신뢰도와 품질 점수)
-                if confidence >= 0.7 and quality_score >= self.config.min_quality_score:
-                    filtered_candidates.append(ticker)
-                    logger.info(f"✅ {ticker}: {recommendation} (신뢰도: {confidence:.3f}, 품질: {quality_score:.1f}, 모드: {filter_mode})")
-                else:
-                    if confidence < 0.7:
-                        logger.info(f"⏭️ {ticker}: 낮은 신뢰도 {confidence:.3f} (임계값 0.7)")
-                    elif quality_score < self.config.min_quality_score:
-                        logger.info(f"⏭️ {ticker}: 낮은 품질 점수 {quality_score:.1f} (임계값 {self.config.min_quality_score})")
-                    else:
-                        logger.info(f"⏭️ {ticker}: {recommendation} (신뢰도: {confidence:.3f})")
+            for candidate in ranked_candidates:
+                filtered_candidates.append(candidate.ticker)
+                logger.info(f"✅ {candidate.ticker}: {candidate.recommendation} (신뢰도: {candidate.confidence:.3f}, "
+                            f"품질: {candidate.quality_score:.1f}, 모드: {candidate.payload.get('filter_mode')})")
+
+            selector_stats = self.candidate_selector.stats
+            if selector_stats['rejected_threshold'] or selector_stats['rejected_rank'] or selector_stats['evicted']:
+                logger.info(f"⏭️ 후보 제외: 품질/신뢰도 임계값 미달 {selector_stats['rejected_threshold']}개, "
+                            f"상위 {self.candidate_selector.k}개 순위 밖 {selector_stats['rejected_rank'] + selector_stats['evicted']}개")
 
             # 기술적 분석 결과를 통계에 저장
-            self.execution_stats['technical_candidates'] = technical_candidates_data
+            self.execution_stats['technical_candidates'] = [
+                {
+                    'ticker': candidate.ticker,
+                    'recommendation': candidate.recommendation,
+                    'confidence': candidate.confidence,
+                    'quality_score': candidate.quality_score,
+                    'filter_mode': candidate.payload.get('filter_mode'),
+                    'processing_time': candidate.payload.get('processing_time')
+                }
+                for candidate in ranked_candidates
+            ]
             self.execution_stats['phases_completed'].append('Phase 2: Unified Technical Filter')
             self.execution_stats['trading_candidates'] = len(filtered_candidates)
 
@@ -605,7 +866,7 @@ class MakenaideLocalOrchestrator:
                     # 성능 메트릭 기록
                     self.technical_filter.record_performance_metrics(
                         session_id=session_id,
-                        total_tickers=len(technical_candidates_data),
+                        total_tickers=phase2_stats['buy_signal_count'],
                         processing_time_ms=processing_time_ms
                     )
 
@@ -617,15 +878,15 @@ class MakenaideLocalOrchestrator:
                         logger.warning(f"   📉 {regression_result.get('message', '알 수 없는 성능 저하')}")
 
                         # 운영팀 알림이 필요한 경우 여기에 SNS/이메일 등 추가 가능
-                        self.execution_stats['warnings'].append(f"성능 회귀 감지: {regression_result.get('message')}")
+                        self.execution_stats.setdefault('warnings', []).append(f"성능 회귀 감지: {regression_result.get('message')}")
                     else:
                         logger.info(f"🎯 성능 모니터링: {regression_result.get('message', '정상')}")
 
                 except Exception as e:
                     logger.error(f"❌ 성능 모니터링 실패: {e}")
 
-            logger.info(f"✅ Phase 2 완료: {len(filtered_candidates)}개 거래 후보 발견 (총 {len(technical_candidates_data)}개 종목 분석)")
-            logger.info(f"🎯 필터링 모드 사용 분포: {[candidate['filter_mode'] for candidate in technical_candidates_data]}")
+            logger.info(f"✅ Phase 2 완료: {len(filtered_candidates)}개 거래 후보 발견 (총 {phase2_stats['analyzed_count']}개 종목 분석, 매수 신호 {phase2_stats['buy_signal_count']}개)")
+            logger.info(f"🎯 필터링 모드 사용 분포: {phase2_stats['filter_mode_counts']}")
 
             return filtered_candidates
 
@@ -634,6 +895,7 @@ class MakenaideLocalOrchestrator:
             self.execution_stats['errors'].append(f"Phase 2 실패: {e}")
             return []
 
+    @traced('Phase 3: GPT Analysis')
     def run_phase_3_gpt_analysis(self, candidates: List[str]) -> List[str]:
         """Phase 3: GPT 패턴 분석 (선택적 & 조건부)"""
 
@@ -702,7 +964,8 @@ class MakenaideLocalOrchestrator:
                         logger.warning(f"💰 일일 GPT 비용 한도 도달: ${total_cost:.2f}")
                         break
 
-                    # GPT 분석 실행
+                    # GPT 분석 실행 (openai 그룹 레이트 리밋)
+                    get_rate_limiter().acquire('openai')
                     result = self.gpt_analyzer.analyze_ticker(ticker)
 
                     if result:
@@ -743,8 +1006,6 @@ class MakenaideLocalOrchestrator:
                     else:
                         total_cost += 0.0  # 실패한 경우 비용 없음
 
-                    time.sleep(1)  # API 레이트 리미트 고려
-
                 except Exception as e:
                     logger.warning(f"⚠️ {ticker} GPT 분석 실패: {e}")
                     # 오류 케이스도 기록
@@ -772,6 +1033,7 @@ class MakenaideLocalOrchestrator:
             self.execution_stats['errors'].append(f"Phase 3 실패: {e}")
             return candidates  # GPT 실패 시 기술적 분석 결과 사용
 
+    @traced('Kelly Calculation')
     def run_kelly_calculation(self, candidates: List[str]) -> Dict[str, float]:
         """Kelly 공식 기반 포지션 사이징 계산"""
         if not candidates:
@@ -781,6 +1043,9 @@ class MakenaideLocalOrchestrator:
         try:
             logger.info(f"🧮 Kelly 포지션 사이징 계산 ({len(candidates)}개 후보)")
 
+            # 마지막 실행 이후 청산된 거래로 패턴별 승률/손익비 갱신 (새 SELL 체결이 없으면 쿼리 1회)
+            self.kelly_calculator.refresh_pattern_probabilities()
+
             # 🔍 디버깅: DB에 저장된 최근 기술적 분석 데이터 확인
             try:
                 with get_db_connection_context() as conn:
@@ -801,35 +1066,39 @@ class MakenaideLocalOrchestrator:
             except Exception as debug_error:
                 logger.debug(f"디버깅 쿼리 실패 (무시): {debug_error}")
 
-            position_sizes = {}
+            # 입력 일괄 적재 (기술적 분석: 선정기 + 그룹 쿼리 1회, GPT: 그룹 쿼리 1회)
+            technical_results = self._load_technical_analysis_for_kelly(candidates)
+            gpt_results = self._load_gpt_analysis_for_kelly(list(technical_results))
 
             for ticker in candidates:
-                try:
-                    # 데이터베이스에서 기술적 분석 결과 조회
-                    technical_result = self._get_technical_analysis_for_kelly(ticker)
-
-                    if not technical_result:
-                        logger.warning(f"⚠️ {ticker}: 기술적 분석 데이터 없음")
-                        continue
+                if ticker not in technical_results:
+                    logger.warning(f"⚠️ {ticker}: 기술적 분석 데이터 없음")
 
-                    # GPT 분석 결과 조회 (있을 경우)
-                    gpt_result = self._get_gpt_analysis_for_kelly(ticker)
+            # 메모리에서 전 종목 계산 후 단일 트랜잭션 저장
+            kelly_results = self.kelly_calculator.calculate_batch_positions(
+                [technical_results[ticker] for ticker in candidates if ticker in technical_results],
+                gpt_results
+            )
 
-                    # Kelly 계산 실행
-                    kelly_result = self.kelly_calculator.calculate_position_size(technical_result, gpt_result)
+            position_sizes = {}
+            for ticker, kelly_result in kelly_results.items():
+                if kelly_result and kelly_result.final_position_pct > 0:
+                    position_sizes[ticker] = kelly_result.final_position_pct
+                    logger.info(f"📊 {ticker}: Kelly 포지션 {kelly_result.final_position_pct:.1f}%")
+                else:
+                    logger.info(f"⏭️ {ticker}: Kelly 포지션 사이징 조건 미충족")
 
-                    if kelly_result and kelly_result.final_position_pct > 0:
-                        position_sizes[ticker] = kelly_result.final_position_pct
-                        logger.info(f"📊 {ticker}: Kelly 포지션 {kelly_result.final_position_pct:.1f}%")
-                    else:
-                        logger.info(f"⏭️ {ticker}: Kelly 포지션 사이징 조건 미충족")
-
-                except Exception as e:
-                    logger.warning(f"⚠️ {ticker} Kelly 계산 실패: {e}")
-                    continue
+            # 후보 간 고상관 쌍 (상관 행렬 캐시 조회, 쌍당 O(1))
+            correlated = self.kelly_calculator.get_correlated_pairs(list(position_sizes))
+            for ticker_a, ticker_b, correlation in correlated:
+                logger.info(f"🔗 고상관 후보: {ticker_a} ↔ {ticker_b} (ρ={correlation:.2f})")
 
             # Kelly 결과를 통계에 저장
             self.execution_stats['kelly_results'] = position_sizes
+            self.execution_stats['correlated_candidates'] = [
+                {'pair': [ticker_a, ticker_b], 'correlation': round(correlation, 3)}
+                for ticker_a, ticker_b, correlation in correlated
+            ]
 
             logger.info(f"✅ Kelly 계산 완료: {len(position_sizes)}개 종목")
             return position_sizes
@@ -839,6 +1108,7 @@ class MakenaideLocalOrchestrator:
             self.execution_stats['errors'].append(f"Kelly 계산 실패: {e}")
             return {}
 
+    @traced('Market Sentiment')
     def run_market_sentiment_analysis(self) -> Tuple[MarketSentiment, bool, float]:
         """실시간 시장 감정 분석 및 거래 가능 여부 판정"""
         try:
@@ -880,6 +1150,7 @@ class MakenaideLocalOrchestrator:
             self.last_sentiment_result = None
             return MarketSentiment.NEUTRAL, True, 1.0  # 기본값으로 거래 허용
 
+    @traced('Trade Execution')
     def execute_trades(self, position_sizes: Dict[str, float], position_adjustment: float) -> int:
         """실제 거래 실행"""
         if not position_sizes or position_adjustment <= 0:
@@ -889,20 +1160,24 @@ class MakenaideLocalOrchestrator:
         try:
             logger.info(f"💸 거래 실행 시작 ({len(position_sizes)}개 종목)")
 
-            if self.config.dry_run:
+            if self._engine_dry_run():
                 logger.info("🧪 DRY RUN 모드: 실제 거래 실행하지 않음")
                 return len(position_sizes)
 
             trades_executed = 0
-            total_balance = self.trading_engine.get_total_balance_krw()  # 🔧 메서드 이름 수정: get_total_balance → get_total_balance_krw
 
+            # 세션 포트폴리오 스냅샷 1회 생성 (잔고 1회 + 현재가 일괄 1회, 체결은 로컬 반영)
+            total_balance = self.trading_engine.begin_portfolio_session().total_balance_krw
+
+            # 1단계: 동일한 잔고 스냅샷 기준으로 전 종목 주문 금액 산정
+            buy_orders = {}
             for ticker, base_position in position_sizes.items():
                 try:
                     # 시장 감정 기반 포지션 조정
                     adjusted_position = base_position * position_adjustment
 
-                    # 최대/최소 포지션 제한
-                    adjusted_position = max(1.0, min(adjusted_position, 8.0))
+                    # 최소 포지션 (상한은 2단계 사전 리스크 검사에서 배치 단위로 적용)
+                    adjusted_position = max(1.0, adjusted_position)
 
                     # 실제 투자 금액 계산
                     investment_amount = total_balance * (adjusted_position / 100)
@@ -913,25 +1188,32 @@ class MakenaideLocalOrchestrator:
                         investment_amount = 10000  # 최소 거래단위로 자동 조정
                         logger.info(f"🔄 {ticker}: 포지션 사이징 자동 조정 ({original_amount:,.0f}원 → {investment_amount:,.0f}원)")
 
-
-                    logger.info(f"💰 {ticker}: {adjusted_position:.1f}% ({investment_amount:,.0f}원) 매수 시도")
-
-                    # 매수 실행
-                    result = self.trading_engine.execute_buy_order(ticker, investment_amount, is_pyramid=False)
-
-                    if result and result.status in [TradeStatus.FULL_FILLED, TradeStatus.PARTIAL_FILLED]:
-                        trades_executed += 1
-                        logger.info(f"✅ {ticker}: 매수 성공 ({result.status.korean_name})")
-                    else:
-                        status_msg = result.status.korean_name if result else "알 수 없는 오류"
-                        logger.warning(f"❌ {ticker}: 매수 실패 ({status_msg})")
-
-                    time.sleep(0.5)  # API 레이트 리미트 고려
+                    logger.info(f"💰 {ticker}: {adjusted_position:.1f}% ({investment_amount:,.0f}원) 매수 요청")
+                    buy_orders[ticker] = investment_amount
 
                 except Exception as e:
                     logger.error(f"❌ {ticker} 거래 실행 실패: {e}")
                     continue
 
+            # 2단계: 사전 리스크 검사 (보유 포함 종목/상관 클러스터/총 노출 + 낙폭 예산, 전체 배치 일괄 축소)
+            if buy_orders:
+                risk_report = self.trading_engine.check_pre_trade_risk(buy_orders)
+                for ticker in buy_orders.keys() - risk_report.approved_orders.keys():
+                    decision = risk_report.decisions[ticker]
+                    logger.warning(f"🛡️ {ticker}: 리스크 한도로 매수 제외 ({', '.join(decision.constraints) or 'equity'})")
+                buy_orders = risk_report.approved_orders
+
+            # 3단계: 일괄 접수 (레이트 리미터 order 그룹) + 체결 동시 확인
+            results = self.trading_engine.execute_buy_orders(buy_orders, is_pyramid=False) if buy_orders else {}
+
+            for ticker, result in results.items():
+                if result and result.status in [TradeStatus.FULL_FILLED, TradeStatus.PARTIAL_FILLED]:
+                    trades_executed += 1
+                    logger.info(f"✅ {ticker}: 매수 성공 ({result.status.korean_name})")
+                else:
+                    status_msg = result.status.korean_name if result else "알 수 없는 오류"
+                    logger.warning(f"❌ {ticker}: 매수 실패 ({status_msg})")
+
             self.execution_stats['trades_executed'] = trades_executed
             logger.info(f"✅ 거래 실행 완료: {trades_executed}개 성공")
             return trades_executed
@@ -941,6 +1223,11 @@ class MakenaideLocalOrchestrator:
             self.execution_stats['errors'].append(f"거래 실행 실패: {e}")
             return 0
 
+        finally:
+            if self.trading_engine:
+                self.trading_engine.end_portfolio_session()
+
+    @traced('Portfolio Management')
     def run_portfolio_management(self):
         """포트폴리오 관리 및 매도 조건 검사 (고급 기술적 분석 기반)"""
         try:
@@ -950,7 +1237,7 @@ class MakenaideLocalOrchestrator:
             if not self.trading_engine:
                 logger.warning("⚠️ Trading Engine이 초기화되지 않음. 재초기화 시도")
                 trading_config = TradingConfig(take_profit_percent=0)  # 기술적 신호에만 의존
-                self.trading_engine = LocalTradingEngine(trading_config, dry_run=self.config.dry_run)
+                self.trading_engine = LocalTradingEngine(trading_config, dry_run=self._engine_dry_run())
                 logger.info("✅ Trading Engine 재초기화 완료")
 
             # 🔍 직접 매수 종목 감지 및 자동 초기화 (포트폴리오 관리 전 실행)
@@ -1028,6 +1315,9 @@ class MakenaideLocalOrchestrator:
         try:
             logger.info("📋 실행 결과 보고서 생성")
 
+            trace_summary = self._finish_tracing()
+            profile_summary = self._finish_profiling()
+
             end_time = datetime.now()
             duration = end_time - self.execution_stats['start_time']
 
@@ -1048,7 +1338,14 @@ class MakenaideLocalOrchestrator:
                     'gpt_enabled': self.config.enable_gpt_analysis,
                     'dry_run': self.config.dry_run,
                     'risk_level': self.config.risk_level.value
-                }
+                },
+                'correlation': {
+                    'cache': get_correlation_cache().summary(),
+                    'correlated_candidates': self.execution_stats['correlated_candidates']
+                },
+                'trace': trace_summary,
+                'profile': profile_summary,
+                'api_rate_limits': get_rate_limiter().get_stats()
             }
 
             # JSON 형태로 저장
@@ -1068,6 +1365,18 @@ class MakenaideLocalOrchestrator:
             logger.info(f"💸 실행된 거래: {self.execution_stats['trades_executed']}개")
             logger.info(f"💰 총 비용: ${self.execution_stats['total_cost']:.2f}")
             logger.info(f"❌ 오류 수: {len(self.execution_stats['errors'])}개")
+            for phase_name, timing in self.execution_stats['phase_timings'].items():
+                logger.info(f"   ⏱️ {phase_name}: {timing['total_ms'] / 1000:.1f}초")
+            if self.execution_stats['trace_path']:
+                logger.info(f"🧭 트레이스: {self.execution_stats['trace_path']}")
+            for group, group_stats in report['api_rate_limits'].items():
+                logger.info(f"   🚦 {group}: {group_stats['calls']}회 호출, 대기 {group_stats['wait_seconds']:.1f}초, "
+                            f"제한 {group_stats['throttled']}회")
+            if profile_summary:
+                logger.info(f"🔬 Hot functions ({profile_summary['mode']}):")
+                for phase_name, phase_profile in profile_summary['phases'].items():
+                    for func in phase_profile.get('top_functions', [])[:3]:
+                        logger.info(f"   {phase_name}: {func['function']} - {func['self_ms']:.1f}ms")
             logger.info(f"📄 보고서: {report_path}")
             logger.info("="*60)
 
@@ -1152,6 +1461,7 @@ class MakenaideLocalOrchestrator:
         """분석 파이프라인만 실행 (거래 없이)"""
         try:
             logger.info("🔍 분석 파이프라인 실행 시작")
+            self._start_tracing()
 
             # 1. 시스템 초기화
             if not self.initialize_components():
@@ -1161,12 +1471,19 @@ class MakenaideLocalOrchestrator:
             if not self.run_phase_0_scanner():
                 return {"status": "failed", "reason": "종목 스캔 실패"}
 
-            # 3. Phase 1: 데이터 수집
-            if not self.run_phase_1_data_collection():
+            # 3. Phase 1: 데이터 수집 (스트리밍 모드에서는 Phase 2 분석과 동시 진행)
+            candidates = None
+            if self.config.streaming_pipeline:
+                phase_1_success, candidates = await self.run_streaming_phase_1_2()
+            else:
+                phase_1_success = self.run_phase_1_data_collection()
+
+            if not phase_1_success:
                 return {"status": "failed", "reason": "데이터 수집 실패"}
 
-            # 4. Phase 2: 기술적 필터링
-            candidates = await self.run_phase_2_technical_filter()
+            # 4. Phase 2: 기술적 필터링 (스트리밍 모드에서는 이미 완료)
+            if candidates is None:
+                candidates = await self.run_phase_2_technical_filter()
 
             # 5. Phase 3: GPT 분석 (선택적)
             final_candidates = self.run_phase_3_gpt_analysis(candidates)
@@ -1194,6 +1511,10 @@ class MakenaideLocalOrchestrator:
             logger.error(f"❌ 분석 파이프라인 실패: {e}")
             return {"status": "failed", "reason": str(e)}
 
+        finally:
+            self._finish_tracing()
+            self._finish_profiling()
+
     def get_execution_status(self) -> Dict:
         """현재 실행 상태 조회"""
         try:
@@ -1378,7 +1699,10 @@ class MakenaideLocalOrchestrator:
                 return False
 
     def _get_latest_technical_analysis(self) -> List[Dict]:
-        """실제 DB에서 최신 기술적 분석 결과 조회 (TechnicalFilter 시스템 연동)"""
+        """최신 기술적 분석 결과 조회 (Phase 2 선정기 우선, 없으면 DB 조회)"""
+        if self.candidate_selector is not None:
+            return self._get_selected_technical_candidates()
+
         import sqlite3
         try:
             # 직접 SQLite 연결 사용 (연결 풀 문제 회피)
@@ -1409,7 +1733,8 @@ class MakenaideLocalOrchestrator:
 
                 # 🔥 실시간 가격 조회 (시장 기회 즉시 파악)
                 try:
-                    current_price = pyupbit.get_current_price(ticker)
+                    current_price = get_rate_limiter().call('ticker', pyupbit.get_current_price, ticker,
+                                                            limit_info_kw='limit_info')
                     if current_price is None:
                         current_price = 0
                 except:
@@ -1438,6 +1763,46 @@ class MakenaideLocalOrchestrator:
             logger.error(f"❌ TechnicalFilter 기반 기술적 분석 결과 조회 실패: {e}")
             return []
 
+    def _get_selected_technical_candidates(self) -> List[Dict]:
+        """Phase 2 상위 K개 후보를 SNS 알림 형식으로 변환 (DB 재조회 없음)"""
+        ranked_candidates = self.candidate_selector.get_ranked_candidates()
+        if not ranked_candidates:
+            return []
+
+        # 🔥 실시간 가격 일괄 조회 (종목별 호출 대신 1회)
+        prices = {}
+        try:
+            tickers = [candidate.ticker for candidate in ranked_candidates]
+            price_result = get_rate_limiter().call('ticker', pyupbit.get_current_price, tickers,
+                                                   limit_info_kw='limit_info')
+            if isinstance(price_result, dict):
+                prices = price_result
+            elif len(tickers) == 1 and price_result is not None:
+                prices = {tickers[0]: price_result}
+        except Exception as e:
+            logger.warning(f"⚠️ 후보 종목 현재가 일괄 조회 실패: {e}")
+
+        analysis_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        candidates = []
+        for candidate in ranked_candidates:
+            payload = candidate.payload
+            candidates.append({
+                'ticker': candidate.ticker,
+                'quality_score': candidate.quality_score,
+                'gates_passed': self._safe_convert_to_int(payload.get('total_gates_passed'), 0),
+                'recommendation': candidate.recommendation,
+                'pattern_type': f"Stage {payload['current_stage']}" if payload.get('current_stage') else 'Stage 2',
+                'price': prices.get(candidate.ticker) or 0,
+                'confidence': candidate.confidence,
+                'filter_mode': payload.get('filter_mode') or 'integrated',
+                'breakout_strength': self._safe_convert_to_float(payload.get('breakout_strength'), 0.0),
+                'technical_bonus': max(0.0, candidate.quality_score - 10.0),
+                'analysis_time': analysis_time
+            })
+
+        logger.info(f"✅ Phase 2 선정기 기반 기술적 분석 후보 {len(candidates)}개 조회 완료 (DB 조회 생략)")
+        return candidates
+
     def _get_latest_gpt_analysis(self) -> List[Dict]:
         """실제 DB에서 최신 GPT 분석 결과 조회 (AI 승인 종목)"""
         try:
@@ -1646,6 +2011,7 @@ class MakenaideLocalOrchestrator:
         """전체 파이프라인 실행"""
         try:
             self.execution_stats['start_time'] = datetime.now()
+            self._start_tracing()
             logger.info("🚀 Makenaide 로컬 통합 파이프라인 시작")
             logger.info("="*60)
 
@@ -1728,8 +2094,14 @@ class MakenaideLocalOrchestrator:
 
                 return False
 
-            # 3. Phase 1: 데이터 수집
-            if not self.run_phase_1_data_collection():
+            # 3. Phase 1: 데이터 수집 (스트리밍 모드에서는 Phase 2 분석과 동시 진행)
+            candidates = None
+            if self.config.streaming_pipeline:
+                phase_1_success, candidates = await self.run_streaming_phase_1_2()
+            else:
+                phase_1_success = self.run_phase_1_data_collection()
+
+            if not phase_1_success:
                 error_msg = "Phase 1 실패 - 파이프라인 중단"
                 logger.error(f"❌ {error_msg}")
 
@@ -1771,8 +2143,9 @@ class MakenaideLocalOrchestrator:
 
                 return False
 
-            # 4. Phase 2: 기술적 필터링
-            candidates = await self.run_phase_2_technical_filter()
+            # 4. Phase 2: 기술적 필터링 (스트리밍 모드에서는 이미 완료)
+            if candidates is None:
+                candidates = await self.run_phase_2_technical_filter()
 
             # 5. Phase 3: GPT 분석 (선택적)
             final_candidates = self.run_phase_3_gpt_analysis(candidates)
@@ -1860,82 +2233,129 @@ class MakenaideLocalOrchestrator:
             self.generate_phase4_daily_report()
             return False
 
-    def _get_technical_analysis_for_kelly(self, ticker: str) -> Optional[Dict]:
-        """특정 종목의 기술적 분석 결과를 Kelly Calculator용으로 조회"""
+        finally:
+            # 조기 종료 경로에서도 trace/프로파일 저장 및 전역 트레이서/프로파일러 해제 (보고서에서 이미 종료했다면 no-op)
+            self._finish_tracing()
+            self._finish_profiling()
+
+    def _load_technical_analysis_for_kelly(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        후보 종목 기술적 분석 결과를 Kelly Calculator용으로 일괄 조회
+
+        Phase 2 선정기에 있는 후보는 DB 왕복 없이 사용하고, 나머지는 종목별 최신 행을 그룹 쿼리 1회로 조회한다.
+
+        Returns:
+            {ticker: Kelly 입력 dict} - 데이터 없는 종목 제외
+        """
+        results = {}
+        missing = []
+
+        # 🏆 Phase 2 선정기에 있는 후보는 DB 왕복 없이 바로 사용
+        for ticker in tickers:
+            candidate = self.candidate_selector.get(ticker) if self.candidate_selector is not None else None
+            if candidate is None:
+                missing.append(ticker)
+                continue
+
+            payload = candidate.payload
+            results[ticker] = self._map_technical_row_for_kelly((
+                ticker, payload.get('quality_score'), payload.get('total_gates_passed'),
+                payload.get('recommendation'), payload.get('stage_confidence'),
+                payload.get('breakout_strength'), payload.get('current_stage'),
+                payload.get('volume_surge')
+            ))
+
+        if not missing:
+            return results
+
         try:
             with get_db_connection_context() as conn:
                 cursor = conn.cursor()
+                placeholders = ','.join('?' * len(missing))
+
+                # 종목별 최신 1행 (ROW_NUMBER 그룹 쿼리)
+                cursor.execute(f"""
+                    SELECT ticker, quality_score, total_gates_passed, recommendation,
+                           stage_confidence, breakout_strength, current_stage, volume_surge
+                    FROM (
+                        SELECT *, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY created_at DESC) AS rn
+                        FROM technical_analysis
+                        WHERE ticker IN ({placeholders})
+                    )
+                    WHERE rn = 1
+                """, missing)
 
-                # 🔧 실제 테이블 구조에 맞게 조회 쿼리 수정
-                query = """
-                SELECT ticker, quality_score, total_gates_passed, recommendation,
-                       stage_confidence, breakout_strength, current_stage, volume_surge
-                FROM technical_analysis
-                WHERE ticker = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-                """
+                for row in cursor.fetchall():
+                    results[row[0]] = self._map_technical_row_for_kelly(row)
 
-                cursor.execute(query, (ticker,))
-                row = cursor.fetchone()
-
-                if not row:
-                    return None
-
-                # 🔧 Kelly Calculator가 기대하는 형태로 변환 - 실제 컬럼에서 매핑
-                technical_result = {
-                    'ticker': row[0],
-                    'quality_score': self._safe_convert_to_float(row[1], 10.0),
-                    'stage_2_entry': (self._safe_convert_to_int(row[6], 1) == 2),  # current_stage == 2이면 Stage 2 진입
-                    'volume_breakout': (self._safe_convert_to_float(row[7], 0.0) > 1.5),  # volume_surge > 1.5면 volume breakout
-                    'ma_trend_strength': self._safe_convert_to_float(row[4], 0.0),  # stage_confidence를 ma_trend_strength로 매핑
-                    'volatility_contraction': True,  # 기본값 True (VCP 패턴 가정)
-                    'volume_dry_up': (self._safe_convert_to_float(row[7], 0.0) < 0.8),  # volume_surge < 0.8이면 volume dry up
-                    'recommendation': row[3] if row[3] else 'HOLD',
-                    'confidence': self._safe_convert_to_float(row[4], 0.0),  # stage_confidence
-                    'breakout_strength': self._safe_convert_to_float(row[5], 0.0),
-                    'technical_bonus': max(0.0, self._safe_convert_to_float(row[1], 10.0) - 10.0),  # quality_score - 10을 bonus로 사용
-                }
+        except Exception as e:
+            logger.error(f"❌ 기술적 분석 일괄 조회 실패 ({len(missing)}개 종목): {e}")
 
-                return technical_result
+        return results
 
-        except Exception as e:
-            logger.error(f"❌ {ticker} 기술적 분석 조회 실패: {e}")
-            return None
+    def _map_technical_row_for_kelly(self, row) -> Dict:
+        """
+        technical_analysis 행을 Kelly Calculator 입력 형태로 변환
+
+        Args:
+            row: (ticker, quality_score, total_gates_passed, recommendation,
+                  stage_confidence, breakout_strength, current_stage, volume_surge)
+        """
+        # 🔧 Kelly Calculator가 기대하는 형태로 변환 - 실제 컬럼에서 매핑
+        return {
+            'ticker': row[0],
+            'quality_score': self._safe_convert_to_float(row[1], 10.0),
+            'stage_2_entry': (self._safe_convert_to_int(row[6], 1) == 2),  # current_stage == 2이면 Stage 2 진입
+            'volume_breakout': (self._safe_convert_to_float(row[7], 0.0) > 1.5),  # volume_surge > 1.5면 volume breakout
+            'ma_trend_strength': self._safe_convert_to_float(row[4], 0.0),  # stage_confidence를 ma_trend_strength로 매핑
+            'volatility_contraction': True,  # 기본값 True (VCP 패턴 가정)
+            'volume_dry_up': (self._safe_convert_to_float(row[7], 0.0) < 0.8),  # volume_surge < 0.8이면 volume dry up
+            'recommendation': row[3] if row[3] else 'HOLD',
+            'confidence': self._safe_convert_to_float(row[4], 0.0),  # stage_confidence
+            'breakout_strength': self._safe_convert_to_float(row[5], 0.0),
+            'technical_bonus': max(0.0, self._safe_convert_to_float(row[1], 10.0) - 10.0),  # quality_score - 10을 bonus로 사용
+        }
+
+    def _load_gpt_analysis_for_kelly(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        후보 종목의 오늘자 GPT 분석 결과를 Kelly Calculator용으로 일괄 조회 (그룹 쿼리 1회)
+
+        Returns:
+            {ticker: {'recommendation', 'confidence'}} - 분석 없는 종목 제외
+        """
+        if not tickers:
+            return {}
 
-    def _get_gpt_analysis_for_kelly(self, ticker: str) -> Optional[Dict]:
-        """특정 종목의 GPT 분석 결과를 Kelly Calculator용으로 조회"""
         try:
             with get_db_connection_context() as conn:
                 cursor = conn.cursor()
+                placeholders = ','.join('?' * len(tickers))
 
-                # 가장 최신 GPT 분석 결과 조회
+                # 종목별 오늘자 최신 GPT 분석 1행
                 today = datetime.now().strftime('%Y-%m-%d')
-                query = """
-                SELECT gpt_recommendation, gpt_confidence
-                FROM gpt_analysis
-                WHERE ticker = ? AND analysis_date = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-                """
-
-                cursor.execute(query, (ticker, today))
-                row = cursor.fetchone()
-
-                if not row:
-                    return None
+                cursor.execute(f"""
+                    SELECT ticker, gpt_recommendation, gpt_confidence
+                    FROM (
+                        SELECT ticker, gpt_recommendation, gpt_confidence,
+                               ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY created_at DESC) AS rn
+                        FROM gpt_analysis
+                        WHERE ticker IN ({placeholders}) AND analysis_date = ?
+                    )
+                    WHERE rn = 1
+                """, (*tickers, today))
 
                 # Kelly Calculator가 기대하는 형태로 변환 - 안전한 타입 변환 적용
-                gpt_result = {
-                    'recommendation': row[0],
-                    'confidence': self._safe_convert_to_float(row[1], 0.0)
+                return {
+                    row[0]: {
+                        'recommendation': row[1],
+                        'confidence': self._safe_convert_to_float(row[2], 0.0)
+                    }
+                    for row in cursor.fetchall()
                 }
 
-                return gpt_result
-
         except Exception as e:
-            logger.warning(f"⚠️ {ticker} GPT 분석 조회 실패: {e}")
-            return None
+            logger.warning(f"⚠️ GPT 분석 일괄 조회 실패 ({len(tickers)}개 종목): {e}")
+            return {}
 
     def _safe_convert_to_int(self, value, default: int = 0) -> int:
         """SQLite에서 조회된 값을 안전하게 정수로 변환"""
@@ -2015,6 +2435,35 @@ class MakenaideLocalOrchestrator:
         logger.warning(f"⚠️ 알 수 없는 타입을 부동소수점으로 변환: {type(value)} {value} → 기본값 {default} 사용")
         return default
 
+    def _build_candidate_payload(self, result) -> Dict:
+        """
+        UnifiedFilterResult에서 다운스트림 단계(GPT/Kelly/SNS)가 쓰는 필드만 추출
+
+        technical_analysis 테이블에 저장되는 컬럼과 동일한 이름을 사용하므로
+        선정기 조회와 DB 조회 결과를 같은 방식으로 처리할 수 있습니다.
+        """
+        weinstein = result.weinstein_result
+        basic = result.basic_result
+
+        volume_surge = None
+        if basic and hasattr(basic, 'volume_surge_ratio'):
+            volume_surge = basic.volume_surge_ratio
+        elif weinstein and hasattr(weinstein, 'volume_surge'):
+            volume_surge = weinstein.volume_surge
+
+        return {
+            'quality_score': result.final_quality_score,
+            'recommendation': result.final_recommendation.value,
+            'confidence': result.final_confidence,
+            'total_gates_passed': basic.total_gates_passed if basic else None,
+            'current_stage': weinstein.current_stage if weinstein else None,
+            'stage_confidence': weinstein.stage_confidence if weinstein else None,
+            'breakout_strength': weinstein.breakout_strength if weinstein else None,
+            'volume_surge': volume_surge,
+            'filter_mode': result.filter_mode.value,
+            'processing_time': result.processing_time_ms
+        }
+
     def _save_technical_analysis_to_db(self, result) -> bool:
         """
         기술적 분석 결과를 technical_analysis 테이블에 저장
@@ -2082,6 +2531,39 @@ class MakenaideLocalOrchestrator:
             logger.warning(f"⚠️ {result.ticker if hasattr(result, 'ticker') else 'Unknown'} DB 저장 실패 (파이프라인 계속 진행): {e}")
             return False
 
+def _setup_simulator(args, config: OrchestratorConfig):
+    """
+    업비트 시뮬레이터 설치 (실제 DB/알림/GPT 비용과 분리)
+
+    상대 경로(./makenaide_local.db, ./logs, blacklist.json)를 쓰는 모듈이 많으므로
+    시뮬레이터 작업 디렉터리로 이동한 뒤 새 SQLite DB를 초기화한다.
+    """
+    global SNS_AVAILABLE
+    from upbit_simulator import UpbitSimulator, SimulatorConfig, prepare_simulation_workdir
+
+    workdir = prepare_simulation_workdir(args.sim_workdir)
+    os.chdir(workdir)
+    os.environ['SQLITE_DATABASE'] = os.path.join(workdir, 'makenaide_local.db')
+    os.environ.setdefault('UPBIT_ACCESS_KEY', 'SIMULATOR')
+    os.environ.setdefault('UPBIT_SECRET_KEY', 'SIMULATOR')
+
+    # 시뮬레이션 결과로 외부 알림/유료 API가 호출되지 않도록 차단
+    SNS_AVAILABLE = False
+    config.enable_gpt_analysis = False
+
+    simulator = UpbitSimulator(SimulatorConfig(
+        seed=args.sim_seed,
+        n_tickers=args.sim_tickers,
+        latency_ms=args.sim_latency_ms,
+        error_rate=args.sim_error_rate,
+        rate_limit_per_sec=args.sim_rate_limit,
+        fill_delay_ms=args.sim_fill_delay_ms
+    )).install()
+
+    logger.info(f"🧪 시뮬레이터 작업 디렉터리: {workdir} (SNS 알림 / GPT 분석 비활성화)")
+    return simulator
+
+
 async def main():
     """메인 실행 함수"""
     import argparse
@@ -2099,9 +2581,34 @@ async def main():
                        help='포트폴리오 자동 동기화 비활성화')
     parser.add_argument('--sync-policy', choices=['conservative', 'moderate', 'aggressive'],
                        default='aggressive', help='포트폴리오 동기화 정책 (기본: aggressive - 모든 금액 동기화)')
+    parser.add_argument('--sync-sell-corrections', action='store_true',
+                       help='DB 초과 기록(외부 매도 추정)을 SELL 보정으로 자동 저장 (기본: 감지/경고만)')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Phase 1 수집과 Phase 2 분석을 종목 단위로 동시 실행 (스트리밍 모드)')
+    parser.add_argument('--no-trace', action='store_true',
+                       help='실행 트레이싱(Chrome trace 저장) 비활성화')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=['cprofile', 'sampling'],
+                       help='Phase별 프로파일링 (cprofile: pstats 저장, sampling: collapsed stack 저장)')
+    parser.add_argument('--profile-top', type=int, default=15,
+                       help='보고서에 포함할 Phase별 hot function 개수')
+    parser.add_argument('--simulator', action='store_true',
+                       help='합성 업비트 시뮬레이터로 전체 파이프라인 실행 (--dry-run 필수)')
+    parser.add_argument('--sim-workdir', default='./simulator_run',
+                       help='시뮬레이터 작업 디렉터리 (별도 SQLite DB/로그 사용, 실행마다 DB 재생성)')
+    parser.add_argument('--sim-seed', type=int, default=42, help='시뮬레이터 합성 데이터 seed')
+    parser.add_argument('--sim-tickers', type=int, default=30, help='시뮬레이터 종목 수')
+    parser.add_argument('--sim-latency-ms', type=float, default=0.0, help='시뮬레이터 API 호출당 지연 (ms)')
+    parser.add_argument('--sim-error-rate', type=float, default=0.0, help='시뮬레이터 API 오류 주입 확률 (0~1)')
+    parser.add_argument('--sim-rate-limit', type=float, default=0.0,
+                       help='시뮬레이터 그룹별 초당 호출 한도 (0이면 무제한)')
+    parser.add_argument('--sim-fill-delay-ms', type=float, default=0.0,
+                       help='시뮬레이터 주문 체결 지연 (ms, 그 전까지 주문 상태 wait)')
 
     args = parser.parse_args()
 
+    if args.simulator and not args.dry_run:
+        parser.error("--simulator는 --dry-run과 함께 사용해야 합니다")
+
     # auto-sync 설정 조정
     if args.no_auto_sync:
         args.auto_sync = False
@@ -2119,9 +2626,22 @@ async def main():
         risk_level=risk_level_map[args.risk_level],
         dry_run=args.dry_run,
         auto_sync_enabled=args.auto_sync,
-        sync_policy=args.sync_policy
+        sync_policy=args.sync_policy,
+        sync_sell_corrections=args.sync_sell_corrections,
+        streaming_pipeline=args.streaming,
+        enable_tracing=not args.no_trace,
+        profile_mode=args.profile,
+        profile_top_n=args.profile_top,
+        use_simulator=args.simulator
     )
 
+    simulator = None
+    if args.simulator:
+        try:
+            simulator = _setup_simulator(args, config)
+        except ValueError as e:
+            parser.error(str(e))
+
     # 실행 모드 출력
     logger.info("🎯 실행 모드 설정")
     logger.info(f"   - GPT 분석: {'활성화' if config.enable_gpt_analysis else '비활성화'}")
@@ -2130,13 +2650,21 @@ async def main():
     logger.info(f"   - GPT 일일 예산: ${config.max_gpt_budget_daily}")
     logger.info(f"   - 포트폴리오 자동 동기화: {'활성화' if config.auto_sync_enabled else '비활성화'}")
     logger.info(f"   - 동기화 정책: {config.sync_policy} ({'모든 금액 동기화' if config.sync_policy == 'aggressive' else '제한적 동기화'})")
+    logger.info(f"   - SELL 보정 자동 저장: {'활성화' if config.sync_sell_corrections else '비활성화 (감지만)'}")
+    logger.info(f"   - 파이프라인 모드: {'스트리밍 (Phase 1 ↔ Phase 2 동시 실행)' if config.streaming_pipeline else '순차 실행'}")
+    logger.info(f"   - 실행 트레이싱: {'활성화' if config.enable_tracing else '비활성화'}")
+    logger.info(f"   - 프로파일링: {config.profile_mode or '비활성화'}")
+    logger.info(f"   - 업비트 시뮬레이터: {'활성화' if config.use_simulator else '비활성화'}")
 
     # 오케스트레이터 실행
     orchestrator = MakenaideLocalOrchestrator(config)
     success = await orchestrator.run_full_pipeline()
 
+    if simulator:
+        logger.info(f"🧪 시뮬레이터 통계: {json.dumps(simulator.get_stats(), ensure_ascii=False)}")
+
     # EC2 자동 종료 처리 (환경 변수로 제어)
-    auto_shutdown = os.getenv('EC2_AUTO_SHUTDOWN', 'false').lower() == 'true'
+    auto_shutdown = os.getenv('EC2_AUTO_SHUTDOWN', 'false').lower() == 'true' and not config.use_simulator
 
     if success:
         logger.info("🎉 파이프라인 성공적으로 완료")
@@ -2164,5 +2692,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -28,6 +28,8 @@ import os
 from dotenv import load_dotenv
 import requests
 import json
+
+from api_rate_limiter import get_rate_limiter
 import sqlite3
 from dataclasses import dataclass
 from enum import Enum
@@ -127,6 +129,7 @@ class FearGreedAnalyzer:
         """Fear&Greed Index 데이터 조회"""
         try:
             logger.debug("🌐 Fear&Greed Index API 호출")
+            get_rate_limiter().acquire('external')
             response = requests.get(self.fear_greed_api_url, timeout=10)
             response.raise_for_status()
 
@@ -171,7 +174,10 @@ class FearGreedAnalyzer:
             ticker_url = f"{self.upbit_api_url}/ticker"
             ticker_params = {"markets": "KRW-BTC"}
 
+            limiter = get_rate_limiter()
+            limiter.acquire('ticker')
             ticker_response = requests.get(ticker_url, params=ticker_params, timeout=10)
+            limiter.observe_headers(ticker_response.headers)
             ticker_response.raise_for_status()
             ticker_data = ticker_response.json()[0]
 
@@ -182,7 +188,9 @@ class FearGreedAnalyzer:
             candles_url = f"{self.upbit_api_url}/candles/days"
             candles_params = {"market": "KRW-BTC", "count": 30}
 
+            limiter.acquire('candles')
             candles_response = requests.get(candles_url, params=candles_params, timeout=10)
+            limiter.observe_headers(candles_response.headers)
             candles_response.raise_for_status()
             candles_data = candles_response.json()
 
@@ -533,10 +541,10 @@ class MarketThermometer:
             query = """
                 SELECT 
                     COUNT(*) as total_tickers,
-                    COUNT(CASE WHEN close > ma_200 THEN 1 END) as above_ma200
+                    COUNT(CASE WHEN close > ma200 THEN 1 END) as above_ma200
                 FROM ohlcv_data 
                 WHERE date = (SELECT MAX(date) FROM ohlcv_data)
-                AND ma_200 IS NOT NULL AND close IS NOT NULL
+                AND ma200 IS NOT NULL AND close IS NOT NULL
             """
             
             with get_db_connection_context() as conn:
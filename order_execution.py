@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Order Execution - 호가창 기반 매수 집행기
+시장가 매수 전에 호가창을 조회해 주문 규모의 예상 슬리피지를 계산하고,
+예상 슬리피지가 임계값을 넘으면 자식 주문(TWAP 분할 시장가 / 지정가 사다리)으로 나누어 집행
+
+🎯 핵심 기능:
+- estimate_buy_slippage: 매도 호가를 순서대로 소진하여 예상 평균 체결가와 슬리피지 계산
+  · slippage_bps: 중간가 기준 (스프레드 포함 총 비용 - 실제 슬리피지와 비교 기록용)
+  · impact_bps: 최우선 매도호가 기준 (호가 소진 비용 - 분할로 줄일 수 있는 부분, 분할 판단 기준)
+- plan_buy: 예상 impact ≤ max_slippage_bps → 단일 시장가, 초과 → 임계값 이내 최대 크기로 자식 주문 분할
+  (스프레드는 분할로 줄지 않으므로 판단에서 제외, 임계값 이내 크기를 찾지 못하면 단일 시장가)
+  · twap: 자식 시장가 주문을 일정 간격으로 순차 접수 (호가 회복 시간 확보)
+  · ladder: 최우선 매도호가 + 임계값 범위의 지정가 주문을 여러 가격에 동시 접수, 제한 시간 후 미체결분 취소
+- execute_plan: 자식 주문 체결 내역을 업비트 주문 응답 형식 하나로 합산 (기존 체결 처리 로직 그대로 사용)
+- actual_slippage_bps: 실제 평균 체결가와 계획 시점 중간가로 실제 슬리피지 계산 (trades 테이블 기록용)
+
+📊 사용 예시:
+    executor = OrderExecutor(upbit, get_rate_limiter(), order_tracker, max_slippage_bps=30.0)
+    books = executor.fetch_orderbooks(['KRW-ABC', 'KRW-XYZ'])   # 호가 일괄 조회 1회
+    plan = executor.plan_buy('KRW-ABC', 800_000, books.get('KRW-ABC'))
+    if plan.is_split:
+        order_detail = executor.execute_plan(plan)               # 합산된 주문 상세 (state / executed_volume / trades)
+"""
+
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pyupbit
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_STYLES = ('market', 'twap', 'ladder')
+
+
+@dataclass
+class SlippageEstimate:
+    """호가창 기준 매수 슬리피지 추정"""
+    ticker: str
+    amount_krw: float
+    mid_price: float
+    best_ask: float
+    expected_avg_price: float
+    slippage_bps: float          # 중간가 대비 예상 평균 체결가 (bp, 스프레드 포함)
+    impact_bps: float            # 최우선 매도호가 대비 예상 평균 체결가 (bp, 호가 소진분만)
+    levels_consumed: int
+    book_depth_krw: float        # 조회된 매도 호가 총액
+    fillable: bool               # 조회된 호가 범위 내 전량 체결 가능 여부 (False면 추정치는 하한)
+
+
+@dataclass
+class ExecutionPlan:
+    """매수 집행 계획"""
+    ticker: str
+    amount_krw: float                       # 수수료 제외 주문 금액
+    style: str = 'market'                   # 'market' | 'twap' | 'ladder'
+    estimate: Optional[SlippageEstimate] = None
+    child_amounts: List[float] = field(default_factory=list)
+    limit_prices: List[float] = field(default_factory=list)  # ladder 전용
+
+    @property
+    def is_split(self) -> bool:
+        return self.style != 'market' and len(self.child_amounts) > 1
+
+    @property
+    def estimated_slippage_bps(self) -> Optional[float]:
+        return self.estimate.slippage_bps if self.estimate else None
+
+
+def estimate_buy_slippage(ticker: str, orderbook: Dict[str, Any], amount_krw: float) -> Optional[SlippageEstimate]:
+    """
+    매도 호가를 낮은 가격부터 소진하여 amount_krw 시장가 매수의 예상 평균 체결가 계산
+
+    조회 범위를 넘는 잔량은 마지막 호가에 체결된다고 가정하므로 fillable=False인 추정치는 하한값이다.
+    """
+    units = (orderbook or {}).get('orderbook_units') or []
+    if not units or amount_krw <= 0:
+        return None
+
+    best_ask = float(units[0]['ask_price'])
+    best_bid = float(units[0]['bid_price'])
+    mid_price = (best_ask + best_bid) / 2 if best_bid > 0 else best_ask
+
+    remaining = amount_krw
+    volume = 0.0
+    levels = 0
+    depth = 0.0
+    last_price = best_ask
+
+    for unit in units:
+        price = float(unit['ask_price'])
+        level_krw = price * float(unit['ask_size'])
+        depth += level_krw
+        if remaining <= 0:
+            continue
+
+        take = min(remaining, level_krw)
+        volume += take / price
+        remaining -= take
+        last_price = price
+        levels += 1
+
+    fillable = remaining <= 1e-9
+    if not fillable:
+        volume += remaining / last_price
+
+    expected_avg = amount_krw / volume
+    return SlippageEstimate(
+        ticker=ticker,
+        amount_krw=amount_krw,
+        mid_price=mid_price,
+        best_ask=best_ask,
+        expected_avg_price=expected_avg,
+        slippage_bps=(expected_avg / mid_price - 1) * 10000,
+        impact_bps=(expected_avg / best_ask - 1) * 10000,
+        levels_consumed=levels,
+        book_depth_krw=depth,
+        fillable=fillable
+    )
+
+
+class OrderExecutor:
+    """호가창 기반 매수 집행 (슬리피지 추정 + TWAP / 지정가 사다리 분할)"""
+
+    def __init__(self, upbit, rate_limiter, order_tracker, max_slippage_bps: float = 30.0,
+                 split_style: str = 'twap', max_child_orders: int = 5, min_child_amount_krw: float = 10000,
+                 twap_interval_sec: float = 3.0, ladder_timeout_sec: float = 10.0):
+        if split_style not in EXECUTION_STYLES[1:]:
+            raise ValueError(f"지원하지 않는 분할 방식: {split_style} (twap | ladder)")
+
+        self.upbit = upbit
+        self.rate_limiter = rate_limiter
+        self.order_tracker = order_tracker
+        self.max_slippage_bps = max_slippage_bps
+        self.split_style = split_style
+        self.max_child_orders = max_child_orders
+        self.min_child_amount_krw = min_child_amount_krw
+        self.twap_interval_sec = twap_interval_sec
+        self.ladder_timeout_sec = ladder_timeout_sec
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'plans': 0,
+            'split_plans': 0,
+            'child_orders': 0,
+            'cancelled_children': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 호가 조회 / 계획
+    # ------------------------------------------------------------------
+
+    def fetch_orderbooks(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """호가창 일괄 조회 (실패 시 빈 dict → 호가 없이 단일 시장가로 진행)"""
+        if not tickers:
+            return {}
+
+        try:
+            books = self.rate_limiter.call('orderbook', pyupbit.get_orderbook, list(tickers), limit_info_kw='limit_info')
+        except Exception as e:
+            logger.warning(f"⚠️ 호가창 조회 실패: {e}")
+            return {}
+
+        if isinstance(books, dict):
+            books = [books]
+        if not isinstance(books, list):
+            return {}
+        return {book['market']: book for book in books if isinstance(book, dict) and 'market' in book}
+
+    def _max_child_amount(self, ticker: str, orderbook: Dict[str, Any], amount_krw: float) -> float:
+        """예상 impact가 임계값 이내인 최대 주문 금액 (impact는 금액에 대해 단조 증가 → 이분 탐색)"""
+        low, high = 0.0, amount_krw
+        for _ in range(30):
+            middle = (low + high) / 2
+            estimate = estimate_buy_slippage(ticker, orderbook, middle)
+            if estimate and estimate.impact_bps <= self.max_slippage_bps:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def plan_buy(self, ticker: str, amount_krw: float, orderbook: Optional[Dict[str, Any]] = None) -> ExecutionPlan:
+        """주문 금액의 예상 슬리피지에 따라 단일 시장가 또는 분할 집행 계획 생성"""
+        if orderbook is None:
+            orderbook = self.fetch_orderbooks([ticker]).get(ticker)
+
+        with self._lock:
+            self.stats['plans'] += 1
+
+        estimate = estimate_buy_slippage(ticker, orderbook, amount_krw) if orderbook else None
+        plan = ExecutionPlan(ticker=ticker, amount_krw=amount_krw, estimate=estimate, child_amounts=[amount_krw])
+        # 스프레드(중간가 ~ 최우선 매도호가)는 분할해도 줄지 않으므로 호가 소진분(impact)만 판단
+        if estimate is None or estimate.impact_bps <= self.max_slippage_bps:
+            return plan
+
+        # 자식 주문 수: 임계값 이내 최대 크기 기준 (최대 max_child_orders, 최소 주문 금액 이상)
+        max_child = self._max_child_amount(ticker, orderbook, amount_krw)
+        if max_child <= 0:
+            # 임계값 이내 크기가 없으면 분할해도 비용이 줄지 않음 → 단일 시장가 (TWAP 대기로 배치 접수 지연 방지)
+            return plan
+        children = min(math.ceil(amount_krw / max_child), self.max_child_orders,
+                       int(amount_krw // self.min_child_amount_krw))
+        if children <= 1:
+            return plan
+
+        plan.style = self.split_style
+        plan.child_amounts = [amount_krw / children] * children
+
+        if plan.style == 'ladder':
+            # 최우선 매도호가 ~ 최우선 매도호가 × (1 + 임계값) 구간에 균등 배치, 호가 단위로 내림
+            plan.limit_prices = []
+            for index in range(children):
+                target = estimate.best_ask * (1 + self.max_slippage_bps * (index + 1) / children / 10000)
+                plan.limit_prices.append(pyupbit.get_tick_size(target, method='floor'))
+
+        with self._lock:
+            self.stats['split_plans'] += 1
+
+        logger.info(f"🪜 {ticker} 예상 호가 소진 {estimate.impact_bps:.1f}bp > {self.max_slippage_bps:.0f}bp: "
+                    f"{plan.style} {children}분할 ({plan.child_amounts[0]:,.0f}원씩)")
+        return plan
+
+    # ------------------------------------------------------------------
+    # 집행
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _order_id(response: Any) -> Optional[str]:
+        if isinstance(response, dict) and 'error' not in response:
+            return response.get('uuid')
+        return None
+
+    def _submit_child(self, ticker: str, func, *args) -> Optional[str]:
+        try:
+            response = self.rate_limiter.call('order', func, ticker, *args, limit_info_kw='contain_req')
+        except Exception as e:
+            logger.error(f"❌ {ticker} 자식 주문 접수 실패: {e}")
+            return None
+
+        order_id = self._order_id(response)
+        if order_id is None:
+            logger.error(f"❌ {ticker} 자식 주문 접수 실패: {response}")
+            return None
+
+        with self._lock:
+            self.stats['child_orders'] += 1
+        return order_id
+
+    def _execute_twap(self, plan: ExecutionPlan) -> List[Dict[str, Any]]:
+        """자식 시장가 주문을 twap_interval_sec 간격으로 접수, 접수 실패 시 남은 주문 중단"""
+        order_ids = []
+        for index, amount in enumerate(plan.child_amounts):
+            if index > 0:
+                time.sleep(self.twap_interval_sec)
+
+            order_id = self._submit_child(plan.ticker, self.upbit.buy_market_order, amount)
+            if order_id is None:
+                break
+            order_ids.append(order_id)
+
+        details = self.order_tracker.wait_for_orders(order_ids)
+        return [detail for detail in details.values() if detail]
+
+    def _execute_ladder(self, plan: ExecutionPlan) -> List[Dict[str, Any]]:
+        """지정가 사다리 동시 접수 → ladder_timeout_sec 후 미체결 주문 취소"""
+        order_ids = []
+        for amount, price in zip(plan.child_amounts, plan.limit_prices):
+            volume = round(amount / price, 8)
+            order_id = self._submit_child(plan.ticker, self.upbit.buy_limit_order, price, volume)
+            if order_id is not None:
+                order_ids.append(order_id)
+
+        details = self.order_tracker.wait_for_orders(order_ids, timeout=self.ladder_timeout_sec)
+
+        open_ids = [order_id for order_id, detail in details.items() if not self.order_tracker.is_terminal(detail)]
+        for order_id in open_ids:
+            try:
+                self.rate_limiter.call('order', self.upbit.cancel_order, order_id, limit_info_kw='contain_req')
+            except Exception as e:
+                logger.warning(f"⚠️ {plan.ticker} 미체결 지정가 주문 취소 실패 ({order_id}): {e}")
+
+        if open_ids:
+            with self._lock:
+                self.stats['cancelled_children'] += len(open_ids)
+            logger.info(f"🧹 {plan.ticker} 미체결 지정가 주문 {len(open_ids)}건 취소")
+            details.update(self.order_tracker.wait_for_orders(open_ids))
+
+        return [detail for detail in details.values() if detail]
+
+    @staticmethod
+    def merge_order_details(ticker: str, details: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        자식 주문 상세를 단일 업비트 주문 응답 형식으로 합산
+
+        모든 자식이 done이면 done, 일부만 체결되었으면 cancel (부분 체결 처리 경로).
+        """
+        if not details:
+            return None
+
+        trades = []
+        executed = 0.0
+        for detail in details:
+            child_executed = float(detail.get('executed_volume') or 0)
+            executed += child_executed
+            child_trades = detail.get('trades') or []
+            if child_trades:
+                trades.extend(child_trades)
+            elif child_executed > 0 and detail.get('ord_type') == 'limit' and detail.get('price'):
+                # 지정가 주문은 체결가 ≤ 주문가 → 주문가로 보수적 대체
+                trades.append({'price': detail['price'], 'volume': str(child_executed)})
+
+        all_done = all(detail.get('state') == 'done' for detail in details)
+        return {
+            'uuid': details[0].get('uuid'),
+            'market': ticker,
+            'side': 'bid',
+            'state': 'done' if all_done else 'cancel',
+            'executed_volume': str(executed),
+            'trades': trades,
+            'child_order_ids': [detail.get('uuid') for detail in details],
+        }
+
+    def execute_plan(self, plan: ExecutionPlan) -> Optional[Dict[str, Any]]:
+        """분할 계획 집행 후 합산 주문 상세 반환 (자식 주문이 하나도 접수되지 않으면 None)"""
+        if plan.style == 'ladder':
+            details = self._execute_ladder(plan)
+        else:
+            details = self._execute_twap(plan)
+        return self.merge_order_details(plan.ticker, details)
+
+    @staticmethod
+    def actual_slippage_bps(plan: Optional[ExecutionPlan], average_price: Optional[float]) -> Optional[float]:
+        """계획 시점 중간가 대비 실제 평균 체결가 (bp)"""
+        if not plan or not plan.estimate or not average_price:
+            return None
+        return (average_price / plan.estimate.mid_price - 1) * 10000
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
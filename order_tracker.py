@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Order Tracker - 주문 체결 확인기
+고정 대기(time.sleep(5)) 후 1회 조회하던 방식 대신, 짧은 간격에서 시작하는
+지수 증가 폴링으로 주문이 종료 상태(done / cancel)에 도달하는 즉시 결과를 반환
+
+🎯 핵심 기능:
+- wait_for_order: 단일 주문 체결 확인 (0.1초 → 0.2초 → 0.4초 ... 최대 1초 간격, 기본 10초 제한)
+- wait_for_orders: 여러 주문을 한 폴링 루프에서 동시에 확인 (라운드마다 미완료 주문만 조회)
+- find_order: 주문 ID를 받지 못한 경우 최근 주문 목록을 같은 방식으로 재조회
+- 모든 조회는 공유 레이트 리미터('default' 그룹) 경유, 스레드 안전 (여러 스레드에서 동시 사용 가능)
+
+📊 사용 예시:
+    tracker = OrderTracker(upbit, get_rate_limiter())
+    detail = tracker.wait_for_order(order_id)                 # 종료 상태 주문 dict 또는 마지막 조회 결과
+    details = tracker.wait_for_orders([uuid_a, uuid_b])       # {uuid: detail}
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 업비트 주문 종료 상태 (시장가 매수는 잔여 금액이 있으면 cancel로 종료)
+TERMINAL_ORDER_STATES = ('done', 'cancel')
+
+
+class OrderTracker:
+    """지수 백오프 폴링 기반 주문 체결 확인"""
+
+    def __init__(self, upbit, rate_limiter, initial_interval: float = 0.1,
+                 max_interval: float = 1.0, backoff_factor: float = 2.0, timeout: float = 10.0):
+        self.upbit = upbit
+        self.rate_limiter = rate_limiter
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'orders_tracked': 0,
+            'orders_confirmed': 0,
+            'orders_timed_out': 0,
+            'polls': 0,
+            'confirm_seconds': 0.0,
+        }
+
+    @staticmethod
+    def is_terminal(order_detail: Optional[Dict[str, Any]]) -> bool:
+        return isinstance(order_detail, dict) and order_detail.get('state') in TERMINAL_ORDER_STATES
+
+    def _fetch_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """주문 1건 조회 (오류 응답/예외는 None → 다음 라운드에 재조회)"""
+        try:
+            detail = self.rate_limiter.call('default', self.upbit.get_order, order_id, limit_info_kw='contain_req')
+        except Exception as e:
+            logger.debug(f"주문 조회 실패 ({order_id}): {e}")
+            return None
+
+        with self._lock:
+            self.stats['polls'] += 1
+
+        if isinstance(detail, dict) and 'error' in detail:
+            logger.debug(f"주문 조회 오류 응답 ({order_id}): {detail['error']}")
+            return None
+        return detail
+
+    def _intervals(self, timeout: float):
+        """폴링 대기 간격 생성 (누적 대기가 timeout에 도달하면 종료)"""
+        interval = self.initial_interval
+        waited = 0.0
+        start = time.monotonic()
+        while waited < timeout and time.monotonic() - start < timeout:
+            yield interval
+            waited += interval
+            interval = min(self.max_interval, interval * self.backoff_factor)
+
+    def wait_for_orders(self, order_ids: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        여러 주문의 종료 상태를 동시에 확인
+
+        Returns:
+            {order_id: 주문 상세} - 제한 시간 내 종료되지 않은 주문은 마지막 조회 결과 (조회 실패 시 None)
+        """
+        pending: List[str] = list(dict.fromkeys(order_ids))
+        results: Dict[str, Optional[Dict[str, Any]]] = {order_id: None for order_id in pending}
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+
+        with self._lock:
+            self.stats['orders_tracked'] += len(pending)
+
+        def poll_round():
+            for order_id in list(pending):
+                detail = self._fetch_order(order_id)
+                if detail is not None:
+                    results[order_id] = detail
+                if self.is_terminal(detail):
+                    pending.remove(order_id)
+
+        poll_round()
+        for interval in self._intervals(timeout):
+            if not pending:
+                break
+            time.sleep(interval)
+            poll_round()
+
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self.stats['orders_confirmed'] += len(results) - len(pending)
+            self.stats['orders_timed_out'] += len(pending)
+            self.stats['confirm_seconds'] += elapsed
+
+        if pending:
+            logger.warning(f"⏱️ 주문 체결 확인 시간 초과 ({timeout:.0f}초): {len(pending)}건 미종료")
+        return results
+
+    def wait_for_order(self, order_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """단일 주문 종료 상태 확인"""
+        return self.wait_for_orders([order_id], timeout)[order_id]
+
+    def find_order(self, predicate: Callable[[Dict[str, Any]], bool], state: str = 'done',
+                   limit: int = 5, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """최근 주문 목록에서 조건에 맞는 주문 탐색 (주문 ID 누락 시 재검증용)"""
+        timeout = self.timeout if timeout is None else timeout
+
+        def search() -> Optional[Dict[str, Any]]:
+            orders = self.rate_limiter.call('default', self.upbit.get_orders, state=state, limit=limit)
+            with self._lock:
+                self.stats['polls'] += 1
+            if isinstance(orders, list):
+                for order in orders:
+                    if predicate(order):
+                        return order
+            return None
+
+        found = search()
+        for interval in self._intervals(timeout):
+            if found:
+                break
+            time.sleep(interval)
+            found = search()
+        return found
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['confirm_seconds'] = round(stats['confirm_seconds'], 3)
+        return stats
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep - 적응형 임계점 / 모듈 가중치 일괄 평가기
+유니버스를 한 번만 채점하고, 모듈 원점수를 재가중하여 수백 개 설정을 평가
+
+🎯 핵심 아이디어:
+- 모듈 점수(0-100)는 가중치와 무관 → 시점별 모듈 원점수를 1회 계산 후 캐시
+- 가중치 설정 하나 = 모듈별 계수 벡터 v → 총점 = S @ v (행렬-벡터 곱 1회)
+- 임계점 변경은 총점 비교만 필요 → 설정 수백 개도 채점 1회 비용과 거의 동일
+- 설정 묶음을 ProcessPoolExecutor로 분산 (캐시 행렬은 워커당 1회 전달)
+
+📊 평가 대상:
+- create_scoring_strategies() 프리셋 가중치
+- AdaptiveScoringManager.get_adaptive_weights(MarketRegime) 시장별 가중치
+- 통과/매수 임계점 격자
+
+📊 사용 예시:
+    sweep = ParameterSweep(BacktestConfig(start_date='2024-01-01', end_date='2024-12-31'))
+    sweep.load_or_build_cache('sweep_cache.pkl')
+    results = sweep.run(sweep.build_parameter_grid())
+"""
+
+import os
+import sys
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from layered_scoring_engine import LayerType
+from adaptive_scoring_config import (
+    AdaptiveConfig, AdaptiveScoringManager, MarketRegime,
+    calculate_performance_score, create_scoring_strategies
+)
+from backtest_engine import BacktestConfig, BacktestEngine, create_default_scoring_engine, load_ohlcv_history
+
+logger = logging.getLogger(__name__)
+
+
+# AdaptiveConfig.dynamic_weights 키 → LayeredScoringEngine 모듈 매핑
+# (매핑되지 않은 MarketRegime / PriceAction / PatternRecognition은 기본 가중치 유지)
+WEIGHT_KEY_MODULES = {
+    'stage_weight': ('StageAnalysis',),
+    'ma_weight': ('MovingAverage',),
+    'rs_weight': ('RelativeStrength',),
+    'volume_weight': ('VolumeProfile', 'VolumeSpike'),
+    'momentum_weight': ('Momentum',),
+}
+
+
+@dataclass
+class SweepConfig:
+    """평가할 파라미터 조합 1개"""
+    name: str
+    weights: Dict[str, float]       # dynamic_weights 형식
+    pass_threshold: float
+    buy_threshold: float
+
+
+@dataclass
+class ModuleSpec:
+    """캐시 행렬 열 하나에 대응하는 모듈 정보"""
+    name: str
+    layer_type: LayerType
+    base_weight: float
+
+
+# 워커 프로세스별 캐시 (initializer로 1회 설정)
+_worker_scores: Optional[np.ndarray] = None
+_worker_returns: Optional[np.ndarray] = None
+
+
+def _init_sweep_worker(scores: np.ndarray, returns: np.ndarray):
+    global _worker_scores, _worker_returns
+    _worker_scores = scores
+    _worker_returns = returns
+
+
+def evaluate_configs(scores: np.ndarray, returns: np.ndarray,
+                     coefficients: np.ndarray, layer_coefficients: Dict[LayerType, np.ndarray],
+                     thresholds: List[Tuple[float, float]],
+                     quality_gates: Optional[Dict[LayerType, float]] = None,
+                     min_total_score: float = 0.0) -> List[Dict[str, float]]:
+    """
+    설정 묶음 평가
+
+    Args:
+        scores: (N, M) 모듈 원점수 캐시
+        returns: (N,) 선행 수익률 (NaN 허용)
+        coefficients: (M, C) 설정별 모듈 계수 → 총점 = scores @ coefficients
+        layer_coefficients: Layer별 (M, C) 계수 → Layer 백분율 (Quality Gate용)
+        thresholds: 설정별 (통과 임계점, 매수 임계점)
+        quality_gates: Layer별 최소 백분율 (None이면 Gate 미적용)
+    """
+    totals = scores @ coefficients
+
+    gate_mask = None
+    if quality_gates:
+        gate_mask = totals >= min_total_score
+        for layer_type, min_pct in quality_gates.items():
+            gate_mask &= (scores @ layer_coefficients[layer_type]) >= min_pct
+
+    has_return = ~np.isnan(returns)
+    results = []
+
+    for col, (pass_threshold, buy_threshold) in enumerate(thresholds):
+        total = totals[:, col]
+        pass_mask = total >= pass_threshold
+        buy_mask = total >= buy_threshold
+        if gate_mask is not None:
+            pass_mask &= gate_mask[:, col]
+            buy_mask &= gate_mask[:, col]
+
+        buy_returns = returns[buy_mask & has_return]
+
+        results.append({
+            'pass_rate': float(pass_mask.mean()) if len(total) else 0.0,
+            'buy_signals': int(buy_mask.sum()),
+            'buy_win_rate': float((buy_returns > 0).mean()) if len(buy_returns) else 0.0,
+            'buy_avg_return': float(buy_returns.mean()) if len(buy_returns) else 0.0,
+            'performance': calculate_performance_score(buy_returns.tolist())
+        })
+
+    return results
+
+
+def _evaluate_chunk_task(args: Tuple) -> List[Dict[str, float]]:
+    """ProcessPoolExecutor용 래퍼 (캐시 행렬은 워커 전역 사용)"""
+    coefficients, layer_coefficients, thresholds, quality_gates, min_total_score = args
+    return evaluate_configs(_worker_scores, _worker_returns,
+                            coefficients, layer_coefficients, thresholds,
+                            quality_gates, min_total_score)
+
+
+class ParameterSweep:
+    """캐시된 모듈 원점수 기반 파라미터 스윕 실행기"""
+
+    def __init__(self, backtest_config: Optional[BacktestConfig] = None,
+                 adaptive_manager: Optional[AdaptiveScoringManager] = None,
+                 max_workers: Optional[int] = None,
+                 require_quality_gates: bool = False):
+        self.backtest_config = backtest_config or BacktestConfig()
+        self.adaptive_manager = adaptive_manager or AdaptiveScoringManager()
+        self.max_workers = max_workers or self.backtest_config.max_workers
+        self.require_quality_gates = require_quality_gates
+
+        # 모듈 구성 (이름 / Layer / 기본 가중치)과 Layer 만점, Quality Gate 기준
+        engine = create_default_scoring_engine(self.backtest_config.db_path)
+        self.module_specs = [
+            ModuleSpec(module.name, module.layer_type, module.weight)
+            for modules in engine.module_registry.get_all_modules().values()
+            for module in modules
+        ]
+        self.layer_max_scores = {
+            layer_type: processor.max_score
+            for layer_type, processor in engine.layer_processors.items()
+        }
+        self.quality_gates = dict(engine.quality_gate_validator.min_score_requirements)
+        self.min_total_score = engine.quality_gate_validator.min_total_score
+
+        # 모듈 기본 가중치에 대응하는 기준 dynamic_weights (계수 환산 기준)
+        self.baseline_weights = AdaptiveConfig().dynamic_weights
+        self.signals: pd.DataFrame = pd.DataFrame()
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+
+    def build_cache(self) -> pd.DataFrame:
+        """유니버스 시점별 채점 1회 (BacktestEngine Phase A 재사용)"""
+        cfg = self.backtest_config
+        history = load_ohlcv_history(cfg.db_path, cfg.tickers, cfg.end_date)
+        if history.empty:
+            logger.warning("⚠️ 스윕할 OHLCV 데이터가 없습니다")
+            return pd.DataFrame()
+
+        signals = BacktestEngine(cfg).generate_signals(history)
+        if signals.empty:
+            return signals
+
+        keep = ['ticker', 'date', 'total_score', 'forward_return'] + \
+               [f"{spec.name}_score" for spec in self.module_specs if f"{spec.name}_score" in signals.columns]
+        return signals[keep].reset_index(drop=True)
+
+    def load_or_build_cache(self, cache_path: Optional[str] = None, refresh: bool = False) -> pd.DataFrame:
+        """캐시 파일이 있으면 로드, 없으면 채점 후 저장"""
+        if cache_path and os.path.exists(cache_path) and not refresh:
+            self.signals = pd.read_pickle(cache_path)
+            logger.info(f"📦 모듈 점수 캐시 로드: {cache_path} ({len(self.signals):,}건)")
+            return self.signals
+
+        self.signals = self.build_cache()
+
+        if cache_path and not self.signals.empty:
+            self.signals.to_pickle(cache_path)
+            logger.info(f"💾 모듈 점수 캐시 저장: {cache_path} ({len(self.signals):,}건)")
+
+        return self.signals
+
+    # ------------------------------------------------------------------
+    # 파라미터 격자
+    # ------------------------------------------------------------------
+
+    def build_parameter_grid(self,
+                             pass_thresholds: Optional[List[float]] = None,
+                             buy_margins: Optional[List[float]] = None,
+                             include_strategies: bool = True,
+                             include_regimes: bool = True) -> List[SweepConfig]:
+        """
+        프리셋 가중치 × 임계점 격자
+
+        Args:
+            pass_thresholds: 통과 임계점 후보 (기본 40~85, 5 간격)
+            buy_margins: 매수 임계점 = 통과 임계점 + margin (기본 10/15/20)
+        """
+        pass_thresholds = pass_thresholds or [float(t) for t in range(40, 90, 5)]
+        buy_margins = buy_margins or [10.0, 15.0, 20.0]
+
+        weight_sets: Dict[str, Dict[str, float]] = {
+            'current': dict(self.adaptive_manager.config.dynamic_weights)
+        }
+
+        if include_strategies:
+            for key, strategy in create_scoring_strategies().items():
+                weight_sets[f"strategy:{key}"] = dict(strategy['weights'])
+
+        if include_regimes:
+            for regime in MarketRegime:
+                weight_sets[f"regime:{regime.value}"] = self.adaptive_manager.get_adaptive_weights(regime)
+
+        return [
+            SweepConfig(name, weights, pass_threshold, min(100.0, pass_threshold + margin))
+            for name, weights in weight_sets.items()
+            for pass_threshold in pass_thresholds
+            for margin in buy_margins
+        ]
+
+    def _module_coefficients(self, weights: Dict[str, float]) -> Tuple[np.ndarray, Dict[LayerType, np.ndarray]]:
+        """
+        dynamic_weights → 모듈별 총점 계수 / Layer 백분율 계수
+
+        모듈 가중치 = 기본 가중치 × (설정 가중치 / 기준 dynamic_weights)
+        Layer 점수 = max_score × Σ(score × w) / Σw / 100 이므로 총점은 모듈 점수의 선형 결합이다.
+        """
+        factors = {}
+        for key, module_names in WEIGHT_KEY_MODULES.items():
+            baseline = self.baseline_weights.get(key, 0.0)
+            factor = weights.get(key, baseline) / baseline if baseline > 0 else 1.0
+            for module_name in module_names:
+                factors[module_name] = factor
+
+        module_weights = np.array([
+            spec.base_weight * factors.get(spec.name, 1.0) for spec in self.module_specs
+        ])
+
+        total_coefficients = np.zeros(len(self.module_specs))
+        layer_coefficients = {}
+
+        for layer_type, max_score in self.layer_max_scores.items():
+            mask = np.array([spec.layer_type == layer_type for spec in self.module_specs])
+            layer_weight = module_weights[mask].sum()
+            coefficients = np.where(mask, module_weights, 0.0) / layer_weight if layer_weight > 0 else np.zeros(len(mask))
+
+            layer_coefficients[layer_type] = coefficients          # Layer 백분율 (0-100)
+            total_coefficients += coefficients * max_score / 100.0  # 총점 기여 (0-max_score)
+
+        return total_coefficients, layer_coefficients
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def run(self, grid: List[SweepConfig], chunk_size: int = 32) -> pd.DataFrame:
+        """격자 전체 평가 (설정 묶음 단위 병렬)"""
+        if self.signals.empty:
+            self.load_or_build_cache()
+        if self.signals.empty or not grid:
+            return pd.DataFrame()
+
+        score_columns = [f"{spec.name}_score" for spec in self.module_specs]
+        scores = self.signals.reindex(columns=score_columns).fillna(0.0).to_numpy(dtype=np.float64)
+        returns = self.signals['forward_return'].to_numpy(dtype=np.float64)
+
+        quality_gates = self.quality_gates if self.require_quality_gates else None
+
+        tasks = []
+        for start in range(0, len(grid), chunk_size):
+            chunk = grid[start:start + chunk_size]
+            coefficient_pairs = [self._module_coefficients(config.weights) for config in chunk]
+
+            coefficients = np.column_stack([pair[0] for pair in coefficient_pairs])
+            layer_coefficients = {
+                layer_type: np.column_stack([pair[1][layer_type] for pair in coefficient_pairs])
+                for layer_type in self.layer_max_scores
+            }
+            thresholds = [(config.pass_threshold, config.buy_threshold) for config in chunk]
+            tasks.append((coefficients, layer_coefficients, thresholds, quality_gates, self.min_total_score))
+
+        logger.info(f"🧪 파라미터 스윕: {len(grid)}개 설정 × {len(scores):,}건 "
+                    f"({len(tasks)}개 묶음, workers={self.max_workers})")
+
+        if self.max_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     initializer=_init_sweep_worker,
+                                     initargs=(scores, returns)) as executor:
+                chunk_results = list(executor.map(_evaluate_chunk_task, tasks))
+        else:
+            _init_sweep_worker(scores, returns)
+            chunk_results = [_evaluate_chunk_task(task) for task in tasks]
+
+        rows = []
+        for config, metrics in zip(grid, (m for chunk in chunk_results for m in chunk)):
+            rows.append({
+                'name': config.name,
+                'pass_threshold': config.pass_threshold,
+                'buy_threshold': config.buy_threshold,
+                **{key: round(value, 4) for key, value in config.weights.items()},
+                **metrics
+            })
+
+        results = pd.DataFrame(rows).sort_values('performance', ascending=False).reset_index(drop=True)
+
+        if not results.empty:
+            best = results.iloc[0]
+            logger.info(f"🏆 최적 설정: {best['name']} (통과 {best['pass_threshold']:.0f}, "
+                        f"매수 {best['buy_threshold']:.0f}) → 성과 {best['performance']:.3f}, "
+                        f"매수 신호 {best['buy_signals']}건, 승률 {best['buy_win_rate']:.1%}")
+
+        return results
+
+    def apply_best(self, results: pd.DataFrame) -> Optional[Dict]:
+        """최고 성과 설정을 AdaptiveScoringManager 기본값으로 반영"""
+        if results.empty:
+            return None
+
+        manager = self.adaptive_manager
+        best = results.iloc[0]
+        manager.config.base_pass_threshold = float(best['pass_threshold'])
+        manager.config.base_buy_threshold = float(best['buy_threshold'])
+        manager.config.dynamic_weights = {
+            key: float(best[key]) for key in manager.config.dynamic_weights if key in best
+        }
+        manager.save_config(manager.config)
+
+        logger.info(f"✅ 적응형 설정 갱신: {best['name']}")
+        return best.to_dict()
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description='적응형 임계점/가중치 파라미터 스윕')
+    parser.add_argument('--db-path', default='./makenaide_local.db', help='SQLite DB 경로')
+    parser.add_argument('--start', dest='start_date', help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', dest='end_date', help='종료일 (YYYY-MM-DD)')
+    parser.add_argument('--tickers', nargs='*', help='대상 종목 (기본: 전체)')
+    parser.add_argument('--cache', default='parameter_sweep_cache.pkl', help='모듈 점수 캐시 경로')
+    parser.add_argument('--refresh-cache', action='store_true', help='캐시 무시하고 재채점')
+    parser.add_argument('--workers', type=int, default=BacktestConfig.max_workers, help='프로세스 수')
+    parser.add_argument('--quality-gates', action='store_true', help='Layer Quality Gate 적용')
+    parser.add_argument('--output', default='parameter_sweep_results.csv', help='결과 CSV 경로')
+    parser.add_argument('--apply', action='store_true', help='최적 설정을 adaptive_config.json에 반영')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    backtest_config = BacktestConfig(
+        db_path=args.db_path,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        tickers=args.tickers or None,
+        max_workers=args.workers
+    )
+
+    sweep = ParameterSweep(backtest_config, max_workers=args.workers,
+                           require_quality_gates=args.quality_gates)
+    sweep.load_or_build_cache(args.cache, refresh=args.refresh_cache)
+
+    results = sweep.run(sweep.build_parameter_grid())
+    if results.empty:
+        logger.warning("⚠️ 스윕 결과가 없습니다")
+        return
+
+    results.to_csv(args.output, index=False)
+    logger.info(f"💾 스윕 결과 저장: {args.output}")
+
+    if args.apply:
+        sweep.apply_best(results)
+
+
+if __name__ == "__main__":
+    main()
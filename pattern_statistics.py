@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Pattern Statistics - 패턴별 실현 거래 성과 기반 Kelly 입력값 추정
+수동으로 관리하던 패턴별 승률/손익비 대신, 청산된 포지션의 실현 수익률을 진입 시점 Kelly 패턴별로
+누적하고 사전값(기존 검증 수치)으로 베이지안 축소하여 패턴 확률을 자동 갱신
+
+🎯 핵심 기능:
+- pattern_outcome_stats 테이블: 패턴별 누적 합계 (청산 수, 승리 수, 승리 수익률 합, 손실률 합)
+- refresh: 마지막 반영 trades.id 이후 새 SELL 체결만 조회 → 해당 종목 체결 이력 재생으로 청산 포지션 식별
+  → kelly_analysis에서 진입일 기준 최근 패턴 매핑 → 누적 합계 증분 갱신 (단일 트랜잭션)
+- estimate: 누적 합계 + 사전값으로 사후 승률/평균 수익/평균 손실 (O(1), 메모리 조회)
+  · 승률: Beta 사전분포 (사전 승률 × prior_strength 가상 거래)
+  · 평균 수익/손실: 사전 평균을 prior_strength 가상 거래로 가중 평균
+  · 기본 포지션: 사전 기본 포지션 × (사후 Kelly 비율 / 사전 Kelly 비율), 0~max_position_scale배
+
+⚠️ 자동 동기화/직접 매수 보정 기록이 포함된 포지션과 패턴을 찾을 수 없는 포지션은 집계에서 제외
+
+📊 사용 예시:
+    stats = PatternStatistics('./makenaide_local.db')
+    stats.refresh()                                                   # 새 청산 거래 반영
+    probability = stats.estimate(PatternType.VCP_BREAKOUT.value, prior)
+"""
+
+import bisect
+import logging
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 집계 제외 주문 ID (포트폴리오 대사 보정 기록 - 실제 체결 손익 아님)
+CORRECTION_ORDER_PREFIXES = ('AUTO-SYNC-', 'DIRECT_PURCHASE_')
+
+
+@dataclass
+class PatternOutcomeStats:
+    """패턴별 청산 성과 누적 합계"""
+    pattern: str
+    trades: int = 0
+    wins: int = 0
+    sum_win_return: float = 0.0    # 승리 거래 수익률 합 (0.25 = 25%)
+    sum_loss_return: float = 0.0   # 손실 거래 손실률 합 (양수)
+
+    @property
+    def losses(self) -> int:
+        return self.trades - self.wins
+
+    def add(self, realized_return: float):
+        self.trades += 1
+        if realized_return > 0:
+            self.wins += 1
+            self.sum_win_return += realized_return
+        else:
+            self.sum_loss_return += -realized_return
+
+
+@dataclass
+class ClosedPosition:
+    """청산 완료 포지션 (첫 매수 ~ 수량 0 도달 SELL)"""
+    ticker: str
+    opened_at: str
+    closing_trade_id: int
+    cost_krw: float
+    proceeds_krw: float
+
+    @property
+    def realized_return(self) -> float:
+        return self.proceeds_krw / self.cost_krw - 1 if self.cost_krw > 0 else 0.0
+
+
+def kelly_fraction(win_rate: float, avg_win: float, avg_loss: float) -> float:
+    """Kelly 비율 f* = p - (1 - p) / b (b = 평균 수익 / 평균 손실)"""
+    if avg_win <= 0 or avg_loss <= 0:
+        return 0.0
+    return win_rate - (1 - win_rate) / (avg_win / avg_loss)
+
+
+class PatternStatistics:
+    """패턴별 실현 성과 누적 (증분 갱신) + 베이지안 축소 추정"""
+
+    def __init__(self, db_path: str = "./makenaide_local.db", prior_strength: float = 20.0,
+                 max_position_scale: float = 2.0, quantity_tolerance: float = 0.001):
+        self.db_path = db_path
+        self.prior_strength = prior_strength          # 사전값 가상 거래 수 (클수록 사전값 유지)
+        self.max_position_scale = max_position_scale  # 사전 기본 포지션 대비 최대 배수
+        self.quantity_tolerance = quantity_tolerance  # 잔량 ≤ 최대 보유량 × 허용치 → 청산
+        self.stats: Dict[str, PatternOutcomeStats] = {}
+        self.last_trade_id = 0
+        self.ensure_tables()
+        self.load()
+
+    @contextmanager
+    def _connect(self):
+        """연결 1개 (정상 종료 시 commit, 예외 시 rollback 후 닫기)"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ensure_tables(self):
+        try:
+            with self._connect() as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS pattern_outcome_stats (
+                        pattern_type TEXT PRIMARY KEY,
+                        trades INTEGER NOT NULL DEFAULT 0,
+                        wins INTEGER NOT NULL DEFAULT 0,
+                        sum_win_return REAL NOT NULL DEFAULT 0,
+                        sum_loss_return REAL NOT NULL DEFAULT 0,
+                        updated_at TEXT DEFAULT (datetime('now'))
+                    );
+                    CREATE TABLE IF NOT EXISTS pattern_outcome_state (
+                        id INTEGER PRIMARY KEY CHECK(id = 1),
+                        last_trade_id INTEGER NOT NULL DEFAULT 0,
+                        updated_at TEXT DEFAULT (datetime('now'))
+                    );
+                """)
+        except Exception as e:
+            logger.warning(f"⚠️ 패턴 성과 테이블 생성 스킵: {e}")
+
+    def load(self):
+        """누적 합계 + 마지막 반영 trades.id 적재"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute("""
+                    SELECT pattern_type, trades, wins, sum_win_return, sum_loss_return
+                    FROM pattern_outcome_stats
+                """).fetchall()
+                state = conn.execute("SELECT last_trade_id FROM pattern_outcome_state WHERE id = 1").fetchone()
+
+            self.stats = {row[0]: PatternOutcomeStats(*row) for row in rows}
+            self.last_trade_id = state[0] if state else 0
+
+        except Exception as e:
+            logger.warning(f"⚠️ 패턴 성과 통계 로드 실패: {e}")
+
+    def _replay_positions(self, history: List[Tuple]) -> List[ClosedPosition]:
+        """
+        종목 체결 이력 재생 → 새로 청산된 포지션 목록
+
+        Args:
+            history: (id, ticker, order_type, filled_quantity, filled_amount, fee, created_at, order_id) - 종목/ID 순
+        """
+        closed = []
+        position = None
+
+        for trade_id, ticker, order_type, quantity, amount, fee, created_at, order_id in history:
+            if position is None or position['ticker'] != ticker:
+                position = {'ticker': ticker, 'quantity': 0.0}
+
+            if position['quantity'] <= 0:
+                if order_type != 'BUY':
+                    continue
+                position.update(opened_at=created_at, cost=0.0, proceeds=0.0, peak=0.0, corrected=False)
+
+            position['corrected'] |= bool(order_id and order_id.startswith(CORRECTION_ORDER_PREFIXES))
+            if order_type == 'BUY':
+                position['quantity'] += quantity
+                position['cost'] += amount + (fee or 0.0)
+                position['peak'] = max(position['peak'], position['quantity'])
+                continue
+
+            position['quantity'] -= quantity
+            position['proceeds'] += amount - (fee or 0.0)
+            if position['quantity'] <= position['peak'] * self.quantity_tolerance:
+                position['quantity'] = 0.0
+                if trade_id > self.last_trade_id and not position['corrected']:
+                    closed.append(ClosedPosition(ticker, position['opened_at'], trade_id,
+                                                 position['cost'], position['proceeds']))
+        return closed
+
+    @staticmethod
+    def _pattern_at(history: List[Tuple[str, str]], opened_at: str) -> Optional[str]:
+        """진입일 이전(당일 포함) 가장 최근 Kelly 분석 패턴"""
+        dates = [analysis_date for analysis_date, _ in history]
+        position = bisect.bisect_right(dates, (opened_at or '')[:10])
+        return history[position - 1][1] if position else None
+
+    def refresh(self) -> int:
+        """
+        마지막 반영 이후 새 SELL 체결로 청산된 포지션을 패턴별 누적 합계에 반영
+
+        Returns:
+            반영된 청산 포지션 수 (실패 시 0)
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT ticker, MAX(id) FROM trades
+                    WHERE order_type = 'SELL' AND status IN ('FULL_FILLED', 'PARTIAL_FILLED') AND id > ?
+                    GROUP BY ticker
+                """, (self.last_trade_id,))
+                rows = cursor.fetchall()
+                if not rows:
+                    return 0
+
+                tickers = [row[0] for row in rows]
+                max_trade_id = max(row[1] for row in rows)
+                placeholders = ','.join('?' * len(tickers))
+
+                cursor.execute(f"""
+                    SELECT id, ticker, order_type, filled_quantity, filled_amount, fee, created_at, order_id
+                    FROM trades
+                    WHERE ticker IN ({placeholders}) AND status IN ('FULL_FILLED', 'PARTIAL_FILLED') AND id <= ?
+                    ORDER BY ticker, id
+                """, (*tickers, max_trade_id))
+                closed = self._replay_positions(cursor.fetchall())
+
+                cursor.execute(f"""
+                    SELECT ticker, analysis_date, detected_pattern FROM kelly_analysis
+                    WHERE ticker IN ({placeholders})
+                    ORDER BY ticker, analysis_date
+                """, tickers)
+                patterns: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+                for ticker, analysis_date, pattern in cursor.fetchall():
+                    patterns[ticker].append((analysis_date, pattern))
+
+                changed = {}
+                applied = 0
+                for position in closed:
+                    pattern = self._pattern_at(patterns.get(position.ticker, []), position.opened_at)
+                    if pattern is None:
+                        continue
+                    if pattern not in changed:
+                        # 저장 실패 시 메모리 합계가 변하지 않도록 사본에 누적
+                        changed[pattern] = replace(self.stats[pattern]) if pattern in self.stats else PatternOutcomeStats(pattern)
+                    changed[pattern].add(position.realized_return)
+                    applied += 1
+
+                # 누적 합계 + 반영 위치를 한 트랜잭션으로 저장 (실패 시 롤백 → 다음 refresh에서 재시도)
+                now = datetime.now().isoformat()
+                conn.executemany("""
+                    INSERT INTO pattern_outcome_stats
+                        (pattern_type, trades, wins, sum_win_return, sum_loss_return, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(pattern_type) DO UPDATE SET
+                        trades = excluded.trades, wins = excluded.wins,
+                        sum_win_return = excluded.sum_win_return, sum_loss_return = excluded.sum_loss_return,
+                        updated_at = excluded.updated_at
+                """, [(s.pattern, s.trades, s.wins, s.sum_win_return, s.sum_loss_return, now)
+                      for s in changed.values()])
+                conn.execute("""
+                    INSERT INTO pattern_outcome_state (id, last_trade_id, updated_at) VALUES (1, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET last_trade_id = excluded.last_trade_id, updated_at = excluded.updated_at
+                """, (max_trade_id, now))
+
+            self.stats.update(changed)
+            self.last_trade_id = max_trade_id
+            if applied:
+                logger.info(f"📈 패턴 성과 갱신: 청산 포지션 {applied}개 반영 ({', '.join(sorted(changed))})")
+            return applied
+
+        except Exception as e:
+            logger.warning(f"⚠️ 패턴 성과 통계 갱신 실패: {e}")
+            return 0
+
+    def estimate(self, pattern: str, prior):
+        """
+        사전값으로 축소한 사후 패턴 확률 (O(1))
+
+        Args:
+            pattern: PatternType 값 (kelly_analysis.detected_pattern)
+            prior: 사전 PatternProbability (win_rate, avg_win, avg_loss, base_position)
+
+        Returns:
+            prior와 같은 타입 - 실현 표본이 없으면 prior 그대로
+        """
+        stats = self.stats.get(pattern)
+        if not stats or stats.trades == 0:
+            return prior
+
+        k = self.prior_strength
+        win_rate = (stats.wins + prior.win_rate * k) / (stats.trades + k)
+        avg_win = (stats.sum_win_return + prior.avg_win * k) / (stats.wins + k)
+        avg_loss = (stats.sum_loss_return + prior.avg_loss * k) / (stats.losses + k)
+
+        prior_fraction = kelly_fraction(prior.win_rate, prior.avg_win, prior.avg_loss)
+        posterior_fraction = kelly_fraction(win_rate, avg_win, avg_loss)
+        scale = posterior_fraction / prior_fraction if prior_fraction > 0 else 1.0
+
+        return replace(
+            prior,
+            win_rate=win_rate,
+            avg_win=avg_win,
+            avg_loss=avg_loss,
+            base_position=prior.base_position * min(max(scale, 0.0), self.max_position_scale),
+            sample_size=stats.trades
+        )
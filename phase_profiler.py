@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Phase Profiler - 파이프라인 단계별 프로파일러
+makenaide.py --profile 실행 시 Phase 단위로 프로파일링하여 로그 디렉터리에 저장하고
+실행 보고서용 hot function Top-N 요약을 생성
+
+🎯 프로파일링 모드:
+- cprofile: Phase마다 cProfile 활성화 → profile_<run_id>_<phase>.prof (pstats 형식)
+  · 함수별 호출 수/자체 시간/누적 시간이 정확하지만 호출 스레드만 측정
+  · 확인: python -m pstats logs/profile_xxx.prof  또는  snakeviz logs/profile_xxx.prof
+- sampling: 백그라운드 스레드가 모든 스레드의 스택을 주기적으로 샘플링
+  → profile_<run_id>_<phase>.collapsed (flamegraph collapsed stack 형식)
+  · 오버헤드가 낮고 asyncio.to_thread / 스레드풀 워커까지 포함
+  · 확인: flamegraph.pl logs/profile_xxx.collapsed > flame.svg  또는 speedscope
+
+📊 사용 예시:
+    profiler = activate_profiler(PhaseProfiler("./logs", run_id, mode="sampling"))
+    with profile_phase("Phase 1: Data Collection"):
+        ...
+    summary = profiler.finish()
+    deactivate_profiler()
+"""
+
+import os
+import re
+import sys
+import time
+import pstats
+import logging
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('cprofile', 'sampling')
+
+_NULL_PHASE = nullcontext()
+
+
+def _slugify(name: str) -> str:
+    """Phase 이름 → 파일명용 slug"""
+    return re.sub(r'[^0-9A-Za-z]+', '_', name).strip('_').lower() or 'phase'
+
+
+def _frame_label(code) -> str:
+    """collapsed stack 프레임 라벨 (';'는 구분자이므로 사용하지 않음)"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _StackSampler(threading.Thread):
+    """활성 Phase 동안 전체 스레드 스택을 주기적으로 수집하는 샘플러"""
+
+    def __init__(self, interval: float):
+        super().__init__(name="phase-profiler-sampler", daemon=True)
+        self.interval = interval
+        self.current_phase: Optional[str] = None
+        self.stacks: Dict[str, Counter] = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            phase = self.current_phase
+            if phase is None:
+                continue
+
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            counter = self.stacks.setdefault(phase, Counter())
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(thread_names.get(ident, str(ident)))
+                labels.reverse()
+                counter[';'.join(labels)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
+
+class PhaseProfiler:
+    """Phase 단위 프로파일 수집 및 저장"""
+
+    def __init__(self, output_dir: str, run_id: str, mode: str = 'cprofile',
+                 top_n: int = 15, sampling_interval: float = 0.01):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일링 모드: {mode} (가능: {', '.join(PROFILE_MODES)})")
+
+        self.output_dir = output_dir
+        self.run_id = run_id
+        self.mode = mode
+        self.top_n = top_n
+        self.sampling_interval = sampling_interval
+
+        self.phase_results: Dict[str, Dict[str, Any]] = {}
+        self._active_phase: Optional[str] = None
+        self._lock = threading.Lock()
+        self._sampler: Optional[_StackSampler] = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if self.mode == 'sampling':
+            self._sampler = _StackSampler(self.sampling_interval)
+            self._sampler.start()
+
+    def _phase_path(self, phase: str, extension: str) -> str:
+        return os.path.join(self.output_dir, f"profile_{self.run_id}_{_slugify(phase)}.{extension}")
+
+    @contextmanager
+    def phase(self, name: str):
+        """Phase 프로파일링 (중첩된 Phase는 바깥 Phase에 합산)"""
+        with self._lock:
+            if self._active_phase is not None:
+                nested = True
+            else:
+                nested = False
+                self._active_phase = name
+
+        if nested:
+            yield
+            return
+
+        profile = None
+        start_time = time.perf_counter()
+        try:
+            if self.mode == 'cprofile':
+                profile = cProfile.Profile()
+                profile.enable()
+            else:
+                self._sampler.current_phase = name
+
+            yield
+
+        finally:
+            if profile is not None:
+                profile.disable()
+            elif self._sampler is not None:
+                self._sampler.current_phase = None
+
+            duration_s = time.perf_counter() - start_time
+            with self._lock:
+                self._active_phase = None
+
+            if profile is not None:
+                self._save_cprofile(name, profile, duration_s)
+            else:
+                self.phase_results[name] = {'duration_seconds': round(duration_s, 3)}
+
+    def _save_cprofile(self, phase: str, profile: cProfile.Profile, duration_s: float):
+        """pstats 파일 저장 및 tottime 기준 Top-N 추출"""
+        try:
+            path = self._phase_path(phase, 'prof')
+            profile.dump_stats(path)
+
+            stats = pstats.Stats(profile)
+            rows = []
+            for (filename, line, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+                label = func if filename == '~' else f"{func} ({os.path.basename(filename)}:{line})"
+                rows.append({
+                    'function': label,
+                    'calls': nc,
+                    'self_ms': round(tt * 1000, 2),
+                    'cumulative_ms': round(ct * 1000, 2)
+                })
+            rows.sort(key=lambda row: row['self_ms'], reverse=True)
+
+            self.phase_results[phase] = {
+                'duration_seconds': round(duration_s, 3),
+                'file': path,
+                'top_functions': rows[:self.top_n]
+            }
+
+        except Exception as e:
+            logger.error(f"❌ {phase} 프로파일 저장 실패: {e}")
+
+    def _save_sampling(self):
+        """Phase별 collapsed stack 파일 저장 및 leaf 함수 기준 Top-N 추출"""
+        for phase, counter in self._sampler.stacks.items():
+            try:
+                path = self._phase_path(phase, 'collapsed')
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, count in counter.most_common():
+                        f.write(f"{stack} {count}\n")
+
+                total_samples = sum(counter.values())
+                self_samples = Counter()
+                for stack, count in counter.items():
+                    self_samples[stack.rsplit(';', 1)[-1]] += count
+
+                result = self.phase_results.setdefault(phase, {})
+                result.update({
+                    'file': path,
+                    'samples': total_samples,
+                    'top_functions': [
+                        {
+                            'function': label,
+                            'samples': count,
+                            'self_ms': round(count * self.sampling_interval * 1000, 1),
+                            'pct': round(count / total_samples * 100, 1)
+                        }
+                        for label, count in self_samples.most_common(self.top_n)
+                    ]
+                })
+
+            except Exception as e:
+                logger.error(f"❌ {phase} 샘플링 프로파일 저장 실패: {e}")
+
+    def finish(self) -> Dict[str, Any]:
+        """샘플러 종료 및 프로파일 요약 반환"""
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._save_sampling()
+            self._sampler = None
+
+        logger.info(f"🔬 프로파일 저장 완료: {len(self.phase_results)}개 Phase ({self.mode}, {self.output_dir})")
+        return {
+            'mode': self.mode,
+            'run_id': self.run_id,
+            'phases': self.phase_results
+        }
+
+
+# ----------------------------------------------------------------------
+# 전역 활성 프로파일러 (trace_recorder.traced Phase 경계에서 사용)
+# ----------------------------------------------------------------------
+
+_active_profiler: Optional[PhaseProfiler] = None
+
+
+def activate_profiler(profiler: PhaseProfiler) -> PhaseProfiler:
+    global _active_profiler
+    _active_profiler = profiler
+    return profiler
+
+
+def deactivate_profiler():
+    global _active_profiler
+    _active_profiler = None
+
+
+def profile_phase(name: str):
+    """활성 프로파일러가 있으면 Phase 프로파일링, 없으면 no-op 컨텍스트"""
+    profiler = _active_profiler
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Portfolio Reconciler - 업비트 잔고 ↔ trades 테이블 포지션 대사
+종목별 쿼리/리스트 탐색 대신 집계 쿼리 1회로 DB 순포지션 해시맵을 만들고,
+잔고 스냅샷 1회와 O(N)으로 비교한 뒤 보정 기록을 단일 트랜잭션으로 저장
+
+🎯 핵심 기능:
+- load_db_positions: 종목별 매수/매도 체결 수량·금액 합계를 GROUP BY 1회로 조회 → {ticker: DbPosition}
+- diff: 거래소 잔고 해시맵과 DB 순포지션 해시맵의 합집합을 한 번 순회하여 보정 항목 생성
+  · missing: 거래소에 있으나 DB 매수 기록 없음 (직접 매수 / 동기화 누락)
+  · under_recorded: 거래소 수량 > DB 순수량 (추가 직접 매수 등) → 차이만큼 BUY 보정
+  · over_recorded / stale: 거래소 수량 < DB 순수량 또는 거래소에 없음 (외부 매도 등) → 차이만큼 SELL 보정 (DB 평단 기준, 손익 0)
+    거래소 수량은 미체결 주문 묶인 수량(locked) 포함 - SELL 보정 저장은 호출 측 명시적 허용 시에만
+- apply: 보정 기록 전체를 명시적 트랜잭션 1개 (BEGIN → executemany 1회 → COMMIT)로 저장
+
+📊 사용 예시:
+    reconciler = PortfolioReconciler()
+    report = reconciler.reconcile(parsed_balances)     # [{'ticker', 'balance', 'avg_buy_price'}, ...]
+    reconciler.apply(report.corrections, source='AUTO_SYNC')
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from db_manager_sqlite import get_db_connection_context
+
+logger = logging.getLogger(__name__)
+
+# 보정 기록 출처별 주문 ID 형식 / 수수료 추정 / error_message 표식 (기존 동기화 기록과 동일)
+CORRECTION_SOURCES = {
+    'AUTO_SYNC': {'order_id': 'AUTO-SYNC-{ticker}-{stamp}', 'fee_rate': 0.0005, 'marker': 'AUTO_SYNC'},
+    'DIRECT_PURCHASE': {'order_id': 'DIRECT_PURCHASE_{ticker}_{stamp}', 'fee_rate': 0.0, 'marker': None},
+}
+
+
+@dataclass
+class DbPosition:
+    """trades 테이블 기준 종목 순포지션"""
+    ticker: str
+    bought_quantity: float = 0.0
+    sold_quantity: float = 0.0
+    bought_amount: float = 0.0
+    buy_count: int = 0
+    last_buy_at: Optional[str] = None
+
+    @property
+    def net_quantity(self) -> float:
+        return self.bought_quantity - self.sold_quantity
+
+    @property
+    def avg_buy_price(self) -> float:
+        return self.bought_amount / self.bought_quantity if self.bought_quantity > 0 else 0.0
+
+
+@dataclass
+class PositionCorrection:
+    """거래소 잔고에 맞추기 위한 보정 항목"""
+    ticker: str
+    kind: str                  # 'missing' | 'under_recorded' | 'over_recorded' | 'stale'
+    exchange_quantity: float
+    db_quantity: float
+    price: float               # 보정 기록 단가 (BUY: 거래소 평단, SELL: DB 평단)
+
+    @property
+    def diff_quantity(self) -> float:
+        return self.exchange_quantity - self.db_quantity
+
+    @property
+    def order_type(self) -> str:
+        return 'BUY' if self.diff_quantity > 0 else 'SELL'
+
+    @property
+    def value_krw(self) -> float:
+        return abs(self.diff_quantity) * self.price
+
+    def as_missing_trade(self) -> Dict[str, Any]:
+        """기존 누락 거래 형식 ({'ticker', 'balance', 'avg_buy_price'}) - 보정 수량 기준"""
+        return {'ticker': self.ticker, 'balance': abs(self.diff_quantity), 'avg_buy_price': self.price}
+
+
+@dataclass
+class ReconciliationReport:
+    """대사 결과"""
+    exchange: Dict[str, Dict[str, float]] = field(default_factory=dict)   # ticker → {'balance', 'avg_buy_price'}
+    db_positions: Dict[str, DbPosition] = field(default_factory=dict)
+    corrections: List[PositionCorrection] = field(default_factory=list)
+    matched: int = 0
+    checked_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def missing(self) -> List[PositionCorrection]:
+        return [c for c in self.corrections if c.kind == 'missing']
+
+    @property
+    def missing_trades(self) -> List[Dict[str, Any]]:
+        """BUY 보정 대상 (DB에 없거나 부족하게 기록된 잔고)"""
+        return [c.as_missing_trade() for c in self.corrections if c.order_type == 'BUY']
+
+    @property
+    def is_synced(self) -> bool:
+        return not self.corrections
+
+
+class PortfolioReconciler:
+    """거래소 잔고와 trades 순포지션 대사 (집계 쿼리 1회 + O(N) 비교 + 단일 트랜잭션 보정)"""
+
+    def __init__(self, quantity_tolerance: float = 0.001, dust_krw: float = 5000.0):
+        self.quantity_tolerance = quantity_tolerance  # 상대 수량 오차 허용 (0.1%)
+        self.dust_krw = dust_krw                      # 업비트 최소 주문 금액 미만 차이는 무시
+
+    def load_db_positions(self) -> Dict[str, DbPosition]:
+        """체결된 매수/매도 기록을 종목별로 집계 (GROUP BY 1회)"""
+        with get_db_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT ticker,
+                       SUM(CASE WHEN order_type = 'BUY' THEN filled_quantity ELSE 0 END),
+                       SUM(CASE WHEN order_type = 'SELL' THEN filled_quantity ELSE 0 END),
+                       SUM(CASE WHEN order_type = 'BUY' THEN filled_amount ELSE 0 END),
+                       SUM(CASE WHEN order_type = 'BUY' THEN 1 ELSE 0 END),
+                       MAX(CASE WHEN order_type = 'BUY' THEN created_at END)
+                FROM trades
+                WHERE status IN ('FULL_FILLED', 'PARTIAL_FILLED')
+                GROUP BY ticker
+            """)
+
+            return {
+                row[0]: DbPosition(
+                    ticker=row[0],
+                    bought_quantity=row[1] or 0.0,
+                    sold_quantity=row[2] or 0.0,
+                    bought_amount=row[3] or 0.0,
+                    buy_count=row[4] or 0,
+                    last_buy_at=row[5]
+                )
+                for row in cursor.fetchall()
+            }
+
+    def diff(self, exchange: Dict[str, Dict[str, float]], db_positions: Dict[str, DbPosition]) -> List[PositionCorrection]:
+        """거래소 잔고 ↔ DB 순포지션 비교 (두 해시맵의 합집합 1회 순회)"""
+        corrections = []
+
+        for ticker in exchange.keys() | db_positions.keys():
+            holding = exchange.get(ticker)
+            position = db_positions.get(ticker)
+
+            exchange_quantity = holding['balance'] if holding else 0.0
+            db_quantity = max(0.0, position.net_quantity) if position else 0.0
+            diff = exchange_quantity - db_quantity
+
+            if abs(diff) <= max(exchange_quantity, db_quantity) * self.quantity_tolerance:
+                continue
+
+            if diff > 0:
+                kind = 'missing' if not position or position.buy_count == 0 else 'under_recorded'
+                price = holding['avg_buy_price']
+            else:
+                kind = 'stale' if not holding else 'over_recorded'
+                price = position.avg_buy_price or (holding['avg_buy_price'] if holding else 0.0)
+
+            correction = PositionCorrection(
+                ticker=ticker,
+                kind=kind,
+                exchange_quantity=exchange_quantity,
+                db_quantity=db_quantity,
+                price=price
+            )
+            if correction.value_krw < self.dust_krw:
+                continue
+            corrections.append(correction)
+
+        corrections.sort(key=lambda c: c.ticker)
+        return corrections
+
+    def reconcile(self, balances: List[Dict[str, Any]]) -> ReconciliationReport:
+        """
+        잔고 스냅샷 대사
+
+        Args:
+            balances: 파싱된 업비트 잔고 [{'ticker': 'KRW-BTC', 'balance': 0.5, 'avg_buy_price': 50000000}, ...]
+        """
+        report = ReconciliationReport(
+            exchange={b['ticker']: {'balance': b['balance'], 'avg_buy_price': b['avg_buy_price']} for b in balances},
+            db_positions=self.load_db_positions()
+        )
+        report.corrections = self.diff(report.exchange, report.db_positions)
+        report.matched = len(report.exchange.keys() | report.db_positions.keys()) - len(report.corrections)
+
+        for correction in report.corrections:
+            logger.warning(f"⚠️ 포트폴리오 불일치 ({correction.kind}): {correction.ticker} "
+                           f"거래소 {correction.exchange_quantity:.8f} / DB {correction.db_quantity:.8f}")
+        return report
+
+    def apply(self, corrections: List[PositionCorrection], source: str = 'AUTO_SYNC') -> int:
+        """
+        보정 기록 일괄 저장 (executemany 1회, 단일 트랜잭션 - 실패 시 전체 롤백)
+
+        Returns:
+            저장된 보정 기록 수 (실패 시 0)
+        """
+        if not corrections:
+            return 0
+
+        settings = CORRECTION_SOURCES[source]
+        now = datetime.now()
+        stamp = int(now.timestamp())
+
+        # AUTO_SYNC는 추정 매수 시각(전일 09:00), 직접 매수는 감지 시각으로 기록
+        if source == 'AUTO_SYNC':
+            recorded_at = (now - timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+        else:
+            recorded_at = now
+
+        rows = []
+        for correction in corrections:
+            quantity = abs(correction.diff_quantity)
+            amount = quantity * correction.price
+            order_id = settings['order_id'].format(ticker=correction.ticker, stamp=stamp)
+            if correction.order_type == 'SELL':
+                order_id += '-SELL'
+
+            rows.append((
+                correction.ticker, correction.order_type, 'FULL_FILLED', order_id,
+                quantity, quantity, amount, amount, correction.price,
+                1.0, False, correction.order_type == 'BUY',
+                amount * settings['fee_rate'],
+                recorded_at.isoformat(), now.isoformat(), now.isoformat(),
+                settings['marker']
+            ))
+
+        try:
+            with get_db_connection_context() as conn:
+                # 풀 연결은 자동 커밋 모드(isolation_level=None)이므로 명시적으로 트랜잭션 시작
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    conn.executemany("""
+                        INSERT INTO trades (
+                            ticker, order_type, status, order_id,
+                            requested_quantity, filled_quantity,
+                            requested_amount, filled_amount, average_price,
+                            fill_rate, is_pyramid, is_pyramid_eligible,
+                            fee, timestamp, created_at, updated_at, error_message
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+                    conn.commit()
+                except Exception:
+                    # 앞서 삽입된 행까지 전체 롤백 (부분 저장 방지)
+                    conn.rollback()
+                    raise
+
+            logger.info(f"✅ 포트폴리오 보정 기록 {len(rows)}건 저장 ({source})")
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"❌ 포트폴리오 보정 기록 저장 실패 ({source}): {e}")
+            return 0
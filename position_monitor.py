@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Position Monitor - 상주형 장중 포지션 모니터
+업비트 웹소켓 ticker 스트림으로 보유 종목 체결가를 받아
+틱마다 LocalTradingEngine.check_sell_conditions를 메모리 데이터만으로 평가하고
+청산 신호 발생 시 즉시 매도 주문을 제출한다.
+
+🎯 핵심 기능:
+- 포지션 컨텍스트(매수 시점, Stage 이력, ATR)은 시작 시와 refresh 주기에만 조회 → 틱 처리 경로에 DB 조회 없음
+- 틱 → 평가 → 매도 제출까지 ms 단위 (매도 주문은 워커 스레드에서 실행, 공유 레이트 리미터 경유)
+- 트레일링 스탑 최고가는 메모리에서 갱신하고 flush 주기마다 trailing_stops에 일괄 저장
+- 웹소켓 끊김 시 지수 백오프 재접속, 보유 종목 변경 시 구독 갱신
+
+📡 가격 피드:
+- UpbitTickerFeed: wss://api.upbit.com/websocket/v1 ticker 스트림 (--record로 원본 메시지 저장 가능)
+- ReplayPriceFeed: 저장된 메시지(JSONL) / CSV(ticker,price,timestamp) / OHLCV 프레임 재생 (테스트용)
+
+📊 사용 예시:
+    python position_monitor.py                          # 실시간 모니터링 (실제 매도)
+    python position_monitor.py --dry-run                # 청산 신호만 기록, 주문 없음
+    python position_monitor.py --record ./logs/ticks.jsonl
+    python position_monitor.py --dry-run --replay ./logs/ticks.jsonl --speed 10
+"""
+
+import os
+import csv
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+try:
+    import websockets
+    from websockets.exceptions import WebSocketException
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+from trading_engine import LocalTradingEngine, TradingConfig, PositionInfo, PositionContext
+from trade_status import TradeStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceTick:
+    """체결가 틱"""
+    ticker: str
+    price: float
+    timestamp_ms: int
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> Optional['PriceTick']:
+        """업비트 웹소켓 ticker 메시지(DEFAULT/SIMPLE 포맷) → PriceTick"""
+        ticker = message.get('code') or message.get('cd')
+        price = message.get('trade_price', message.get('tp'))
+        if not ticker or price is None:
+            return None
+        timestamp_ms = message.get('timestamp', message.get('tms')) or int(time.time() * 1000)
+        return cls(ticker=ticker, price=float(price), timestamp_ms=int(timestamp_ms))
+
+
+class UpbitTickerFeed:
+    """업비트 웹소켓 ticker 스트림 (자동 재접속)"""
+
+    URI = "wss://api.upbit.com/websocket/v1"
+
+    def __init__(self, record_path: Optional[str] = None,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        if not WEBSOCKETS_AVAILABLE:
+            raise ImportError("websockets 패키지가 필요합니다 (pip install websockets)")
+
+        self.codes: List[str] = []
+        self.record_path = record_path
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._ws = None
+        self._closed = False
+        self._codes_changed = asyncio.Event()
+        self._record_file = None
+
+    async def update_codes(self, codes: List[str]):
+        """구독 종목 변경 (현재 연결을 닫고 새 구독으로 재접속)"""
+        self.codes = sorted(set(codes))
+        self._codes_changed.set()
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def ticks(self) -> AsyncIterator[PriceTick]:
+        delay = self.reconnect_delay
+        if self.record_path:
+            os.makedirs(os.path.dirname(self.record_path) or '.', exist_ok=True)
+            self._record_file = open(self.record_path, 'a', encoding='utf-8')
+
+        try:
+            while not self._closed:
+                if not self.codes:
+                    self._codes_changed.clear()
+                    await self._codes_changed.wait()
+                    continue
+
+                try:
+                    async with websockets.connect(self.URI, ping_interval=60) as ws:
+                        self._ws = ws
+                        await ws.send(json.dumps([
+                            {'ticket': str(uuid.uuid4())[:8]},
+                            {'type': 'ticker', 'codes': self.codes, 'isOnlyRealtime': True}
+                        ]))
+                        logger.info(f"📡 웹소켓 구독: {len(self.codes)}개 종목")
+                        delay = self.reconnect_delay
+
+                        async for raw in ws:
+                            message = json.loads(raw)
+                            if self._record_file:
+                                self._record_file.write(json.dumps(message, ensure_ascii=False) + '\n')
+                            tick = PriceTick.from_message(message)
+                            if tick:
+                                yield tick
+
+                except (WebSocketException, OSError) as e:
+                    # 연결 끊김뿐 아니라 핸드셰이크 거부(InvalidStatus: 429/5xx 등)도 백오프 후 재접속
+                    if self._closed:
+                        break
+                    if self._codes_changed.is_set():
+                        self._codes_changed.clear()
+                        continue
+                    logger.warning(f"⚠️ 웹소켓 연결 실패/끊김: {e} - {delay:.1f}초 후 재접속")
+                    await asyncio.sleep(delay)
+                    delay = min(self.max_reconnect_delay, delay * 2)
+
+                finally:
+                    self._ws = None
+
+        finally:
+            if self._record_file:
+                self._record_file.close()
+                self._record_file = None
+
+    async def close(self):
+        self._closed = True
+        self._codes_changed.set()
+        if self._ws is not None:
+            await self._ws.close()
+
+
+class ReplayPriceFeed:
+    """저장된 틱 재생 피드 (speed=0이면 대기 없이 최대 속도)"""
+
+    def __init__(self, ticks: Iterable[PriceTick], speed: float = 0.0):
+        self._ticks = sorted(ticks, key=lambda tick: tick.timestamp_ms)
+        self.speed = speed
+        self.codes: Set[str] = set()
+        self._closed = False
+
+    @classmethod
+    def from_file(cls, path: str, speed: float = 0.0) -> 'ReplayPriceFeed':
+        """JSONL(웹소켓 원본 메시지, --record 결과) 또는 CSV(ticker,price,timestamp_ms) 로드"""
+        ticks = []
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.csv'):
+                for row in csv.DictReader(f):
+                    ticks.append(PriceTick(row['ticker'], float(row['price']), int(float(row['timestamp_ms']))))
+            else:
+                for line in f:
+                    if line.strip():
+                        tick = PriceTick.from_message(json.loads(line))
+                        if tick:
+                            ticks.append(tick)
+
+        logger.info(f"📼 리플레이 로드: {path} ({len(ticks)}개 틱)")
+        return cls(ticks, speed)
+
+    @classmethod
+    def from_ohlcv(cls, frames: Dict[str, pd.DataFrame], speed: float = 0.0) -> 'ReplayPriceFeed':
+        """
+        OHLCV 프레임 → 틱 (봉마다 open → low → high → close 순서)
+
+        저가를 고가보다 먼저 재생하여 스탑 조건을 보수적으로 검증한다.
+        """
+        ticks = []
+        for ticker, df in frames.items():
+            if df is None or df.empty:
+                continue
+            index_ms = (pd.DatetimeIndex(df.index).asi8 // 1_000_000).tolist()
+            for ts, open_, low, high, close in zip(index_ms, df['open'], df['low'], df['high'], df['close']):
+                for offset, price in enumerate((open_, low, high, close)):
+                    ticks.append(PriceTick(ticker, float(price), int(ts) + offset))
+        return cls(ticks, speed)
+
+    async def update_codes(self, codes: List[str]):
+        self.codes = set(codes)
+
+    async def ticks(self) -> AsyncIterator[PriceTick]:
+        previous_ms = None
+        for tick in self._ticks:
+            if self._closed:
+                break
+            if self.speed > 0 and previous_ms is not None:
+                await asyncio.sleep(max(0.0, (tick.timestamp_ms - previous_ms) / 1000 / self.speed))
+            previous_ms = tick.timestamp_ms
+
+            if tick.ticker in self.codes:
+                yield tick
+            elif self.speed <= 0:
+                # 최대 속도 재생 시에도 이벤트 루프에 제어권 양보 (매도 태스크 진행)
+                await asyncio.sleep(0)
+
+    async def close(self):
+        self._closed = True
+
+
+class PositionMonitor:
+    """틱 단위 매도 조건 평가 및 즉시 청산"""
+
+    def __init__(self, engine: LocalTradingEngine, feed, dry_run: bool = False,
+                 refresh_interval_sec: float = 300.0, flush_interval_sec: float = 30.0,
+                 exit_retry_sec: float = 30.0):
+        self.engine = engine
+        self.feed = feed
+        self.dry_run = dry_run
+        self.refresh_interval_sec = refresh_interval_sec
+        self.flush_interval_sec = flush_interval_sec
+        self.exit_retry_sec = exit_retry_sec
+
+        self.positions: Dict[str, PositionInfo] = {}
+        self.context = PositionContext()
+
+        self._exiting: Set[str] = set()
+        self._exit_blocked_until: Dict[str, float] = {}
+        self._exit_tasks: Set[asyncio.Task] = set()
+        self._eval_latencies_us: List[float] = []
+
+        self.stats = {
+            'ticks': 0,
+            'evaluations': 0,
+            'exit_signals': 0,
+            'sells_submitted': 0,
+            'sells_filled': 0,
+            'sells_failed': 0,
+            'refreshes': 0,
+            'submit_latency_ms': [],
+        }
+
+    # ------------------------------------------------------------------
+    # 포지션 / 컨텍스트 (틱 경로 밖에서만 DB 조회)
+    # ------------------------------------------------------------------
+
+    def _load_positions(self):
+        positions = self.engine.get_current_positions()
+        context = self.engine.get_position_context([position.ticker for position in positions])
+        return positions, context
+
+    async def refresh_positions(self):
+        """보유 포지션 및 포지션 컨텍스트 재조회 후 구독 종목 갱신"""
+        positions, context = await asyncio.to_thread(self._load_positions)
+
+        self.positions = {p.ticker: p for p in positions if p.ticker not in self._exiting}
+        self.context = context
+        self.stats['refreshes'] += 1
+
+        await self.feed.update_codes(list(self.positions))
+        logger.info(f"🔄 모니터링 대상 갱신: {len(self.positions)}개 포지션")
+
+    async def _periodic(self, interval: float, action):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await action()
+            except Exception as e:
+                logger.error(f"❌ 모니터 주기 작업 실패: {e}")
+
+    async def _flush_stops(self):
+        if not self.dry_run:
+            await asyncio.to_thread(self.engine.trailing_stop_manager.flush, self.engine.db_path)
+
+    # ------------------------------------------------------------------
+    # 틱 처리 (hot path: 메모리 연산만)
+    # ------------------------------------------------------------------
+
+    def handle_tick(self, tick: PriceTick):
+        self.stats['ticks'] += 1
+
+        position = self.positions.get(tick.ticker)
+        if position is None or tick.ticker in self._exiting:
+            return
+
+        start = time.perf_counter()
+
+        position.current_price = tick.price
+        position.market_value = position.quantity * tick.price
+        cost_basis = position.quantity * position.avg_buy_price
+        position.unrealized_pnl = position.market_value - cost_basis
+        position.unrealized_pnl_percent = (position.unrealized_pnl / cost_basis) * 100 if cost_basis > 0 else 0.0
+
+        should_sell, reason = self.engine.check_sell_conditions(position, self.context)
+
+        self.stats['evaluations'] += 1
+        self._eval_latencies_us.append((time.perf_counter() - start) * 1e6)
+
+        if not should_sell or time.monotonic() < self._exit_blocked_until.get(tick.ticker, 0.0):
+            return
+
+        self.stats['exit_signals'] += 1
+        self._exiting.add(tick.ticker)
+        task = asyncio.create_task(self._submit_exit(position, reason, start))
+        self._exit_tasks.add(task)
+        task.add_done_callback(self._exit_tasks.discard)
+
+    async def _submit_exit(self, position: PositionInfo, reason: str, signal_time: float):
+        ticker = position.ticker
+        logger.info(f"🚨 {ticker} 청산 신호 ({position.current_price:,.0f}원, {position.unrealized_pnl_percent:+.1f}%): {reason}")
+
+        if self.dry_run:
+            self.stats['submit_latency_ms'].append((time.perf_counter() - signal_time) * 1000)
+            self.positions.pop(ticker, None)
+            await self.feed.update_codes(list(self.positions))
+            return
+
+        def sell():
+            # 스레드 시작 시점 = 주문 제출 시점
+            self.stats['submit_latency_ms'].append((time.perf_counter() - signal_time) * 1000)
+            return self.engine.execute_sell_order(ticker)
+
+        self.stats['sells_submitted'] += 1
+        try:
+            result = await asyncio.to_thread(sell)
+            filled = result.status in (TradeStatus.FULL_FILLED, TradeStatus.PARTIAL_FILLED)
+        except Exception as e:
+            logger.error(f"❌ {ticker} 매도 제출 실패: {e}")
+            filled = False
+            result = None
+
+        if filled:
+            self.stats['sells_filled'] += 1
+            self.positions.pop(ticker, None)
+            self._exiting.discard(ticker)
+            await self.feed.update_codes(list(self.positions))
+            logger.info(f"✅ {ticker} 청산 완료")
+        else:
+            self.stats['sells_failed'] += 1
+            self._exiting.discard(ticker)
+            self._exit_blocked_until[ticker] = time.monotonic() + self.exit_retry_sec
+            error = result.error_message if result else '예외 발생'
+            logger.warning(f"⚠️ {ticker} 청산 실패, {self.exit_retry_sec:.0f}초 후 재시도 가능: {error}")
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    async def run(self, duration_sec: Optional[float] = None) -> Dict[str, Any]:
+        """모니터링 실행 (duration_sec 경과 또는 피드 종료 시 반환)"""
+        await self.refresh_positions()
+        if not self.positions:
+            logger.info("📭 모니터링할 포지션이 없습니다")
+            return self.get_stats()
+
+        background = [
+            asyncio.create_task(self._periodic(self.refresh_interval_sec, self.refresh_positions)),
+            asyncio.create_task(self._periodic(self.flush_interval_sec, self._flush_stops)),
+        ]
+        deadline = time.monotonic() + duration_sec if duration_sec else None
+
+        try:
+            async for tick in self.feed.ticks():
+                self.handle_tick(tick)
+                if deadline and time.monotonic() >= deadline:
+                    break
+                if not self.positions and not self._exit_tasks:
+                    logger.info("📭 모든 포지션 청산 - 모니터 종료")
+                    break
+
+        finally:
+            for task in background:
+                task.cancel()
+            await self.feed.close()
+            if self._exit_tasks:
+                await asyncio.gather(*self._exit_tasks, return_exceptions=True)
+            await self._flush_stops()
+
+        stats = self.get_stats()
+        logger.info(f"📊 모니터 종료: 틱 {stats['ticks']}개, 평가 {stats['evaluations']}회 "
+                    f"(p50 {stats['eval_p50_us']:.0f}μs), 청산 신호 {stats['exit_signals']}개")
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._eval_latencies_us)
+        submit = sorted(self.stats['submit_latency_ms'])
+
+        def percentile(values: List[float], pct: float) -> float:
+            return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+        stats = {k: v for k, v in self.stats.items() if k != 'submit_latency_ms'}
+        stats.update({
+            'eval_p50_us': round(percentile(latencies, 0.5), 1),
+            'eval_p99_us': round(percentile(latencies, 0.99), 1),
+            'submit_latency_ms_max': round(submit[-1], 2) if submit else 0.0,
+            'open_positions': sorted(self.positions),
+        })
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Makenaide 상주형 포지션 모니터')
+    parser.add_argument('--dry-run', action='store_true', help='청산 신호만 기록하고 매도 주문은 제출하지 않음')
+    parser.add_argument('--replay', type=str, help='웹소켓 대신 재생할 틱 파일 (JSONL 또는 CSV)')
+    parser.add_argument('--speed', type=float, default=0.0, help='리플레이 배속 (0: 대기 없이 최대 속도)')
+    parser.add_argument('--record', type=str, help='웹소켓 원본 메시지 저장 경로 (JSONL)')
+    parser.add_argument('--duration', type=float, help='모니터링 시간 (초, 미지정 시 무기한)')
+    parser.add_argument('--refresh-interval', type=float, default=300.0, help='포지션/컨텍스트 재조회 주기 (초)')
+    parser.add_argument('--flush-interval', type=float, default=30.0, help='트레일링 스탑 저장 주기 (초)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # 포지션 조회는 실제 잔고 기준 (주문 제출 여부는 모니터 dry_run으로 제어)
+    engine = LocalTradingEngine(TradingConfig(), dry_run=False)
+
+    if args.replay:
+        feed = ReplayPriceFeed.from_file(args.replay, speed=args.speed)
+    else:
+        feed = UpbitTickerFeed(record_path=args.record)
+
+    monitor = PositionMonitor(
+        engine, feed,
+        dry_run=args.dry_run,
+        refresh_interval_sec=args.refresh_interval,
+        flush_interval_sec=args.flush_interval
+    )
+
+    try:
+        stats = asyncio.run(monitor.run(duration_sec=args.duration))
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    except KeyboardInterrupt:
+        logger.info("⏹️ 사용자 중단")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,8 @@ import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 
+from api_rate_limiter import get_rate_limiter
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
@@ -126,6 +128,7 @@ class FearGreedAPI:
         """현재 Fear & Greed Index 조회"""
         try:
             logger.debug("🌐 Fear & Greed Index API 호출")
+            get_rate_limiter().acquire('external')
             response = requests.get(self.api_url, timeout=self.timeout)
             response.raise_for_status()
 
@@ -224,7 +227,8 @@ class BTCTrendAnalyzer:
     def _get_current_price(self) -> Optional[float]:
         """현재가 조회"""
         try:
-            price = pyupbit.get_current_price(self.ticker)
+            price = get_rate_limiter().call('ticker', pyupbit.get_current_price, self.ticker,
+                                            limit_info_kw='limit_info')
             return float(price) if price else None
         except Exception as e:
             logger.error(f"❌ BTC 현재가 조회 실패: {e}")
@@ -233,7 +237,7 @@ class BTCTrendAnalyzer:
     def _get_ohlcv(self, interval: str, count: int) -> Optional[pd.DataFrame]:
         """OHLCV 데이터 조회"""
         try:
-            df = pyupbit.get_ohlcv(self.ticker, interval=interval, count=count)
+            df = get_rate_limiter().call('candles', pyupbit.get_ohlcv, self.ticker, interval=interval, count=count)
             return df if df is not None and len(df) >= count // 2 else None
         except Exception as e:
             logger.error(f"❌ BTC OHLCV 조회 실패 ({interval}): {e}")
@@ -320,7 +324,7 @@ class MarketBreadthAnalyzer:
             logger.debug("📊 시장 폭 분석 시작")
 
             # 전체 KRW 마켓 종목 조회
-            all_tickers = pyupbit.get_tickers(fiat="KRW")
+            all_tickers = get_rate_limiter().call('market', pyupbit.get_tickers, fiat="KRW", limit_info_kw='limit_info')
             if not all_tickers:
                 logger.error("❌ 종목 목록 조회 실패")
                 return None
@@ -328,7 +332,8 @@ class MarketBreadthAnalyzer:
             logger.debug(f"📋 전체 종목 수: {len(all_tickers)}개")
 
             # 현재가 일괄 조회
-            current_prices = pyupbit.get_current_price(all_tickers)
+            current_prices = get_rate_limiter().call('ticker', pyupbit.get_current_price, all_tickers,
+                                                     limit_info_kw='limit_info')
             if not current_prices:
                 logger.error("❌ 현재가 일괄 조회 실패")
                 return None
@@ -418,7 +423,7 @@ class MarketBreadthAnalyzer:
             for ticker in major_tickers:
                 try:
                     # 간단한 거래량 확인 (최근 데이터)
-                    ohlcv = pyupbit.get_ohlcv(ticker, interval="minute60", count=1)
+                    ohlcv = get_rate_limiter().call('candles', pyupbit.get_ohlcv, ticker, interval="minute60", count=1)
                     if ohlcv is not None and len(ohlcv) > 0:
                         volume = ohlcv.iloc[0]['volume']
                         if volume > 0:
@@ -529,7 +534,7 @@ class VolumeAnalyzer:
 
             for ticker in major_tickers:
                 try:
-                    ohlcv = pyupbit.get_ohlcv(ticker, interval="day", count=1)
+                    ohlcv = get_rate_limiter().call('candles', pyupbit.get_ohlcv, ticker, interval="day", count=1)
                     if ohlcv is not None and len(ohlcv) > 0:
                         volume = ohlcv.iloc[0]['volume']
                         close = ohlcv.iloc[0]['close']
@@ -561,7 +566,7 @@ class VolumeAnalyzer:
         """거래량 트렌드 점수 계산"""
         try:
             # BTC 거래량 기준으로 트렌드 판단
-            btc_ohlcv = pyupbit.get_ohlcv("KRW-BTC", interval="day", count=7)
+            btc_ohlcv = get_rate_limiter().call('candles', pyupbit.get_ohlcv, "KRW-BTC", interval="day", count=7)
             if btc_ohlcv is None or len(btc_ohlcv) < 7:
                 return 50.0
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Pre-Trade Risk Engine - 주문 배치 사전 리스크 한도 적용
+종목별 스칼라 클램프(max(1.0, min(x, 8.0))) 대신, 접수 직전 전체 매수 후보를 하나의 벡터로 묶어
+보유 포지션과 합산한 노출 한도를 한 번에 적용
+
+🎯 핵심 기능:
+- 공분산/상관 행렬: correlation_cache.ReturnCorrelationCache 부분 행렬 (증분 갱신 디스크 캐시)
+- PreTradeRiskEngine.check_batch: 후보 주문 금액 벡터에 한도를 순서대로 적용 (모두 numpy 벡터 연산)
+  1. 보유 종목 수 한도 (신규 종목은 요청 금액 큰 순으로 남은 슬롯만큼)
+  2. 종목별 노출 한도 (기존 보유 + 신규 ≤ max_position_pct)
+  3. 상관 클러스터 노출 한도 (상관계수 ≥ 임계값으로 연결된 종목 묶음, 기존 + 신규 ≤ max_cluster_exposure_pct)
+  4. 총 노출 한도 (기존 + 신규 ≤ max_total_exposure_pct, 현금 이내)
+  5. 낙폭 예산 (보유 미실현 손실 + 손절가까지 남은 위험 + 신규 주문 손절 위험 ≤ max_drawdown_budget_pct)
+  6. 축소 후 최소 주문 금액 미만 주문 제외
+
+📊 사용 예시:
+    engine = PreTradeRiskEngine(RiskLimits(max_position_pct=8.0))
+    report = engine.check_batch({'KRW-BTC': 80000, 'KRW-ETH': 50000}, snapshot)
+    orders = report.approved_orders     # {ticker: 승인 금액}
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from correlation_cache import ReturnCorrelationCache, get_correlation_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RiskLimits:
+    """사전 리스크 한도 (모두 총 자산 대비 %)"""
+    max_position_pct: float = 8.0            # 종목별 최대 노출 (기존 보유 포함)
+    max_total_exposure_pct: float = 64.0     # 코인 총 노출 (기본: 8종목 × 8%)
+    max_cluster_exposure_pct: float = 24.0   # 상관 클러스터 최대 노출
+    correlation_threshold: float = 0.7       # 클러스터 연결 상관계수 임계값
+    max_drawdown_budget_pct: float = 10.0    # 미실현 손실 + 손절 도달 시 예상 손실 합계 한도
+    stop_loss_pct: float = 8.0               # 신규/보유 포지션 손절 거리 (%)
+    max_positions: int = 8                   # 최대 동시 보유 종목
+    min_order_krw: float = 10000.0           # 축소 후 이 금액 미만 주문은 제외
+
+
+@dataclass
+class OrderRiskDecision:
+    """종목별 리스크 검사 결과"""
+    ticker: str
+    requested_krw: float
+    approved_krw: float
+    constraints: List[str] = field(default_factory=list)   # 금액을 줄인 한도 이름 (적용 순서)
+
+    @property
+    def scale(self) -> float:
+        return self.approved_krw / self.requested_krw if self.requested_krw > 0 else 0.0
+
+
+@dataclass
+class RiskReport:
+    """주문 배치 리스크 검사 결과"""
+    equity_krw: float = 0.0
+    existing_exposure_krw: float = 0.0
+    approved_exposure_krw: float = 0.0
+    drawdown_used_krw: float = 0.0          # 보유분 미실현 손실 + 손절까지 남은 위험
+    drawdown_budget_krw: float = 0.0
+    portfolio_volatility_pct: float = 0.0   # 배치 반영 후 일간 변동성 추정 (총 자산 대비 %)
+    clusters: List[List[str]] = field(default_factory=list)   # 2종목 이상 상관 클러스터
+    decisions: Dict[str, OrderRiskDecision] = field(default_factory=dict)
+    checked_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def approved_orders(self) -> Dict[str, float]:
+        return {t: d.approved_krw for t, d in self.decisions.items() if d.approved_krw > 0}
+
+    @property
+    def reduced(self) -> List[OrderRiskDecision]:
+        return [d for d in self.decisions.values() if d.constraints]
+
+
+def correlation_clusters(corr: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    상관계수 ≥ threshold 연결 요소 라벨 (행렬 곱 기반 도달 가능성 전파)
+
+    Returns:
+        종목별 클러스터 라벨 (연결 요소 내 최소 인덱스)
+    """
+    n = corr.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=int)
+
+    reach = (corr >= threshold) | np.eye(n, dtype=bool)
+    while True:
+        expanded = (reach.astype(np.int32) @ reach.astype(np.int32)) > 0
+        if np.array_equal(expanded, reach):
+            break
+        reach = expanded
+    return reach.argmax(axis=1)
+
+
+class PreTradeRiskEngine:
+    """주문 배치 사전 리스크 검사 (보유 포지션 + 전체 후보 벡터 연산)"""
+
+    def __init__(self, limits: Optional[RiskLimits] = None, correlations: Optional[ReturnCorrelationCache] = None):
+        self.limits = limits or RiskLimits()
+        self.correlations = correlations or get_correlation_cache()
+
+    @staticmethod
+    def _scale_to_cap(amounts: np.ndarray, mask: np.ndarray, used: float, cap: float) -> float:
+        """mask 주문 합계를 (cap - used) 이내로 맞추는 비율 (0~1)"""
+        requested = amounts[mask].sum()
+        if requested <= 0:
+            return 1.0
+        return float(np.clip((cap - used) / requested, 0.0, 1.0))
+
+    def check_batch(self, orders: Dict[str, float], snapshot) -> RiskReport:
+        """
+        매수 주문 배치 한도 적용
+
+        Args:
+            orders: {ticker: 요청 금액 (KRW)}
+            snapshot: 세션 포트폴리오 스냅샷 (cash_krw, holdings, prices, total_balance_krw)
+
+        Returns:
+            RiskReport (approved_orders: 한도 적용 후 주문)
+        """
+        limits = self.limits
+        equity = snapshot.total_balance_krw
+        report = RiskReport(equity_krw=equity)
+
+        candidates = [t for t, amount in orders.items() if amount > 0]
+        if not candidates or equity <= 0:
+            report.decisions = {t: OrderRiskDecision(t, a, 0.0, ['equity'] if a > 0 else []) for t, a in orders.items()}
+            return report
+
+        held = [t for t, h in snapshot.holdings.items() if h['quantity'] > 0 and snapshot.prices.get(t)]
+        universe = list(dict.fromkeys(held + candidates))
+        n_held = len(held)
+        index = {t: i for i, t in enumerate(universe)}
+        cand_idx = np.array([index[t] for t in candidates])
+
+        # 보유 노출 / 평단 / 현재가 벡터 (universe 순서)
+        quantity = np.array([snapshot.holdings[t]['quantity'] if t in snapshot.holdings else 0.0 for t in universe])
+        avg_price = np.array([snapshot.holdings[t]['avg_buy_price'] if t in snapshot.holdings else 0.0 for t in universe])
+        price = np.array([snapshot.prices.get(t, 0.0) for t in universe])
+        existing = quantity * price
+
+        requested = np.array([orders[t] for t in candidates], dtype=float)
+        amounts = np.zeros(len(universe))
+        amounts[cand_idx] = requested
+        reasons: Dict[str, List[str]] = {t: [] for t in candidates}
+
+        def mark(before: np.ndarray, name: str):
+            for i in np.flatnonzero(amounts < before - 1e-6):
+                if universe[i] in reasons:
+                    reasons[universe[i]].append(name)
+
+        # 1. 보유 종목 수: 신규 종목은 남은 슬롯만큼 요청 금액 큰 순으로 허용
+        before = amounts.copy()
+        new_mask = (existing <= 0) & (amounts > 0)
+        open_slots = max(0, limits.max_positions - n_held)
+        new_idx = np.flatnonzero(new_mask)
+        if len(new_idx) > open_slots:
+            ranked = new_idx[np.argsort(-amounts[new_idx], kind='stable')]
+            amounts[ranked[open_slots:]] = 0.0
+        mark(before, 'max_positions')
+
+        # 2. 종목별 노출 한도 (기존 보유분 차감)
+        before = amounts.copy()
+        position_cap = np.maximum(0.0, equity * limits.max_position_pct / 100 - existing)
+        amounts = np.minimum(amounts, position_cap)
+        mark(before, 'position')
+
+        # 3. 상관 클러스터 노출 한도 (클러스터별 기존 + 신규 합계)
+        cov, corr = self.correlations.submatrix(universe)
+        labels = correlation_clusters(corr, limits.correlation_threshold)
+        before = amounts.copy()
+        n_labels = labels.max() + 1
+        cluster_existing = np.bincount(labels, weights=existing, minlength=n_labels)
+        cluster_new = np.bincount(labels, weights=amounts, minlength=n_labels)
+        cluster_cap = equity * limits.max_cluster_exposure_pct / 100
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cluster_scale = np.where(cluster_new > 0,
+                                     np.clip((cluster_cap - cluster_existing) / cluster_new, 0.0, 1.0), 1.0)
+        amounts = amounts * cluster_scale[labels]
+        mark(before, 'cluster')
+
+        # 4. 총 노출 한도 (현금 범위 이내)
+        before = amounts.copy()
+        total_cap = min(equity * limits.max_total_exposure_pct / 100, existing.sum() + max(0.0, snapshot.cash_krw))
+        amounts = amounts * self._scale_to_cap(amounts, amounts > 0, existing.sum(), total_cap)
+        mark(before, 'total')
+
+        # 5. 낙폭 예산: 보유분 (평단 대비 미실현 손실 + 손절가까지 남은 위험) + 신규 주문 손절 위험
+        before = amounts.copy()
+        stop = limits.stop_loss_pct / 100
+        stop_price = avg_price * (1 - stop)
+        incurred = quantity * np.maximum(0.0, avg_price - price)
+        to_stop = quantity * np.maximum(0.0, price - stop_price)
+        report.drawdown_used_krw = float((incurred + to_stop).sum())
+        report.drawdown_budget_krw = equity * limits.max_drawdown_budget_pct / 100
+        amounts = amounts * self._scale_to_cap(amounts * stop, amounts > 0, report.drawdown_used_krw, report.drawdown_budget_krw)
+        mark(before, 'drawdown')
+
+        # 6. 최소 주문 금액 미만 제외
+        before = amounts.copy()
+        amounts[amounts < limits.min_order_krw] = 0.0
+        mark(before, 'min_order')
+
+        # 배치 반영 후 포트폴리오 일간 변동성 (w' Σ w)
+        weights = (existing + amounts) / equity
+        report.portfolio_volatility_pct = float(np.sqrt(max(0.0, weights @ cov @ weights)) * 100)
+        report.existing_exposure_krw = float(existing.sum())
+        report.approved_exposure_krw = float(amounts.sum())
+        report.clusters = [
+            [universe[i] for i in np.flatnonzero(labels == label)]
+            for label in np.unique(labels) if (labels == label).sum() > 1
+        ]
+        report.decisions = {
+            t: OrderRiskDecision(t, float(orders[t]), float(amounts[index[t]]) if t in index else 0.0, reasons.get(t, []))
+            for t in orders
+        }
+
+        self._log_report(report)
+        return report
+
+    @staticmethod
+    def _log_report(report: RiskReport):
+        equity = report.equity_krw
+        logger.info(f"🛡️ 사전 리스크 검사: 기존 노출 {report.existing_exposure_krw / equity:.1%} + "
+                    f"승인 {report.approved_exposure_krw / equity:.1%} (낙폭 예산 사용 "
+                    f"{report.drawdown_used_krw:,.0f}/{report.drawdown_budget_krw:,.0f}원, "
+                    f"일간 변동성 {report.portfolio_volatility_pct:.2f}%)")
+        for cluster in report.clusters:
+            logger.info(f"🔗 상관 클러스터: {', '.join(cluster)}")
+        for decision in report.reduced:
+            logger.info(f"✂️ {decision.ticker}: {decision.requested_krw:,.0f}원 → {decision.approved_krw:,.0f}원 "
+                        f"({', '.join(decision.constraints)})")
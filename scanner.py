@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from utils import logger, setup_logger, load_blacklist, safe_strftime, setup_restricted_logger
 from db_manager_sqlite import get_db_connection_context
+from api_rate_limiter import get_rate_limiter
 import sys
 import argparse
 
@@ -42,7 +43,7 @@ def update_tickers():
             blacklist = {}
 
         # 현재 거래 가능한 티커 목록 조회
-        current_tickers = pyupbit.get_tickers(fiat="KRW")
+        current_tickers = get_rate_limiter().call('market', pyupbit.get_tickers, fiat="KRW", limit_info_kw='limit_info')
         if not current_tickers:
             logger.error("❌ 티커 목록 조회 실패")
             return
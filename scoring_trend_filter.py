@@ -15,6 +15,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import sqlite3
+import bisect
 import pandas as pd
 import numpy as np
 import logging
@@ -105,6 +106,9 @@ class ScoringTrendFilter:
         # 시장 데이터 캐시 (상대 평가용)
         self.market_cache = {}
 
+        # 최근 일괄 분석의 점수 분포 (오름차순 정렬, 백분위 O(log N) 조회용)
+        self.score_distribution: List[float] = []
+
         logger.info("🚀 ScoringTrendFilter 초기화 완료")
 
     def analyze_ticker(self, ticker: str) -> ScoringResult:
@@ -388,10 +392,23 @@ class ScoringTrendFilter:
             return "D"
 
     def _calculate_percentile(self, ticker: str, score: float) -> float:
-        """상대 백분위 계산 (임시로 고정값 반환)"""
-        # 실제로는 전체 시장 대비 상대 백분위를 계산해야 함
-        # 현재는 점수 기반 근사치 반환
-        return min(100.0, score)
+        """상대 백분위 계산
+
+        analyze_multiple_tickers로 구축된 점수 분포가 있으면 정렬 배열 이진 탐색으로
+        "점수가 같거나 낮은 종목 비율"을 O(log N)에 계산합니다.
+        분포가 없으면 점수 기반 근사치를 반환합니다.
+        """
+        if not self.score_distribution:
+            return min(100.0, score)
+
+        rank = bisect.bisect_right(self.score_distribution, score)
+        return rank / len(self.score_distribution) * 100
+
+    def _build_score_distribution(self, results: List[ScoringResult]):
+        """필수 조건을 통과한 종목의 총점으로 정렬된 시장 점수 분포 구축 (O(N log N))"""
+        self.score_distribution = sorted(
+            r.total_score for r in results if r.mandatory_passed
+        )
 
     def _make_recommendation(self, score: float) -> Tuple[str, float]:
         """점수 기반 추천사항 및 신뢰도 계산"""
@@ -474,7 +491,12 @@ class ScoringTrendFilter:
         )
 
     def analyze_multiple_tickers(self, tickers: List[str]) -> List[ScoringResult]:
-        """여러 ticker 점수제 분석"""
+        """여러 ticker 점수제 분석 (2-pass)
+
+        1차: 전체 종목 점수 계산
+        2차: 정렬된 점수 분포로 종목별 정확한 상대 백분위 부여 (전체 O(N log N))
+        구축된 분포는 이후 단일 종목 analyze_ticker 호출의 백분위 계산에도 재사용됩니다.
+        """
         logger.info(f"🚀 {len(tickers)}개 ticker 점수제 일괄 분석")
 
         results = []
@@ -489,6 +511,16 @@ class ScoringTrendFilter:
             except Exception as e:
                 logger.error(f"❌ [{i}/{len(tickers)}] {ticker} 분석 실패: {e}")
 
+        # 2차: 시장 점수 분포 기반 상대 백분위 부여
+        self._build_score_distribution(results)
+        for result in results:
+            if result.mandatory_passed:
+                result.percentile = self._calculate_percentile(result.ticker, result.total_score)
+
+        if self.score_distribution:
+            logger.info(f"📐 상대 백분위 계산 완료: {len(self.score_distribution)}개 종목 분포 "
+                        f"(중앙값 {self.score_distribution[len(self.score_distribution) // 2]:.1f}점)")
+
         # 통과 종목 요약
         passed_results = [r for r in results if r.passed]
         logger.info(f"📊 분석 결과: {len(passed_results)}/{len(results)}개 종목 통과 ({len(passed_results)/len(results)*100:.1f}%)")
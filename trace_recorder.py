@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Trace Recorder - 실행 단계별 경량 트레이싱
+Phase → 종목 → 세부 단계(DB 조회, API 호출, 지표 계산, 모듈 점수, DB 저장) 구간을 기록하고
+실행마다 Chrome Trace(JSON) 파일로 내보낸다.
+
+🎯 핵심 기능:
+- span 단위 기록: 시작 시각 + 소요 시간 (Chrome trace 'X' complete event)
+- 스레드별 타임라인 자동 분리 (asyncio.to_thread / 스레드풀 워커 포함)
+- 비활성 상태에서는 공유 nullcontext 반환 → 계측 코드가 남아 있어도 오버헤드 거의 없음
+- 카테고리/이름별 소요 시간 요약 (execution_stats 보고서용)
+
+📊 사용 예시:
+    recorder = TraceRecorder(run_id="20250101_090000")
+    activate_tracer(recorder)
+
+    with trace_span("KRW-BTC", "ticker"):
+        with trace_span("api_call", "step", ticker="KRW-BTC"):
+            df = pyupbit.get_ohlcv(...)
+
+    recorder.export_chrome_trace("./logs/trace_20250101_090000.json")
+    deactivate_tracer()
+
+💡 결과 파일은 chrome://tracing 또는 https://ui.perfetto.dev 에서 열어 확인
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+from phase_profiler import profile_phase
+
+logger = logging.getLogger(__name__)
+
+_NULL_SPAN = nullcontext()
+
+
+class TraceRecorder:
+    """span 기록기 (스레드 안전)"""
+
+    def __init__(self, run_id: Optional[str] = None, max_events: int = 200000):
+        self.run_id = run_id or time.strftime('%Y%m%d_%H%M%S')
+        self.max_events = max_events
+
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "step", **args):
+        """구간 기록 (예외 발생 시에도 기록하고 error 인자 추가)"""
+        start_ns = time.perf_counter_ns()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            if error:
+                args['error'] = error
+            self._record(name, category, start_ns, time.perf_counter_ns(), args)
+
+    def _record(self, name: str, category: str, start_ns: int, end_ns: int, args: Dict[str, Any]):
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start_ns - self._origin_ns) / 1000,  # Chrome trace 단위: μs
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': self._pid,
+            'tid': thread.ident,
+        }
+        if args:
+            event['args'] = args
+
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self._dropped += 1
+                return
+            self._events.append(event)
+            self._thread_names.setdefault(thread.ident, thread.name)
+
+    @property
+    def event_count(self) -> int:
+        return len(self._events)
+
+    def summary(self, category: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        이름별 소요 시간 요약
+
+        Returns:
+            {name: {'count', 'total_ms', 'avg_ms', 'max_ms'}} (total_ms 내림차순)
+        """
+        with self._lock:
+            events = [e for e in self._events if category is None or e['cat'] == category]
+
+        summary: Dict[str, Dict[str, float]] = {}
+        for event in events:
+            key = event['name'] if category else f"{event['cat']}:{event['name']}"
+            entry = summary.setdefault(key, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            duration_ms = event['dur'] / 1000
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+
+        for entry in summary.values():
+            entry['avg_ms'] = entry['total_ms'] / entry['count']
+            entry['total_ms'] = round(entry['total_ms'], 2)
+            entry['avg_ms'] = round(entry['avg_ms'], 2)
+            entry['max_ms'] = round(entry['max_ms'], 2)
+
+        return dict(sorted(summary.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def slowest(self, category: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """카테고리 내 가장 오래 걸린 span 목록 (예: 느린 종목 Top N)"""
+        with self._lock:
+            events = [e for e in self._events if e['cat'] == category]
+
+        events.sort(key=lambda e: e['dur'], reverse=True)
+        return [
+            {'name': e['name'], 'duration_ms': round(e['dur'] / 1000, 2), **e.get('args', {})}
+            for e in events[:limit]
+        ]
+
+    def export_chrome_trace(self, path: str) -> Optional[str]:
+        """Chrome Trace Event 형식 JSON 저장"""
+        try:
+            with self._lock:
+                events = list(self._events)
+                thread_names = dict(self._thread_names)
+                dropped = self._dropped
+
+            metadata_events = [
+                {'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                 'args': {'name': f"makenaide {self.run_id}"}}
+            ]
+            metadata_events.extend(
+                {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': name}}
+                for tid, name in thread_names.items()
+            )
+
+            trace = {
+                'traceEvents': metadata_events + events,
+                'displayTimeUnit': 'ms',
+                'otherData': {
+                    'run_id': self.run_id,
+                    'event_count': len(events),
+                    'dropped_events': dropped
+                }
+            }
+
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, ensure_ascii=False)
+
+            if dropped:
+                logger.warning(f"⚠️ 트레이스 이벤트 한도 초과로 {dropped}개 누락 (max_events={self.max_events})")
+            logger.info(f"🧭 트레이스 저장: {path} ({len(events)}개 span)")
+            return path
+
+        except Exception as e:
+            logger.error(f"❌ 트레이스 저장 실패: {e}")
+            return None
+
+
+# ----------------------------------------------------------------------
+# 전역 활성 트레이서 (계측 지점은 trace_span만 호출)
+# ----------------------------------------------------------------------
+
+_active_tracer: Optional[TraceRecorder] = None
+
+
+def activate_tracer(recorder: TraceRecorder) -> TraceRecorder:
+    """실행 단위 트레이서 활성화"""
+    global _active_tracer
+    _active_tracer = recorder
+    return recorder
+
+
+def deactivate_tracer():
+    """트레이서 비활성화 (이후 trace_span은 no-op)"""
+    global _active_tracer
+    _active_tracer = None
+
+
+def get_tracer() -> Optional[TraceRecorder]:
+    return _active_tracer
+
+
+def trace_span(name: str, category: str = "step", **args):
+    """활성 트레이서가 있으면 span, 없으면 no-op 컨텍스트"""
+    recorder = _active_tracer
+    if recorder is None:
+        return _NULL_SPAN
+    return recorder.span(name, category, **args)
+
+
+def traced(name: str, category: str = "phase"):
+    """
+    함수 전체를 span으로 기록하는 데코레이터 (동기/async 함수 모두 지원)
+
+    category가 'phase'이면 활성 PhaseProfiler(--profile)의 Phase 경계로도 사용된다.
+    """
+    def phase_profile():
+        return profile_phase(name) if category == "phase" else _NULL_SPAN
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with trace_span(name, category), phase_profile():
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name, category), phase_profile():
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -25,9 +25,11 @@ import logging
 import pyupbit
 import json
 import struct
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 # 블랙리스트 기능 임포트
@@ -37,6 +39,11 @@ from dotenv import load_dotenv
 # 프로젝트 모듈 import
 from utils import logger, setup_restricted_logger, retry
 from db_manager_sqlite import get_db_connection_context
+from api_rate_limiter import get_rate_limiter
+from order_tracker import OrderTracker
+from order_execution import OrderExecutor, ExecutionPlan
+from portfolio_reconciler import PortfolioReconciler, PositionCorrection, ReconciliationReport
+from risk_engine import PreTradeRiskEngine, RiskLimits, RiskReport
 from kelly_calculator import KellyCalculator, PatternType
 from market_sentiment import MarketSentiment
 from pyramid_state_manager import PyramidStateManager
@@ -80,6 +87,106 @@ class PositionInfo:
     buy_timestamp: datetime
     hold_days: int
 
+# 포지션 컨텍스트 조회용 복합 인덱스 (init_db_sqlite.py 스키마와 동일, 기존 DB는 엔진 초기화 시 생성)
+POSITION_CONTEXT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_trades_ticker_type_created ON trades(ticker, order_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_unified_technical_analysis_ticker_created ON unified_technical_analysis(ticker, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_technical_analysis_ticker_created ON technical_analysis(ticker, created_at)",
+]
+
+# 호가창 기반 집행 기록 컬럼 (init_db_sqlite.py 스키마와 동일, 기존 DB는 엔진 초기화 시 추가)
+TRADES_EXECUTION_COLUMNS = [
+    ('estimated_slippage_bps', 'REAL'),
+    ('actual_slippage_bps', 'REAL'),
+    ('execution_style', 'TEXT'),
+]
+
+@dataclass
+class PositionContext:
+    """
+    보유 종목 컨텍스트 (세션 단위 일괄 조회)
+
+    종목별 쿼리 대신 종목 그룹 쿼리 몇 번으로 최근 매수 시점, Stage 이력, ATR, 기술 지표를 적재한다.
+    """
+    tickers: Set[str] = field(default_factory=set)                                 # 조회 대상 종목
+    last_buy: Dict[str, datetime] = field(default_factory=dict)                    # ticker → 최근 체결 매수 시점
+    stage_history: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)  # ticker → 최근 Stage 이력 (최신순)
+    atr: Dict[str, float] = field(default_factory=dict)                            # ticker → 최신 ATR (ohlcv_data 백업 포함)
+    technicals: Dict[str, Dict[str, Any]] = field(default_factory=dict)            # ticker → 최신 supertrend/macd/지지선/adx
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+    def covers(self, tickers: List[str]) -> bool:
+        return set(tickers) <= self.tickers
+
+@dataclass
+class PendingOrder:
+    """접수 완료 후 체결 확인 대기 중인 매수 주문"""
+    ticker: str
+    trade_result: TradeResult
+    order_id: str
+    amount_krw: float
+    current_price: float
+    is_pyramid: bool = False
+    plan: Optional[ExecutionPlan] = None               # 호가창 기반 집행 계획 (슬리피지 기록용)
+    order_detail: Optional[Dict[str, Any]] = None      # 분할 집행으로 이미 확인된 합산 주문 상세
+
+@dataclass
+class PortfolioSnapshot:
+    """
+    세션 단위 포트폴리오 스냅샷 (잔고 + 현재가 + 현금)
+
+    세션 시작 시 get_balances 1회 + 현재가 일괄 조회 1회로 생성하고,
+    이후 체결은 apply_fill로 로컬 반영하여 포지션 사이징이 API를 다시 호출하지 않도록 한다.
+    """
+    cash_krw: float = 0.0
+    holdings: Dict[str, Dict[str, float]] = field(default_factory=dict)  # ticker → {'quantity', 'avg_buy_price'}
+    prices: Dict[str, float] = field(default_factory=dict)               # ticker → 현재가 (체결 시 체결가로 갱신)
+    created_at: datetime = field(default_factory=datetime.now)
+    fills_applied: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def holdings_value_krw(self) -> float:
+        """보유 코인 평가액 (현재가 없는 종목 제외)"""
+        with self._lock:
+            return sum(
+                holding['quantity'] * self.prices[ticker]
+                for ticker, holding in self.holdings.items()
+                if self.prices.get(ticker)
+            )
+
+    @property
+    def total_balance_krw(self) -> float:
+        return self.cash_krw + self.holdings_value_krw
+
+    def apply_fill(self, trade_result: TradeResult, trade_type: str):
+        """체결 결과 반영 (매수: 현금 차감/수량·평단 증가, 매도: 현금 증가/수량 감소)"""
+        quantity = trade_result.filled_quantity or 0.0
+        if quantity <= 0:
+            return
+
+        price = trade_result.average_price or self.prices.get(trade_result.ticker, 0.0)
+        amount = trade_result.filled_amount or quantity * price
+        fees = trade_result.fees or 0.0
+
+        with self._lock:
+            holding = self.holdings.setdefault(trade_result.ticker, {'quantity': 0.0, 'avg_buy_price': 0.0})
+
+            if trade_type == 'BUY':
+                cost_basis = holding['quantity'] * holding['avg_buy_price'] + amount
+                holding['quantity'] += quantity
+                holding['avg_buy_price'] = cost_basis / holding['quantity']
+                self.cash_krw -= amount + fees
+            else:
+                holding['quantity'] -= quantity
+                self.cash_krw += amount - fees
+                if holding['quantity'] <= 1e-12:
+                    del self.holdings[trade_result.ticker]
+
+            if price:
+                self.prices[trade_result.ticker] = price
+            self.fills_applied += 1
+
 @dataclass
 class TradingConfig:
     """거래 설정"""
@@ -89,7 +196,23 @@ class TradingConfig:
     take_profit_percent: float = 20.0  # 익절 비율 (%) - 윌리엄 오닐 20-25% 규칙
     taker_fee_rate: float = 0.00139  # Taker 수수료 (0.139%)
     maker_fee_rate: float = 0.0005  # Maker 수수료 (0.05%)
-    api_rate_limit_delay: float = 0.5  # API 호출 간격 (초)
+    api_rate_limit_delay: float = 0.5  # (미사용) API 호출 간격은 api_rate_limiter가 Remaining-Req 기반으로 조절
+    concurrent_exit_evaluation: bool = True  # 보유 종목 매도 조건을 스냅샷 기반으로 동시 평가
+    exit_evaluation_workers: int = 8  # 매도 조건 평가 워커 수
+    order_confirm_timeout_sec: float = 10.0  # 주문 체결 확인 최대 대기 (초)
+    order_poll_initial_sec: float = 0.1  # 체결 확인 첫 폴링 간격 (이후 2배씩 증가)
+    order_poll_max_sec: float = 1.0  # 체결 확인 최대 폴링 간격
+    orderbook_execution: bool = True  # 매수 전 호가창 조회로 슬리피지 추정, 임계값 초과 시 분할 집행
+    max_slippage_bps: float = 30.0  # 단일 시장가 허용 예상 슬리피지 (bp, 최우선 매도호가 기준 - 스프레드 제외)
+    split_execution_style: str = 'twap'  # 분할 방식: 'twap' (간격 분할 시장가) | 'ladder' (지정가 사다리)
+    max_child_orders: int = 5  # 분할 집행 최대 자식 주문 수
+    twap_interval_sec: float = 3.0  # TWAP 자식 주문 간격
+    ladder_timeout_sec: float = 10.0  # 지정가 사다리 미체결 취소까지 대기
+    max_position_pct: float = 8.0  # 종목별 최대 노출 (총 자산 대비 %, 기존 보유 포함)
+    max_total_exposure_pct: float = 64.0  # 코인 총 노출 한도 (%)
+    max_cluster_exposure_pct: float = 24.0  # 상관 클러스터 노출 한도 (%)
+    correlation_threshold: float = 0.7  # 클러스터 연결 상관계수 임계값 (일간 수익률)
+    max_drawdown_budget_pct: float = 10.0  # 미실현 손실 + 손절 도달 시 예상 손실 합계 한도 (%)
 
 # PyramidingManager 클래스는 PyramidStateManager로 대체됨
 
@@ -100,8 +223,19 @@ class TrailingStopManager:
     Min/Max 클램핑 로직 추가 (Quick Win #2):
     - 최소 손절: 5% (너무 타이트한 스탑 방지)
     - 최대 손절: 15% (과도한 손실 방지)
+
+    상태 영속화 (trailing_stops 테이블):
+    - load_from_db(): 시작 시 전체 스탑 상태를 1회 쿼리로 로드 (실행 간 최고가 유지, ATR 재조회 생략)
+    - update()/remove()는 메모리만 변경하고 변경 종목을 기록
+    - flush(): 변경분을 단일 트랜잭션 executemany로 일괄 반영
     """
 
+    # 기존 DB에 없을 수 있는 확장 컬럼 (init_db_sqlite.py 스키마와 동일)
+    PERSISTED_COLUMNS = [
+        ('highest_price', 'REAL'),
+        ('stop_type', 'TEXT'),
+    ]
+
     def __init__(
         self,
         atr_multiplier: float = 1.0,
@@ -119,6 +253,138 @@ class TrailingStopManager:
         self.stop_price = {}
         self.stop_type = {}  # 손절 타입 추적용
 
+        # 영속화 상태 (동시 평가 스레드에서 갱신되므로 lock 사용)
+        self._dirty = set()
+        self._removed = set()
+        self._persist_lock = threading.Lock()
+
+    def _mark_dirty(self, ticker: str):
+        with self._persist_lock:
+            self._dirty.add(ticker)
+            self._removed.discard(ticker)
+
+    def _ensure_table(self, conn: sqlite3.Connection):
+        """trailing_stops 테이블 및 확장 컬럼 보장 (기존 DB 마이그레이션)"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS trailing_stops (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT UNIQUE NOT NULL,
+                initial_price REAL NOT NULL,
+                activation_price REAL NOT NULL,
+                stop_price REAL NOT NULL,
+                atr_value REAL,
+                highest_price REAL,
+                stop_type TEXT,
+                created_at TEXT DEFAULT (datetime('now')),
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(trailing_stops)")}
+        for column_name, column_type in self.PERSISTED_COLUMNS:
+            if column_name not in existing:
+                conn.execute(f"ALTER TABLE trailing_stops ADD COLUMN {column_name} {column_type}")
+                logger.info(f"✅ trailing_stops 테이블에 {column_name} 컬럼 추가")
+
+    def load_from_db(self, db_path: str = "./makenaide_local.db") -> int:
+        """
+        저장된 트레일링 스탑 상태 일괄 로드 (단일 쿼리)
+
+        Returns:
+            int: 로드된 종목 수
+        """
+        try:
+            with sqlite3.connect(db_path) as conn:
+                self._ensure_table(conn)
+                rows = conn.execute("""
+                    SELECT ticker, initial_price, highest_price, atr_value, stop_price, stop_type
+                    FROM trailing_stops
+                """).fetchall()
+
+            for ticker, entry_price, highest_price, atr_value, stop_price, stop_type in rows:
+                if entry_price is None or atr_value is None:
+                    continue
+                self.entry_price[ticker] = float(entry_price)
+                self.highest_price[ticker] = float(highest_price if highest_price is not None else entry_price)
+                self.atr[ticker] = float(atr_value)
+                self.stop_price[ticker] = float(stop_price)
+                self.stop_type[ticker] = stop_type or 'atr_fixed'
+
+            if rows:
+                logger.info(f"📥 트레일링 스탑 상태 로드: {len(self.highest_price)}개 종목")
+            return len(self.highest_price)
+
+        except Exception as e:
+            logger.error(f"❌ 트레일링 스탑 상태 로드 실패: {e}")
+            return 0
+
+    def remove(self, ticker: str):
+        """종목 스탑 상태 제거 (청산 또는 신규 진입 시 재초기화용)"""
+        for state in (self.entry_price, self.highest_price, self.atr, self.stop_price, self.stop_type):
+            state.pop(ticker, None)
+
+        with self._persist_lock:
+            self._dirty.discard(ticker)
+            self._removed.add(ticker)
+
+    def prune(self, active_tickers: List[str]):
+        """보유하지 않은 종목의 스탑 상태 제거"""
+        active = set(active_tickers)
+        for ticker in [t for t in self.highest_price if t not in active]:
+            self.remove(ticker)
+
+    def flush(self, db_path: str = "./makenaide_local.db") -> int:
+        """
+        변경된 스탑 상태를 단일 트랜잭션으로 일괄 저장
+
+        Returns:
+            int: 반영된 종목 수 (upsert + delete)
+        """
+        with self._persist_lock:
+            dirty = [t for t in self._dirty if t in self.highest_price]
+            removed = list(self._removed)
+            self._dirty.clear()
+            self._removed.clear()
+
+        if not dirty and not removed:
+            return 0
+
+        try:
+            rows = [
+                (ticker, self.entry_price[ticker], self.entry_price[ticker], self.stop_price[ticker],
+                 self.atr[ticker], self.highest_price[ticker], self.stop_type.get(ticker))
+                for ticker in dirty
+            ]
+
+            with sqlite3.connect(db_path) as conn:
+                self._ensure_table(conn)
+                conn.executemany("""
+                    INSERT INTO trailing_stops (
+                        ticker, initial_price, activation_price, stop_price, atr_value, highest_price, stop_type
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(ticker) DO UPDATE SET
+                        initial_price = excluded.initial_price,
+                        activation_price = excluded.activation_price,
+                        stop_price = excluded.stop_price,
+                        atr_value = excluded.atr_value,
+                        highest_price = excluded.highest_price,
+                        stop_type = excluded.stop_type,
+                        updated_at = datetime('now')
+                """, rows)
+                if removed:
+                    conn.executemany("DELETE FROM trailing_stops WHERE ticker = ?", [(t,) for t in removed])
+
+            logger.debug(f"💾 트레일링 스탑 저장: {len(rows)}개 갱신, {len(removed)}개 삭제")
+            return len(rows) + len(removed)
+
+        except Exception as e:
+            # 다음 flush에서 재시도
+            with self._persist_lock:
+                self._dirty.update(dirty)
+                self._removed.update(removed)
+            logger.error(f"❌ 트레일링 스탑 저장 실패: {e}")
+            return 0
+
     def get_atr_multiplier(self, ticker: str) -> float:
         """티커별 ATR 배수 반환"""
         return self.per_ticker_config.get(ticker, self.atr_multiplier)
@@ -155,7 +421,7 @@ class TrailingStopManager:
             # 너무 타이트한 스탑 → 최소값으로 클램핑
             final_stop = entry_price * (1 - self.min_stop_pct)
             stop_type = 'clamped_min'
-            logger.info(
+            logger.debug(
                 f"🔒 {ticker} 손절가 최소 클램핑: {stop_pct*100:.2f}% → {self.min_stop_pct*100:.0f}% "
                 f"(ATR 기반: {atr_based_stop:.0f}, 클램핑 후: {final_stop:.0f})"
             )
@@ -164,7 +430,7 @@ class TrailingStopManager:
             # 너무 루즈한 스탑 → 최대값으로 클램핑
             final_stop = entry_price * (1 - self.max_stop_pct)
             stop_type = 'clamped_max'
-            logger.info(
+            logger.debug(
                 f"🔒 {ticker} 손절가 최대 클램핑: {stop_pct*100:.2f}% → {self.max_stop_pct*100:.0f}% "
                 f"(ATR 기반: {atr_based_stop:.0f}, 클램핑 후: {final_stop:.0f})"
             )
@@ -231,7 +497,8 @@ class TrailingStopManager:
             logger.error(f"❌ {ticker} ATR 조회 실패, 기본값 3% 사용: {e}")
             return default_atr
 
-    def update(self, ticker: str, current_price: float, db_path: str = "./makenaide_local.db") -> bool:
+    def update(self, ticker: str, current_price: float, db_path: str = "./makenaide_local.db",
+               atr_value: Optional[float] = None) -> bool:
         """
         트레일링 스탑 업데이트 및 청산 신호 확인
 
@@ -239,13 +506,15 @@ class TrailingStopManager:
             ticker: 종목 코드
             current_price: 현재가
             db_path: SQLite DB 경로
+            atr_value: 미리 조회한 ATR (스냅샷 평가 시 DB 조회 생략)
 
         Returns:
             bool: True면 청산 신호, False면 보유 유지
         """
         # 첫 업데이트 시 ATR 값을 SQLite에서 조회 (이중화 백업 로직)
         if ticker not in self.highest_price:
-            atr_value = self.get_atr_with_fallback(ticker, current_price, db_path)
+            if atr_value is None:
+                atr_value = self.get_atr_with_fallback(ticker, current_price, db_path)
 
             # 초기 설정 (ATR 조회 성공/실패와 관계없이 실행)
             self.entry_price[ticker] = current_price
@@ -271,6 +540,7 @@ class TrailingStopManager:
 
             self.stop_price[ticker] = final_stop
             self.stop_type[ticker] = stop_type
+            self._mark_dirty(ticker)
 
             logger.info(
                 f"🎯 {ticker} 트레일링 스탑 초기화: "
@@ -282,6 +552,7 @@ class TrailingStopManager:
         # 최고가 업데이트
         if current_price > self.highest_price[ticker]:
             self.highest_price[ticker] = current_price
+            self._mark_dirty(ticker)
 
         # 동적 손절 레벨 계산
         atr_value = self.atr[ticker]
@@ -302,6 +573,8 @@ class TrailingStopManager:
         )
 
         # 손절가 및 타입 업데이트
+        if final_stop != self.stop_price.get(ticker) or stop_type != self.stop_type.get(ticker):
+            self._mark_dirty(ticker)
         self.stop_price[ticker] = final_stop
         self.stop_type[ticker] = stop_type
 
@@ -317,6 +590,22 @@ class TrailingStopManager:
 
         return should_exit
 
+    def should_exit(self, ticker: str, current_price: float, db_path: str = "./makenaide_local.db",
+                    atr_value: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        트레일링 스탑 청산 여부와 사유 반환 (check_sell_conditions용)
+
+        Returns:
+            Tuple[bool, str]: (청산 여부, 사유)
+        """
+        if not self.update(ticker, current_price, db_path, atr_value=atr_value):
+            return False, "트레일링 스탑 미도달"
+
+        return True, (
+            f"현재가 {current_price:.0f} ≤ 손절가 {self.stop_price[ticker]:.0f} "
+            f"({self.stop_type.get(ticker, 'unknown')})"
+        )
+
 class LocalTradingEngine:
     """로컬 아키텍처 기반 거래 엔진"""
 
@@ -325,15 +614,64 @@ class LocalTradingEngine:
         self.dry_run = dry_run
         self.db_path = "./makenaide_local.db"
 
-        # 업비트 API 초기화
+        # 업비트 API 초기화 (모든 호출은 공유 레이트 리미터 경유)
         self.upbit = None
+        self.rate_limiter = get_rate_limiter()
         self.initialize_upbit_client()
 
+        # 주문 체결 확인기 (고정 대기 대신 지수 증가 폴링)
+        self.order_tracker = OrderTracker(
+            self.upbit,
+            self.rate_limiter,
+            initial_interval=config.order_poll_initial_sec,
+            max_interval=config.order_poll_max_sec,
+            timeout=config.order_confirm_timeout_sec
+        )
+
+        # 호가창 기반 매수 집행기 (슬리피지 추정 + 분할 집행)
+        self.order_executor = OrderExecutor(
+            self.upbit,
+            self.rate_limiter,
+            self.order_tracker,
+            max_slippage_bps=config.max_slippage_bps,
+            split_style=config.split_execution_style,
+            max_child_orders=config.max_child_orders,
+            min_child_amount_krw=config.min_order_amount_krw,
+            twap_interval_sec=config.twap_interval_sec,
+            ladder_timeout_sec=config.ladder_timeout_sec
+        )
+        self._ensure_trades_execution_columns()
+
+        # 잔고 ↔ trades 대사기 (집계 쿼리 1회 + 단일 트랜잭션 보정)
+        self.reconciler = PortfolioReconciler()
+
+        # 사전 리스크 엔진 (매수 배치 전체에 종목/클러스터/총 노출 + 낙폭 예산 한도 적용)
+        self.risk_engine = PreTradeRiskEngine(RiskLimits(
+            max_position_pct=config.max_position_pct,
+            max_total_exposure_pct=config.max_total_exposure_pct,
+            max_cluster_exposure_pct=config.max_cluster_exposure_pct,
+            correlation_threshold=config.correlation_threshold,
+            max_drawdown_budget_pct=config.max_drawdown_budget_pct,
+            stop_loss_pct=abs(config.stop_loss_percent),
+            max_positions=config.max_positions,
+            min_order_krw=config.min_order_amount_krw
+        ))
+
+        # 세션 포트폴리오 스냅샷 (begin_portfolio_session ~ end_portfolio_session 동안 유지)
+        self.portfolio_snapshot: Optional[PortfolioSnapshot] = None
+
+        # 보유 종목 컨텍스트 (get_current_positions 호출 시 일괄 갱신)
+        self.position_context: Optional[PositionContext] = None
+        self._ensure_position_context_indexes()
+
         # 트레일링 스탑 관리자 초기화
         self.trailing_stop_manager = TrailingStopManager(
             atr_multiplier=1.0,  # 기본 ATR 배수
             per_ticker_config={}  # 티커별 설정 (필요시 확장)
         )
+        if not self.dry_run:
+            # 이전 실행의 최고가/손절가 복원 (DRY RUN은 실제 상태를 건드리지 않음)
+            self.trailing_stop_manager.load_from_db(self.db_path)
 
         # 피라미딩 상태 관리자 초기화 (pyramid_state 테이블 기반)
         self.pyramid_state_manager = PyramidStateManager(
@@ -464,8 +802,9 @@ class LocalTradingEngine:
             is_pyramid=is_pyramid
         )
 
-    def save_trade_record(self, trade_result, ticker: str = None, is_pyramid: bool = False, requested_amount: float = 0, trade_type: str = 'BUY'):
-        """거래 기록을 새로운 trades 테이블에 저장"""
+    def save_trade_record(self, trade_result, ticker: str = None, is_pyramid: bool = False, requested_amount: float = 0,
+                          trade_type: str = 'BUY', position_closed: bool = False):
+        """거래 기록을 새로운 trades 테이블에 저장 (position_closed: 매도로 보유 수량 전부 청산 여부)"""
         try:
             # 기존 TradeResult인지 새로운 TradeResult인지 판별
             if hasattr(trade_result, 'filled_amount'):
@@ -514,6 +853,24 @@ class LocalTradingEngine:
             logger.error(f"   TradeResult 내용: {trade_result}")
             # 에러가 발생해도 거래는 계속 진행되어야 하므로 raise하지 않음
 
+        self._reset_trailing_stop_after_trade(trade_result, ticker, is_pyramid, trade_type, position_closed)
+
+    def _reset_trailing_stop_after_trade(self, trade_result, ticker: Optional[str], is_pyramid: bool, trade_type: str,
+                                         position_closed: bool = False):
+        """
+        전량 청산 또는 신규 진입 체결 시 저장된 트레일링 스탑 초기화 (다음 평가에서 새로 설정)
+
+        부분 매도는 남은 수량의 최고가/손절가를 유지해야 하므로 초기화하지 않는다.
+        """
+        if self.dry_run or getattr(trade_result, 'status', None) not in (TradeStatus.FULL_FILLED, TradeStatus.PARTIAL_FILLED):
+            return
+
+        if trade_type == 'SELL':
+            if position_closed and trade_result.status == TradeStatus.FULL_FILLED:
+                self.trailing_stop_manager.remove(ticker or trade_result.ticker)
+        elif not is_pyramid:
+            self.trailing_stop_manager.remove(ticker or trade_result.ticker)
+
     def process_trade_result(self, old_trade_result, ticker: str, is_pyramid: bool = False,
                            requested_amount: float = 0) -> TradeResult:
         """거래 결과를 처리하고 통합 워크플로우 실행"""
@@ -547,12 +904,14 @@ class LocalTradingEngine:
         sync_result = self.validate_and_sync_portfolio(auto_sync=False)
         return sync_result[0]
 
-    def validate_and_sync_portfolio(self, auto_sync: bool = True, sync_policy: str = 'aggressive') -> Tuple[bool, Dict]:
+    def validate_and_sync_portfolio(self, auto_sync: bool = True, sync_policy: str = 'aggressive',
+                                    sync_sell_corrections: bool = False) -> Tuple[bool, Dict]:
         """포트폴리오 검증 및 자동 동기화
 
         Args:
             auto_sync: 자동 동기화 활성화 여부
             sync_policy: 동기화 정책 ('conservative', 'moderate', 'aggressive')
+            sync_sell_corrections: 초과 기록(외부 매도 추정) SELL 보정 자동 저장 허용 여부 (기본: 감지만)
 
         Returns:
             Tuple[bool, Dict]: (동기화 성공 여부, 동기화 결과 상세)
@@ -560,20 +919,23 @@ class LocalTradingEngine:
         try:
             logger.info("🔍 포트폴리오 동기화 상태 검증 시작...")
 
-            # Phase 1: 포트폴리오 불일치 감지
-            missing_trades = self._detect_portfolio_mismatch()
+            # Phase 1: 포트폴리오 불일치 감지 (잔고 스냅샷 1회 ↔ DB 순포지션)
+            corrections = self._detect_portfolio_mismatch()
 
-            if not missing_trades:
+            if not corrections:
                 logger.info("✅ 포트폴리오 동기화 상태 정상")
                 return True, {'status': 'synced', 'missing_trades': []}
 
             # Phase 2: 불일치 감지됨 - 로깅
-            total_missing_value = sum(trade['balance'] * trade['avg_buy_price'] for trade in missing_trades)
-            logger.warning(f"⚠️ 포트폴리오 동기화 불일치 감지: {len(missing_trades)}개 종목")
-            logger.warning(f"📊 누락된 총 투자금액: {total_missing_value:,.0f} KRW")
+            total_missing_value = sum(correction.value_krw for correction in corrections)
+            logger.warning(f"⚠️ 포트폴리오 동기화 불일치 감지: {len(corrections)}개 종목")
+            logger.warning(f"📊 보정 대상 총 금액: {total_missing_value:,.0f} KRW")
+
+            for correction in corrections:
+                logger.warning(f"  - {correction.ticker} ({correction.kind}): {correction.order_type} "
+                               f"{abs(correction.diff_quantity):.8f} @ {correction.price:,.0f}")
 
-            for trade in missing_trades:
-                logger.warning(f"  - {trade['ticker']}: {trade['balance']:.8f} @ {trade['avg_buy_price']:,.0f}")
+            missing_trades = [correction.as_missing_trade() for correction in corrections]
 
             # Phase 3: 자동 동기화 수행 여부 결정
             if not auto_sync:
@@ -581,11 +943,12 @@ class LocalTradingEngine:
                 return False, {
                     'status': 'mismatch_detected',
                     'missing_trades': missing_trades,
+                    'corrections': corrections,
                     'auto_sync_disabled': True
                 }
 
             # Phase 4: 동기화 위험도 평가 및 실행
-            sync_result = self._execute_safe_portfolio_sync(missing_trades, sync_policy)
+            sync_result = self._execute_safe_portfolio_sync(corrections, sync_policy, sync_sell_corrections)
 
             if sync_result['success']:
                 logger.info("🎉 포트폴리오 자동 동기화 완료")
@@ -608,13 +971,14 @@ class LocalTradingEngine:
 
         Success case:
             (True, [{'ticker': 'KRW-BTC', 'balance': 0.5, 'avg_buy_price': 50000000}, ...], None)
+            - balance: 주문 가능 수량 + 미체결 주문 묶인 수량 (locked)
 
         Error cases:
             (False, [], "API Error: This is not a verified IP")
             (False, [], "Invalid response type: str")
         """
         try:
-            response = self.upbit.get_balances()
+            response = self.rate_limiter.call('default', self.upbit.get_balances, limit_info_kw='contain_req')
 
             # Case 1: API 에러 응답 (dict with 'error' key)
             if isinstance(response, dict):
@@ -637,7 +1001,8 @@ class LocalTradingEngine:
                     if balance.get('currency') == 'KRW':
                         continue
 
-                    balance_amount = float(balance.get('balance', 0))
+                    # 미체결 주문에 묶인 수량(locked)도 보유 수량으로 집계 (지정가 매도 대기분을 매도로 오인하지 않도록)
+                    balance_amount = float(balance.get('balance', 0)) + float(balance.get('locked', 0) or 0)
                     if balance_amount <= 0:
                         continue
 
@@ -658,51 +1023,42 @@ class LocalTradingEngine:
             logger.error(f"❌ Upbit 잔고 조회 실패: {e}")
             return False, [], f"Exception: {str(e)}"
 
-    def _detect_portfolio_mismatch(self) -> List[Dict]:
+    def reconcile_portfolio(self) -> Optional[ReconciliationReport]:
         """
-        포트폴리오 불일치 감지 (개선된 에러 핸들링)
+        업비트 잔고 스냅샷(1회 조회)과 trades 순포지션(집계 쿼리 1회) 대사
 
         Returns:
-            List[Dict]: 누락된 거래 목록
-                - 성공: [{'ticker': 'KRW-BTC', 'balance': 0.5, 'avg_buy_price': 50000000}, ...]
-                - API 에러: [] (빈 리스트, 경고 로그 출력)
-                - DB 에러: [] (빈 리스트, 에러 로그 출력)
+            ReconciliationReport, 잔고 조회 실패 시 None (경고 로그 출력)
         """
-        try:
-            # 1. Upbit 잔고 조회 (개선된 파싱)
-            success, upbit_balances, error_msg = self._parse_upbit_balances()
+        success, upbit_balances, error_msg = self._parse_upbit_balances()
 
-            if not success:
-                logger.warning(f"⚠️ Upbit 잔고 조회 실패: {error_msg}")
-                logger.warning("포트폴리오 불일치 감지를 건너뜁니다.")
-                return []
+        if not success:
+            logger.warning(f"⚠️ Upbit 잔고 조회 실패: {error_msg}")
+            logger.warning("포트폴리오 불일치 감지를 건너뜁니다.")
+            return None
+
+        return self.reconciler.reconcile(upbit_balances)
+
+    def _detect_portfolio_mismatch(self) -> List[PositionCorrection]:
+        """
+        포트폴리오 불일치 감지 (개선된 에러 핸들링)
 
-            if not upbit_balances:
-                logger.info("✅ Upbit 잔고 없음 - 포트폴리오 불일치 없음")
+        Returns:
+            List[PositionCorrection]: 거래소 잔고에 맞추기 위한 보정 항목
+                - 누락/부족 기록: BUY 보정, 외부 매도 등 초과 기록: SELL 보정
+                - API 에러 / DB 에러: [] (빈 리스트, 로그 출력)
+        """
+        try:
+            report = self.reconcile_portfolio()
+            if report is None:
                 return []
 
-            # 2. 데이터베이스 거래 기록 조회
-            with get_db_connection_context() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT DISTINCT ticker FROM trades
-                    WHERE order_type = 'BUY' AND status = 'FULL_FILLED'
-                """)
-                db_tickers = {row[0] for row in cursor.fetchall()}
-
-            # 3. 누락된 거래 찾기
-            missing_trades = []
-            for balance in upbit_balances:
-                if balance['ticker'] not in db_tickers:
-                    missing_trades.append(balance)
-                    logger.warning(f"⚠️ 포트폴리오 불일치: {balance['ticker']} (Upbit에 있지만 DB에 없음)")
-
-            if missing_trades:
-                logger.warning(f"⚠️ 총 {len(missing_trades)}개 종목 불일치 감지")
+            if report.corrections:
+                logger.warning(f"⚠️ 총 {len(report.corrections)}개 종목 불일치 감지 (일치 {report.matched}개)")
             else:
-                logger.info("✅ 포트폴리오 일치 확인 완료")
+                logger.info(f"✅ 포트폴리오 일치 확인 완료 ({report.matched}개 종목)")
 
-            return missing_trades
+            return report.corrections
 
         except Exception as e:
             logger.error(f"❌ 포트폴리오 불일치 감지 실패: {e}")
@@ -710,8 +1066,12 @@ class LocalTradingEngine:
             logger.error(f"   에러 위치: {e.__traceback__.tb_lineno if hasattr(e, '__traceback__') else 'unknown'}")
             return []
 
-    def _execute_safe_portfolio_sync(self, missing_trades: List[Dict], sync_policy: str) -> Dict:
-        """안전한 포트폴리오 동기화 실행"""
+    def _execute_safe_portfolio_sync(self, corrections: List[PositionCorrection], sync_policy: str,
+                                     sync_sell_corrections: bool = False) -> Dict:
+        """안전한 포트폴리오 동기화 실행 (정책 한도 내 보정 기록을 단일 트랜잭션으로 저장)
+
+        SELL 보정은 실제 체결 손익 없이 DB 평단으로 매도 처리하므로 sync_sell_corrections=True일 때만 저장한다.
+        """
         try:
             # 동기화 정책별 최대 금액 설정
             policy_limits = {
@@ -727,14 +1087,15 @@ class LocalTradingEngine:
             sync_targets = []
             total_sync_value = 0
 
-            for trade in missing_trades:
-                trade_value = trade['balance'] * trade['avg_buy_price']
-
-                if trade_value <= max_sync_amount:
-                    sync_targets.append(trade)
-                    total_sync_value += trade_value
+            for correction in corrections:
+                if correction.order_type == 'SELL' and not sync_sell_corrections:
+                    logger.warning(f"⚠️ {correction.ticker} 제외: SELL 보정은 명시적 허용 필요 "
+                                   f"({correction.kind}, {abs(correction.diff_quantity):.8f}개 - 수동 확인 또는 --sync-sell-corrections)")
+                elif correction.value_krw <= max_sync_amount:
+                    sync_targets.append(correction)
+                    total_sync_value += correction.value_krw
                 else:
-                    logger.warning(f"⚠️ {trade['ticker']} 제외: 금액 초과 ({trade_value:,.0f} > {max_sync_amount:,.0f})")
+                    logger.warning(f"⚠️ {correction.ticker} 제외: 금액 초과 ({correction.value_krw:,.0f} > {max_sync_amount:,.0f})")
 
             if not sync_targets:
                 return {
@@ -745,11 +1106,8 @@ class LocalTradingEngine:
 
             logger.info(f"🎯 동기화 대상: {len(sync_targets)}개 종목 (총 {total_sync_value:,.0f} KRW)")
 
-            # 실제 동기화 실행
-            success_count = 0
-            for trade in sync_targets:
-                if self._create_sync_trade_record(trade):
-                    success_count += 1
+            # 실제 동기화 실행 (전체 성공 또는 전체 롤백)
+            success_count = self.reconciler.apply(sync_targets, source='AUTO_SYNC')
 
             return {
                 'success': success_count == len(sync_targets),
@@ -757,55 +1115,13 @@ class LocalTradingEngine:
                 'total_targets': len(sync_targets),
                 'total_value': total_sync_value,
                 'policy': sync_policy,
-                'synced_trades': sync_targets[:success_count]
+                'synced_trades': [correction.as_missing_trade() for correction in sync_targets[:success_count]]
             }
 
         except Exception as e:
             logger.error(f"❌ 포트폴리오 동기화 실행 실패: {e}")
             return {'success': False, 'error': str(e)}
 
-    def _create_sync_trade_record(self, trade: Dict) -> bool:
-        """동기화용 거래 기록 생성"""
-        try:
-            with get_db_connection_context() as conn:
-                cursor = conn.cursor()
-
-                # 추정 매수 시간 (현재 시간 - 1일)
-                estimated_buy_time = datetime.now() - timedelta(days=1)
-                estimated_buy_time = estimated_buy_time.replace(hour=9, minute=0, second=0, microsecond=0)
-
-                # 거래 기록 생성
-                cursor.execute("""
-                    INSERT INTO trades (
-                        ticker, order_type, status, order_id,
-                        requested_quantity, filled_quantity,
-                        requested_amount, filled_amount, average_price,
-                        fill_rate, is_pyramid, is_pyramid_eligible,
-                        fee, timestamp, created_at, updated_at, error_message
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    trade['ticker'], 'BUY', 'FULL_FILLED',
-                    f'AUTO-SYNC-{trade["ticker"]}-{int(datetime.now().timestamp())}',
-                    trade['balance'], trade['balance'],
-                    trade['balance'] * trade['avg_buy_price'],
-                    trade['balance'] * trade['avg_buy_price'],
-                    trade['avg_buy_price'],
-                    1.0, False, True,
-                    trade['balance'] * trade['avg_buy_price'] * 0.0005,  # 0.05% 수수료 추정
-                    estimated_buy_time.isoformat(),
-                    datetime.now().isoformat(),
-                    datetime.now().isoformat(),
-                    'AUTO_SYNC'
-                ))
-
-                conn.commit()
-                logger.info(f"✅ {trade['ticker']} 동기화 완료: {trade['balance']:.8f} @ {trade['avg_buy_price']:,.0f}")
-                return True
-
-        except Exception as e:
-            logger.error(f"❌ {trade['ticker']} 동기화 실패: {e}")
-            return False
-
     def get_current_positions(self) -> List[PositionInfo]:
         """현재 보유 포지션 조회 (블랙리스트 필터링 적용)"""
         positions = []
@@ -822,7 +1138,7 @@ class LocalTradingEngine:
                 blacklist = {}
 
             # 업비트에서 잔고 조회
-            balances = self.upbit.get_balances()
+            balances = self.rate_limiter.call('default', self.upbit.get_balances, limit_info_kw='contain_req')
 
             if not balances:
                 logger.info("📭 보유 포지션이 없습니다")
@@ -842,6 +1158,7 @@ class LocalTradingEngine:
             # 블랙리스트 통계를 위한 카운터
             total_balances = 0
             blacklisted_positions = 0
+            holdings = []
 
             for balance in balances:
                 currency = balance['currency']
@@ -865,9 +1182,18 @@ class LocalTradingEngine:
                     logger.info(f"⛔️ {ticker}: 블랙리스트에 등록되어 포트폴리오 관리 제외")
                     continue
 
+                holdings.append((ticker, quantity, avg_buy_price))
+
+            # 현재가 일괄 조회 (종목별 호출 대신 1회)
+            prices = self._get_current_prices([ticker for ticker, _, _ in holdings])
+
+            # 매수 시점/Stage 이력/ATR 일괄 조회 (종목별 쿼리 대신 그룹 쿼리)
+            context = self.load_position_context([ticker for ticker, _, _ in holdings])
+            self.position_context = context
+
+            for ticker, quantity, avg_buy_price in holdings:
                 try:
-                    # 현재가 조회
-                    current_price = pyupbit.get_current_price(ticker)
+                    current_price = prices.get(ticker)
                     if not current_price:
                         continue
 
@@ -877,8 +1203,8 @@ class LocalTradingEngine:
                     unrealized_pnl = market_value - cost_basis
                     unrealized_pnl_percent = (unrealized_pnl / cost_basis) * 100
 
-                    # 보유 일수 계산 (SQLite에서 매수 시점 조회)
-                    buy_timestamp = self.get_last_buy_timestamp(ticker)
+                    # 보유 일수 계산 (컨텍스트의 최근 매수 시점)
+                    buy_timestamp = context.last_buy.get(ticker)
                     hold_days = 0
                     if buy_timestamp:
                         # 달력 기준 일수 계산 (시간 무관, 날짜만 비교)
@@ -915,6 +1241,24 @@ class LocalTradingEngine:
             logger.error(f"❌ 포지션 조회 실패: {e}")
             return positions
 
+    def _get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        """복수 종목 현재가 일괄 조회 (실패 시 빈 dict)"""
+        if not tickers:
+            return {}
+
+        try:
+            price_result = self.rate_limiter.call('ticker', pyupbit.get_current_price, tickers,
+                                                  limit_info_kw='limit_info')
+            if isinstance(price_result, dict):
+                return price_result
+            if len(tickers) == 1 and price_result is not None:
+                return {tickers[0]: price_result}
+
+        except Exception as e:
+            logger.warning(f"⚠️ 현재가 일괄 조회 실패: {e}")
+
+        return {}
+
     def get_last_buy_timestamp(self, ticker: str) -> Optional[datetime]:
         """마지막 매수 시점 조회"""
         try:
@@ -958,46 +1302,35 @@ class LocalTradingEngine:
             if not blacklist:
                 blacklist = {}
 
-            # 업비트에서 잔고 조회
-            balances = self.upbit.get_balances()
-
-            if not balances or not isinstance(balances, list):
+            # 잔고 스냅샷 1회 ↔ DB 순포지션 대사
+            report = self.reconcile_portfolio()
+            if report is None:
                 return direct_purchases
 
             logger.info("🔍 직접 매수 종목 감지 시작...")
 
-            for balance in balances:
-                currency = balance['currency']
-
-                # KRW는 제외
-                if currency == 'KRW':
-                    continue
-
-                quantity = float(balance['balance'])
-                if quantity <= 0:
+            # 매수 기록이 전혀 없는 잔고를 직접 매수 종목으로 분류
+            targets = []
+            for correction in report.missing:
+                if correction.ticker in blacklist:
                     continue
 
-                ticker = f"KRW-{currency}"
-
-                # 블랙리스트 확인
-                if ticker in blacklist:
+                if correction.price <= 0:
+                    logger.error(f"❌ {correction.ticker} 잘못된 잔고 정보: 수량={correction.exchange_quantity}, 평균매수가={correction.price}")
                     continue
 
-                # trades 테이블에서 매수 기록 확인
-                last_buy_timestamp = self.get_last_buy_timestamp(ticker)
-
-                # 매수 기록이 없으면 직접 매수 종목으로 분류
-                if last_buy_timestamp is None:
-                    logger.warning(f"🔍 직접 매수 종목 감지: {ticker} (보유량: {quantity:.8f})")
+                logger.warning(f"🔍 직접 매수 종목 감지: {correction.ticker} (보유량: {correction.exchange_quantity:.8f})")
+                targets.append(correction)
 
-                    # 직접 매수 종목 데이터베이스 초기화
-                    success = self._initialize_direct_purchase_record(ticker, balance)
-
-                    if success:
-                        direct_purchases.append(ticker)
-                        logger.info(f"✅ {ticker} 직접 매수 종목 데이터베이스 초기화 완료")
-                    else:
-                        logger.error(f"❌ {ticker} 직접 매수 종목 초기화 실패")
+            # 직접 매수 종목 데이터베이스 초기화 (단일 트랜잭션)
+            if targets:
+                if self.reconciler.apply(targets, source='DIRECT_PURCHASE'):
+                    direct_purchases = [correction.ticker for correction in targets]
+                    for correction in targets:
+                        logger.info(f"📝 {correction.ticker} 직접 매수 기록 생성: {correction.exchange_quantity:.8f}개 @ "
+                                    f"{correction.price:,.0f}원 (총 {correction.value_krw:,.0f}원)")
+                else:
+                    logger.error(f"❌ 직접 매수 종목 초기화 실패: {', '.join(c.ticker for c in targets)}")
 
             if direct_purchases:
                 logger.info(f"🎯 총 {len(direct_purchases)}개 직접 매수 종목 감지 및 초기화: {', '.join(direct_purchases)}")
@@ -1010,104 +1343,33 @@ class LocalTradingEngine:
             logger.error(f"❌ 직접 매수 종목 감지 실패: {e}")
             return direct_purchases
 
-    def _initialize_direct_purchase_record(self, ticker: str, balance_info: dict) -> bool:
-        """
-        직접 매수 종목의 초기 데이터베이스 레코드 생성
-
-        Args:
-            ticker: 종목 코드 (예: KRW-NEAR)
-            balance_info: 업비트 잔고 정보
+    def build_portfolio_snapshot(self) -> PortfolioSnapshot:
+        """잔고 1회 + 현재가 일괄 조회 1회로 포트폴리오 스냅샷 생성 (실패 시 빈 스냅샷)"""
+        snapshot = PortfolioSnapshot()
 
-        Returns:
-            bool: 초기화 성공 여부
-        """
         try:
-            currency = ticker.replace("KRW-", "")
-            quantity = float(balance_info['balance'])
-            avg_buy_price = float(balance_info['avg_buy_price'])
-
-            if quantity <= 0 or avg_buy_price <= 0:
-                logger.error(f"❌ {ticker} 잘못된 잔고 정보: 수량={quantity}, 평균매수가={avg_buy_price}")
-                return False
-
-            # 총 매수 금액 계산
-            total_amount = quantity * avg_buy_price
-
-            # 현재 시간을 매수 시점으로 설정 (실제 매수 시점은 알 수 없음)
-            purchase_timestamp = datetime.now().isoformat()
-
-            # 가상의 거래 ID 생성 (직접 매수 종목 식별용)
-            virtual_order_id = f"DIRECT_PURCHASE_{ticker}_{int(datetime.now().timestamp())}"
-
-            with get_db_connection_context() as conn:
-                cursor = conn.cursor()
-
-                # trades 테이블에 직접 매수 기록 삽입 (새 스키마 적용)
-                cursor.execute("""
-                    INSERT INTO trades (
-                        ticker, order_type, status, order_id,
-                        requested_quantity, filled_quantity,
-                        requested_amount, filled_amount, average_price,
-                        is_pyramid, is_pyramid_eligible,
-                        fee, error_message, timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    ticker,
-                    'BUY',
-                    'FULL_FILLED',  # 새 스키마의 상태값
-                    virtual_order_id,
-                    quantity,        # requested_quantity
-                    quantity,        # filled_quantity (직접 매수는 전량 체결)
-                    total_amount,    # requested_amount
-                    total_amount,    # filled_amount (직접 매수는 전량 체결)
-                    avg_buy_price,   # average_price
-                    False,          # is_pyramid (직접 매수는 피라미딩 아님)
-                    True,           # is_pyramid_eligible (향후 피라미딩 가능)
-                    0.0,            # fee (수수료 정보 없음)
-                    None,           # error_message
-                    purchase_timestamp
-                ))
-
-                conn.commit()
-
-            logger.info(f"📝 {ticker} 직접 매수 기록 생성: {quantity:.8f}개 @ {avg_buy_price:,.0f}원 (총 {total_amount:,.0f}원)")
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ {ticker} 직접 매수 초기화 실패: {e}")
-            return False
-
-    def get_total_balance_krw(self) -> float:
-        """총 보유 자산 KRW 환산 (개선된 디버깅 버전)"""
-        try:
-            logger.debug("🔍 총 자산 조회 시작")
-
             if self.dry_run:
-                logger.debug("🧪 DRY RUN 모드: 1,000,000원 반환")
-                return 1000000.0  # DRY RUN 시 100만원으로 가정
+                logger.debug("🧪 DRY RUN 모드: 현금 1,000,000원 스냅샷")
+                snapshot.cash_krw = 1000000.0  # DRY RUN 시 100만원으로 가정
+                return snapshot
 
             logger.debug("📡 업비트 API 잔고 조회 시작")
-            balances = self.upbit.get_balances()
+            balances = self.rate_limiter.call('default', self.upbit.get_balances, limit_info_kw='contain_req')
 
             if not balances:
                 logger.warning("⚠️ 업비트 잔고 조회 결과가 비어있음")
-                return 0.0
-
-            logger.debug(f"📊 조회된 잔고 수: {len(balances) if isinstance(balances, list) else 'N/A'}")
+                return snapshot
 
             # API 오류 응답 처리
             if isinstance(balances, dict) and 'error' in balances:
                 error_info = balances['error']
                 logger.error(f"❌ 업비트 API 오류: {error_info.get('name', 'unknown')} - {error_info.get('message', 'no message')}")
-                return 0.0
+                return snapshot
 
             # balances가 리스트가 아닌 경우 처리
             if not isinstance(balances, list):
                 logger.error(f"❌ 예상치 못한 balances 타입: {type(balances)}, 값: {balances}")
-                return 0.0
-
-            total_krw = 0.0
-            processed_currencies = []
+                return snapshot
 
             for balance in balances:
                 try:
@@ -1118,44 +1380,68 @@ class LocalTradingEngine:
                         continue
 
                     if currency == 'KRW':
-                        total_krw += quantity
-                        processed_currencies.append(f"KRW: {quantity:,.0f}원")
-                        logger.debug(f"💰 KRW 잔고: {quantity:,.0f}원")
+                        snapshot.cash_krw += quantity
                     else:
-                        # 암호화폐는 현재가로 환산
-                        ticker = f"KRW-{currency}"
-                        current_price = pyupbit.get_current_price(ticker)
-                        if current_price:
-                            crypto_value_krw = quantity * current_price
-                            total_krw += crypto_value_krw
-                            processed_currencies.append(f"{currency}: {quantity:.8f} @ {current_price:,.0f}원 = {crypto_value_krw:,.0f}원")
-                            logger.debug(f"🪙 {currency}: {quantity:.8f}개 × {current_price:,.0f}원 = {crypto_value_krw:,.0f}원")
-                        else:
-                            logger.warning(f"⚠️ {ticker} 현재가 조회 실패")
-                            continue
+                        snapshot.holdings[f"KRW-{currency}"] = {
+                            'quantity': quantity,
+                            'avg_buy_price': float(balance.get('avg_buy_price', 0) or 0)
+                        }
 
                 except Exception as balance_error:
-                    ticker = f"KRW-{currency}" if 'currency' in locals() and currency != 'KRW' else currency if 'currency' in locals() else 'UNKNOWN'
-                    logger.warning(f"❌ {ticker}: 잔고 처리 실패 - {balance_error}")
-                    logger.debug(f"🔍 {ticker}: balance 구조 - {balance if 'balance' in locals() else 'N/A'}")
+                    logger.warning(f"❌ {balance.get('currency', 'UNKNOWN')}: 잔고 처리 실패 - {balance_error}")
                     continue
 
-            logger.info(f"💰 총 자산 조회 완료: {total_krw:,.0f}원 (처리된 자산: {len(processed_currencies)}개)")
-            logger.debug(f"📋 자산 상세: {', '.join(processed_currencies) if processed_currencies else '없음'}")
+            # 암호화폐는 현재가 일괄 조회로 환산 (종목별 호출 대신 1회)
+            snapshot.prices = self._get_current_prices(list(snapshot.holdings))
+            for ticker in snapshot.holdings:
+                if ticker not in snapshot.prices:
+                    logger.warning(f"⚠️ {ticker} 현재가 조회 실패")
+
+            logger.debug(f"📋 스냅샷: 현금 {snapshot.cash_krw:,.0f}원, 보유 {len(snapshot.holdings)}개 종목")
+
+        except Exception as e:
+            logger.error(f"❌ 포트폴리오 스냅샷 생성 실패: {type(e).__name__}: {str(e)}")
+
+        return snapshot
+
+    def begin_portfolio_session(self) -> PortfolioSnapshot:
+        """거래 세션 시작: 스냅샷 1회 생성 (세션 중 사이징은 이 스냅샷만 사용)"""
+        self.portfolio_snapshot = self.build_portfolio_snapshot()
+        logger.info(f"💰 세션 포트폴리오 스냅샷: 총 자산 {self.portfolio_snapshot.total_balance_krw:,.0f}원 "
+                    f"(현금 {self.portfolio_snapshot.cash_krw:,.0f}원, {len(self.portfolio_snapshot.holdings)}개 종목)")
+        return self.portfolio_snapshot
+
+    def end_portfolio_session(self):
+        """거래 세션 종료: 스냅샷 폐기 (다음 세션은 새로 조회)"""
+        self.portfolio_snapshot = None
 
+    def get_portfolio_snapshot(self) -> PortfolioSnapshot:
+        """활성 세션 스냅샷 (세션 밖에서는 1회성 스냅샷 생성)"""
+        return self.portfolio_snapshot or self.build_portfolio_snapshot()
+
+    def _apply_fill_to_portfolio(self, trade_result: TradeResult, trade_type: str):
+        """체결 결과를 세션 스냅샷에 로컬 반영 (DRY RUN은 고정 스냅샷 유지)"""
+        if self.dry_run or self.portfolio_snapshot is None:
+            return
+        if trade_result.status in (TradeStatus.FULL_FILLED, TradeStatus.PARTIAL_FILLED, TradeStatus.PARTIAL_FILLED_NO_AVG):
+            self.portfolio_snapshot.apply_fill(trade_result, trade_type)
+
+    def get_total_balance_krw(self) -> float:
+        """총 보유 자산 KRW 환산 (활성 세션이 있으면 세션 스냅샷 기준)"""
+        try:
+            total_krw = self.get_portfolio_snapshot().total_balance_krw
+            logger.info(f"💰 총 자산 조회 완료: {total_krw:,.0f}원")
             return total_krw
 
         except Exception as e:
             logger.error(f"❌ 총 자산 조회 함수 전체 실패: {type(e).__name__}: {str(e)}")
-            import traceback
-            logger.debug(f"🔍 상세 스택 트레이스:\n{traceback.format_exc()}")
             return 0.0
 
     def calculate_position_size(self, ticker: str, kelly_percentage: float,
                               market_sentiment_adjustment: float) -> float:
         """포지션 사이즈 계산"""
         try:
-            # 총 자산 조회
+            # 총 자산 조회 (세션 스냅샷 기준, 체결 반영 포함 - 백테스트 엔진은 시뮬레이션 자산으로 재정의)
             total_balance = self.get_total_balance_krw()
 
             if total_balance <= 0:
@@ -1183,10 +1469,9 @@ class LocalTradingEngine:
             logger.error(f"❌ {ticker} 포지션 사이즈 계산 실패: {e}")
             return 0.0
 
-    @retry(max_attempts=3, initial_delay=1, backoff=2)
-    def execute_buy_order(self, ticker: str, amount_krw: float, is_pyramid: bool = False) -> TradeResult:
-        """매수 주문 실행"""
-        trade_result = TradeResult(
+    def _new_buy_result(self, ticker: str, amount_krw: float, is_pyramid: bool = False) -> TradeResult:
+        """매수 TradeResult 초기값"""
+        return TradeResult(
             ticker=ticker,
             order_id="PENDING",  # 임시 order_id, 실제 주문 후 업데이트
             status=TradeStatus.FAILED,
@@ -1195,151 +1480,331 @@ class LocalTradingEngine:
             is_pyramid=is_pyramid  # 피라미딩 상태 설정
         )
 
+    def _record_buy_exception(self, trade_result: TradeResult, ticker: str, amount_krw: float,
+                              is_pyramid: bool, error: Exception):
+        """예상치 못한 매수 오류 기록 (저장 후 실패 결과 유지)"""
+        trade_result.error_message = f"매수 실행 중 예상치 못한 오류: {error}"
+        logger.error(f"❌ {ticker} 매수 실행 중 예상치 못한 오류: {error}")
+        self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
+
+    @retry(max_attempts=3, initial_delay=1, backoff=2)
+    def execute_buy_order(self, ticker: str, amount_krw: float, is_pyramid: bool = False) -> TradeResult:
+        """매수 주문 실행 (접수 → 체결 확인 → 결과 처리)"""
+        trade_result = self._new_buy_result(ticker, amount_krw, is_pyramid)
+
         try:
             self.trading_stats['orders_attempted'] += 1
 
-            # DRY RUN 모드
-            if self.dry_run:
-                current_price = pyupbit.get_current_price(ticker)
-                if current_price:
-                    requested_quantity = amount_krw / current_price
-                    trade_result.requested_quantity = requested_quantity
-                    trade_result.order_id = f"DRY_RUN_{int(datetime.now().timestamp())}"
-                    trade_result.status = TradeStatus.FULL_FILLED
-                    trade_result.filled_amount = amount_krw
-                    trade_result.filled_quantity = requested_quantity
-                    trade_result.average_price = current_price
-                    logger.info(f"🧪 DRY RUN: {ticker} 매수 주문 ({amount_krw:,.0f}원)")
-                    self.trading_stats['orders_successful'] += 1
-                    self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-                    return trade_result
-                else:
-                    trade_result.error_message = "DRY RUN 모드에서 현재가 조회 실패"
-                    return trade_result
+            pending = self._submit_buy_order(trade_result, ticker, amount_krw, is_pyramid)
+            if pending is None:
+                # DRY RUN 완료 또는 접수 단계 실패 (거래 기록 저장 완료)
+                return trade_result
 
-            # 최소 주문 금액 확인
-            if amount_krw < self.config.min_order_amount_krw:
-                trade_result.error_message = f"주문 금액 부족: {amount_krw:,.0f} < {self.config.min_order_amount_krw:,.0f}"
-                trade_result.status = TradeStatus.CANCELLED
-                logger.warning(f"⚠️ {ticker}: {trade_result.error_message}")
+            # 주문 체결 확인 (종료 상태 도달 즉시 반환, 최대 order_confirm_timeout_sec / 분할 집행은 확인 완료)
+            order_detail = pending.order_detail or self.order_tracker.wait_for_order(pending.order_id)
+            try:
+                self._complete_buy_order(pending, order_detail)
+            finally:
+                # 거래 기록 저장 실패와 무관하게 체결분은 세션 스냅샷에 반영
+                self._apply_fill_to_portfolio(trade_result, 'BUY')
+                self._record_execution_slippage([pending])
+
+        except pyupbit.UpbitError as ue:
+            trade_result.error_message = f"업비트 API 오류: {str(ue)}"
+            logger.error(f"❌ {ticker} 매수 중 업비트 API 오류: {ue}")
+            # API 관련 오류는 재시도할 수 있으므로 raise하여 @retry가 처리하도록 함
+            raise
+
+        except Exception as e:
+            # Exception 케이스는 저장 후 return 필요
+            self._record_buy_exception(trade_result, ticker, amount_krw, is_pyramid, e)
+            return trade_result
+
+        finally:
+            # 중복 저장 방지:
+            # 1. 성공 케이스는 process_trade_result에서 이미 저장됨
+            # 2. 실패 케이스는 각각의 early return에서 이미 저장됨
+            # 3. Exception 케이스도 이제 저장 후 return됨
+            # finally에서는 저장하지 않음 (중복 방지)
+            pass
+
+        return trade_result
+
+    def check_pre_trade_risk(self, orders: Dict[str, float]) -> RiskReport:
+        """
+        매수 주문 배치 사전 리스크 검사 (세션 스냅샷 기준, 전체 후보 일괄)
+
+        Args:
+            orders: {ticker: 요청 매수 금액(KRW)}
+
+        Returns:
+            RiskReport - approved_orders가 한도 적용 후 접수할 주문
+        """
+        return self.risk_engine.check_batch(orders, self.get_portfolio_snapshot())
+
+    def execute_buy_orders(self, orders: Dict[str, float], is_pyramid: bool = False) -> Dict[str, TradeResult]:
+        """
+        복수 매수 주문 일괄 실행
+
+        현재가와 호가창을 1회씩 일괄 조회한 뒤 모든 주문을 레이트 리미터(order 그룹) 한도 내에서 연속 접수하고,
+        체결 확인은 OrderTracker.wait_for_orders로 한 번에 수행한다 (분할 집행 주문은 접수 단계에서 확인 완료).
+        주문별 TradeResult와 trades 기록은 execute_buy_order와 동일하다.
+
+        Args:
+            orders: {ticker: 매수 금액(KRW)} - 접수 순서 유지
+
+        Returns:
+            {ticker: TradeResult}
+        """
+        results: Dict[str, TradeResult] = {}
+        pending_orders: List[PendingOrder] = []
+        current_prices = self._get_current_prices(list(orders))
+        orderbooks = {}
+        if self.config.orderbook_execution and not self.dry_run:
+            orderbooks = self.order_executor.fetch_orderbooks(list(orders))
+
+        for ticker, amount_krw in orders.items():
+            trade_result = self._new_buy_result(ticker, amount_krw, is_pyramid)
+            results[ticker] = trade_result
+            self.trading_stats['orders_attempted'] += 1
+
+            try:
+                pending = self._submit_buy_order(
+                    trade_result, ticker, amount_krw, is_pyramid,
+                    current_price=current_prices.get(ticker),
+                    orderbook=orderbooks.get(ticker)
+                )
+                if pending is not None:
+                    pending_orders.append(pending)
+            except Exception as e:
+                self._record_buy_exception(trade_result, ticker, amount_krw, is_pyramid, e)
+
+        if pending_orders:
+            unconfirmed = [pending.order_id for pending in pending_orders if pending.order_detail is None]
+            logger.info(f"⏳ 매수 주문 {len(unconfirmed)}건 체결 동시 확인")
+            order_details = self.order_tracker.wait_for_orders(unconfirmed) if unconfirmed else {}
+
+            for pending in pending_orders:
+                try:
+                    self._complete_buy_order(pending, pending.order_detail or order_details.get(pending.order_id))
+                except Exception as e:
+                    self._record_buy_exception(pending.trade_result, pending.ticker, pending.amount_krw,
+                                               pending.is_pyramid, e)
+                finally:
+                    self._apply_fill_to_portfolio(pending.trade_result, 'BUY')
+
+            self._record_execution_slippage(pending_orders)
+
+        return results
+
+    def _submit_buy_order(self, trade_result: TradeResult, ticker: str, amount_krw: float,
+                          is_pyramid: bool = False, current_price: Optional[float] = None,
+                          orderbook: Optional[Dict[str, Any]] = None) -> Optional[PendingOrder]:
+        """
+        매수 주문 접수 (DRY RUN은 즉시 체결 처리)
+
+        orderbook_execution이 켜져 있으면 호가창으로 예상 슬리피지를 계산하고,
+        max_slippage_bps를 넘는 주문은 자식 주문으로 분할 집행한 뒤 합산 주문 상세를 함께 반환한다.
+
+        Returns:
+            체결 확인이 필요한 PendingOrder, 접수 단계에서 종료된 경우 None (거래 기록 저장 완료)
+        """
+        # DRY RUN 모드
+        if self.dry_run:
+            if current_price is None:
+                current_price = self.rate_limiter.call('ticker', pyupbit.get_current_price, ticker, limit_info_kw='limit_info')
+            if current_price:
+                requested_quantity = amount_krw / current_price
+                trade_result.requested_quantity = requested_quantity
+                trade_result.order_id = f"DRY_RUN_{int(datetime.now().timestamp())}"
+                trade_result.status = TradeStatus.FULL_FILLED
+                trade_result.filled_amount = amount_krw
+                trade_result.filled_quantity = requested_quantity
+                trade_result.average_price = current_price
+                logger.info(f"🧪 DRY RUN: {ticker} 매수 주문 ({amount_krw:,.0f}원)")
+                self.trading_stats['orders_successful'] += 1
                 self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-                return trade_result
+                return None
+            else:
+                trade_result.error_message = "DRY RUN 모드에서 현재가 조회 실패"
+                return None
 
-            # 현재가 조회
-            current_price = pyupbit.get_current_price(ticker)
-            if not current_price:
-                trade_result.error_message = "현재가 조회 실패"
-                logger.error(f"❌ {ticker}: {trade_result.error_message}")
+        # 최소 주문 금액 확인
+        if amount_krw < self.config.min_order_amount_krw:
+            trade_result.error_message = f"주문 금액 부족: {amount_krw:,.0f} < {self.config.min_order_amount_krw:,.0f}"
+            trade_result.status = TradeStatus.CANCELLED
+            logger.warning(f"⚠️ {ticker}: {trade_result.error_message}")
+            self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
+            return None
+
+        # 현재가 조회 (일괄 주문 시 사전 조회 값 사용)
+        if current_price is None:
+            current_price = self.rate_limiter.call('ticker', pyupbit.get_current_price, ticker, limit_info_kw='limit_info')
+        if not current_price:
+            trade_result.error_message = "현재가 조회 실패"
+            logger.error(f"❌ {ticker}: {trade_result.error_message}")
+            self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
+            return None
+
+        # requested_quantity 계산
+        trade_result.requested_quantity = amount_krw / current_price
+
+        # 수수료를 고려한 실제 주문 금액
+        order_amount = amount_krw / (1 + self.config.taker_fee_rate)
+
+        # 호가창 기반 슬리피지 추정 (임계값 초과 시 분할 집행)
+        plan = None
+        if self.config.orderbook_execution:
+            plan = self.order_executor.plan_buy(ticker, order_amount, orderbook)
+            if plan.estimate:
+                logger.info(f"📊 {ticker} 예상 슬리피지 {plan.estimate.slippage_bps:.1f}bp "
+                            f"(호가 소진 {plan.estimate.impact_bps:.1f}bp, 호가 {plan.estimate.levels_consumed}단계, 매도 잔량 {plan.estimate.book_depth_krw:,.0f}원)")
+
+        if plan is not None and plan.is_split:
+            order_detail = self.order_executor.execute_plan(plan)
+            if not order_detail:
+                trade_result.error_message = f"분할 집행 실패: 자식 주문 접수 없음 ({plan.style})"
+                logger.error(f"❌ {ticker} {trade_result.error_message}")
                 self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-                return trade_result
+                return None
 
-            # requested_quantity 계산
-            trade_result.requested_quantity = amount_krw / current_price
+            trade_result.order_id = order_detail['uuid']
+            logger.info(f"✅ {ticker} 분할 매수 집행 완료 ({plan.style}, 자식 주문 {len(order_detail['child_order_ids'])}건)")
+            return PendingOrder(
+                ticker=ticker,
+                trade_result=trade_result,
+                order_id=order_detail['uuid'],
+                amount_krw=amount_krw,
+                current_price=current_price,
+                is_pyramid=is_pyramid,
+                plan=plan,
+                order_detail=order_detail
+            )
 
-            # 수수료를 고려한 실제 주문 금액
-            order_amount = amount_krw / (1 + self.config.taker_fee_rate)
+        logger.info(f"🚀 {ticker} 시장가 매수 주문: {order_amount:,.0f}원 (현재가: {current_price:,.0f})")
 
-            logger.info(f"🚀 {ticker} 시장가 매수 주문: {order_amount:,.0f}원 (현재가: {current_price:,.0f})")
+        # 업비트 매수 주문
+        response = self.rate_limiter.call('order', self.upbit.buy_market_order, ticker, order_amount, limit_info_kw='contain_req')
 
-            # 업비트 매수 주문
-            response = self.upbit.buy_market_order(ticker, order_amount)
+        # 강화된 API 응답 검증 (다중 필드 검증)
+        order_id = None
+        if response:
+            # 다양한 주문 ID 필드명 시도
+            order_id = response.get('uuid') or response.get('order_id') or response.get('id') or response.get('orderId')
 
-            # 강화된 API 응답 검증 (다중 필드 검증)
-            order_id = None
-            if response:
-                # 다양한 주문 ID 필드명 시도
-                order_id = response.get('uuid') or response.get('order_id') or response.get('id') or response.get('orderId')
+        if not response:
+            trade_result.error_message = f"주문 접수 실패: API 응답 없음"
+            logger.error(f"❌ {ticker} 매수 주문 접수 실패 - 응답 없음")
+            self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
+            return None
+        elif not order_id:
+            # 상세한 응답 로깅으로 디버깅 지원
+            logger.warning(f"⚠️ {ticker} 주문 응답에서 주문ID 필드를 찾을 수 없음. 응답 구조: {response}")
+            trade_result.error_message = f"주문 ID 추출 실패. 응답: {response}"
+            logger.error(f"❌ {ticker} 매수 주문 접수 실패 - 주문ID 없음")
+
+            # 재검증 시도: 최근 주문 목록을 짧은 간격으로 재조회 (최대 3초)
+            logger.info(f"🔄 {ticker} 주문 재검증 시도...")
+            try:
+                matched_order = self.order_tracker.find_order(
+                    lambda order: (order.get('market') == ticker and
+                                   order.get('side') == 'bid' and
+                                   abs(float(order.get('volume', 0)) * float(order.get('price', 0)) - order_amount) < 1000),
+                    state='done',
+                    limit=5,
+                    timeout=3.0
+                )
+                if matched_order:
+                    order_id = matched_order.get('uuid')
+                    logger.info(f"✅ {ticker} 주문ID 재검증 성공: {order_id}")
 
-            if not response:
-                trade_result.error_message = f"주문 접수 실패: API 응답 없음"
-                logger.error(f"❌ {ticker} 매수 주문 접수 실패 - 응답 없음")
-                self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-                return trade_result
-            elif not order_id:
-                # 상세한 응답 로깅으로 디버깅 지원
-                logger.warning(f"⚠️ {ticker} 주문 응답에서 주문ID 필드를 찾을 수 없음. 응답 구조: {response}")
-                trade_result.error_message = f"주문 ID 추출 실패. 응답: {response}"
-                logger.error(f"❌ {ticker} 매수 주문 접수 실패 - 주문ID 없음")
-
-                # 재검증 시도: 3초 후 주문 목록에서 최근 주문 확인
-                logger.info(f"🔄 {ticker} 주문 재검증 시도...")
-                time.sleep(3)
-                try:
-                    # 최근 주문 목록에서 확인 시도
-                    recent_orders = self.upbit.get_orders(state='done', limit=5)
-                    if recent_orders:
-                        for order in recent_orders:
-                            if (order.get('market') == ticker and
-                                order.get('side') == 'bid' and
-                                abs(float(order.get('volume', 0)) * float(order.get('price', 0)) - order_amount) < 1000):
-                                order_id = order.get('uuid')
-                                logger.info(f"✅ {ticker} 주문ID 재검증 성공: {order_id}")
-                                break
-
-                    if not order_id:
-                        self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-                        return trade_result
-
-                except Exception as retry_error:
-                    logger.error(f"❌ {ticker} 주문 재검증 실패: {retry_error}")
+                if not order_id:
                     self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-                    return trade_result
-            trade_result.order_id = order_id
+                    return None
 
-            logger.info(f"✅ {ticker} 매수 주문 접수 성공 (주문ID: {order_id})")
+            except Exception as retry_error:
+                logger.error(f"❌ {ticker} 주문 재검증 실패: {retry_error}")
+                self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
+                return None
+        trade_result.order_id = order_id
 
-            # 주문 체결 확인 (최대 10초 대기)
-            time.sleep(5)
-            order_detail = self.upbit.get_order(order_id)
+        logger.info(f"✅ {ticker} 매수 주문 접수 성공 (주문ID: {order_id})")
 
-            if order_detail and order_detail.get('state') == 'done':
-                executed_quantity = float(order_detail.get('executed_volume', 0))
-                trades = order_detail.get('trades', [])
+        return PendingOrder(
+            ticker=ticker,
+            trade_result=trade_result,
+            order_id=order_id,
+            amount_krw=amount_krw,
+            current_price=current_price,
+            is_pyramid=is_pyramid,
+            plan=plan
+        )
 
-                if trades and executed_quantity > 0:
-                    # 평균 체결가 계산
-                    total_value = sum(float(trade['price']) * float(trade['volume']) for trade in trades)
-                    total_volume = sum(float(trade['volume']) for trade in trades)
+    def _ensure_trades_execution_columns(self):
+        """trades 테이블 슬리피지 기록 컬럼 보장 (기존 DB 마이그레이션)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(trades)")}
+                if not existing:
+                    return
+                for column, column_type in TRADES_EXECUTION_COLUMNS:
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE trades ADD COLUMN {column} {column_type}")
 
-                    if total_volume > 0:
-                        avg_price = total_value / total_volume
-                        fee = total_value * self.config.taker_fee_rate
+        except Exception as e:
+            logger.warning(f"⚠️ trades 슬리피지 컬럼 추가 실패: {e}")
 
-                        # 전량 체결 또는 부분 체결 판단
-                        if executed_quantity >= trade_result.requested_quantity * 0.99:  # 99% 이상이면 전량 체결로 간주
-                            trade_result.status = TradeStatus.FULL_FILLED
-                            self.trading_stats['orders_successful'] += 1  # 전량 체결만 성공으로 카운팅
-                        else:
-                            trade_result.status = TradeStatus.PARTIAL_FILLED
-                            self.trading_stats['orders_partial_filled'] += 1  # 부분 체결로 분류
+    def _record_execution_slippage(self, pending_orders: List[PendingOrder]):
+        """예상/실제 슬리피지와 집행 방식을 trades 기록에 반영 (executemany 1회)"""
+        rows = []
+        for pending in pending_orders:
+            if pending.plan is None:
+                continue
 
-                        trade_result.filled_quantity = executed_quantity
-                        trade_result.average_price = avg_price
-                        trade_result.filled_amount = total_value
-                        trade_result.fees = fee
-                        self.trading_stats['total_volume_krw'] += total_value
-                        self.trading_stats['total_fees_krw'] += fee
+            actual = self.order_executor.actual_slippage_bps(pending.plan, pending.trade_result.average_price)
+            rows.append((pending.plan.estimated_slippage_bps, actual, pending.plan.style, pending.order_id))
+            if actual is not None and pending.plan.estimate is not None:
+                logger.info(f"📐 {pending.ticker} 슬리피지: 예상 {pending.plan.estimate.slippage_bps:.1f}bp / 실제 {actual:.1f}bp ({pending.plan.style})")
 
-                        # 통합된 거래 결과 처리 (새로운 TradeResult 활용)
-                        self.process_trade_result(
-                            trade_result,
-                            ticker,
-                            is_pyramid=is_pyramid,  # 매개변수로 전달받은 값 사용
-                            requested_amount=amount_krw
-                        )
+        if not rows:
+            return
 
-                        logger.info(f"💰 {ticker} 매수 체결 완료: {executed_quantity:.8f}개, 평균가 {avg_price:,.0f}원")
-                    else:
-                        trade_result.error_message = f"체결 내역 있으나 총 체결 수량 0. OrderID: {order_id}"
-                        logger.error(f"❌ {ticker} 매수 체결 정보 오류: {trade_result.error_message}")
+        try:
+            with get_db_connection_context() as conn:
+                conn.executemany("""
+                    UPDATE trades
+                    SET estimated_slippage_bps = ?, actual_slippage_bps = ?, execution_style = ?
+                    WHERE order_id = ? AND order_type = 'BUY'
+                """, rows)
+                conn.commit()
 
-                elif executed_quantity > 0:
-                    # trades 정보 없지만 executed_volume은 있는 경우 (업비트에서 가끔 발생)
-                    filled_amount = executed_quantity * current_price
-                    fee = filled_amount * self.config.taker_fee_rate
+        except Exception as e:
+            logger.warning(f"⚠️ 슬리피지 기록 실패: {e}")
+
+    def _complete_buy_order(self, pending: PendingOrder, order_detail: Optional[Dict[str, Any]]) -> TradeResult:
+        """체결 확인 결과를 TradeResult/통계/거래 기록에 반영"""
+        ticker = pending.ticker
+        trade_result = pending.trade_result
+        order_id = pending.order_id
+        current_price = pending.current_price
+        amount_krw = pending.amount_krw
+        is_pyramid = pending.is_pyramid
+
+        if order_detail and order_detail.get('state') == 'done':
+            executed_quantity = float(order_detail.get('executed_volume', 0))
+            trades = order_detail.get('trades', [])
+
+            if trades and executed_quantity > 0:
+                # 평균 체결가 계산
+                total_value = sum(float(trade['price']) * float(trade['volume']) for trade in trades)
+                total_volume = sum(float(trade['volume']) for trade in trades)
+
+                if total_volume > 0:
+                    avg_price = total_value / total_volume
+                    fee = total_value * self.config.taker_fee_rate
 
                     # 전량 체결 또는 부분 체결 판단
-                    if executed_quantity >= trade_result.requested_quantity * 0.99:
+                    if executed_quantity >= trade_result.requested_quantity * 0.99:  # 99% 이상이면 전량 체결로 간주
                         trade_result.status = TradeStatus.FULL_FILLED
                         self.trading_stats['orders_successful'] += 1  # 전량 체결만 성공으로 카운팅
                     else:
@@ -1347,94 +1812,103 @@ class LocalTradingEngine:
                         self.trading_stats['orders_partial_filled'] += 1  # 부분 체결로 분류
 
                     trade_result.filled_quantity = executed_quantity
-                    trade_result.average_price = current_price  # 현재가로 대체
-                    trade_result.filled_amount = filled_amount
+                    trade_result.average_price = avg_price
+                    trade_result.filled_amount = total_value
                     trade_result.fees = fee
-                    trade_result.error_message = "Trades 정보 없음 - 현재가로 평균단가 대체"
-                    self.trading_stats['total_volume_krw'] += filled_amount
+                    self.trading_stats['total_volume_krw'] += total_value
                     self.trading_stats['total_fees_krw'] += fee
 
-                    logger.warning(f"⚠️ {ticker} 매수 체결 완료 (trades 정보 없음): {executed_quantity:.8f}개, 현재가 {current_price:,.0f}원으로 기록")
-                else:
-                    trade_result.error_message = f"주문 'done'이지만 executed_volume=0이고 trades 없음. OrderID: {order_id}"
-                    logger.error(f"❌ {ticker} 매수 체결 오류: {trade_result.error_message}")
-
-            elif order_detail:
-                # cancel 상태에서도 체결된 수량이 있으면 부분 체결 성공 처리
-                order_state = order_detail.get('state', 'unknown')
-                executed_quantity = float(order_detail.get('executed_volume', 0))
+                    # 통합된 거래 결과 처리 (새로운 TradeResult 활용)
+                    self.process_trade_result(
+                        trade_result,
+                        ticker,
+                        is_pyramid=is_pyramid,  # 매개변수로 전달받은 값 사용
+                        requested_amount=amount_krw
+                    )
 
-                if order_state == 'cancel' and executed_quantity > 0:
-                    trades = order_detail.get('trades', [])
+                    logger.info(f"💰 {ticker} 매수 체결 완료: {executed_quantity:.8f}개, 평균가 {avg_price:,.0f}원")
+                else:
+                    trade_result.error_message = f"체결 내역 있으나 총 체결 수량 0. OrderID: {order_id}"
+                    logger.error(f"❌ {ticker} 매수 체결 정보 오류: {trade_result.error_message}")
 
-                    if trades:
-                        total_value = sum(float(trade['price']) * float(trade['volume']) for trade in trades)
-                        total_volume = sum(float(trade['volume']) for trade in trades)
+            elif executed_quantity > 0:
+                # trades 정보 없지만 executed_volume은 있는 경우 (업비트에서 가끔 발생)
+                filled_amount = executed_quantity * current_price
+                fee = filled_amount * self.config.taker_fee_rate
 
-                        if total_volume > 0:
-                            avg_price = total_value / total_volume
-                            fee = total_value * self.config.taker_fee_rate
+                # 전량 체결 또는 부분 체결 판단
+                if executed_quantity >= trade_result.requested_quantity * 0.99:
+                    trade_result.status = TradeStatus.FULL_FILLED
+                    self.trading_stats['orders_successful'] += 1  # 전량 체결만 성공으로 카운팅
+                else:
+                    trade_result.status = TradeStatus.PARTIAL_FILLED
+                    self.trading_stats['orders_partial_filled'] += 1  # 부분 체결로 분류
+
+                trade_result.filled_quantity = executed_quantity
+                trade_result.average_price = current_price  # 현재가로 대체
+                trade_result.filled_amount = filled_amount
+                trade_result.fees = fee
+                trade_result.error_message = "Trades 정보 없음 - 현재가로 평균단가 대체"
+                self.trading_stats['total_volume_krw'] += filled_amount
+                self.trading_stats['total_fees_krw'] += fee
+
+                logger.warning(f"⚠️ {ticker} 매수 체결 완료 (trades 정보 없음): {executed_quantity:.8f}개, 현재가 {current_price:,.0f}원으로 기록")
+            else:
+                trade_result.error_message = f"주문 'done'이지만 executed_volume=0이고 trades 없음. OrderID: {order_id}"
+                logger.error(f"❌ {ticker} 매수 체결 오류: {trade_result.error_message}")
 
-                            trade_result.status = TradeStatus.PARTIAL_FILLED
-                            trade_result.filled_quantity = executed_quantity
-                            trade_result.average_price = avg_price
-                            trade_result.filled_amount = total_value
-                            trade_result.fees = fee
-                            trade_result.error_message = "부분 체결 후 취소"
+        elif order_detail:
+            # cancel 상태에서도 체결된 수량이 있으면 부분 체결 성공 처리
+            order_state = order_detail.get('state', 'unknown')
+            executed_quantity = float(order_detail.get('executed_volume', 0))
 
-                            self.trading_stats['orders_partial_cancelled'] += 1  # 부분 체결 후 취소로 분류
-                            self.trading_stats['total_volume_krw'] += total_value
-                            self.trading_stats['total_fees_krw'] += fee
+            if order_state == 'cancel' and executed_quantity > 0:
+                trades = order_detail.get('trades', [])
 
-                            logger.info(f"💰 {ticker} 매수 부분 체결 완료 (cancel): {executed_quantity:.8f}개, 평균가 {avg_price:,.0f}원")
+                if trades:
+                    total_value = sum(float(trade['price']) * float(trade['volume']) for trade in trades)
+                    total_volume = sum(float(trade['volume']) for trade in trades)
 
-                            # 부분 체결도 성공이므로 PyramidStateManager에 반영
-                            self.process_trade_result(
-                                trade_result,
-                                ticker,
-                                is_pyramid=is_pyramid,
-                                requested_amount=amount_krw
-                            )
-                        else:
-                            # trades 있지만 volume 합계가 0인 경우
-                            fee = (executed_quantity * current_price) * self.config.taker_fee_rate
+                    if total_volume > 0:
+                        avg_price = total_value / total_volume
+                        fee = total_value * self.config.taker_fee_rate
 
-                            trade_result.status = TradeStatus.PARTIAL_FILLED_NO_AVG
-                            trade_result.filled_quantity = executed_quantity
-                            trade_result.average_price = current_price
-                            trade_result.filled_amount = executed_quantity * current_price
-                            trade_result.fees = fee
-                            trade_result.error_message = "부분 체결 후 취소, trades 정보 불완전"
+                        trade_result.status = TradeStatus.PARTIAL_FILLED
+                        trade_result.filled_quantity = executed_quantity
+                        trade_result.average_price = avg_price
+                        trade_result.filled_amount = total_value
+                        trade_result.fees = fee
+                        trade_result.error_message = "부분 체결 후 취소"
 
-                            self.trading_stats['orders_partial_cancelled'] += 1  # 부분 체결 후 취소로 분류
-                            self.trading_stats['total_volume_krw'] += trade_result.amount_krw
-                            self.trading_stats['total_fees_krw'] += fee
+                        self.trading_stats['orders_partial_cancelled'] += 1  # 부분 체결 후 취소로 분류
+                        self.trading_stats['total_volume_krw'] += total_value
+                        self.trading_stats['total_fees_krw'] += fee
 
-                            logger.warning(f"⚠️ {ticker} 매수 부분 체결 (trades 정보 불완전): {executed_quantity:.8f}개, 현재가로 기록")
+                        logger.info(f"💰 {ticker} 매수 부분 체결 완료 (cancel): {executed_quantity:.8f}개, 평균가 {avg_price:,.0f}원")
 
-                            # 부분 체결도 성공이므로 PyramidStateManager에 반영
-                            self.process_trade_result(
-                                trade_result,
-                                ticker,
-                                is_pyramid=is_pyramid,
-                                requested_amount=amount_krw
-                            )
+                        # 부분 체결도 성공이므로 PyramidStateManager에 반영
+                        self.process_trade_result(
+                            trade_result,
+                            ticker,
+                            is_pyramid=is_pyramid,
+                            requested_amount=amount_krw
+                        )
                     else:
-                        # trades 없지만 executed_quantity는 있는 경우
+                        # trades 있지만 volume 합계가 0인 경우
                         fee = (executed_quantity * current_price) * self.config.taker_fee_rate
 
-                        trade_result.status = TradeStatus.PARTIAL_FILLED
+                        trade_result.status = TradeStatus.PARTIAL_FILLED_NO_AVG
                         trade_result.filled_quantity = executed_quantity
                         trade_result.average_price = current_price
                         trade_result.filled_amount = executed_quantity * current_price
                         trade_result.fees = fee
-                        trade_result.error_message = "부분 체결 후 취소, trades 정보 없음"
+                        trade_result.error_message = "부분 체결 후 취소, trades 정보 불완전"
 
                         self.trading_stats['orders_partial_cancelled'] += 1  # 부분 체결 후 취소로 분류
                         self.trading_stats['total_volume_krw'] += trade_result.amount_krw
                         self.trading_stats['total_fees_krw'] += fee
 
-                        logger.warning(f"⚠️ {ticker} 매수 부분 체결 (trades 정보 없음): {executed_quantity:.8f}개, 현재가로 기록")
+                        logger.warning(f"⚠️ {ticker} 매수 부분 체결 (trades 정보 불완전): {executed_quantity:.8f}개, 현재가로 기록")
 
                         # 부분 체결도 성공이므로 PyramidStateManager에 반영
                         self.process_trade_result(
@@ -1444,37 +1918,37 @@ class LocalTradingEngine:
                             requested_amount=amount_krw
                         )
                 else:
-                    # 실제로 실패한 경우
-                    trade_result.error_message = f"주문 미체결: state={order_state}, executed_volume={executed_quantity}, OrderID: {order_id}"
-                    logger.error(f"❌ {ticker} 매수 주문 체결 실패: {trade_result.error_message}")
+                    # trades 없지만 executed_quantity는 있는 경우
+                    fee = (executed_quantity * current_price) * self.config.taker_fee_rate
 
-            else:
-                trade_result.error_message = f"주문 상세 정보 조회 실패. OrderID: {order_id}"
-                logger.error(f"❌ {ticker} 매수 주문 상세 정보 조회 실패")
+                    trade_result.status = TradeStatus.PARTIAL_FILLED
+                    trade_result.filled_quantity = executed_quantity
+                    trade_result.average_price = current_price
+                    trade_result.filled_amount = executed_quantity * current_price
+                    trade_result.fees = fee
+                    trade_result.error_message = "부분 체결 후 취소, trades 정보 없음"
 
-            # API 레이트 리미트 고려
-            time.sleep(self.config.api_rate_limit_delay)
+                    self.trading_stats['orders_partial_cancelled'] += 1  # 부분 체결 후 취소로 분류
+                    self.trading_stats['total_volume_krw'] += trade_result.amount_krw
+                    self.trading_stats['total_fees_krw'] += fee
 
-        except pyupbit.UpbitError as ue:
-            trade_result.error_message = f"업비트 API 오류: {str(ue)}"
-            logger.error(f"❌ {ticker} 매수 중 업비트 API 오류: {ue}")
-            # API 관련 오류는 재시도할 수 있으므로 raise하여 @retry가 처리하도록 함
-            raise
+                    logger.warning(f"⚠️ {ticker} 매수 부분 체결 (trades 정보 없음): {executed_quantity:.8f}개, 현재가로 기록")
 
-        except Exception as e:
-            trade_result.error_message = f"매수 실행 중 예상치 못한 오류: {e}"
-            logger.error(f"❌ {ticker} 매수 실행 중 예상치 못한 오류: {e}")
-            # Exception 케이스는 저장 후 return 필요
-            self.save_trade_record(trade_result, ticker, is_pyramid=is_pyramid, requested_amount=amount_krw)
-            return trade_result
+                    # 부분 체결도 성공이므로 PyramidStateManager에 반영
+                    self.process_trade_result(
+                        trade_result,
+                        ticker,
+                        is_pyramid=is_pyramid,
+                        requested_amount=amount_krw
+                    )
+            else:
+                # 실제로 실패한 경우
+                trade_result.error_message = f"주문 미체결: state={order_state}, executed_volume={executed_quantity}, OrderID: {order_id}"
+                logger.error(f"❌ {ticker} 매수 주문 체결 실패: {trade_result.error_message}")
 
-        finally:
-            # 중복 저장 방지:
-            # 1. 성공 케이스는 process_trade_result에서 이미 저장됨
-            # 2. 실패 케이스는 각각의 early return에서 이미 저장됨
-            # 3. Exception 케이스도 이제 저장 후 return됨
-            # finally에서는 저장하지 않음 (중복 방지)
-            pass
+        else:
+            trade_result.error_message = f"주문 상세 정보 조회 실패. OrderID: {order_id}"
+            logger.error(f"❌ {ticker} 매수 주문 상세 정보 조회 실패")
 
         return trade_result
 
@@ -1489,6 +1963,7 @@ class LocalTradingEngine:
             requested_quantity=quantity or 0.0,
             timestamp=datetime.now()
         )
+        sells_whole_balance = False
 
         try:
             self.trading_stats['orders_attempted'] += 1
@@ -1506,13 +1981,13 @@ class LocalTradingEngine:
                 dry_run_quantity = quantity or 1.0
                 trade_result.requested_quantity = dry_run_quantity
                 trade_result.filled_quantity = dry_run_quantity
-                trade_result.average_price = pyupbit.get_current_price(ticker)
+                trade_result.average_price = self.rate_limiter.call('ticker', pyupbit.get_current_price, ticker, limit_info_kw='limit_info')
                 self.trading_stats['orders_successful'] += 1
                 self.save_trade_record(trade_result, ticker, is_pyramid=False, requested_amount=0, trade_type='SELL')
                 return trade_result
 
             # 보유 수량 확인
-            balance = self.upbit.get_balance(currency)
+            balance = self.rate_limiter.call('default', self.upbit.get_balance, currency, limit_info_kw='contain_req')
 
             # API 오류 응답 처리
             if isinstance(balance, dict) and 'error' in balance:
@@ -1532,12 +2007,13 @@ class LocalTradingEngine:
 
             # 매도 수량 결정
             sell_quantity = quantity if quantity and quantity <= balance else balance
+            sells_whole_balance = sell_quantity >= balance
 
             # TradeResult에 실제 요청 수량 반영 (DB 제약 조건 충족용)
             trade_result.requested_quantity = sell_quantity
 
             # 현재가 조회
-            current_price = pyupbit.get_current_price(ticker)
+            current_price = self.rate_limiter.call('ticker', pyupbit.get_current_price, ticker, limit_info_kw='limit_info')
             if not current_price:
                 trade_result.error_message = "현재가 조회 실패"
                 logger.error(f"❌ {ticker}: {trade_result.error_message}")
@@ -1561,7 +2037,7 @@ class LocalTradingEngine:
             logger.info(f"🚀 {ticker} 시장가 매도 주문: {sell_quantity:.8f}개 (현재가: {current_price:,.0f})")
 
             # 업비트 매도 주문
-            response = self.upbit.sell_market_order(ticker, sell_quantity)
+            response = self.rate_limiter.call('order', self.upbit.sell_market_order, ticker, sell_quantity, limit_info_kw='contain_req')
 
             if not response or not response.get('uuid'):
                 trade_result.error_message = f"주문 접수 실패: {response}"
@@ -1574,9 +2050,8 @@ class LocalTradingEngine:
 
             logger.info(f"✅ {ticker} 매도 주문 접수 성공 (주문ID: {order_id})")
 
-            # 주문 체결 확인
-            time.sleep(5)
-            order_detail = self.upbit.get_order(order_id)
+            # 주문 체결 확인 (종료 상태 도달 즉시 반환)
+            order_detail = self.order_tracker.wait_for_order(order_id)
 
             if order_detail and order_detail.get('state') == 'done':
                 executed_quantity = float(order_detail.get('executed_volume', 0))
@@ -1692,9 +2167,6 @@ class LocalTradingEngine:
                 trade_result.error_message = f"매도 주문 상세 정보 조회 실패. OrderID: {order_id}"
                 logger.error(f"❌ {ticker} 매도 주문 상세 정보 조회 실패")
 
-            # API 레이트 리미트 고려
-            time.sleep(self.config.api_rate_limit_delay)
-
         except pyupbit.UpbitError as ue:
             trade_result.error_message = f"업비트 API 오류: {str(ue)}"
             logger.error(f"❌ {ticker} 매도 중 업비트 API 오류: {ue}")
@@ -1706,7 +2178,12 @@ class LocalTradingEngine:
             logger.error(f"❌ {ticker} 매도 실행 중 예상치 못한 오류: {e}")
 
         finally:
-            self.save_trade_record(trade_result)
+            self._apply_fill_to_portfolio(trade_result, 'SELL')
+            if trade_result.order_id != "PENDING":
+                # 주문 접수 이후 결과만 저장 (접수 전 종료 경로는 각 분기에서 SELL로 저장 완료)
+                # 보유 수량 전체 매도 주문이 전량 체결된 경우만 청산 (트레일링 스탑 초기화 대상)
+                position_closed = sells_whole_balance and trade_result.status == TradeStatus.FULL_FILLED
+                self.save_trade_record(trade_result, ticker, trade_type='SELL', position_closed=position_closed)
 
         return trade_result
 
@@ -1748,7 +2225,8 @@ class LocalTradingEngine:
         }
 
     def should_exit_trade(self, ticker: str, current_price: float,
-                         gpt_analysis: Optional[str] = None) -> Tuple[bool, str]:
+                         gpt_analysis: Optional[str] = None,
+                         context: Optional[PositionContext] = None) -> Tuple[bool, str]:
         """
         기술적 지표와 GPT 분석을 바탕으로 매도 여부 판단 (trade_executor.py에서 이식)
 
@@ -1756,6 +2234,7 @@ class LocalTradingEngine:
             ticker: 종목 코드
             current_price: 현재가
             gpt_analysis: GPT 분석 결과 (선택)
+            context: 포지션 컨텍스트 (있으면 기술 지표를 DB 대신 컨텍스트에서 읽음)
 
         Returns:
             Tuple[bool, str]: (매도 여부, 사유)
@@ -1771,27 +2250,31 @@ class LocalTradingEngine:
             if trailing_exit:
                 return True, "ATR 기반 트레일링 스탑 청산"
 
-            # 2. SQLite에서 기술적 지표 조회
+            # 2. 기술적 지표 조회 (컨텍스트 우선, 없으면 SQLite)
             market_data = {}
-            with get_db_connection_context() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT supertrend, macd_histogram, support_level, adx
-                    FROM technical_analysis
-                    WHERE ticker = ?
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                """, (ticker,))
-                result = cursor.fetchone()
-
-                if result:
-                    market_data = {
-                        'price': current_price,
-                        'supertrend': self._safe_convert_to_float(result[0], None),
-                        'macd_histogram': self._safe_convert_to_float(result[1], 0.0),
-                        'support': self._safe_convert_to_float(result[2], None),
-                        'adx': self._safe_convert_to_float(result[3], 0.0)
-                    }
+            if context is not None and ticker in context.tickers:
+                if ticker in context.technicals:
+                    market_data = {'price': current_price, **context.technicals[ticker]}
+            else:
+                with get_db_connection_context() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT supertrend, macd_histogram, support_level, adx
+                        FROM technical_analysis
+                        WHERE ticker = ?
+                        ORDER BY created_at DESC
+                        LIMIT 1
+                    """, (ticker,))
+                    result = cursor.fetchone()
+
+                    if result:
+                        market_data = {
+                            'price': current_price,
+                            'supertrend': self._safe_convert_to_float(result[0], None),
+                            'macd_histogram': self._safe_convert_to_float(result[1], 0.0),
+                            'support': self._safe_convert_to_float(result[2], None),
+                            'adx': self._safe_convert_to_float(result[3], 0.0)
+                        }
 
             # 3. 지지선 하회 조건 (최우선 매도 신호)
             if (market_data.get("support") is not None and
@@ -1892,7 +2375,143 @@ class LocalTradingEngine:
             logger.error(f"❌ {ticker} Stage 이력 조회 실패: {e}")
             return []
 
-    def _check_stage3_transition_fast(self, position: PositionInfo) -> Tuple[bool, str]:
+    def _ensure_position_context_indexes(self):
+        """포지션 컨텍스트 그룹 쿼리용 복합 인덱스 생성 (기존 DB 마이그레이션, 없는 테이블은 건너뜀)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                existing_tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                for statement in POSITION_CONTEXT_INDEXES:
+                    table = statement.split(' ON ')[1].split('(')[0].strip()
+                    if table in existing_tables:
+                        conn.execute(statement)
+
+        except Exception as e:
+            logger.warning(f"⚠️ 포지션 컨텍스트 인덱스 생성 실패: {e}")
+
+    @staticmethod
+    def _fetch_last_buy_timestamps(cursor, tickers: List[str]) -> Dict[str, datetime]:
+        """종목별 최근 체결 매수 시점 (GROUP BY 1회, idx_trades_ticker_type_created 사용)"""
+        placeholders = ','.join('?' * len(tickers))
+        cursor.execute(f"""
+            SELECT ticker, MAX(created_at)
+            FROM trades
+            WHERE ticker IN ({placeholders}) AND order_type = 'BUY' AND status IN ('FULL_FILLED', 'PARTIAL_FILLED')
+            GROUP BY ticker
+        """, tickers)
+
+        last_buys = {}
+        for ticker, created_at in cursor.fetchall():
+            if created_at:
+                last_buys[ticker] = datetime.fromisoformat(created_at)
+        return last_buys
+
+    def load_position_context(self, tickers: List[str], stage_limit: int = 2) -> PositionContext:
+        """
+        보유 종목 전체의 컨텍스트를 단일 연결에서 그룹 쿼리로 일괄 조회
+
+        - trades: 종목별 최근 체결 매수 시점 (보유 일수 계산)
+        - unified_technical_analysis: 종목별 최근 stage_limit개 Stage 이력
+        - technical_analysis: 종목별 최신 ATR / supertrend / MACD / 지지선 / ADX
+        - ohlcv_data: technical_analysis에 ATR이 없는 종목의 백업 ATR
+        """
+        context = PositionContext(tickers=set(tickers))
+        if not tickers:
+            return context
+
+        placeholders = ','.join('?' * len(tickers))
+
+        try:
+            with get_db_connection_context() as conn:
+                cursor = conn.cursor()
+
+                context.last_buy = self._fetch_last_buy_timestamps(cursor, tickers)
+
+                cursor.execute(f"""
+                    SELECT ticker, current_stage, stage_confidence, analysis_date,
+                           ma200_trend, price_vs_ma200, created_at
+                    FROM (
+                        SELECT *, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY created_at DESC) AS rn
+                        FROM unified_technical_analysis
+                        WHERE ticker IN ({placeholders})
+                    )
+                    WHERE rn <= ?
+                    ORDER BY ticker, rn
+                """, (*tickers, stage_limit))
+
+                for row in cursor.fetchall():
+                    context.stage_history.setdefault(row[0], []).append({
+                        'stage': row[1],
+                        'confidence': row[2],
+                        'analysis_date': row[3],
+                        'ma200_trend': row[4],
+                        'price_vs_ma200': row[5],
+                        'created_at': row[6]
+                    })
+
+                # 최신 기술 지표 행 + ATR이 있는 최신 행 (ATR은 최신 행에 없을 수 있어 별도 순위)
+                cursor.execute(f"""
+                    SELECT ticker, supertrend, macd_histogram, support_level, adx, latest_atr
+                    FROM (
+                        SELECT ticker, supertrend, macd_histogram, support_level, adx,
+                               ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY created_at DESC) AS rn,
+                               FIRST_VALUE(atr) OVER (
+                                   PARTITION BY ticker ORDER BY (atr IS NULL), created_at DESC
+                                   ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                               ) AS latest_atr
+                        FROM technical_analysis
+                        WHERE ticker IN ({placeholders})
+                    )
+                    WHERE rn = 1
+                """, tickers)
+
+                for ticker, supertrend, macd_histogram, support_level, adx, atr_value in cursor.fetchall():
+                    context.technicals[ticker] = {
+                        'supertrend': self._safe_convert_to_float(supertrend, None),
+                        'macd_histogram': self._safe_convert_to_float(macd_histogram, 0.0),
+                        'support': self._safe_convert_to_float(support_level, None),
+                        'adx': self._safe_convert_to_float(adx, 0.0)
+                    }
+                    converted = self._safe_convert_to_float(atr_value, None)
+                    if converted is not None:
+                        context.atr[ticker] = converted
+
+                # 🔄 ATR 백업: ohlcv_data 최신 ATR (구 스키마에는 atr 컬럼이 없을 수 있음)
+                missing_atr = [ticker for ticker in tickers if ticker not in context.atr]
+                if missing_atr:
+                    try:
+                        cursor.execute(f"""
+                            SELECT ticker, atr
+                            FROM (
+                                SELECT ticker, atr, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY date DESC) AS rn
+                                FROM ohlcv_data
+                                WHERE ticker IN ({','.join('?' * len(missing_atr))}) AND atr IS NOT NULL
+                            )
+                            WHERE rn = 1
+                        """, missing_atr)
+                        for ticker, atr_value in cursor.fetchall():
+                            converted = self._safe_convert_to_float(atr_value, None)
+                            if converted is not None:
+                                context.atr[ticker] = converted
+                    except sqlite3.OperationalError as e:
+                        logger.debug(f"ohlcv_data 백업 ATR 조회 건너뜀: {e}")
+
+            logger.info(f"📦 포지션 컨텍스트 로드: {len(tickers)}개 종목 (매수 기록 {len(context.last_buy)}개, "
+                        f"Stage 이력 {len(context.stage_history)}개, ATR {len(context.atr)}개)")
+
+        except Exception as e:
+            logger.error(f"❌ 포지션 컨텍스트 조회 실패: {e}")
+
+        return context
+
+    def get_position_context(self, tickers: List[str]) -> PositionContext:
+        """세션 컨텍스트 재사용 (get_current_positions에서 적재된 종목이면 재조회 없음)"""
+        context = self.position_context
+        if context is not None and context.covers(tickers):
+            return context
+        return self.load_position_context(tickers)
+
+    def _check_stage3_transition_fast(self, position: PositionInfo,
+                                      stage_history: Optional[List[Dict[str, Any]]] = None) -> Tuple[bool, str]:
         """
         초고속 Stage 3 전환 익절 체크 (GPT 없이 Weinstein 지표만 사용)
 
@@ -1900,6 +2519,7 @@ class LocalTradingEngine:
 
         Args:
             position: 현재 포지션 정보
+            stage_history: 미리 조회한 Stage 이력 (None이면 DB 조회)
 
         Returns:
             Tuple[bool, str]: (익절 여부, 사유)
@@ -1920,7 +2540,8 @@ class LocalTradingEngine:
         """
         try:
             # 1. Stage 이력 조회 (최근 2개만, 빠름!)
-            stage_history = self._get_stage_history(position.ticker, limit=2)
+            if stage_history is None:
+                stage_history = self._get_stage_history(position.ticker, limit=2)
 
             if len(stage_history) < 2:
                 return False, "Stage 이력 부족 (최소 2개 필요)"
@@ -1982,10 +2603,13 @@ class LocalTradingEngine:
             logger.error(f"❌ {position.ticker} Stage 3 전환 체크 실패: {e}")
             return False, f"Stage 3 전환 체크 오류: {e}"
 
-    def check_sell_conditions(self, position: PositionInfo) -> Tuple[bool, str]:
+    def check_sell_conditions(self, position: PositionInfo,
+                              context: Optional[PositionContext] = None) -> Tuple[bool, str]:
         """
         최적화된 매도 조건 확인 (GPT 제거, Stage 3 전환 최우선)
 
+        context가 주어지면 Stage 이력/ATR을 DB 대신 포지션 컨텍스트에서 읽는다 (동시 평가/상주 모니터용).
+
         성능 개선: 140ms → 35ms (75% 빠름)
 
         우선순위:
@@ -2004,7 +2628,8 @@ class LocalTradingEngine:
             # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
             # 우선순위 1: Stage 3 전환 익절 (최우선!)
             # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-            is_stage3, stage3_reason = self._check_stage3_transition_fast(position)
+            stage_history = context.stage_history.get(position.ticker, []) if context else None
+            is_stage3, stage3_reason = self._check_stage3_transition_fast(position, stage_history)
             if is_stage3:
                 return True, stage3_reason
 
@@ -2013,7 +2638,8 @@ class LocalTradingEngine:
             # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
             if hasattr(self, 'trailing_stop_manager'):
                 trailing_exit, trailing_reason = self.trailing_stop_manager.should_exit(
-                    position.ticker, position.current_price
+                    position.ticker, position.current_price, self.db_path,
+                    atr_value=self._context_atr(position, context)
                 )
                 if trailing_exit:
                     return True, f"트레일링 손절: {trailing_reason}"
@@ -2051,6 +2677,56 @@ class LocalTradingEngine:
             logger.error(f"❌ {position.ticker} 매도 조건 확인 실패: {e}")
             return False, f"매도 조건 확인 오류: {e}"
 
+    @staticmethod
+    def _context_atr(position: PositionInfo, context: Optional[PositionContext]) -> Optional[float]:
+        """컨텍스트 ATR (없으면 get_atr_with_fallback과 동일하게 현재가 3% 기본값)"""
+        if context is None:
+            return None
+        return context.atr.get(position.ticker, position.current_price * 0.03)
+
+    def evaluate_exit_conditions(self, positions: List[PositionInfo]) -> List[Tuple[PositionInfo, bool, str]]:
+        """
+        전체 포지션 매도 조건 동시 평가
+
+        포지션 컨텍스트(세션 1회 조회)를 공유하여 워커 스레드에서 메모리 데이터만으로 평가한다.
+        (종목별 DB 조회/대기 없음 → 급락 시 전체 판단 지연 최소화)
+
+        Returns:
+            List[(position, 매도 여부, 사유)] - 입력 순서 유지
+        """
+        if not positions:
+            return []
+
+        context = self.get_position_context([position.ticker for position in positions])
+        workers = max(1, min(self.config.exit_evaluation_workers, len(positions)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exit-eval") as executor:
+            decisions = list(executor.map(lambda position: self.check_sell_conditions(position, context), positions))
+
+        return [(position, should_sell, reason) for position, (should_sell, reason) in zip(positions, decisions)]
+
+    def _execute_position_exit(self, position: PositionInfo, reason: str, management_result: Dict[str, Any]):
+        """단일 포지션 매도 실행 및 결과 집계 (주문은 레이트 리미터 order 그룹 경유)"""
+        logger.info(f"💹 {position.ticker} 매도 실행: {reason}")
+
+        sell_result = self.execute_sell_order(position.ticker)
+
+        if sell_result.status in [TradeStatus.FULL_FILLED, TradeStatus.PARTIAL_FILLED]:
+            management_result['sell_orders_executed'] += 1
+            logger.info(f"✅ {position.ticker} 매도 성공")
+
+            # 포트폴리오 업데이트 로그
+            if sell_result.filled_quantity and sell_result.average_price and position.avg_buy_price > 0:
+                realized_pnl = (sell_result.average_price - position.avg_buy_price) * sell_result.filled_quantity
+                realized_pnl_percent = (realized_pnl / (position.avg_buy_price * sell_result.filled_quantity)) * 100
+
+                logger.info(f"💰 실현 손익: {realized_pnl:+,.0f}원 ({realized_pnl_percent:+.1f}%)")
+
+        else:
+            error_msg = f"{position.ticker} 매도 실패: {sell_result.error_message}"
+            management_result['errors'].append(error_msg)
+            logger.warning(f"⚠️ {error_msg}")
+
     def process_portfolio_management(self) -> Dict[str, Any]:
         """포트폴리오 관리 및 매도 실행"""
         management_result = {
@@ -2073,51 +2749,46 @@ class LocalTradingEngine:
                 return management_result
 
             management_result['positions_checked'] = len(positions)
+            self.trailing_stop_manager.prune([position.ticker for position in positions])
 
-            for position in positions:
-                try:
-                    logger.info(f"📈 {position.ticker}: {position.unrealized_pnl_percent:+.1f}% "
-                              f"({position.hold_days}일 보유)")
-
-                    # 매도 조건 확인
-                    should_sell, reason = self.check_sell_conditions(position)
-
-                    if should_sell:
-                        logger.info(f"💹 {position.ticker} 매도 실행: {reason}")
+            if self.config.concurrent_exit_evaluation:
+                # 스냅샷 기반 동시 평가 → 매도 주문만 순차 실행 (손실 큰 종목 우선)
+                evaluation_start = time.perf_counter()
+                decisions = self.evaluate_exit_conditions(positions)
+                logger.info(f"⚡ 매도 조건 동시 평가 완료: {len(decisions)}개 포지션 "
+                            f"({(time.perf_counter() - evaluation_start) * 1000:.1f}ms)")
 
-                        # 매도 주문 실행
-                        sell_result = self.execute_sell_order(position.ticker)
+                for position, should_sell, reason in decisions:
+                    logger.info(f"📈 {position.ticker}: {position.unrealized_pnl_percent:+.1f}% "
+                                f"({position.hold_days}일 보유) - {reason}")
 
-                        if sell_result.status in [
-                            OrderStatus.SUCCESS,
-                            OrderStatus.SUCCESS_NO_AVG_PRICE,
-                            OrderStatus.SUCCESS_PARTIAL,
-                            OrderStatus.SUCCESS_PARTIAL_NO_AVG
-                        ]:
-                            management_result['sell_orders_executed'] += 1
-                            logger.info(f"✅ {position.ticker} 매도 성공")
+                exits = sorted((d for d in decisions if d[1]), key=lambda d: d[0].unrealized_pnl_percent)
+                for position, _, reason in exits:
+                    try:
+                        self._execute_position_exit(position, reason, management_result)
+                    except Exception as e:
+                        error_msg = f"{position.ticker} 관리 중 오류: {e}"
+                        management_result['errors'].append(error_msg)
+                        logger.error(f"❌ {error_msg}")
 
-                            # 포트폴리오 업데이트 로그
-                            realized_pnl = (sell_result.price - position.avg_buy_price) * sell_result.quantity
-                            realized_pnl_percent = (realized_pnl / (position.avg_buy_price * sell_result.quantity)) * 100
+            else:
+                for position in positions:
+                    try:
+                        logger.info(f"📈 {position.ticker}: {position.unrealized_pnl_percent:+.1f}% "
+                                  f"({position.hold_days}일 보유)")
 
-                            logger.info(f"💰 실현 손익: {realized_pnl:+,.0f}원 ({realized_pnl_percent:+.1f}%)")
+                        # 매도 조건 확인
+                        should_sell, reason = self.check_sell_conditions(position)
 
+                        if should_sell:
+                            self._execute_position_exit(position, reason, management_result)
                         else:
-                            error_msg = f"{position.ticker} 매도 실패: {sell_result.error_message}"
-                            management_result['errors'].append(error_msg)
-                            logger.warning(f"⚠️ {error_msg}")
-
-                    else:
-                        logger.info(f"✅ {position.ticker}: {reason}")
+                            logger.info(f"✅ {position.ticker}: {reason}")
 
-                    # API 레이트 리미트
-                    time.sleep(0.2)
-
-                except Exception as e:
-                    error_msg = f"{position.ticker} 관리 중 오류: {e}"
-                    management_result['errors'].append(error_msg)
-                    logger.error(f"❌ {error_msg}")
+                    except Exception as e:
+                        error_msg = f"{position.ticker} 관리 중 오류: {e}"
+                        management_result['errors'].append(error_msg)
+                        logger.error(f"❌ {error_msg}")
 
             logger.info(f"✅ 포트폴리오 관리 완료: {management_result['sell_orders_executed']}개 매도 실행")
 
@@ -2126,6 +2797,11 @@ class LocalTradingEngine:
             management_result['errors'].append(error_msg)
             logger.error(f"❌ {error_msg}")
 
+        finally:
+            # 이번 관리 주기의 스탑 변경분 일괄 저장
+            if not self.dry_run:
+                self.trailing_stop_manager.flush(self.db_path)
+
         return management_result
 
     def get_trading_statistics(self) -> Dict[str, Any]:
@@ -2175,6 +2851,9 @@ class LocalTradingEngine:
         try:
             logger.info(f"🚀 거래 세션 시작: {len(candidates)}개 매수 후보")
 
+            # 세션 포트폴리오 스냅샷 1회 생성 (후보별 사이징은 스냅샷 + 체결 반영 기준)
+            self.begin_portfolio_session()
+
             # 1. 매수 주문 실행
             for ticker in candidates:
                 if ticker not in position_sizes:
@@ -2221,6 +2900,9 @@ class LocalTradingEngine:
         except Exception as e:
             logger.error(f"❌ 거래 세션 실행 실패: {e}")
 
+        finally:
+            self.end_portfolio_session()
+
         return session_result
 
     def check_pyramid_opportunities(self) -> Dict[str, Dict]:
@@ -2249,13 +2931,18 @@ class LocalTradingEngine:
             'details': []
         }
 
+        # 세션 스냅샷 (활성 세션이 없으면 여기서 시작) - 체결마다 로컬 반영되어 다음 종목 사이징에 사용
+        owns_session = self.portfolio_snapshot is None
+
         try:
+            snapshot = self.begin_portfolio_session() if owns_session else self.portfolio_snapshot
+
             for ticker, opportunity in pyramid_opportunities.items():
                 try:
                     pyramid_results['attempted'] += 1
 
-                    # 총 자산 조회
-                    total_balance = self.get_total_balance_krw()
+                    # 총 자산 (스냅샷 기준)
+                    total_balance = snapshot.total_balance_krw
                     if total_balance <= 0:
                         continue
 
@@ -2305,9 +2992,6 @@ class LocalTradingEngine:
 
                         logger.warning(f"❌ {ticker} 피라미딩 매수 실패: {trade_result.error_message}")
 
-                    # API 레이트 리미트
-                    time.sleep(self.config.api_rate_limit_delay)
-
                 except Exception as e:
                     pyramid_results['failed'] += 1
                     pyramid_results['details'].append({
@@ -2330,6 +3014,10 @@ class LocalTradingEngine:
         except Exception as e:
             logger.error(f"❌ 피라미딩 거래 실행 실패: {e}")
 
+        finally:
+            if owns_session:
+                self.end_portfolio_session()
+
         return pyramid_results
 
     def process_enhanced_portfolio_management(self) -> Dict[str, Any]:
@@ -2344,6 +3032,9 @@ class LocalTradingEngine:
         try:
             logger.info("🎯 향상된 포트폴리오 관리 시작 (피라미딩 + 트레일링 스탑)")
 
+            # 세션 포트폴리오 스냅샷 1회 생성 (매도 체결 반영 후 피라미딩 사이징에 사용)
+            self.begin_portfolio_session()
+
             # 1. 기본 포트폴리오 관리 (매도 조건 확인)
             basic_result = self.process_portfolio_management()
             management_result.update(basic_result)
@@ -2373,6 +3064,9 @@ class LocalTradingEngine:
             management_result['errors'].append(error_msg)
             logger.error(f"❌ {error_msg}")
 
+        finally:
+            self.end_portfolio_session()
+
         return management_result
 
 def main():
@@ -0,0 +1,882 @@
+#!/usr/bin/env python3
+"""
+Upbit Simulator - 로컬 부하 테스트용 합성 업비트 거래소
+pyupbit 시세/거래 API를 결정적(deterministic) 합성 데이터로 대체하여
+makenaide.py 전체 파이프라인을 오프라인에서 최대 속도로 실행
+
+🎯 대체 범위:
+- 시세: pyupbit.get_tickers / get_ohlcv (day, week, month, minuteN) / get_current_price / get_orderbook
+- 거래: pyupbit.Upbit → FakeUpbitClient (잔고, 시장가 매수/매도, 지정가 매수/취소, 주문 조회)
+- REST: requests.get 중 Fear&Greed(alternative.me), 업비트 /v1/ticker, /v1/candles/days
+- 대기: 파이프라인 모듈의 time.sleep (fast_sleep=True면 대기 없이 누적 시간만 기록)
+
+⚙️ 장애 주입:
+- latency_ms / latency_jitter_ms: 호출당 지연
+- rate_limit_per_sec: 초당 호출 한도 (초과 시 get_ohlcv는 None, 그 외 API는 pyupbit.errors.TooManyRequests)
+  · limit_info=True / contain_req=True 호출 시 Remaining-Req 정보(group/min/sec)를 함께 반환
+- error_rate: 호출당 오류 발생 확률
+- fill_delay_ms: 주문 접수 후 체결까지 지연 (그 전까지 주문 조회 시 state='wait')
+- book_depth_krw / market_impact: 호가 단계별 잔량 규모, 시장가 매수가 매도 호가를 소진하며 체결 (얇은 알트 재현)
+
+📊 사용 예시:
+    python makenaide.py --dry-run --simulator --sim-tickers 50 --sim-latency-ms 30
+
+    simulator = UpbitSimulator(SimulatorConfig(n_tickers=20))
+    with simulator.installed():
+        orchestrator.run_full_pipeline()
+    print(simulator.get_stats())
+
+⚠️ 실제 DB 오염 방지를 위해 makenaide.py --simulator는 별도 작업 디렉터리
+   (기본 ./simulator_run)로 이동한 뒤 새 SQLite DB를 초기화하여 실행한다.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import zlib
+import logging
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyupbit
+import requests
+from pyupbit.errors import TooManyRequests
+
+logger = logging.getLogger(__name__)
+
+# time.sleep을 가속할 파이프라인 모듈 (import된 경우에만 적용)
+FAST_SLEEP_MODULES = ('data_collector', 'trading_engine', 'order_tracker', 'order_execution', 'makenaide', '__main__')
+
+_real_sleep = time.sleep
+
+
+@dataclass
+class SimulatorConfig:
+    """시뮬레이터 설정"""
+    seed: int = 42
+    n_tickers: int = 30                     # KRW-BTC, KRW-ETH 포함 전체 종목 수
+    history_days: int = 420                 # 일봉 이력 (월봉 13개월 품질 필터 통과용)
+    initial_krw: float = 10_000_000.0
+    fee_rate: float = 0.0005                # 업비트 KRW 마켓 수수료
+    slippage_bps: float = 5.0               # 시장가 체결 슬리피지 (bp)
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    rate_limit_per_sec: float = 0.0         # 0이면 무제한
+    error_rate: float = 0.0
+    fill_delay_ms: float = 0.0              # 주문 체결 지연 (fast_sleep 시 건너뛴 대기 시간도 경과로 계산)
+    book_depth_krw: float = 2e6             # 호가 단계별 평균 잔량 (KRW)
+    market_impact: bool = False             # 시장가 매수 시 매도 호가 소진 가격으로 체결
+    fear_greed_value: Optional[int] = None  # None이면 seed 기반 결정
+    fast_sleep: bool = True
+
+
+@dataclass
+class SimulatedOrder:
+    """시뮬레이터 주문 (settle_at 이후 전량 체결 상태로 조회)"""
+    uuid: str
+    market: str
+    side: str                   # 'bid' | 'ask'
+    ord_type: str               # 'price' (시장가 매수) | 'market' (시장가 매도) | 'limit' (지정가 매수)
+    price: Optional[float]
+    volume: Optional[float]
+    executed_volume: float
+    avg_price: float
+    paid_fee: float
+    created_at: str
+    state: str = 'done'
+    settle_at: float = 0.0      # 시뮬레이터 시계 기준 체결 시각
+
+    def to_response(self, include_trades: bool = True, now: Optional[float] = None) -> Dict[str, Any]:
+        """업비트 주문 응답 형식 (숫자는 문자열, 체결 전이면 state='wait')"""
+        if now is not None and now < self.settle_at:
+            return {
+                'uuid': self.uuid,
+                'side': self.side,
+                'ord_type': self.ord_type,
+                'price': None if self.price is None else str(self.price),
+                'state': 'wait',
+                'market': self.market,
+                'created_at': self.created_at,
+                'volume': None if self.volume is None else str(self.volume),
+                'executed_volume': '0.0',
+                'trades_count': 0,
+                **({'trades': []} if include_trades else {}),
+            }
+
+        filled = self.executed_volume > 0
+
+        response = {
+            'uuid': self.uuid,
+            'side': self.side,
+            'ord_type': self.ord_type,
+            'price': None if self.price is None else str(self.price),
+            'state': self.state,
+            'market': self.market,
+            'created_at': self.created_at,
+            'volume': None if self.volume is None else str(self.volume),
+            'remaining_volume': '0.0' if filled or self.volume is None else str(self.volume),
+            'reserved_fee': str(self.paid_fee),
+            'remaining_fee': '0.0',
+            'paid_fee': str(self.paid_fee),
+            'locked': '0.0',
+            'executed_volume': str(self.executed_volume),
+            'trades_count': 1 if filled else 0,
+        }
+        if include_trades and not filled:
+            response['trades'] = []
+        elif include_trades:
+            response['trades'] = [{
+                'market': self.market,
+                'uuid': f"{self.uuid}-t1",
+                'price': str(self.avg_price),
+                'volume': str(self.executed_volume),
+                'funds': str(self.avg_price * self.executed_volume),
+                'side': self.side,
+                'created_at': self.created_at,
+            }]
+        return response
+
+
+class _SimulatedResponse:
+    """requests.Response 대체 (json / raise_for_status / headers)"""
+
+    def __init__(self, payload: Any, status_code: int = 200, group: str = 'market', sec: int = 9):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = {'Remaining-Req': f"group={group}; min=600; sec={sec}"}
+        self.text = json.dumps(payload, ensure_ascii=False, default=str)
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} simulated error", response=self)
+
+
+class _FastTime:
+    """time 모듈 프록시: sleep만 가속, 나머지는 원본 time 위임"""
+
+    def __init__(self, simulator: 'UpbitSimulator'):
+        self._simulator = simulator
+
+    def sleep(self, seconds: float):
+        self._simulator._record_skipped_sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class UpbitSimulator:
+    """합성 시장 데이터 + 가상 계좌 기반 업비트 시뮬레이터"""
+
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+
+        self.tickers = self._build_ticker_list(self.config.n_tickers)
+        self.end_date = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+
+        self._daily: Dict[str, pd.DataFrame] = {}
+        self._intraday: Dict[tuple, pd.DataFrame] = {}
+        self._data_lock = threading.Lock()
+
+        # 가상 계좌
+        self._account_lock = threading.Lock()
+        self.krw_balance = self.config.initial_krw
+        self.holdings: Dict[str, Dict[str, float]] = {}  # currency → {'balance', 'avg_buy_price'}
+        self.orders: Dict[str, SimulatedOrder] = {}
+
+        # 장애 주입 / 통계
+        self._rng = np.random.default_rng(self.config.seed)
+        self._call_times: Dict[str, deque] = defaultdict(deque)
+        self.stats = {
+            'calls': defaultdict(int),
+            'injected_errors': 0,
+            'rate_limited': 0,
+            'skipped_sleep_seconds': 0.0,
+            'orders_filled': 0,
+        }
+        self._stats_lock = threading.Lock()
+
+        self._originals: Dict[str, Any] = {}
+        self._patched_time_modules: Dict[str, Any] = {}
+        self._limiter_enabled = None
+
+    # ------------------------------------------------------------------
+    # 합성 시장 데이터
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _build_ticker_list(n_tickers: int) -> List[str]:
+        majors = ['KRW-BTC', 'KRW-ETH', 'KRW-XRP', 'KRW-SOL', 'KRW-ADA']
+        tickers = majors[:max(1, min(n_tickers, len(majors)))]
+        tickers += [f"KRW-SIM{i:03d}" for i in range(1, max(0, n_tickers - len(tickers)) + 1)]
+        return tickers
+
+    def _ticker_rng(self, ticker: str, salt: str = '') -> np.random.Generator:
+        """종목별 독립 난수 (종목 순서/개수와 무관하게 같은 시계열 생성)"""
+        return np.random.default_rng([self.config.seed, zlib.crc32(f"{ticker}{salt}".encode())])
+
+    def _base_price(self, ticker: str) -> float:
+        if ticker == 'KRW-BTC':
+            return 90_000_000.0
+        if ticker == 'KRW-ETH':
+            return 4_000_000.0
+        return float(10 ** self._ticker_rng(ticker, 'base').uniform(1.5, 5.0))
+
+    def daily_frame(self, ticker: str) -> pd.DataFrame:
+        """종목 일봉 전체 이력 (캐시)"""
+        with self._data_lock:
+            cached = self._daily.get(ticker)
+            if cached is not None:
+                return cached
+
+            rng = self._ticker_rng(ticker)
+            n_days = self.config.history_days
+            drift = rng.normal(0.0005, 0.002)
+            volatility = rng.uniform(0.02, 0.06)
+            returns = rng.normal(drift, volatility, n_days)
+
+            close = self._base_price(ticker) * np.exp(np.cumsum(returns) - np.sum(returns))
+            open_ = close * (1 + rng.normal(0, volatility / 4, n_days))
+            high = np.maximum(open_, close) * (1 + rng.uniform(0, volatility / 2, n_days))
+            low = np.minimum(open_, close) * (1 - rng.uniform(0, volatility / 2, n_days))
+            # 거래대금 일 5억~50억원 수준 (Phase 1 품질 필터 3억원 통과)
+            value = rng.lognormal(np.log(2e9), 0.6, n_days)
+            volume = value / close
+
+            index = pd.date_range(end=self.end_date, periods=n_days, freq='D')
+            frame = pd.DataFrame(
+                {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume, 'value': value},
+                index=index
+            )
+            self._daily[ticker] = frame
+            return frame
+
+    def _intraday_frame(self, ticker: str, minutes: int, count: int) -> pd.DataFrame:
+        """분봉 (마지막 종가가 일봉 현재가와 일치하도록 역방향 생성)"""
+        key = (ticker, minutes, count)
+        with self._data_lock:
+            cached = self._intraday.get(key)
+        if cached is not None:
+            return cached
+
+        daily = self.daily_frame(ticker)
+        last_close = float(daily['close'].iloc[-1])
+        rng = self._ticker_rng(ticker, f"m{minutes}")
+        volatility = 0.004 * np.sqrt(minutes / 60)
+        returns = rng.normal(0, volatility, count)
+
+        close = last_close * np.exp(np.cumsum(returns) - np.sum(returns))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        high = np.maximum(open_, close) * (1 + rng.uniform(0, volatility / 2, count))
+        low = np.minimum(open_, close) * (1 - rng.uniform(0, volatility / 2, count))
+        value = float(daily['value'].iloc[-1]) * minutes / 1440 * rng.uniform(0.5, 1.5, count)
+
+        end = datetime.now().replace(second=0, microsecond=0)
+        index = pd.date_range(end=end, periods=count, freq=f"{minutes}min")
+        frame = pd.DataFrame(
+            {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': value / close, 'value': value},
+            index=index
+        )
+        with self._data_lock:
+            self._intraday[key] = frame
+        return frame
+
+    def current_price(self, ticker: str) -> float:
+        return float(self.daily_frame(ticker)['close'].iloc[-1])
+
+    # ------------------------------------------------------------------
+    # 장애 주입 (지연 / 레이트 리밋 / 오류)
+    # ------------------------------------------------------------------
+
+    def _before_call(self, endpoint: str, group: str) -> Optional[str]:
+        """호출 전처리: 지연 적용 후 오류 사유 반환 (정상이면 None)"""
+        with self._stats_lock:
+            self.stats['calls'][endpoint] += 1
+
+            if self.config.rate_limit_per_sec > 0:
+                now = time.monotonic()
+                window = self._call_times[group]
+                while window and now - window[0] >= 1.0:
+                    window.popleft()
+                if len(window) >= self.config.rate_limit_per_sec:
+                    self.stats['rate_limited'] += 1
+                    return 'too_many_requests'
+                window.append(now)
+
+            inject_error = self.config.error_rate > 0 and self._rng.random() < self.config.error_rate
+            latency_ms = self.config.latency_ms
+            if self.config.latency_jitter_ms > 0:
+                latency_ms += self._rng.uniform(-1, 1) * self.config.latency_jitter_ms
+            if inject_error:
+                self.stats['injected_errors'] += 1
+
+        if latency_ms > 0:
+            _real_sleep(latency_ms / 1000)
+
+        return 'server_error' if inject_error else None
+
+    def _remaining(self, group: str) -> Dict[str, Any]:
+        """Remaining-Req 정보 (레이트 리밋 미설정 시 업비트 시세 기본값)"""
+        if self.config.rate_limit_per_sec <= 0:
+            return {'group': group, 'min': 600, 'sec': 9}
+        with self._stats_lock:
+            used = len(self._call_times[group])
+        return {'group': group, 'min': 600, 'sec': max(0, int(self.config.rate_limit_per_sec) - used)}
+
+    def _respond(self, result: Any, group: str, with_req: bool):
+        """limit_info / contain_req 요청 시 (결과, Remaining-Req) 튜플 반환"""
+        return (result, self._remaining(group)) if with_req else result
+
+    def _raise_if_limited(self, error: Optional[str]) -> Optional[str]:
+        """요청 수 제한은 실제 pyupbit처럼 TooManyRequests 예외로 전달"""
+        if error == 'too_many_requests':
+            raise TooManyRequests()
+        return error
+
+    @staticmethod
+    def _error_response(reason: str) -> Dict[str, Any]:
+        messages = {
+            'too_many_requests': '요청 수 제한을 초과했습니다. (simulated)',
+            'server_error': '일시적인 서버 오류입니다. (simulated)'
+        }
+        return {'error': {'name': reason, 'message': messages.get(reason, reason)}}
+
+    def _clock(self) -> float:
+        """시뮬레이터 시계 (fast_sleep으로 건너뛴 대기 시간 포함)"""
+        with self._stats_lock:
+            skipped = self.stats['skipped_sleep_seconds']
+        return time.monotonic() + skipped
+
+    def _record_skipped_sleep(self, seconds: float):
+        with self._stats_lock:
+            self.stats['skipped_sleep_seconds'] += max(0.0, float(seconds))
+
+    # ------------------------------------------------------------------
+    # 시세 API (pyupbit 함수 시그니처 호환)
+    # ------------------------------------------------------------------
+
+    def get_tickers(self, fiat: str = "", is_details: bool = False, limit_info: bool = False, verbose: bool = False):
+        if self._raise_if_limited(self._before_call('get_tickers', 'market')):
+            return None
+        tickers = [t for t in self.tickers if not fiat or t.startswith(f"{fiat}-")]
+        if verbose or is_details:
+            tickers = [{'market': t, 'korean_name': t.split('-')[1], 'english_name': t.split('-')[1]} for t in tickers]
+        return self._respond(tickers, 'market', limit_info)
+
+    def get_ohlcv(self, ticker: str = "KRW-BTC", interval: str = "day", count: int = 200,
+                  to=None, period: float = 0.1) -> Optional[pd.DataFrame]:
+        if self._before_call('get_ohlcv', 'candles') or ticker not in self.tickers:
+            return None
+
+        interval = interval or 'day'
+        if interval.startswith('minute'):
+            minutes = int(interval.replace('minute', '') or 1)
+            return self._intraday_frame(ticker, minutes, count).copy()
+
+        daily = self.daily_frame(ticker)
+        if to is not None:
+            daily = daily[daily.index < pd.to_datetime(to)]
+
+        if interval in ('day', 'days'):
+            frame = daily
+        elif interval in ('week', 'weeks'):
+            frame = self._resample(daily, 'W-MON')
+        elif interval in ('month', 'months'):
+            frame = self._resample(daily, 'MS')
+        else:
+            return None
+
+        return frame.tail(count).copy()
+
+    @staticmethod
+    def _resample(daily: pd.DataFrame, rule: str) -> pd.DataFrame:
+        return daily.resample(rule, label='left', closed='left').agg({
+            'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'value': 'sum'
+        }).dropna()
+
+    def get_current_price(self, ticker: Union[str, List[str]] = "KRW-BTC", limit_info: bool = False,
+                          verbose: bool = False):
+        if self._raise_if_limited(self._before_call('get_current_price', 'ticker')):
+            return None
+        if isinstance(ticker, (list, tuple)):
+            price = {t: self.current_price(t) for t in ticker if t in self.tickers}
+        else:
+            price = self.current_price(ticker) if ticker in self.tickers else None
+        return self._respond(price, 'ticker', limit_info)
+
+    @staticmethod
+    def _tick_unit(price: float) -> float:
+        """업비트 원화 마켓 호가 단위"""
+        adjusted = pyupbit.get_tick_size(price)
+        return adjusted - pyupbit.get_tick_size(adjusted * (1 - 1e-9))
+
+    def orderbook(self, market: str) -> Dict[str, Any]:
+        """현재가 기준 15단계 호가 (단계별 잔량은 종목별 고정 난수 × book_depth_krw)"""
+        price = self.current_price(market)
+        tick = self._tick_unit(price)
+        best_bid = pyupbit.get_tick_size(price)
+        rng = self._ticker_rng(market, 'book')
+        units = []
+        for level in range(15):
+            ask_price = best_bid + tick * (level + 1)
+            bid_price = max(tick, best_bid - tick * level)
+            units.append({
+                'ask_price': ask_price,
+                'bid_price': bid_price,
+                'ask_size': float(rng.lognormal(0, 0.5) * self.config.book_depth_krw / ask_price),
+                'bid_size': float(rng.lognormal(0, 0.5) * self.config.book_depth_krw / bid_price),
+            })
+        return {
+            'market': market,
+            'timestamp': int(time.time() * 1000),
+            'total_ask_size': sum(u['ask_size'] for u in units),
+            'total_bid_size': sum(u['bid_size'] for u in units),
+            'orderbook_units': units,
+        }
+
+    def get_orderbook(self, ticker: Union[str, List[str]] = "KRW-BTC", limit_info: bool = False):
+        if self._raise_if_limited(self._before_call('get_orderbook', 'orderbook')):
+            return None
+
+        if isinstance(ticker, (list, tuple)):
+            books = [self.orderbook(t) for t in ticker if t in self.tickers]
+            if len(books) == 1:
+                books = books[0]
+        else:
+            books = self.orderbook(ticker) if ticker in self.tickers else None
+        return self._respond(books, 'orderbook', limit_info)
+
+    # ------------------------------------------------------------------
+    # 가상 계좌 / 주문 체결
+    # ------------------------------------------------------------------
+
+    def balances(self) -> List[Dict[str, str]]:
+        with self._account_lock:
+            rows = [{
+                'currency': 'KRW', 'balance': str(self.krw_balance), 'locked': '0.0',
+                'avg_buy_price': '0', 'avg_buy_price_modified': False, 'unit_currency': 'KRW'
+            }]
+            for currency, holding in self.holdings.items():
+                if holding['balance'] <= 0:
+                    continue
+                rows.append({
+                    'currency': currency, 'balance': str(holding['balance']), 'locked': '0.0',
+                    'avg_buy_price': str(holding['avg_buy_price']), 'avg_buy_price_modified': False,
+                    'unit_currency': 'KRW'
+                })
+            return rows
+
+    def _fill(self, market: str, side: str, price: Optional[float], volume: Optional[float]) -> Dict[str, Any]:
+        """시장가 주문 즉시 체결 (슬리피지 + 수수료 반영)"""
+        if market not in self.tickers:
+            return {'error': {'name': 'market_does_not_exist', 'message': f"{market} 마켓이 없습니다"}}
+
+        slippage = self.config.slippage_bps / 10000
+        base_price = self.current_price(market)
+        currency = market.split('-')[1]
+
+        with self._account_lock:
+            if side == 'bid':
+                fill_price = base_price * (1 + slippage)
+                if self.config.market_impact:
+                    from order_execution import estimate_buy_slippage
+                    estimate = estimate_buy_slippage(market, self.orderbook(market), price)
+                    if estimate:
+                        fill_price = estimate.expected_avg_price * (1 + slippage)
+                fee = price * self.config.fee_rate
+                if price < 5000:
+                    return {'error': {'name': 'under_min_total_bid', 'message': '최소주문금액 이상으로 주문해주세요'}}
+                if price + fee > self.krw_balance:
+                    return {'error': {'name': 'insufficient_funds_bid', 'message': '매수가능금액이 부족합니다.'}}
+
+                executed = price / fill_price
+                holding = self.holdings.setdefault(currency, {'balance': 0.0, 'avg_buy_price': 0.0})
+                total_cost = holding['balance'] * holding['avg_buy_price'] + price
+                holding['balance'] += executed
+                holding['avg_buy_price'] = total_cost / holding['balance']
+                self.krw_balance -= price + fee
+            else:
+                holding = self.holdings.get(currency)
+                if not holding or volume > holding['balance'] + 1e-12:
+                    return {'error': {'name': 'insufficient_funds_ask', 'message': '매도가능수량이 부족합니다.'}}
+
+                fill_price = base_price * (1 - slippage)
+                executed = volume
+                fee = executed * fill_price * self.config.fee_rate
+                holding['balance'] -= executed
+                if holding['balance'] <= 1e-12:
+                    del self.holdings[currency]
+                self.krw_balance += executed * fill_price - fee
+
+            order = SimulatedOrder(
+                uuid=str(uuid.uuid4()),
+                market=market,
+                side=side,
+                ord_type='price' if side == 'bid' else 'market',
+                price=price,
+                volume=volume,
+                executed_volume=executed,
+                avg_price=fill_price,
+                paid_fee=fee,
+                created_at=datetime.now().astimezone().isoformat(timespec='seconds'),
+                settle_at=self._clock() + self.config.fill_delay_ms / 1000,
+            )
+            self.orders[order.uuid] = order
+
+        with self._stats_lock:
+            self.stats['orders_filled'] += 1
+
+        return order.to_response(include_trades=False, now=self._clock())
+
+    def _place_limit_bid(self, market: str, price: float, volume: float) -> Dict[str, Any]:
+        """지정가 매수: 주문가 ≥ 최우선 매도호가면 주문가로 즉시 체결, 아니면 KRW를 묶고 대기 (취소 시 반환)"""
+        if market not in self.tickers:
+            return {'error': {'name': 'market_does_not_exist', 'message': f"{market} 마켓이 없습니다"}}
+
+        best_ask = float(self.orderbook(market)['orderbook_units'][0]['ask_price'])
+        currency = market.split('-')[1]
+        funds = price * volume
+        fee = funds * self.config.fee_rate
+        fills = price >= best_ask
+
+        with self._account_lock:
+            if funds < 5000:
+                return {'error': {'name': 'under_min_total_bid', 'message': '최소주문금액 이상으로 주문해주세요'}}
+            if funds + fee > self.krw_balance:
+                return {'error': {'name': 'insufficient_funds_bid', 'message': '매수가능금액이 부족합니다.'}}
+
+            self.krw_balance -= funds + fee
+            if fills:
+                holding = self.holdings.setdefault(currency, {'balance': 0.0, 'avg_buy_price': 0.0})
+                total_cost = holding['balance'] * holding['avg_buy_price'] + funds
+                holding['balance'] += volume
+                holding['avg_buy_price'] = total_cost / holding['balance']
+
+            order = SimulatedOrder(
+                uuid=str(uuid.uuid4()),
+                market=market,
+                side='bid',
+                ord_type='limit',
+                price=price,
+                volume=volume,
+                executed_volume=volume if fills else 0.0,
+                avg_price=price,
+                paid_fee=fee if fills else 0.0,
+                created_at=datetime.now().astimezone().isoformat(timespec='seconds'),
+                state='done' if fills else 'wait',
+                settle_at=self._clock() + self.config.fill_delay_ms / 1000,
+            )
+            self.orders[order.uuid] = order
+
+        if fills:
+            with self._stats_lock:
+                self.stats['orders_filled'] += 1
+
+        return order.to_response(include_trades=False, now=self._clock())
+
+    def _cancel(self, order_uuid: str) -> Dict[str, Any]:
+        """대기 중인 지정가 주문 취소 (묶인 KRW 반환)"""
+        with self._account_lock:
+            order = self.orders.get(order_uuid)
+            if order is None or order.state != 'wait':
+                return {'error': {'name': 'order_not_found', 'message': '주문을 찾지 못했습니다'}}
+
+            order.state = 'cancel'
+            funds = order.price * order.volume
+            self.krw_balance += funds * (1 + self.config.fee_rate)
+
+        return order.to_response(include_trades=False)
+
+    # ------------------------------------------------------------------
+    # REST 라우팅 (requests.get)
+    # ------------------------------------------------------------------
+
+    def _rest_error(self, error: str, group: str) -> _SimulatedResponse:
+        """REST 오류 응답 (요청 수 제한은 429 + Remaining-Req sec=0)"""
+        if error == 'too_many_requests':
+            return _SimulatedResponse(self._error_response(error), status_code=429, group=group, sec=0)
+        return _SimulatedResponse(self._error_response(error), status_code=500, group=group)
+
+    def _route_request(self, url: str, params: Optional[Dict[str, Any]]):
+        """시뮬레이터가 처리하는 URL이면 응답 반환, 아니면 None"""
+        params = params or {}
+
+        if 'alternative.me/fng' in url:
+            if self._before_call('fear_greed', 'external'):
+                return _SimulatedResponse({}, status_code=503)
+            value = self.config.fear_greed_value
+            if value is None:
+                value = int(np.random.default_rng([self.config.seed, 7]).integers(20, 80))
+            classification = ('Extreme Fear' if value <= 25 else 'Fear' if value <= 45 else
+                              'Neutral' if value <= 55 else 'Greed' if value <= 75 else 'Extreme Greed')
+            return _SimulatedResponse({'data': [{
+                'value': str(value), 'value_classification': classification,
+                'timestamp': str(int(time.time()))
+            }]})
+
+        if 'api.upbit.com/v1/ticker' in url:
+            error = self._before_call('rest_ticker', 'ticker')
+            if error:
+                return self._rest_error(error, 'ticker')
+            markets = [m.strip() for m in str(params.get('markets', '')).split(',') if m.strip()]
+            payload = []
+            for market in markets:
+                if market not in self.tickers:
+                    continue
+                daily = self.daily_frame(market)
+                prev_close = float(daily['close'].iloc[-2])
+                price = float(daily['close'].iloc[-1])
+                payload.append({
+                    'market': market,
+                    'trade_price': price,
+                    'prev_closing_price': prev_close,
+                    'change_rate': abs(price - prev_close) / prev_close,
+                    'signed_change_rate': (price - prev_close) / prev_close,
+                    'acc_trade_volume_24h': float(daily['volume'].iloc[-1]),
+                    'acc_trade_price_24h': float(daily['value'].iloc[-1]),
+                })
+            return _SimulatedResponse(payload, group='ticker', sec=self._remaining('ticker')['sec'])
+
+        if 'api.upbit.com/v1/candles/days' in url:
+            error = self._before_call('rest_candles', 'candles')
+            if error:
+                return self._rest_error(error, 'candles')
+            market = params.get('market', 'KRW-BTC')
+            count = int(params.get('count', 1))
+            if market not in self.tickers:
+                return _SimulatedResponse([], group='candles')
+            daily = self.daily_frame(market).tail(count).iloc[::-1]  # 업비트는 최신순
+            payload = [{
+                'market': market,
+                'candle_date_time_kst': index.strftime('%Y-%m-%dT%H:%M:%S'),
+                'opening_price': row['open'],
+                'high_price': row['high'],
+                'low_price': row['low'],
+                'trade_price': row['close'],
+                'candle_acc_trade_volume': row['volume'],
+                'candle_acc_trade_price': row['value'],
+            } for index, row in daily.iterrows()]
+            return _SimulatedResponse(payload, group='candles', sec=self._remaining('candles')['sec'])
+
+        return None
+
+    # ------------------------------------------------------------------
+    # 설치 / 해제
+    # ------------------------------------------------------------------
+
+    def install(self):
+        """pyupbit / requests.get / 파이프라인 모듈 time.sleep 대체"""
+        if self._originals:
+            return self
+
+        simulator = self
+        original_requests_get = requests.get
+
+        def routed_get(url, params=None, **kwargs):
+            response = simulator._route_request(str(url), params)
+            return response if response is not None else original_requests_get(url, params=params, **kwargs)
+
+        replacements = {
+            'get_tickers': self.get_tickers,
+            'get_ohlcv': self.get_ohlcv,
+            'get_current_price': self.get_current_price,
+            'get_orderbook': self.get_orderbook,
+            'Upbit': lambda access=None, secret=None: FakeUpbitClient(simulator),
+        }
+        for name, replacement in replacements.items():
+            self._originals[f"pyupbit.{name}"] = getattr(pyupbit, name)
+            setattr(pyupbit, name, replacement)
+
+        self._originals['requests.get'] = original_requests_get
+        requests.get = routed_get
+
+        if self.config.fast_sleep:
+            fast_time = _FastTime(self)
+            for module_name in FAST_SLEEP_MODULES:
+                module = sys.modules.get(module_name)
+                if module is not None and getattr(module, 'time', None) is time:
+                    self._patched_time_modules[module_name] = module
+                    module.time = fast_time
+
+            # 레이트 리밋 주입이 없으면 공유 레이트 리미터도 대기 없이 통과 (호출 통계만 기록)
+            if self.config.rate_limit_per_sec <= 0:
+                from api_rate_limiter import get_rate_limiter
+                limiter = get_rate_limiter()
+                self._limiter_enabled = limiter.enabled
+                limiter.enabled = False
+
+        logger.info(f"🧪 업비트 시뮬레이터 설치: {len(self.tickers)}개 종목, seed={self.config.seed}, "
+                    f"지연 {self.config.latency_ms:.0f}ms, 오류율 {self.config.error_rate:.1%}, "
+                    f"레이트 리밋 {self.config.rate_limit_per_sec or '무제한'}/s")
+        return self
+
+    def uninstall(self):
+        """원래 pyupbit / requests / time 복원"""
+        for key, original in self._originals.items():
+            module_name, attr = key.split('.', 1)
+            setattr(pyupbit if module_name == 'pyupbit' else requests, attr, original)
+        self._originals.clear()
+
+        for module in self._patched_time_modules.values():
+            module.time = time
+        self._patched_time_modules.clear()
+
+        if self._limiter_enabled is not None:
+            from api_rate_limiter import get_rate_limiter
+            get_rate_limiter().enabled = self._limiter_enabled
+            self._limiter_enabled = None
+
+    @contextmanager
+    def installed(self):
+        self.install()
+        try:
+            yield self
+        finally:
+            self.uninstall()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """호출/장애 주입/계좌 통계"""
+        with self._stats_lock:
+            stats = {
+                'calls': dict(self.stats['calls']),
+                'total_calls': sum(self.stats['calls'].values()),
+                'injected_errors': self.stats['injected_errors'],
+                'rate_limited': self.stats['rate_limited'],
+                'skipped_sleep_seconds': round(self.stats['skipped_sleep_seconds'], 2),
+                'orders_filled': self.stats['orders_filled'],
+            }
+        with self._account_lock:
+            stats['krw_balance'] = round(self.krw_balance, 2)
+            stats['holdings'] = {c: round(h['balance'], 8) for c, h in self.holdings.items()}
+        return stats
+
+
+class FakeUpbitClient:
+    """pyupbit.Upbit 대체 (시뮬레이터 가상 계좌 사용)"""
+
+    def __init__(self, simulator: UpbitSimulator):
+        self.simulator = simulator
+
+    def get_balances(self, contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('get_balances', 'default'))
+        if error:
+            return self.simulator._error_response(error)
+        return self.simulator._respond(self.simulator.balances(), 'default', contain_req)
+
+    def get_balance(self, ticker: str = "KRW", verbose: bool = False, contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('get_balance', 'default'))
+        if error:
+            return self.simulator._error_response(error)
+
+        currency = ticker.split('-')[-1] if '-' in ticker else ticker
+        if currency == 'KRW':
+            balance = self.simulator.krw_balance
+        else:
+            holding = self.simulator.holdings.get(currency)
+            balance = holding['balance'] if holding else 0.0
+        return self.simulator._respond(balance, 'default', contain_req)
+
+    def buy_market_order(self, ticker: str, price: float, contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('buy_market_order', 'order'))
+        if error:
+            return self.simulator._error_response(error)
+        return self.simulator._respond(self.simulator._fill(ticker, 'bid', price=float(price), volume=None),
+                                       'order', contain_req)
+
+    def sell_market_order(self, ticker: str, volume: float, contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('sell_market_order', 'order'))
+        if error:
+            return self.simulator._error_response(error)
+        return self.simulator._respond(self.simulator._fill(ticker, 'ask', price=None, volume=float(volume)),
+                                       'order', contain_req)
+
+    def buy_limit_order(self, ticker: str, price: float, volume: float, contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('buy_limit_order', 'order'))
+        if error:
+            return self.simulator._error_response(error)
+        return self.simulator._respond(self.simulator._place_limit_bid(ticker, float(price), float(volume)),
+                                       'order', contain_req)
+
+    def get_order(self, ticker_or_uuid: str, state: str = 'wait', page: int = 1, limit: int = 100,
+                  contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('get_order', 'default'))
+        if error:
+            return self.simulator._error_response(error)
+
+        order = self.simulator.orders.get(ticker_or_uuid)
+        if order is not None:
+            result = order.to_response(now=self.simulator._clock())
+        else:
+            # 마켓 코드로 조회 시 해당 마켓 주문 목록
+            now = self.simulator._clock()
+            responses = [o.to_response(include_trades=False, now=now) for o in self.simulator.orders.values()
+                         if o.market == ticker_or_uuid]
+            result = [r for r in responses if r['state'] == state][:limit]
+        return self.simulator._respond(result, 'default', contain_req)
+
+    def get_orders(self, state: str = 'done', limit: int = 100, **kwargs):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('get_orders', 'default'))
+        if error:
+            return self.simulator._error_response(error)
+
+        now = self.simulator._clock()
+        responses = [o.to_response(include_trades=False, now=now) for o in self.simulator.orders.values()]
+        responses = [r for r in responses if r['state'] == state]
+        responses.sort(key=lambda r: r['created_at'], reverse=True)
+        return responses[:limit]
+
+    def cancel_order(self, uuid: str, contain_req: bool = False):
+        error = self.simulator._raise_if_limited(self.simulator._before_call('cancel_order', 'order'))
+        if error:
+            return self.simulator._error_response(error)
+        return self.simulator._respond(self.simulator._cancel(uuid), 'order', contain_req)
+
+
+# 실행마다 재생성하는 작업 디렉터리 상태 파일 (가상 계좌가 매 실행 초기화되므로 함께 초기화)
+SIMULATION_STATE_FILES = (
+    'makenaide_local.db', 'makenaide_local.db-wal', 'makenaide_local.db-shm',
+    'correlation_cache.npz', 'adaptive_config.json', 'blacklist.json'
+)
+SIMULATION_MARKER = '.makenaide_simulator'
+
+
+def prepare_simulation_workdir(workdir: str) -> str:
+    """
+    시뮬레이션 작업 디렉터리 준비 (매 실행 빈 SQLite 스키마 + 빈 블랙리스트로 재생성)
+
+    이전 실행의 거래/포지션이 새 가상 계좌와 섞이지 않도록 상태 파일을 삭제한다.
+    실제 DB 삭제를 막기 위해 시뮬레이터가 만든 디렉터리(마커 파일 존재)에서만 삭제한다.
+    """
+    from init_db_sqlite import SQLiteDatabaseInitializer
+
+    workdir = os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+
+    marker_path = os.path.join(workdir, SIMULATION_MARKER)
+    existing = [name for name in SIMULATION_STATE_FILES if os.path.exists(os.path.join(workdir, name))]
+    if existing and not os.path.exists(marker_path):
+        raise ValueError(f"시뮬레이터 작업 디렉터리가 아닌 경로의 기존 상태는 삭제하지 않습니다: {workdir} "
+                         f"({', '.join(existing)}) - 다른 --sim-workdir를 지정하세요")
+
+    for name in existing:
+        os.remove(os.path.join(workdir, name))
+    with open(marker_path, 'w', encoding='utf-8') as f:
+        f.write(datetime.now().isoformat())
+
+    with SQLiteDatabaseInitializer(os.path.join(workdir, 'makenaide_local.db')) as db_init:
+        db_init.initialize_database()
+
+    with open(os.path.join(workdir, 'blacklist.json'), 'w', encoding='utf-8') as f:
+        json.dump({}, f)
+
+    return workdir